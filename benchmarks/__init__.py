@@ -0,0 +1 @@
+"""Benchmark and load-testing tooling for the Story Bible Service."""
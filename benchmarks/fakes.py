@@ -0,0 +1,192 @@
+"""In-process stand-ins for PayloadCMS and the Brain Service.
+
+Both fakes are plain FastAPI apps so they can be served by uvicorn next to the
+real service.  Latency is injected per request and the PayloadCMS store can be
+seeded with synthetic story bibles of any scale, which lets the load harness
+exercise realistic payload sizes without any external dependency.
+"""
+
+import asyncio
+import json
+import random
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+
+from src.services.embeddings import HashingEmbedder
+
+from .synthetic import BibleScale, generate_story_bible
+
+
+BENCH_PROJECT_ID = "bench-project"
+BENCH_TOKEN = "bench-token"
+
+# PayloadCMS collections that hang off a story bible and are populated at depth=2.
+_POPULATED_COLLECTIONS = {
+    "characters": "story-bible-characters",
+    "scenes": "story-bible-scenes",
+    "plot_threads": "plot-threads",
+    "relationships": "character-relationships",
+}
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    payload_ms: float = 5.0
+    brain_ms: float = 50.0
+    jitter: float = 0.2
+
+
+LATENCY_PROFILES: Dict[str, LatencyProfile] = {
+    "none": LatencyProfile(payload_ms=0.0, brain_ms=0.0, jitter=0.0),
+    "lan": LatencyProfile(payload_ms=5.0, brain_ms=50.0),
+    "wan": LatencyProfile(payload_ms=40.0, brain_ms=400.0),
+}
+
+
+async def _sleep(base_ms: float, jitter: float, rng: random.Random) -> None:
+    if base_ms <= 0:
+        return
+    delay = base_ms * (1 + rng.uniform(-jitter, jitter))
+    await asyncio.sleep(delay / 1000)
+
+
+def _matches(doc: Dict[str, Any], filters: Dict[str, Dict[str, str]]) -> bool:
+    for field, ops in filters.items():
+        value = doc.get(field)
+        for op, expected in ops.items():
+            if op == "equals" and str(value) != expected:
+                return False
+            if op == "in" and str(value) not in expected.split(","):
+                return False
+    return True
+
+
+def _parse_where(query: Dict[str, str]) -> Dict[str, Dict[str, str]]:
+    filters: Dict[str, Dict[str, str]] = {}
+    for key, value in query.items():
+        if not key.startswith("where["):
+            continue
+        parts = key[len("where[") : -1].split("][")
+        if len(parts) == 2:
+            filters.setdefault(parts[0], {})[parts[1]] = value
+    return filters
+
+
+class FakePayloadStore:
+    def __init__(self) -> None:
+        self.collections: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def insert(self, collection: str, doc: Dict[str, Any]) -> Dict[str, Any]:
+        doc = dict(doc)
+        doc.setdefault("id", uuid.uuid4().hex[:16])
+        self.collections.setdefault(collection, {})[doc["id"]] = doc
+        return doc
+
+    def get(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        return self.collections.get(collection, {}).get(doc_id)
+
+    def find(self, collection: str, filters: Dict[str, Dict[str, str]]) -> List[Dict[str, Any]]:
+        return [doc for doc in self.collections.get(collection, {}).values() if _matches(doc, filters)]
+
+    def populate(self, story_bible: Dict[str, Any]) -> Dict[str, Any]:
+        populated = dict(story_bible)
+        for field, collection in _POPULATED_COLLECTIONS.items():
+            populated[field] = self.find(collection, {"story_bible": {"equals": story_bible["id"]}})
+        return populated
+
+
+def seed_story_bible(store: FakePayloadStore, scale: BibleScale, *, seed: int = 0) -> str:
+    """Insert one synthetic story bible of the requested scale and return its id."""
+    bible = generate_story_bible(scale, seed=seed, project_id=BENCH_PROJECT_ID)
+    for field, collection in _POPULATED_COLLECTIONS.items():
+        for doc in bible.pop(field):
+            store.insert(collection, doc)
+    return store.insert("story-bibles", bible)["id"]
+
+
+def create_fake_payload_app(store: FakePayloadStore, latency: LatencyProfile, *, seed: int = 0) -> FastAPI:
+    app = FastAPI()
+    rng = random.Random(seed)
+
+    @app.get("/api/users/me")
+    async def users_me() -> Dict[str, Any]:
+        await _sleep(latency.payload_ms, latency.jitter, rng)
+        return {"id": "bench-user", "projects": [BENCH_PROJECT_ID], "roles": ["writer"]}
+
+    @app.get("/api/{collection}")
+    async def list_docs(collection: str, request: Request) -> Dict[str, Any]:
+        await _sleep(latency.payload_ms, latency.jitter, rng)
+        docs = store.find(collection, _parse_where(dict(request.query_params)))
+        return {"docs": docs, "totalDocs": len(docs)}
+
+    @app.post("/api/{collection}")
+    async def create_doc(collection: str, request: Request) -> Dict[str, Any]:
+        await _sleep(latency.payload_ms, latency.jitter, rng)
+        return {"doc": store.insert(collection, await request.json())}
+
+    @app.get("/api/{collection}/{doc_id}")
+    async def get_doc(collection: str, doc_id: str, depth: int = 0) -> Dict[str, Any]:
+        await _sleep(latency.payload_ms, latency.jitter, rng)
+        doc = store.get(collection, doc_id)
+        if doc is None:
+            raise HTTPException(status_code=404, detail="Not found")
+        if collection == "story-bibles" and depth >= 1:
+            return store.populate(doc)
+        return doc
+
+    @app.patch("/api/{collection}/{doc_id}")
+    async def update_doc(collection: str, doc_id: str, request: Request) -> Dict[str, Any]:
+        await _sleep(latency.payload_ms, latency.jitter, rng)
+        doc = store.get(collection, doc_id)
+        if doc is None:
+            raise HTTPException(status_code=404, detail="Not found")
+        doc.update(await request.json())
+        return {"doc": doc}
+
+    @app.delete("/api/{collection}/{doc_id}")
+    async def delete_doc(collection: str, doc_id: str) -> Dict[str, Any]:
+        await _sleep(latency.payload_ms, latency.jitter, rng)
+        doc = store.collections.get(collection, {}).pop(doc_id, None)
+        if doc is None:
+            raise HTTPException(status_code=404, detail="Not found")
+        return {"doc": doc}
+
+    return app
+
+
+_EMBEDDER = HashingEmbedder()
+
+
+def _brain_result(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    if name == "generate_embeddings":
+        return {"embeddings": [_EMBEDDER.embed_one(text).tolist() for text in arguments.get("texts", [])]}
+    return {"tool": name, "summary": f"Synthetic {name} result", "argument_bytes": len(json.dumps(arguments))}
+
+
+def create_fake_brain_app(latency: LatencyProfile, *, seed: int = 0) -> FastAPI:
+    app = FastAPI()
+    rng = random.Random(seed)
+
+    @app.post("/tools/{name}")
+    async def call_tool(name: str, request: Request) -> Dict[str, Any]:
+        arguments = await request.json()
+        await _sleep(latency.brain_ms, latency.jitter, rng)
+        return _brain_result(name, arguments)
+
+    @app.websocket("/mcp")
+    async def mcp(websocket: WebSocket) -> None:
+        await websocket.accept()
+        try:
+            while True:
+                message = await websocket.receive_json()
+                params = message.get("params", {})
+                await _sleep(latency.brain_ms, latency.jitter, rng)
+                result = _brain_result(params.get("name", ""), params.get("arguments", {}))
+                await websocket.send_json({"jsonrpc": "2.0", "id": message.get("id"), "result": result})
+        except WebSocketDisconnect:
+            return
+
+    return app
@@ -0,0 +1,314 @@
+"""End-to-end load test for the Story Bible Service.
+
+Starts the real FastAPI app alongside in-process PayloadCMS and Brain Service
+fakes, drives a weighted mix of REST and ``/mcp/ws`` traffic against it and
+writes throughput and latency percentiles to a JSON file::
+
+    python -m benchmarks.load_test --duration 30 --concurrency 16 --size medium
+    python -m benchmarks.load_test --baseline benchmarks/results/load_<old>.json
+
+Every server shares one event loop with the load generator, so absolute
+numbers are pessimistic; the harness is meant for comparing commits on the
+same machine rather than for capacity planning.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import socket
+import subprocess
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+import uvicorn
+import websockets
+
+from .fakes import (
+    BENCH_TOKEN,
+    LATENCY_PROFILES,
+    FakePayloadStore,
+    LatencyProfile,
+    create_fake_brain_app,
+    create_fake_payload_app,
+    seed_story_bible,
+)
+from .synthetic import SCALES, BibleScale
+
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+DEFAULT_MIX: Dict[str, int] = {
+    "rest_get_story_bible": 40,
+    "rest_bulk_scene_writes": 15,
+    "rest_export": 15,
+    "rest_consistency": 5,
+    "mcp_get_story_bible": 15,
+    "mcp_add_scene": 10,
+}
+
+
+@dataclass
+class LoadTestConfig:
+    duration_s: float = 10.0
+    concurrency: int = 8
+    latency: str = "lan"
+    size: str = "medium"
+    bulk_scene_batch: int = 10
+    seed: int = 0
+    mix: Dict[str, int] = field(default_factory=lambda: dict(DEFAULT_MIX))
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class _ServerGroup:
+    """Run several ASGI apps on uvicorn servers inside the current event loop."""
+
+    def __init__(self) -> None:
+        self._servers: List[uvicorn.Server] = []
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self, app: Any, port: int) -> None:
+        config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="auto")
+        server = uvicorn.Server(config)
+        self._servers.append(server)
+        self._tasks.append(asyncio.create_task(server.serve()))
+        while not server.started:
+            await asyncio.sleep(0.01)
+
+    async def stop(self) -> None:
+        for server in reversed(self._servers):
+            server.should_exit = True
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+class _Scenario:
+    def __init__(self, client: httpx.AsyncClient, ws_url: str, story_bible_id: str, config: LoadTestConfig) -> None:
+        self._client = client
+        self.ws_url = ws_url
+        self._story_bible_id = story_bible_id
+        self._config = config
+        self._sequence = 10_000
+
+    def _scene_payload(self) -> Dict[str, Any]:
+        self._sequence += 1
+        return {
+            "story_bible": self._story_bible_id,
+            "sequence_number": self._sequence,
+            "title": f"Load scene {self._sequence}",
+            "location": "Harbour",
+            "time_of_day": "night",
+            "scene_purpose": "conflict",
+            "description": "Waves crash against the pier while the bell tolls.",
+        }
+
+    async def rest_get_story_bible(self, _ws: Any) -> None:
+        resp = await self._client.get(f"/api/v1/story-bibles/{self._story_bible_id}")
+        resp.raise_for_status()
+
+    async def rest_bulk_scene_writes(self, _ws: Any) -> None:
+        url = f"/api/v1/story-bibles/{self._story_bible_id}/scenes"
+        responses = await asyncio.gather(
+            *(self._client.post(url, json=self._scene_payload()) for _ in range(self._config.bulk_scene_batch))
+        )
+        for resp in responses:
+            resp.raise_for_status()
+
+    async def rest_export(self, _ws: Any) -> None:
+        resp = await self._client.get(f"/api/v1/story-bibles/{self._story_bible_id}/export")
+        resp.raise_for_status()
+
+    async def rest_consistency(self, _ws: Any) -> None:
+        resp = await self._client.post(f"/api/v1/story-bibles/{self._story_bible_id}/consistency")
+        resp.raise_for_status()
+
+    async def _mcp_call(self, ws: Any, name: str, arguments: Dict[str, Any]) -> None:
+        await ws.send(json.dumps({"id": 1, "method": "call_tool", "params": {"name": name, "arguments": arguments}}))
+        response = json.loads(await ws.recv())
+        if "error" in response:
+            raise RuntimeError(response["error"].get("message"))
+
+    async def mcp_get_story_bible(self, ws: Any) -> None:
+        await self._mcp_call(ws, "get_story_bible", {"story_bible_id": self._story_bible_id})
+
+    async def mcp_add_scene(self, ws: Any) -> None:
+        await self._mcp_call(ws, "add_scene", self._scene_payload())
+
+
+async def _worker(
+    scenario: _Scenario,
+    operations: List[str],
+    weights: List[int],
+    deadline: float,
+    samples: Dict[str, List[float]],
+    errors: Dict[str, int],
+    rng: random.Random,
+) -> None:
+    headers = {"Authorization": f"Bearer {BENCH_TOKEN}"}
+    async with websockets.connect(scenario.ws_url, extra_headers=headers) as ws:
+        while time.perf_counter() < deadline:
+            name = rng.choices(operations, weights=weights)[0]
+            operation: Callable[[Any], Awaitable[None]] = getattr(scenario, name)
+            started = time.perf_counter()
+            try:
+                await operation(ws)
+            except Exception:  # noqa: BLE001
+                errors[name] = errors.get(name, 0) + 1
+                continue
+            samples.setdefault(name, []).append((time.perf_counter() - started) * 1000)
+
+
+def _summarise(samples: Dict[str, List[float]], errors: Dict[str, int], elapsed: float) -> Dict[str, Any]:
+    def stats(values: List[float], error_count: int) -> Dict[str, Any]:
+        return {
+            "count": len(values),
+            "errors": error_count,
+            "rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(_percentile(values, 50), 2),
+            "p95_ms": round(_percentile(values, 95), 2),
+            "p99_ms": round(_percentile(values, 99), 2),
+        }
+
+    operations = {
+        name: stats(samples.get(name, []), errors.get(name, 0)) for name in sorted(set(samples) | set(errors))
+    }
+    all_samples = [value for values in samples.values() for value in values]
+    return {"overall": stats(all_samples, sum(errors.values())), "operations": operations}
+
+
+async def run_load_test(config: LoadTestConfig) -> Dict[str, Any]:
+    from src.config import settings
+    from src.main import app as service_app
+
+    latency: LatencyProfile = LATENCY_PROFILES[config.latency]
+    size: BibleScale = SCALES[config.size]
+    store = FakePayloadStore()
+    story_bible_id = seed_story_bible(store, size, seed=config.seed)
+
+    payload_port, brain_port, service_port = _free_port(), _free_port(), _free_port()
+    overrides = {
+        "PAYLOADCMS_API_URL": f"http://127.0.0.1:{payload_port}",
+        "BRAIN_SERVICE_URL": f"http://127.0.0.1:{brain_port}",
+        "BRAIN_SERVICE_WS_URL": f"ws://127.0.0.1:{brain_port}/mcp",
+        "PAYLOADCMS_MAX_RETRIES": 1,
+    }
+    previous = {key: getattr(settings, key) for key in overrides}
+    for key, value in overrides.items():
+        setattr(settings, key, value)
+
+    servers = _ServerGroup()
+    try:
+        await servers.start(create_fake_payload_app(store, latency, seed=config.seed), payload_port)
+        await servers.start(create_fake_brain_app(latency, seed=config.seed), brain_port)
+        await servers.start(service_app, service_port)
+
+        samples: Dict[str, List[float]] = {}
+        errors: Dict[str, int] = {}
+        operations = list(config.mix)
+        weights = [config.mix[name] for name in operations]
+        headers = {"Authorization": f"Bearer {BENCH_TOKEN}"}
+        limits = httpx.Limits(max_connections=config.concurrency * config.bulk_scene_batch)
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{service_port}", headers=headers, limits=limits, timeout=60.0
+        ) as client:
+            scenario = _Scenario(client, f"ws://127.0.0.1:{service_port}/mcp/ws", story_bible_id, config)
+            started = time.perf_counter()
+            deadline = started + config.duration_s
+            await asyncio.gather(
+                *(
+                    _worker(scenario, operations, weights, deadline, samples, errors, random.Random(config.seed + i))
+                    for i in range(config.concurrency)
+                )
+            )
+            elapsed = time.perf_counter() - started
+    finally:
+        await servers.stop()
+        for key, value in previous.items():
+            setattr(settings, key, value)
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": int(time.time()),
+        "config": asdict(config),
+        "elapsed_s": round(elapsed, 3),
+        "results": _summarise(samples, errors, elapsed),
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Render a per-operation comparison of two result files."""
+    lines = [f"{'operation':<26}{'rps':>18}{'p95 ms':>22}"]
+    base_ops = baseline["results"]["operations"]
+    for name, stats in current["results"]["operations"].items():
+        before = base_ops.get(name)
+        if before is None:
+            lines.append(f"{name:<26}{stats['rps']:>18}{stats['p95_ms']:>22}")
+            continue
+        lines.append(
+            f"{name:<26}{before['rps']:>8} -> {stats['rps']:<7}{before['p95_ms']:>10} -> {stats['p95_ms']:<8}"
+        )
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load to generate")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent virtual clients")
+    parser.add_argument("--latency", choices=sorted(LATENCY_PROFILES), default="lan")
+    parser.add_argument("--size", choices=sorted(SCALES), default="medium")
+    parser.add_argument("--bulk-batch", type=int, default=10, help="Scenes per bulk write operation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mix", type=json.loads, default=None, help='JSON weights, e.g. \'{"rest_export": 1}\'')
+    parser.add_argument("--output", type=Path, default=None, help="Result file (default: results/load_<commit>.json)")
+    parser.add_argument("--baseline", type=Path, default=None, help="Previous result file to compare against")
+    args = parser.parse_args(argv)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    config = LoadTestConfig(
+        duration_s=args.duration,
+        concurrency=args.concurrency,
+        latency=args.latency,
+        size=args.size,
+        bulk_scene_batch=args.bulk_batch,
+        seed=args.seed,
+        mix=args.mix or dict(DEFAULT_MIX),
+    )
+    report = asyncio.run(run_load_test(config))
+
+    output = args.output or RESULTS_DIR / f"load_{report['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(json.dumps(report["results"]["overall"], indent=2))
+    print(f"Results written to {output}")
+
+    if args.baseline:
+        for line in compare(json.loads(args.baseline.read_text()), report):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Memory held by indexed story bible entities: parsed JSON dicts vs compact records.
+
+For each synthetic scale the bible is parsed from JSON once and kept as
+dicts, and once converted to the records the indexes store (with the dicts
+dropped).  Sizes are the bytes still allocated afterwards, measured with
+``tracemalloc``, so strings shared by both forms are counted in both::
+
+    python -m benchmarks.memory --scales small medium large xlarge
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any, Dict, List, Optional
+
+from src.indexes.records import (
+    CharacterRecord,
+    PlotThreadRecord,
+    RecordTable,
+    RelationshipRecord,
+    SceneRecord,
+)
+
+from .synthetic import SCALES, generate_story_bible
+
+
+_RECORD_TYPES = {
+    "characters": CharacterRecord,
+    "scenes": SceneRecord,
+    "plot_threads": PlotThreadRecord,
+    "relationships": RelationshipRecord,
+}
+
+
+def _retained(build: Callable[[], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        held = build()  # noqa: F841 - kept alive until measured
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current
+
+
+def measure_scale(scale_name: str) -> Dict[str, Any]:
+    raw = json.dumps(generate_story_bible(SCALES[scale_name]))
+
+    def as_dicts() -> Dict[str, List[Dict[str, Any]]]:
+        document = json.loads(raw)
+        return {kind: document[kind] for kind in _RECORD_TYPES}
+
+    def as_records() -> Dict[str, RecordTable]:
+        document = json.loads(raw)
+        return {kind: RecordTable(record_type, document[kind]) for kind, record_type in _RECORD_TYPES.items()}
+
+    dict_bytes = _retained(as_dicts)
+    # Timed outside tracemalloc; this also warms up the interpreter's interned-string
+    # table so its one-off growth is not charged to the records.
+    document = json.loads(raw)
+    started = time.perf_counter()
+    tables = {kind: RecordTable(record_type, document[kind]) for kind, record_type in _RECORD_TYPES.items()}
+    build_seconds = time.perf_counter() - started
+    del tables, document
+    record_bytes = _retained(as_records)
+
+    tables = as_records()
+    started = time.perf_counter()
+    for table in tables.values():
+        for entity_id in table:
+            table[entity_id]
+    materialize_seconds = time.perf_counter() - started
+
+    return {
+        "entities": sum(len(table) for table in tables.values()),
+        "dict_kib": round(dict_bytes / 1024, 1),
+        "record_kib": round(record_bytes / 1024, 1),
+        "saved": round(1 - record_bytes / dict_bytes, 3),
+        "build_ms": round(build_seconds * 1000, 1),
+        "materialize_ms": round(materialize_seconds * 1000, 1),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", nargs="+", choices=sorted(SCALES), default=["small", "medium", "large"])
+    args = parser.parse_args(argv)
+
+    print(f"{'scale':<8}{'entities':>10}{'dict KiB':>12}{'record KiB':>12}{'saved':>8}{'build ms':>10}{'to_dict ms':>12}")
+    for scale_name in args.scales:
+        stats = measure_scale(scale_name)
+        print(
+            f"{scale_name:<8}{stats['entities']:>10}{stats['dict_kib']:>12}{stats['record_kib']:>12}"
+            f"{stats['saved']:>8.0%}{stats['build_ms']:>10}{stats['materialize_ms']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
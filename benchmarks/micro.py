@@ -0,0 +1,144 @@
+"""Micro-benchmarks for formatting, export and model-validation hot paths.
+
+Each benchmark runs against synthetic bibles from :mod:`benchmarks.synthetic`
+and reports the best and mean wall time over several repeats plus the peak
+memory allocated by a single run (measured separately under ``tracemalloc``
+so tracing overhead does not skew the timings)::
+
+    python -m benchmarks.micro --scales small medium large
+    python -m benchmarks.micro --baseline benchmarks/results/micro_<old>.json --max-regression 0.2
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.models import CharacterCreate, SceneCreate
+from src.services.export_service import ExportService
+from src.utils.formatting import render_json, render_markdown
+
+from .synthetic import SCALES, generate_story_bible
+
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+_EXPORT_SECTIONS = ["title", "genre", "premise", "characters", "scenes"]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _validate_scenes(story_bible: Dict[str, Any]) -> None:
+    for scene in story_bible["scenes"]:
+        SceneCreate.model_validate(scene)
+
+
+def _validate_characters(story_bible: Dict[str, Any]) -> None:
+    for character in story_bible["characters"]:
+        CharacterCreate.model_validate(character)
+
+
+def build_benchmarks() -> Dict[str, Callable[[Dict[str, Any]], Any]]:
+    export = ExportService()
+    return {
+        "render_markdown": render_markdown,
+        "render_json": render_json,
+        "filter_sections": lambda bible: export._filter_sections(bible, _EXPORT_SECTIONS),
+        "export_markdown": lambda bible: export.generate(bible, export_format="markdown"),
+        "export_json_sections": lambda bible: export.generate(bible, export_format="json", sections=_EXPORT_SECTIONS),
+        "validate_scene_create": _validate_scenes,
+        "validate_character_create": _validate_characters,
+    }
+
+
+def measure(func: Callable[[Dict[str, Any]], Any], story_bible: Dict[str, Any], repeats: int) -> Dict[str, float]:
+    durations: List[float] = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func(story_bible)
+        durations.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    try:
+        func(story_bible)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "best_ms": round(min(durations), 3),
+        "mean_ms": round(sum(durations) / len(durations), 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_micro_benchmarks(scales: List[str], repeats: int, *, only: Optional[List[str]] = None) -> Dict[str, Any]:
+    benchmarks = build_benchmarks()
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for scale_name in scales:
+        story_bible = generate_story_bible(SCALES[scale_name])
+        results[scale_name] = {
+            name: measure(func, story_bible, repeats)
+            for name, func in benchmarks.items()
+            if not only or name in only
+        }
+    return {"commit": _git_commit(), "timestamp": int(time.time()), "repeats": repeats, "results": results}
+
+
+def find_regressions(baseline: Dict[str, Any], current: Dict[str, Any], max_regression: float) -> List[str]:
+    """Return human readable lines for benchmarks slower than ``baseline`` by more than ``max_regression``."""
+    regressions: List[str] = []
+    for scale_name, benches in current["results"].items():
+        for name, stats in benches.items():
+            before = baseline["results"].get(scale_name, {}).get(name)
+            if not before or before["best_ms"] <= 0:
+                continue
+            ratio = stats["best_ms"] / before["best_ms"] - 1
+            if ratio > max_regression:
+                regressions.append(
+                    f"{scale_name}/{name}: {before['best_ms']}ms -> {stats['best_ms']}ms (+{ratio:.0%})"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", nargs="+", choices=sorted(SCALES), default=["small", "medium", "large"])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--only", nargs="+", default=None, help="Restrict to the named benchmarks")
+    parser.add_argument("--output", type=Path, default=None, help="Result file (default: results/micro_<commit>.json)")
+    parser.add_argument("--baseline", type=Path, default=None, help="Previous result file to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    report = run_micro_benchmarks(args.scales, args.repeats, only=args.only)
+    output = args.output or RESULTS_DIR / f"micro_{report['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+
+    print(f"{'scale':<8}{'benchmark':<28}{'best ms':>12}{'mean ms':>12}{'peak KiB':>12}")
+    for scale_name, benches in report["results"].items():
+        for name, stats in benches.items():
+            print(f"{scale_name:<8}{name:<28}{stats['best_ms']:>12}{stats['mean_ms']:>12}{stats['peak_kib']:>12}")
+    print(f"Results written to {output}")
+
+    if args.baseline:
+        regressions = find_regressions(json.loads(args.baseline.read_text()), report, args.max_regression)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
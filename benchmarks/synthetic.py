@@ -0,0 +1,165 @@
+"""Deterministic generator for synthetic, fully populated story bibles.
+
+The generated documents mirror what PayloadCMS returns for a story bible at
+``depth=2``: top-level bible fields plus ``characters``, ``scenes``,
+``plot_threads`` and ``relationships`` lists whose cross-references point at
+each other by id.  The same ``(scale, seed)`` pair always yields the same
+document, so benchmark results are comparable across commits.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+
+@dataclass(frozen=True)
+class BibleScale:
+    scenes: int
+    characters: int
+    plot_threads: int
+    relationships: int
+    characters_per_scene: int = 4
+
+
+SCALES: Dict[str, BibleScale] = {
+    "small": BibleScale(scenes=10, characters=6, plot_threads=3, relationships=8),
+    "medium": BibleScale(scenes=100, characters=40, plot_threads=12, relationships=80),
+    "large": BibleScale(scenes=1_000, characters=200, plot_threads=60, relationships=600),
+    "xlarge": BibleScale(scenes=10_000, characters=800, plot_threads=300, relationships=3_000),
+}
+
+TIMES_OF_DAY = ["dawn", "morning", "afternoon", "evening", "night"]
+SCENE_PURPOSES = ["setup", "conflict", "resolution", "character_development", "plot_advancement"]
+ROLES = ["protagonist", "antagonist", "supporting", "minor"]
+THREAD_TYPES = ["main_plot", "subplot", "character_arc", "theme"]
+RELATIONSHIP_TYPES = ["ally", "rival", "sibling", "mentor", "lover", "enemy", "colleague"]
+
+_LOCATIONS = [
+    "Lighthouse", "Harbour", "Ferry deck", "Town hall", "Fish market", "Cliff path",
+    "Boarding house", "Chapel", "Radio room", "Boat shed", "Tide pools", "Pub",
+]
+_WORDS = [
+    "fog", "lamp", "storm", "letter", "ferry", "bell", "keeper", "tide", "secret", "harbour",
+    "signal", "map", "wreck", "promise", "lantern", "gull", "net", "whisper", "debt", "oath",
+    "shore", "rope", "engine", "photograph", "winter", "compass", "silence", "flare", "anchor",
+    "ledger", "radio", "shadow", "window", "salt", "key", "fire", "journal", "witness", "rumour",
+]
+_FIRST_NAMES = [
+    "Ada", "Bram", "Cora", "Dov", "Elin", "Finn", "Greta", "Hal", "Iris", "Jonah",
+    "Kit", "Lena", "Magnus", "Nell", "Oskar", "Pia", "Quinn", "Rune", "Saga", "Tove",
+]
+_LAST_NAMES = ["Holm", "Strand", "Berg", "Lind", "Vik", "Dahl", "Nord", "Sund", "Fjell", "Brekke"]
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(_WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _paragraph(rng: random.Random, sentences: int) -> str:
+    return " ".join(_sentence(rng, rng.randint(6, 14)) for _ in range(sentences))
+
+
+def generate_story_bible(scale: BibleScale, *, seed: int = 0, project_id: str = "bench-project") -> Dict[str, Any]:
+    """Build a populated story bible of the given scale."""
+    rng = random.Random(seed)
+    bible_id = f"sb-{seed:04d}"
+    timestamp = "2024-01-01T00:00:00.000Z"
+
+    characters: List[Dict[str, Any]] = []
+    for index in range(scale.characters):
+        name = f"{_FIRST_NAMES[index % len(_FIRST_NAMES)]} {_LAST_NAMES[(index // len(_FIRST_NAMES)) % len(_LAST_NAMES)]}"
+        characters.append(
+            {
+                "id": f"{bible_id}-ch-{index:05d}",
+                "story_bible": bible_id,
+                "name": f"{name} {index}" if index >= len(_FIRST_NAMES) * len(_LAST_NAMES) else name,
+                "role": ROLES[0] if index == 0 else rng.choice(ROLES),
+                "background": _paragraph(rng, 3),
+                "motivation": _paragraph(rng, 1),
+                "arc_description": _paragraph(rng, 2),
+                "physical_description": _sentence(rng, 10),
+                "personality_traits": rng.sample(_WORDS, 3),
+                "dialogue_style": _sentence(rng, 6),
+                "created_at": timestamp,
+                "updated_at": timestamp,
+            }
+        )
+
+    thread_ids = [f"{bible_id}-pt-{index:05d}" for index in range(scale.plot_threads)]
+    scenes: List[Dict[str, Any]] = []
+    for index in range(scale.scenes):
+        present = rng.sample(characters, min(scale.characters_per_scene, len(characters)))
+        scenes.append(
+            {
+                "id": f"{bible_id}-sc-{index:05d}",
+                "story_bible": bible_id,
+                "sequence_number": index + 1,
+                "title": _sentence(rng, 4).rstrip("."),
+                "location": rng.choice(_LOCATIONS),
+                "time_of_day": rng.choice(TIMES_OF_DAY),
+                "scene_purpose": rng.choice(SCENE_PURPOSES),
+                "description": _paragraph(rng, 4),
+                "dialogue_notes": _paragraph(rng, 1),
+                "emotional_beats": rng.sample(_WORDS, 2),
+                "estimated_duration": rng.randint(1, 8),
+                "characters_present": [character["id"] for character in present],
+                "plot_threads": rng.sample(thread_ids, min(2, len(thread_ids))),
+                "created_at": timestamp,
+                "updated_at": timestamp,
+            }
+        )
+
+    plot_threads: List[Dict[str, Any]] = []
+    for index, thread_id in enumerate(thread_ids):
+        touching = [scene["id"] for scene in scenes if thread_id in scene["plot_threads"]]
+        plot_threads.append(
+            {
+                "id": thread_id,
+                "story_bible": bible_id,
+                "thread_name": f"Thread {index + 1}: {_sentence(rng, 3).rstrip('.')}",
+                "thread_type": "main_plot" if index == 0 else rng.choice(THREAD_TYPES),
+                "description": _paragraph(rng, 2),
+                "introduction_scene": touching[0] if touching else None,
+                "resolution_scene": touching[-1] if len(touching) > 1 else None,
+                "status": rng.choice(["active", "active", "resolved"]),
+                "key_scenes": touching[:: max(1, len(touching) // 5)][:5],
+                "created_at": timestamp,
+                "updated_at": timestamp,
+            }
+        )
+
+    relationships: List[Dict[str, Any]] = []
+    if len(characters) > 1:
+        for index in range(scale.relationships):
+            source, target = rng.sample(characters, 2)
+            relationships.append(
+                {
+                    "id": f"{bible_id}-rel-{index:05d}",
+                    "story_bible": bible_id,
+                    "character_from": source["id"],
+                    "character_to": target["id"],
+                    "relationship_type": rng.choice(RELATIONSHIP_TYPES),
+                    "description": _sentence(rng, 8),
+                    "strength": rng.randint(1, 10),
+                }
+            )
+
+    return {
+        "id": bible_id,
+        "project_id": project_id,
+        "title": f"Synthetic Bible {seed}",
+        "genre": "Drama",
+        "premise": _paragraph(rng, 2),
+        "logline": _sentence(rng, 12),
+        "treatment": _paragraph(rng, 6),
+        "themes": rng.sample(_WORDS, 4),
+        "status": "in_progress",
+        "created_at": timestamp,
+        "updated_at": timestamp,
+        "created_by": "bench-user",
+        "characters": characters,
+        "scenes": scenes,
+        "plot_threads": plot_threads,
+        "relationships": relationships,
+    }
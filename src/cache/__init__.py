@@ -0,0 +1,12 @@
+"""Cache backends shared by all workers and replicas."""
+
+from .backend import CacheBackend, MemoryCacheBackend
+from .cache import Cache
+from .resp import RedisCacheBackend
+
+__all__ = [
+    "Cache",
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "RedisCacheBackend",
+]
@@ -0,0 +1,91 @@
+"""Cache backend protocol and the in-process implementation."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Dict, List, Optional, Protocol, Tuple
+
+
+MessageHandler = Callable[[bytes], None]
+
+
+class CacheBackend(Protocol):
+    """Byte-oriented key/value store with counters and pub/sub.
+
+    Keys and channels are plain strings; values and messages are bytes.
+    Implementations raise :class:`~src.utils.exceptions.CacheError` when the
+    store cannot be reached.
+    """
+
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        ...
+
+    async def delete(self, key: str) -> None:
+        ...
+
+    async def incr(self, key: str) -> int:
+        ...
+
+    async def publish(self, channel: str, message: bytes) -> None:
+        ...
+
+    async def subscribe(self, channel: str, handler: MessageHandler) -> None:
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+class MemoryCacheBackend:
+    """LRU store local to the process; pub/sub reaches other caches sharing this instance only."""
+
+    def __init__(self, *, max_entries: int = 2048) -> None:
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[bytes, Optional[float]]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._handlers: Dict[str, List[MessageHandler]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if key in self._counters:
+            return str(self._counters[key]).encode()
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires is not None and expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        expires = time.monotonic() + ttl if ttl else None
+        self._entries[key] = (value, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+        self._counters.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        # Counters live outside the LRU so a generation is never evicted back to zero.
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def publish(self, channel: str, message: bytes) -> None:
+        for handler in list(self._handlers.get(channel, ())):
+            handler(message)
+
+    async def subscribe(self, channel: str, handler: MessageHandler) -> None:
+        self._handlers.setdefault(channel, []).append(handler)
+
+    async def close(self) -> None:
+        self._handlers.clear()
@@ -0,0 +1,165 @@
+"""Shared cache used by the service's caching points.
+
+Entries that belong to a story bible are stored under a per-bible
+generation number (``sb:<id>@<generation>:...``).  Invalidating the bible
+increments the generation in the backend, which orphans every entry written
+under the old one at once — documents, exports and Brain results alike —
+and publishes an invalidation message so other workers drop their copy of
+the generation and their in-process indexes for that bible.
+
+The cache is an optimisation only: backend failures are logged and treated
+as misses, never surfaced to callers.
+"""
+
+import hashlib
+import json
+import logging
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils.exceptions import CacheError
+from .backend import CacheBackend
+
+
+logger = logging.getLogger(__name__)
+
+InvalidationListener = Callable[[str], None]
+
+_INVALIDATION_CHANNEL = "invalidate"
+
+
+def _digest(parts: Tuple[Any, ...]) -> str:
+    raw = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+class Cache:
+    def __init__(
+        self,
+        backend: CacheBackend,
+        *,
+        namespace: str = "sbs",
+        generation_ttl_seconds: float = 5.0,
+    ) -> None:
+        self._backend = backend
+        self._namespace = namespace
+        self._origin = uuid.uuid4().hex
+        self._generation_ttl = generation_ttl_seconds
+        # Local copies of story bible generations, refreshed after a few seconds
+        # in case an invalidation message was missed.
+        self._generations: Dict[str, Tuple[int, float]] = {}
+        self._listeners: List[InvalidationListener] = []
+
+    @property
+    def backend(self) -> CacheBackend:
+        return self._backend
+
+    def on_invalidate(self, listener: InvalidationListener) -> None:
+        """Call ``listener(story_bible_id)`` when another worker invalidates a story bible."""
+        self._listeners.append(listener)
+
+    async def start(self) -> None:
+        try:
+            await self._backend.subscribe(f"{self._namespace}:{_INVALIDATION_CHANNEL}", self._on_message)
+        except CacheError as exc:
+            logger.warning("Cache invalidation channel unavailable: %s", exc)
+
+    async def close(self) -> None:
+        await self._backend.close()
+
+    async def ping(self) -> Dict[str, Any]:
+        """Round trip to the backend, for readiness probes."""
+        await self._backend.get(f"{self._namespace}:ping")
+        return {"ok": True, "backend": type(self._backend).__name__}
+
+    def _on_message(self, raw: bytes) -> None:
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            logger.warning("Ignoring malformed cache invalidation message")
+            return
+        if message.get("origin") == self._origin:
+            return
+        story_bible_id = message.get("story_bible_id")
+        if not story_bible_id:
+            return
+        self._generations.pop(story_bible_id, None)
+        for listener in self._listeners:
+            listener(story_bible_id)
+
+    def _generation_key(self, story_bible_id: str) -> str:
+        return f"{self._namespace}:gen:{story_bible_id}"
+
+    async def _generation(self, story_bible_id: str) -> int:
+        cached = self._generations.get(story_bible_id)
+        now = time.monotonic()
+        if cached is not None and now - cached[1] < self._generation_ttl:
+            return cached[0]
+        raw = await self._backend.get(self._generation_key(story_bible_id))
+        generation = int(raw or 0)
+        self._generations[story_bible_id] = (generation, now)
+        return generation
+
+    async def key(self, kind: str, *parts: Any, story_bible_id: Optional[str] = None) -> Optional[str]:
+        """Cache key for ``kind`` and ``parts``, scoped to the bible's current generation if given.
+
+        Resolve the key before reading the source of truth and reuse it for the
+        write, so a value fetched across a concurrent invalidation lands under
+        the old generation.  ``None`` means the backend is unavailable.
+        """
+        suffix = f"{kind}:{_digest(parts)}" if parts else kind
+        if story_bible_id is None:
+            return f"{self._namespace}:{suffix}"
+        try:
+            generation = await self._generation(story_bible_id)
+        except CacheError as exc:
+            logger.warning("Cache unavailable, bypassing: %s", exc)
+            return None
+        return f"{self._namespace}:sb:{story_bible_id}@{generation}:{suffix}"
+
+    async def get_bytes(self, key: Optional[str]) -> Optional[bytes]:
+        if key is None:
+            return None
+        try:
+            return await self._backend.get(key)
+        except CacheError as exc:
+            logger.warning("Cache read failed, treating as a miss: %s", exc)
+            return None
+
+    async def set_bytes(self, key: Optional[str], value: bytes, ttl: Optional[float] = None) -> None:
+        if key is None or (ttl is not None and ttl <= 0):
+            return
+        try:
+            await self._backend.set(key, value, ttl)
+        except CacheError as exc:
+            logger.warning("Cache write failed: %s", exc)
+
+    async def get(self, key: Optional[str]) -> Any:
+        raw = await self.get_bytes(key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: Optional[str], value: Any, ttl: Optional[float] = None) -> None:
+        if value is None:
+            return
+        await self.set_bytes(key, json.dumps(value, default=str).encode(), ttl)
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self._backend.delete(key)
+        except CacheError as exc:
+            logger.warning("Cache delete failed: %s", exc)
+
+    async def invalidate_story_bible(self, story_bible_id: str) -> None:
+        """Orphan every cached entry of the bible here and tell the other workers."""
+        self._generations.pop(story_bible_id, None)
+        try:
+            generation = await self._backend.incr(self._generation_key(story_bible_id))
+            self._generations[story_bible_id] = (generation, time.monotonic())
+            message = {"origin": self._origin, "story_bible_id": story_bible_id}
+            await self._backend.publish(
+                f"{self._namespace}:{_INVALIDATION_CHANNEL}", json.dumps(message).encode()
+            )
+        except CacheError as exc:
+            logger.warning("Cache invalidation of story bible %s failed: %s", story_bible_id, exc)
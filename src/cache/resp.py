@@ -0,0 +1,198 @@
+"""Redis-protocol (RESP2) cache backend.
+
+Speaks the wire protocol directly over asyncio streams, so any server that
+implements the handful of commands used here (``GET``, ``SET``, ``DEL``,
+``INCR``, ``PUBLISH``, ``SUBSCRIBE``) works: Redis, Valkey, KeyDB or the
+stand-in in :mod:`.stand_in`.  Commands share one connection and are issued
+one at a time; subscriptions use a second connection whose reader task
+reconnects and resubscribes after failures.
+"""
+
+import asyncio
+import logging
+from collections.abc import Sequence
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+from ..utils.exceptions import CacheError
+from .backend import MessageHandler
+
+
+logger = logging.getLogger(__name__)
+
+Arg = Union[str, bytes, int, float]
+
+
+class RespError(CacheError):
+    """Error reply sent by the server."""
+
+
+def encode_command(args: Sequence[Arg]) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """Next RESP2 value from ``reader``; error replies are returned as :class:`RespError`."""
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise CacheError("Connection closed by cache server")
+    prefix, body = line[:1], line[1:-2]
+    if prefix == b"+":
+        return body.decode()
+    if prefix == b"-":
+        return RespError(body.decode())
+    if prefix == b":":
+        return int(body)
+    if prefix == b"$":
+        length = int(body)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if prefix == b"*":
+        count = int(body)
+        if count < 0:
+            return None
+        return [await read_reply(reader) for _ in range(count)]
+    raise CacheError(f"Unexpected reply from cache server: {line[:40]!r}")
+
+
+def parse_url(url: str) -> Tuple[str, int, Optional[str], int]:
+    parsed = urlparse(url)
+    if parsed.scheme not in ("redis", ""):
+        raise ValueError(f"Unsupported cache URL scheme {parsed.scheme}")
+    db = int(parsed.path.lstrip("/") or 0)
+    return parsed.hostname or "localhost", parsed.port or 6379, parsed.password, db
+
+
+class RedisCacheBackend:
+    def __init__(self, url: str = "redis://localhost:6379/0", *, timeout: float = 2.0) -> None:
+        self._host, self._port, self._password, self._db = parse_url(url)
+        self._timeout = timeout
+        self._streams: Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = None
+        self._lock = asyncio.Lock()
+        self._handlers: Dict[str, List[MessageHandler]] = {}
+        self._subscriber: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+
+    async def _open(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(self._host, self._port), self._timeout)
+        setup: List[List[Arg]] = []
+        if self._password:
+            setup.append(["AUTH", self._password])
+        if self._db:
+            setup.append(["SELECT", self._db])
+        for command in setup:
+            writer.write(encode_command(command))
+            await writer.drain()
+            reply = await read_reply(reader)
+            if isinstance(reply, RespError):
+                writer.close()
+                raise reply
+        return reader, writer
+
+    def _drop_connection(self) -> None:
+        if self._streams is not None:
+            self._streams[1].close()
+            self._streams = None
+
+    async def execute(self, *args: Arg) -> Any:
+        async with self._lock:
+            try:
+                if self._streams is None:
+                    self._streams = await self._open()
+                reader, writer = self._streams
+                writer.write(encode_command(args))
+                await writer.drain()
+                reply = await asyncio.wait_for(read_reply(reader), self._timeout)
+            except RespError:
+                raise
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, CacheError) as exc:
+                self._drop_connection()
+                command = args[0].decode() if isinstance(args[0], bytes) else args[0]
+                raise CacheError(f"Cache command {command} failed: {exc!r}") from exc
+            except asyncio.CancelledError:
+                # The reply may still be in flight; the connection cannot be reused.
+                self._drop_connection()
+                raise
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.execute("GET", key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        if ttl:
+            await self.execute("SET", key, value, "PX", max(int(ttl * 1000), 1))
+        else:
+            await self.execute("SET", key, value)
+
+    async def delete(self, key: str) -> None:
+        await self.execute("DEL", key)
+
+    async def incr(self, key: str) -> int:
+        return int(await self.execute("INCR", key))
+
+    async def publish(self, channel: str, message: bytes) -> None:
+        await self.execute("PUBLISH", channel, message)
+
+    async def subscribe(self, channel: str, handler: MessageHandler) -> None:
+        first = channel not in self._handlers
+        self._handlers.setdefault(channel, []).append(handler)
+        if self._subscriber is None:
+            self._subscriber = asyncio.create_task(self._listen(), name="cache-subscriber")
+        elif first:
+            # Resubscribe with the new channel list.
+            self._subscriber.cancel()
+            self._subscriber = asyncio.create_task(self._listen(), name="cache-subscriber")
+        try:
+            await asyncio.wait_for(self._subscribed.wait(), self._timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Cache subscription to %s not confirmed yet; retrying in the background", channel)
+
+    async def _listen(self) -> None:
+        self._subscribed.clear()
+        backoff = 0.5
+        while True:
+            writer = None
+            try:
+                reader, writer = await self._open()
+                channels = list(self._handlers)
+                writer.write(encode_command(["SUBSCRIBE", *channels]))
+                await writer.drain()
+                for _ in channels:
+                    await read_reply(reader)
+                self._subscribed.set()
+                backoff = 0.5
+                while True:
+                    message = await read_reply(reader)
+                    if isinstance(message, list) and len(message) == 3 and message[0] == b"message":
+                        channel = message[1].decode()
+                        for handler in list(self._handlers.get(channel, ())):
+                            try:
+                                handler(message[2])
+                            except Exception:  # noqa: BLE001
+                                logger.exception("Cache invalidation handler failed")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                self._subscribed.clear()
+                logger.warning("Cache subscription lost (%s), reconnecting in %.1fs", exc, backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if writer is not None:
+                    writer.close()
+
+    async def close(self) -> None:
+        if self._subscriber is not None:
+            self._subscriber.cancel()
+            await asyncio.gather(self._subscriber, return_exceptions=True)
+            self._subscriber = None
+        async with self._lock:
+            self._drop_connection()
@@ -0,0 +1,176 @@
+"""Minimal Redis-protocol server for tests and local multi-worker runs.
+
+Implements only what :class:`~src.cache.resp.RedisCacheBackend` needs:
+``PING``, ``AUTH``, ``SELECT``, ``GET``, ``SET`` (with ``EX``/``PX``),
+``DEL``, ``INCR``, ``PUBLISH``, ``SUBSCRIBE`` and ``FLUSHALL``.  State is
+kept in memory and shared by all databases.
+
+Run it with ``python -m src.cache.stand_in --port 6379`` and point
+``CACHE_REDIS_URL`` at it to exercise cross-worker invalidation without a
+real Redis.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+def _encode(value: Any) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(_encode(item) for item in value)
+    return b"+%s\r\n" % str(value).encode()
+
+
+def _error(message: str) -> bytes:
+    return b"-ERR %s\r\n" % message.encode()
+
+
+class RespStandInServer:
+    def __init__(self, *, password: Optional[str] = None) -> None:
+        self._password = password
+        self._data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self._subscribers: Dict[bytes, Set[asyncio.StreamWriter]] = {}
+        self._server: Optional[asyncio.Server] = None
+        self._connections: Set[asyncio.Task] = set()
+        self.commands: List[str] = []
+
+    @property
+    def port(self) -> int:
+        assert self._server is not None
+        return self._server.sockets[0].getsockname()[1]
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.port}/0"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> "RespStandInServer":
+        self._server = await asyncio.start_server(self._serve, host, port)
+        return self
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for connection in list(self._connections):
+                connection.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    def _live(self, key: bytes) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry[0]
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        authenticated = self._password is None
+        channels: Set[bytes] = set()
+        task = asyncio.current_task()
+        assert task is not None
+        self._connections.add(task)
+        try:
+            while True:
+                command = await self._read_command(reader)
+                if command is None:
+                    return
+                name = command[0].upper().decode()
+                self.commands.append(name)
+                args = command[1:]
+                if name == "AUTH":
+                    authenticated = args[-1].decode() == self._password
+                    writer.write(b"+OK\r\n" if authenticated else _error("invalid password"))
+                elif not authenticated:
+                    writer.write(b"-NOAUTH Authentication required.\r\n")
+                elif name == "SUBSCRIBE":
+                    for count, channel in enumerate(args, start=len(channels) + 1):
+                        channels.add(channel)
+                        self._subscribers.setdefault(channel, set()).add(writer)
+                        writer.write(_encode([b"subscribe", channel, count]))
+                else:
+                    writer.write(self._execute(name, args))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return
+        finally:
+            for channel in channels:
+                self._subscribers.get(channel, set()).discard(writer)
+            self._connections.discard(task)
+            writer.close()
+
+    @staticmethod
+    async def _read_command(reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.strip().split()
+        args = []
+        for _ in range(int(line[1:])):
+            length = int((await reader.readline())[1:])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    def _execute(self, name: str, args: List[bytes]) -> bytes:
+        if name == "PING":
+            return b"+PONG\r\n"
+        if name == "SELECT":
+            return b"+OK\r\n"
+        if name == "FLUSHALL":
+            self._data.clear()
+            return b"+OK\r\n"
+        if name == "GET":
+            return _encode(self._live(args[0]))
+        if name == "SET":
+            expires = None
+            options = [arg.upper() for arg in args[2:]]
+            if b"PX" in options:
+                expires = time.monotonic() + int(args[2 + options.index(b"PX") + 1]) / 1000
+            elif b"EX" in options:
+                expires = time.monotonic() + int(args[2 + options.index(b"EX") + 1])
+            self._data[args[0]] = (args[1], expires)
+            return b"+OK\r\n"
+        if name == "DEL":
+            return _encode(sum(1 for key in args if self._data.pop(key, None) is not None))
+        if name == "INCR":
+            current = self._live(args[0])
+            try:
+                value = int(current or 0) + 1
+            except ValueError:
+                return _error("value is not an integer or out of range")
+            self._data[args[0]] = (str(value).encode(), None)
+            return _encode(value)
+        if name == "PUBLISH":
+            receivers = self._subscribers.get(args[0], set())
+            for subscriber in list(receivers):
+                subscriber.write(_encode([b"message", args[0], args[1]]))
+            return _encode(len(receivers))
+        return _error(f"unknown command '{name}'")
+
+
+async def _main(host: str, port: int) -> None:
+    server = await RespStandInServer().start(host, port)
+    logger.info("RESP stand-in listening on %s:%d", host, server.port)
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    options = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(options.host, options.port))
@@ -1,6 +1,6 @@
 """Configuration settings for MCP Story Bible Service."""
 
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -30,6 +30,22 @@ class Settings(BaseSettings):
         default=3,
         description="Maximum number of retries for PayloadCMS operations",
     )
+    PAYLOAD_WEBHOOK_SECRET: Optional[str] = Field(
+        default=None,
+        description="Shared secret PayloadCMS sends to POST /hooks/payload; the receiver is disabled when unset",
+    )
+    PAYLOAD_WEBHOOK_DEBOUNCE_SECONDS: float = Field(
+        default=0.5,
+        description="Quiet period after the last webhook event for a story bible before the batch is applied",
+    )
+    PAYLOAD_WEBHOOK_MAX_DELAY_SECONDS: float = Field(
+        default=5.0,
+        description="Longest a webhook event waits while a story bible keeps receiving events",
+    )
+    PAYLOAD_WEBHOOK_MAX_INCREMENTAL: int = Field(
+        default=50,
+        description="Events per batch above which indexes are rebuilt instead of updated incrementally",
+    )
 
     # Brain Service Configuration
     BRAIN_SERVICE_URL: str = Field(
@@ -44,6 +60,133 @@ class Settings(BaseSettings):
         default=30.0,
         description="Timeout for Brain Service requests",
     )
+    BRAIN_MAX_CONCURRENCY: int = Field(default=16, description="Brain Service calls in flight across all projects")
+    BRAIN_PER_PROJECT_LIMIT: int = Field(default=4, description="Brain Service calls in flight per project")
+    BRAIN_MAX_QUEUE_PER_PROJECT: int = Field(
+        default=50,
+        description="Brain Service calls queued per project before new ones are rejected with 429",
+    )
+    BRAIN_MAX_QUEUE_TOTAL: int = Field(
+        default=500,
+        description="Brain Service calls queued in total before new ones are rejected with 503",
+    )
+    BRAIN_PROJECT_WEIGHTS: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Fair-queuing weights by project id (JSON object); unlisted projects weigh 1.0",
+    )
+
+    # Story bible indexes
+    INDEX_MAX_STORY_BIBLES: int = Field(
+        default=256,
+        description="Maximum number of story bibles kept indexed in memory per worker",
+    )
+    SCENE_TRANSITION_WINDOW: int = Field(
+        default=3,
+        description="Scenes before and after the target sent to the Brain for transition suggestions",
+    )
+
+    JOB_WORKERS: int = Field(default=4, description="Background workers running long Brain Service jobs")
+    JOB_MAX_PENDING: int = Field(default=100, description="Queued background jobs before submissions are refused")
+    JOB_RESULT_TTL_SECONDS: float = Field(
+        default=3600.0,
+        description="How long finished job results remain available",
+    )
+    REORDER_MAX_CONCURRENCY: int = Field(
+        default=8,
+        description="Concurrent PayloadCMS writes issued by a single reorder_scenes call",
+    )
+    CLONE_MAX_CONCURRENCY: int = Field(
+        default=8,
+        description="Concurrent PayloadCMS writes issued by a single clone_story_bible call",
+    )
+    CHANGE_SUBSCRIBER_BUFFER: int = Field(
+        default=256,
+        description="Change notifications buffered per MCP subscriber before it is dropped as a slow consumer",
+    )
+
+    CHANGE_LOG_MAX_ENTRIES: int = Field(
+        default=1000,
+        description="Versioned changes retained per story bible for delta sync before clients fall back to a snapshot",
+    )
+
+    # Shared cache (documents, exports, Brain results, verified tokens)
+    CACHE_BACKEND: Literal["memory", "redis"] = Field(
+        default="memory",
+        description="memory keeps a per-worker cache; redis shares one across workers and replicas",
+    )
+    CACHE_REDIS_URL: str = Field(
+        default="redis://localhost:6379/0",
+        description="Redis-protocol server used when CACHE_BACKEND=redis",
+    )
+    CACHE_NAMESPACE: str = Field(default="sbs", description="Prefix for cache keys and the invalidation channel")
+    CACHE_MEMORY_MAX_ENTRIES: int = Field(default=2048, description="Entries kept by the in-process cache backend")
+    CACHE_DOCUMENT_TTL_SECONDS: float = Field(default=300.0, description="Lifetime of cached story bible documents")
+    CACHE_EXPORT_TTL_SECONDS: float = Field(default=3600.0, description="Lifetime of cached export artifacts")
+    CACHE_BRAIN_RESULT_TTL_SECONDS: float = Field(
+        default=3600.0,
+        description="Lifetime of cached Brain Service results (0 disables)",
+    )
+    AUTH_CACHE_TTL_SECONDS: float = Field(
+        default=60.0,
+        description="How long a verified bearer token is trusted without asking PayloadCMS again (0 disables)",
+    )
+
+    # Snapshots (immutable, content-addressed copies of story bibles)
+    SNAPSHOT_BACKEND: Literal["memory", "disk"] = Field(
+        default="memory",
+        description="memory keeps snapshots per worker until restart; disk stores them under SNAPSHOT_DIR",
+    )
+    SNAPSHOT_DIR: str = Field(default="data/snapshots", description="Root directory of the disk snapshot store")
+    SNAPSHOT_MAX_PER_STORY_BIBLE: int = Field(
+        default=50,
+        description="Snapshots kept per story bible; the oldest are dropped and compacted away (0 keeps all)",
+    )
+    SNAPSHOT_COMPACTION_GRACE_SECONDS: float = Field(
+        default=600.0,
+        description="Unreferenced snapshot blobs younger than this survive compaction (disk store)",
+    )
+
+    COMPRESSION_ENABLED: bool = Field(default=True, description="Negotiate gzip/br/zstd for REST responses")
+    COMPRESSION_MIN_SIZE: int = Field(default=1024, description="Smallest response body worth compressing, in bytes")
+    COMPRESSION_OFFLOAD_SIZE: int = Field(
+        default=256 * 1024,
+        description="Bodies at least this large are compressed in a worker thread instead of on the event loop",
+    )
+    COMPRESSION_GZIP_LEVEL: int = Field(default=6, ge=1, le=9, description="gzip compression level")
+    COMPRESSION_BROTLI_QUALITY: int = Field(default=5, ge=0, le=11, description="Brotli quality (needs brotli)")
+    COMPRESSION_ZSTD_LEVEL: int = Field(default=3, ge=1, le=22, description="zstd level (needs zstandard)")
+    MCP_WS_PER_MESSAGE_DEFLATE: bool = Field(
+        default=True,
+        description="Offer permessage-deflate on the MCP WebSocket",
+    )
+
+    EMBEDDING_BACKEND: Literal["brain", "hashing"] = Field(
+        default="hashing",
+        description=(
+            "Embedding source for similarity search: local hashing embedder, or the Brain Service "
+            "(needs its generate_embeddings tool)"
+        ),
+    )
+    EMBEDDING_DIMENSION: int = Field(
+        default=256,
+        description="Vector dimension of the local hashing embedder",
+    )
+
+    # Inbound rate limiting (token buckets per user, and per project at RATE_LIMIT_PROJECT_MULTIPLIER times the rate)
+    RATE_LIMIT_ENABLED: bool = Field(default=True, description="Throttle REST and MCP requests per user and project")
+    RATE_LIMIT_READ_PER_MINUTE: float = Field(default=600.0, description="Read requests per user per minute (0 disables)")
+    RATE_LIMIT_WRITE_PER_MINUTE: float = Field(
+        default=120.0,
+        description="Write requests per user per minute (0 disables)",
+    )
+    RATE_LIMIT_AI_PER_MINUTE: float = Field(
+        default=20.0,
+        description="Brain Service backed requests per user per minute (0 disables)",
+    )
+    RATE_LIMIT_PROJECT_MULTIPLIER: float = Field(
+        default=5.0,
+        description="Size of each shared project bucket relative to the per-user bucket",
+    )
 
     # Authentication
     ALLOWED_ORIGINS: List[str] = Field(
@@ -62,6 +205,26 @@ class Settings(BaseSettings):
     # Monitoring
     ENABLE_METRICS: bool = Field(default=True, description="Enable Prometheus metrics")
     METRICS_PORT: int = Field(default=9015, description="Prometheus metrics port")
+    ENABLE_SERVER_TIMING: bool = Field(
+        default=True,
+        description="Emit Server-Timing headers with per-request span breakdowns",
+    )
+    DEFAULT_REQUEST_TIMEOUT_MS: float = Field(
+        default=0.0,
+        description="Deadline for requests that do not send X-Request-Timeout-Ms or deadline_ms (0 disables)",
+    )
+    SLOW_REQUEST_THRESHOLD_MS: float = Field(
+        default=2000.0,
+        description="Log the full timing breakdown of requests slower than this (0 disables)",
+    )
+    READINESS_PROBE_INTERVAL_SECONDS: float = Field(
+        default=10.0,
+        description="How often dependency probes behind /health/ready are refreshed",
+    )
+    READINESS_PROBE_TIMEOUT_SECONDS: float = Field(
+        default=3.0,
+        description="Timeout of each dependency probe",
+    )
 
     class Config:
         env_file = ".env"
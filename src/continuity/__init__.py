@@ -0,0 +1,6 @@
+"""Deterministic continuity checks that run before the Brain Service."""
+
+from .engine import ContinuityEngine
+from .registry import ContinuityRule, RuleRegistry, default_registry
+
+__all__ = ["ContinuityEngine", "ContinuityRule", "RuleRegistry", "default_registry"]
@@ -0,0 +1,44 @@
+"""Runs registered continuity rules over a story bible's indexes."""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from ..indexes import StoryBibleIndexes
+from ..models import ContinuityFinding
+# Importing the module registers the built-in rules on the default registry.
+from . import rules as builtin_rules  # noqa: F401
+from .registry import RuleRegistry, default_registry
+
+
+logger = logging.getLogger(__name__)
+
+
+class ContinuityEngine:
+    def __init__(self, registry: Optional[RuleRegistry] = None) -> None:
+        self._registry = registry or default_registry
+
+    @property
+    def registry(self) -> RuleRegistry:
+        return self._registry
+
+    def run(self, indexes: StoryBibleIndexes, *, rules: Optional[List[str]] = None) -> Dict[str, Any]:
+        started = time.perf_counter()
+        selected = [self._registry.get(name) for name in rules] if rules else list(self._registry)
+        findings: List[ContinuityFinding] = []
+        for rule in selected:
+            try:
+                findings.extend(
+                    finding.model_copy(update={"severity": rule.severity}) for finding in rule.check(indexes)
+                )
+            except Exception:  # noqa: BLE001
+                logger.exception("Continuity rule %s failed", rule.name)
+        summary = {"error": 0, "warning": 0, "info": 0}
+        for finding in findings:
+            summary[finding.severity] += 1
+        return {
+            "findings": [finding.model_dump() for finding in findings],
+            "summary": summary,
+            "rules_run": [rule.name for rule in selected],
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
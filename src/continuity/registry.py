@@ -0,0 +1,53 @@
+"""Pluggable registry of continuity rules."""
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Literal
+
+from ..indexes import StoryBibleIndexes
+from ..models import ContinuityFinding
+
+
+Severity = Literal["error", "warning", "info"]
+RuleCheck = Callable[[StoryBibleIndexes], Iterable[ContinuityFinding]]
+
+
+@dataclass(frozen=True)
+class ContinuityRule:
+    name: str
+    severity: Severity
+    check: RuleCheck
+
+
+class RuleRegistry:
+    def __init__(self) -> None:
+        self._rules: Dict[str, ContinuityRule] = {}
+
+    def register(self, name: str, check: RuleCheck, *, severity: Severity = "warning") -> None:
+        self._rules[name] = ContinuityRule(name=name, severity=severity, check=check)
+
+    def rule(self, name: str, *, severity: Severity = "warning") -> Callable[[RuleCheck], RuleCheck]:
+        """Decorator form of :meth:`register`."""
+
+        def decorator(check: RuleCheck) -> RuleCheck:
+            self.register(name, check, severity=severity)
+            return check
+
+        return decorator
+
+    def unregister(self, name: str) -> None:
+        self._rules.pop(name, None)
+
+    def get(self, name: str) -> ContinuityRule:
+        if name not in self._rules:
+            raise KeyError(f"Continuity rule {name} is not registered")
+        return self._rules[name]
+
+    def names(self) -> List[str]:
+        return list(self._rules)
+
+    def __iter__(self) -> Iterator[ContinuityRule]:
+        return iter(list(self._rules.values()))
+
+
+default_registry = RuleRegistry()
@@ -0,0 +1,122 @@
+"""Built-in deterministic continuity rules.
+
+Each rule receives the :class:`StoryBibleIndexes` of a populated bible and
+yields findings; the engine stamps them with the severity the rule was
+registered with.  Rules must stay linear in the size of the bible; anything
+that needs judgement belongs in the Brain Service call instead.
+"""
+
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from ..indexes import StoryBibleIndexes
+from ..models import ContinuityFinding
+from ..utils.references import ref_id, ref_ids
+from .registry import default_registry
+
+
+@default_registry.rule("unknown_character_in_scene", severity="error")
+def unknown_character_in_scene(indexes: StoryBibleIndexes) -> Iterator[ContinuityFinding]:
+    for scene in indexes.scenes.ordered_records():
+        for character_id in ref_ids(scene.get("characters_present")):
+            if character_id not in indexes.characters:
+                yield ContinuityFinding(
+                    rule="unknown_character_in_scene",
+                    message=f"Scene {scene.get('sequence_number')} lists unknown character {character_id}",
+                    entity_type="scene",
+                    entity_id=scene["id"],
+                    details={"character_id": character_id},
+                )
+
+
+@default_registry.rule("unknown_plot_thread_in_scene", severity="warning")
+def unknown_plot_thread_in_scene(indexes: StoryBibleIndexes) -> Iterator[ContinuityFinding]:
+    for scene in indexes.scenes.ordered_records():
+        for thread_id in ref_ids(scene.get("plot_threads")):
+            if thread_id not in indexes.plot_threads:
+                yield ContinuityFinding(
+                    rule="unknown_plot_thread_in_scene",
+                    message=f"Scene {scene.get('sequence_number')} references unknown plot thread {thread_id}",
+                    entity_type="scene",
+                    entity_id=scene["id"],
+                    details={"plot_thread_id": thread_id},
+                )
+
+
+@default_registry.rule("duplicate_sequence_number", severity="error")
+def duplicate_sequence_number(indexes: StoryBibleIndexes) -> Iterator[ContinuityFinding]:
+    by_number: Dict[int, List[str]] = {}
+    for scene in indexes.scenes.ordered_records():
+        by_number.setdefault(int(scene.get("sequence_number") or 0), []).append(scene["id"])
+    for number, scene_ids in by_number.items():
+        if len(scene_ids) > 1:
+            yield ContinuityFinding(
+                rule="duplicate_sequence_number",
+                message=f"{len(scene_ids)} scenes share sequence number {number}",
+                entity_type="scene",
+                entity_id=scene_ids[0],
+                details={"sequence_number": number, "scene_ids": scene_ids},
+            )
+
+
+@default_registry.rule("dangling_scene_reference", severity="error")
+def dangling_scene_reference(indexes: StoryBibleIndexes) -> Iterator[ContinuityFinding]:
+    for thread in indexes.plot_threads.records():
+        references: Dict[str, Sequence[Optional[str]]] = {
+            "introduction_scene": [ref_id(thread.get("introduction_scene"))],
+            "resolution_scene": [ref_id(thread.get("resolution_scene"))],
+            "key_scenes": ref_ids(thread.get("key_scenes")),
+        }
+        for field, scene_ids in references.items():
+            for scene_id in scene_ids:
+                if scene_id and scene_id not in indexes.scenes:
+                    yield ContinuityFinding(
+                        rule="dangling_scene_reference",
+                        message=f"Plot thread '{thread.get('thread_name')}' {field} points at missing scene {scene_id}",
+                        entity_type="plot_thread",
+                        entity_id=thread["id"],
+                        details={"field": field, "scene_id": scene_id},
+                    )
+
+
+@default_registry.rule("resolution_before_introduction", severity="error")
+def resolution_before_introduction(indexes: StoryBibleIndexes) -> Iterator[ContinuityFinding]:
+    for thread in indexes.plot_threads.records():
+        introduction = indexes.scenes.record(ref_id(thread.get("introduction_scene")) or "")
+        resolution = indexes.scenes.record(ref_id(thread.get("resolution_scene")) or "")
+        if introduction is None or resolution is None:
+            continue
+        intro_number = int(introduction.get("sequence_number") or 0)
+        resolution_number = int(resolution.get("sequence_number") or 0)
+        if resolution_number < intro_number:
+            yield ContinuityFinding(
+                rule="resolution_before_introduction",
+                message=(
+                    f"Plot thread '{thread.get('thread_name')}' resolves in scene {resolution_number} "
+                    f"before it is introduced in scene {intro_number}"
+                ),
+                entity_type="plot_thread",
+                entity_id=thread["id"],
+                details={"introduction_sequence": intro_number, "resolution_sequence": resolution_number},
+            )
+
+
+@default_registry.rule("active_thread_without_scenes", severity="warning")
+def active_thread_without_scenes(indexes: StoryBibleIndexes) -> Iterator[ContinuityFinding]:
+    referenced = {
+        thread_id for scene in indexes.scenes.ordered_records() for thread_id in ref_ids(scene.get("plot_threads"))
+    }
+    for thread in indexes.plot_threads.records():
+        if thread.get("status", "active") != "active" or thread["id"] in referenced:
+            continue
+        linked = [
+            ref_id(thread.get("introduction_scene")),
+            ref_id(thread.get("resolution_scene")),
+            *ref_ids(thread.get("key_scenes")),
+        ]
+        if not any(scene_id and scene_id in indexes.scenes for scene_id in linked):
+            yield ContinuityFinding(
+                rule="active_thread_without_scenes",
+                message=f"Active plot thread '{thread.get('thread_name')}' does not appear in any scene",
+                entity_type="plot_thread",
+                entity_id=thread["id"],
+            )
@@ -0,0 +1,24 @@
+"""In-memory indexes over story bible content."""
+
+from .character_index import CharacterIndex
+from .manager import IndexManager, StoryBibleIndexes
+from .records import CharacterRecord, PlotThreadRecord, RecordTable, RelationshipRecord, SceneRecord
+from .relationship_graph import RelationshipGraph
+from .scene_index import SceneIndex
+from .text_index import TextIndex
+from .vector_index import VectorIndex
+
+__all__ = [
+    "CharacterIndex",
+    "CharacterRecord",
+    "IndexManager",
+    "PlotThreadRecord",
+    "RecordTable",
+    "RelationshipGraph",
+    "RelationshipRecord",
+    "SceneIndex",
+    "SceneRecord",
+    "StoryBibleIndexes",
+    "TextIndex",
+    "VectorIndex",
+]
@@ -0,0 +1,117 @@
+"""Inverted index from characters to the scenes, relationships and threads around them."""
+
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from ..utils.references import ref_id, ref_ids
+from .records import Entity, RecordTable, RelationshipRecord
+
+
+def _thread_scene_ids(thread: Entity) -> Set[str]:
+    scene_ids = set(ref_ids(thread.get("key_scenes")))
+    for field in ("introduction_scene", "resolution_scene"):
+        scene_id = ref_id(thread.get(field))
+        if scene_id:
+            scene_ids.add(scene_id)
+    return scene_ids
+
+
+class CharacterIndex:
+    """Character id -> scene ids, relationship ids and the plot threads touching those scenes."""
+
+    def __init__(
+        self,
+        scenes: Iterable[Entity] = (),
+        relationships: Iterable[Entity] = (),
+        plot_threads: Iterable[Entity] = (),
+    ) -> None:
+        self.relationships = RecordTable(RelationshipRecord)
+        self._scenes_by_character: Dict[str, Set[str]] = {}
+        self._scene_characters: Dict[str, List[str]] = {}
+        self._scene_threads: Dict[str, List[str]] = {}
+        self._relationships_by_character: Dict[str, Set[str]] = {}
+        self._threads_by_scene: Dict[str, Set[str]] = {}
+        self._thread_scenes: Dict[str, Set[str]] = {}
+        for scene in scenes:
+            self.apply_scene(scene)
+        for relationship in relationships:
+            self.apply_relationship(relationship)
+        for thread in plot_threads:
+            self.apply_plot_thread(thread)
+
+    def apply_scene(self, scene: Entity) -> None:
+        scene_id = str(scene["id"])
+        if "characters_present" in scene or scene_id not in self._scene_characters:
+            self._unlink_scene_characters(scene_id)
+            characters = ref_ids(scene.get("characters_present"))
+            self._scene_characters[scene_id] = characters
+            for character_id in characters:
+                self._scenes_by_character.setdefault(character_id, set()).add(scene_id)
+        if "plot_threads" in scene or scene_id not in self._scene_threads:
+            self._scene_threads[scene_id] = ref_ids(scene.get("plot_threads"))
+
+    def remove_scene(self, scene_id: str) -> None:
+        self._unlink_scene_characters(scene_id)
+        self._scene_characters.pop(scene_id, None)
+        self._scene_threads.pop(scene_id, None)
+
+    def _unlink_scene_characters(self, scene_id: str) -> None:
+        for character_id in self._scene_characters.get(scene_id, []):
+            scene_ids = self._scenes_by_character.get(character_id)
+            if scene_ids is not None:
+                scene_ids.discard(scene_id)
+
+    def apply_relationship(self, relationship: Entity) -> None:
+        relationship_id = ref_id(relationship.get("id"))
+        if not relationship_id:
+            return
+        self.remove_relationship(relationship_id)
+        self.relationships[relationship_id] = relationship
+        for field in ("character_from", "character_to"):
+            character_id = ref_id(relationship.get(field))
+            if character_id:
+                self._relationships_by_character.setdefault(character_id, set()).add(relationship_id)
+
+    def remove_relationship(self, relationship_id: str) -> None:
+        previous = self.relationships.pop_record(relationship_id)
+        if previous is None:
+            return
+        for field in ("character_from", "character_to"):
+            character_id = ref_id(previous.get(field))
+            if character_id:
+                self._relationships_by_character.get(character_id, set()).discard(relationship_id)
+
+    def apply_plot_thread(self, thread: Entity) -> None:
+        thread_id = str(thread["id"])
+        self.remove_plot_thread(thread_id)
+        scene_ids = _thread_scene_ids(thread)
+        self._thread_scenes[thread_id] = scene_ids
+        for scene_id in scene_ids:
+            self._threads_by_scene.setdefault(scene_id, set()).add(thread_id)
+
+    def remove_plot_thread(self, thread_id: str) -> None:
+        for scene_id in self._thread_scenes.pop(thread_id, set()):
+            self._threads_by_scene.get(scene_id, set()).discard(thread_id)
+
+    def remove_character(self, character_id: str) -> None:
+        for relationship_id in list(self._relationships_by_character.pop(character_id, set())):
+            self.remove_relationship(relationship_id)
+
+    def scene_ids_for(self, character_id: str) -> Set[str]:
+        return set(self._scenes_by_character.get(character_id, set()))
+
+    def relationships_for(self, character_id: str) -> List[Dict[str, Any]]:
+        return [
+            self.relationships[relationship_id]
+            for relationship_id in sorted(self._relationships_by_character.get(character_id, set()))
+        ]
+
+    def thread_ids_for_scenes(self, scene_ids: Iterable[str]) -> List[str]:
+        thread_ids: Dict[str, None] = {}
+        for scene_id in scene_ids:
+            thread_ids.update(dict.fromkeys(self._scene_threads.get(scene_id, [])))
+            thread_ids.update(dict.fromkeys(sorted(self._threads_by_scene.get(scene_id, set()))))
+        return list(thread_ids)
+
+    def thread_ids_for(self, character_id: str, ordered_scene_ids: Optional[List[str]] = None) -> List[str]:
+        scene_ids = ordered_scene_ids if ordered_scene_ids is not None else sorted(self.scene_ids_for(character_id))
+        return self.thread_ids_for_scenes(scene_ids)
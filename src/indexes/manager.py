@@ -0,0 +1,285 @@
+"""Per story bible index bundles and their lifecycle."""
+
+import asyncio
+from collections import Counter, OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..utils.references import ref_id, ref_ids
+from .character_index import CharacterIndex
+from .records import CharacterRecord, PlotThreadRecord, RecordTable, RelationshipRecord
+from .relationship_graph import RelationshipGraph
+from .scene_index import SceneIndex
+from .text_index import TextIndex
+from .vector_index import VectorIndex, character_text, scene_text
+
+
+# Populated collections that are indexed separately rather than kept on the summary.
+_ENTITY_FIELDS = ("characters", "scenes", "plot_threads", "relationships")
+
+
+def _relationships_of(story_bible: Dict[str, Any]) -> List[RelationshipRecord]:
+    """Relationships listed on the bible itself or embedded on its characters."""
+    relationships: Dict[str, RelationshipRecord] = {}
+    embedded = [rel for char in story_bible.get("characters") or [] for rel in char.get("relationships") or []]
+    for relationship in [*(story_bible.get("relationships") or []), *embedded]:
+        if isinstance(relationship, dict) and relationship.get("id") and str(relationship["id"]) not in relationships:
+            relationships[str(relationship["id"])] = RelationshipRecord.from_dict(relationship)
+    return list(relationships.values())
+
+
+class StoryBibleIndexes:
+    """Indexes derived from one populated story bible and maintained on write.
+
+    Entities are held as compact records (see :mod:`.records`); the entity
+    tables and scene index hand out plain dicts.
+    """
+
+    def __init__(self, story_bible: Dict[str, Any]) -> None:
+        self.story_bible_id = str(story_bible["id"])
+        self.summary: Dict[str, Any] = {
+            key: value for key, value in story_bible.items() if key not in _ENTITY_FIELDS
+        }
+        self.characters = RecordTable(CharacterRecord, story_bible.get("characters") or [])
+        self.plot_threads = RecordTable(PlotThreadRecord, story_bible.get("plot_threads") or [])
+        self.scenes = SceneIndex(story_bible.get("scenes") or [])
+        self.cast = CharacterIndex(
+            self.scenes.ordered_records(),
+            _relationships_of(story_bible),
+            self.plot_threads.records(),
+        )
+        self.graph = RelationshipGraph(self.characters, self.cast.relationships.records())
+        self.vectors = VectorIndex()
+        self.text = TextIndex()
+        for character in self.characters.records():
+            self.vectors.mark(("character", str(character["id"])), character_text(character))
+            self.text.index_entity("character", character)
+        for scene in self.scenes.ordered_records():
+            self.vectors.mark(("scene", str(scene["id"])), scene_text(scene))
+            self.text.index_entity("scene", scene)
+        for thread in self.plot_threads.records():
+            self.text.index_entity("plot_thread", thread)
+
+    @property
+    def project_id(self) -> Optional[str]:
+        return ref_id(self.summary.get("project_id"))
+
+    def apply_story_bible(self, story_bible: Dict[str, Any]) -> None:
+        self.summary.update({key: value for key, value in story_bible.items() if key not in _ENTITY_FIELDS})
+
+    def apply_scene(self, scene: Dict[str, Any]) -> None:
+        merged = self.scenes.upsert(scene)
+        self.cast.apply_scene(scene)
+        self.vectors.mark(("scene", str(scene["id"])), scene_text(merged))
+        self.text.index_entity("scene", merged)
+
+    def remove_scene(self, scene_id: str) -> None:
+        self.scenes.remove(scene_id)
+        self.cast.remove_scene(scene_id)
+        self.vectors.remove(("scene", scene_id))
+        self.text.remove_entity("scene", scene_id)
+
+    def apply_character(self, character: Dict[str, Any]) -> None:
+        character_id = str(character["id"])
+        merged = self.characters.merge(character_id, character)
+        self.graph.add_character(character_id)
+        self.vectors.mark(("character", character_id), character_text(merged))
+        self.text.index_entity("character", merged)
+        for relationship in character.get("relationships") or []:
+            if isinstance(relationship, dict):
+                self.apply_relationship(relationship)
+
+    def remove_character(self, character_id: str) -> None:
+        self.characters.pop(character_id, None)
+        for relationship in self.cast.relationships_for(character_id):
+            self.graph.remove_relationship(str(relationship["id"]))
+        self.cast.remove_character(character_id)
+        self.graph.remove_character(character_id)
+        self.vectors.remove(("character", character_id))
+        self.text.remove_entity("character", character_id)
+
+    def apply_relationship(self, relationship: Dict[str, Any]) -> None:
+        record = RelationshipRecord.from_dict(relationship)
+        self.cast.apply_relationship(record)
+        self.graph.apply_relationship(record)
+
+    def remove_relationship(self, relationship_id: str) -> None:
+        self.cast.remove_relationship(relationship_id)
+        self.graph.remove_relationship(relationship_id)
+
+    def apply_plot_thread(self, thread: Dict[str, Any]) -> None:
+        merged = self.plot_threads.merge(str(thread["id"]), thread)
+        self.cast.apply_plot_thread(merged)
+        self.text.index_entity("plot_thread", merged)
+
+    def remove_plot_thread(self, thread_id: str) -> None:
+        self.plot_threads.pop(thread_id, None)
+        self.cast.remove_plot_thread(thread_id)
+        self.text.remove_entity("plot_thread", thread_id)
+
+    def referenced_by(self, scenes: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Characters and plot threads referenced by ``scenes``, in first-seen order."""
+        character_ids: Dict[str, None] = {}
+        thread_ids: Dict[str, None] = {}
+        for scene in scenes:
+            character_ids.update(dict.fromkeys(ref_ids(scene.get("characters_present"))))
+            thread_ids.update(dict.fromkeys(ref_ids(scene.get("plot_threads"))))
+        return {
+            "characters": [self.characters[cid] for cid in character_ids if cid in self.characters],
+            "plot_threads": [self.plot_threads[tid] for tid in thread_ids if tid in self.plot_threads],
+        }
+
+    def to_story_bible(self) -> Dict[str, Any]:
+        """Reassemble a populated story bible document from the indexed entities."""
+        return {
+            **self.summary,
+            "characters": list(self.characters.values()),
+            "scenes": self.scenes.ordered(),
+            "plot_threads": list(self.plot_threads.values()),
+            "relationships": list(self.cast.relationships.values()),
+        }
+
+    def character_context(self, character_id: str) -> Optional[Dict[str, Any]]:
+        """Focused context for one character: their scenes, relationships and threads."""
+        character = self.characters.get(character_id)
+        if character is None:
+            return None
+        scenes = self.scenes.ordered_subset(self.cast.scene_ids_for(character_id))
+        relationships = []
+        for relationship in self.cast.relationships_for(character_id):
+            other_id = ref_id(relationship.get("character_to"))
+            if other_id == character_id:
+                other_id = ref_id(relationship.get("character_from"))
+            other = self.characters.record(other_id or "")
+            name = other.get("name") if other is not None else None
+            relationships.append({**relationship, "other_character": {"id": other_id, "name": name}})
+        thread_ids = self.cast.thread_ids_for(character_id, [scene["id"] for scene in scenes])
+        return {
+            "story_bible": self.summary,
+            "character": character,
+            "scenes": scenes,
+            "relationships": relationships,
+            "plot_threads": [self.plot_threads[tid] for tid in thread_ids if tid in self.plot_threads],
+        }
+
+
+IndexLoader = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+class IndexManager:
+    """LRU of :class:`StoryBibleIndexes`, built lazily from a populated bible.
+
+    Write hooks only touch bibles that are already indexed; a bible that is
+    not resident is rebuilt from fresh data on its next read.  A build that
+    overlaps a write or :meth:`invalidate` of the same bible may have loaded
+    the document from before that write, so it is built again rather than
+    stored.
+    """
+
+    def __init__(self, max_story_bibles: int = 256, *, max_build_attempts: int = 3) -> None:
+        self._max = max_story_bibles
+        self._max_build_attempts = max_build_attempts
+        self._indexes: "OrderedDict[str, StoryBibleIndexes]" = OrderedDict()
+        self._build_locks: Dict[str, asyncio.Lock] = {}
+        # Builds in flight and writes seen meanwhile, per bible; both only hold bibles being built.
+        self._builds: "Counter[str]" = Counter()
+        self._generations: "Counter[str]" = Counter()
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def peek(self, story_bible_id: str) -> Optional[StoryBibleIndexes]:
+        return self._indexes.get(story_bible_id)
+
+    async def get(self, story_bible_id: str, loader: IndexLoader) -> StoryBibleIndexes:
+        indexes = self._indexes.get(story_bible_id)
+        if indexes is not None:
+            self._indexes.move_to_end(story_bible_id)
+            return indexes
+        lock = self._build_locks.setdefault(story_bible_id, asyncio.Lock())
+        try:
+            async with lock:
+                indexes = self._indexes.get(story_bible_id)
+                if indexes is None:
+                    indexes = await self._build(story_bible_id, loader)
+        finally:
+            self._build_locks.pop(story_bible_id, None)
+        return indexes
+
+    async def _build(self, story_bible_id: str, loader: IndexLoader) -> StoryBibleIndexes:
+        self._builds[story_bible_id] += 1
+        try:
+            for _ in range(self._max_build_attempts):
+                generation = self._generations[story_bible_id]
+                indexes = StoryBibleIndexes(await loader())
+                if self._generations[story_bible_id] == generation:
+                    self._store(story_bible_id, indexes)
+                    return indexes
+            # Writes kept landing during the load: serve this build but leave the next read to rebuild.
+            return indexes
+        finally:
+            self._builds[story_bible_id] -= 1
+            if self._builds[story_bible_id] <= 0:
+                del self._builds[story_bible_id]
+                self._generations.pop(story_bible_id, None)
+
+    def _store(self, story_bible_id: str, indexes: StoryBibleIndexes) -> None:
+        self._indexes[story_bible_id] = indexes
+        self._indexes.move_to_end(story_bible_id)
+        while len(self._indexes) > self._max:
+            self._indexes.popitem(last=False)
+
+    def _written(self, story_bible_id: str) -> Optional[StoryBibleIndexes]:
+        """Note a write to ``story_bible_id`` and return its resident indexes, if any."""
+        if story_bible_id in self._builds:
+            self._generations[story_bible_id] += 1
+        return self._indexes.get(story_bible_id)
+
+    def invalidate(self, story_bible_id: str) -> None:
+        self._written(story_bible_id)
+        self._indexes.pop(story_bible_id, None)
+
+    def on_story_bible_written(self, story_bible_id: str, story_bible: Dict[str, Any]) -> None:
+        indexes = self._written(story_bible_id)
+        if indexes is not None:
+            indexes.apply_story_bible(story_bible)
+
+    def on_scene_written(self, story_bible_id: str, scene: Dict[str, Any]) -> None:
+        indexes = self._written(story_bible_id)
+        if indexes is not None and scene.get("id"):
+            indexes.apply_scene(scene)
+
+    def on_scene_deleted(self, story_bible_id: str, scene_id: str) -> None:
+        indexes = self._written(story_bible_id)
+        if indexes is not None:
+            indexes.remove_scene(scene_id)
+
+    def on_character_written(self, story_bible_id: str, character: Dict[str, Any]) -> None:
+        indexes = self._written(story_bible_id)
+        if indexes is not None and character.get("id"):
+            indexes.apply_character(character)
+
+    def on_character_deleted(self, story_bible_id: str, character_id: str) -> None:
+        indexes = self._written(story_bible_id)
+        if indexes is not None:
+            indexes.remove_character(character_id)
+
+    def on_relationship_written(self, story_bible_id: str, relationship: Dict[str, Any]) -> None:
+        indexes = self._written(story_bible_id)
+        if indexes is not None:
+            indexes.apply_relationship(relationship)
+
+    def on_relationship_deleted(self, story_bible_id: str, relationship_id: str) -> None:
+        indexes = self._written(story_bible_id)
+        if indexes is not None:
+            indexes.remove_relationship(relationship_id)
+
+    def on_plot_thread_written(self, story_bible_id: str, thread: Dict[str, Any]) -> None:
+        indexes = self._written(story_bible_id)
+        if indexes is not None and thread.get("id"):
+            indexes.apply_plot_thread(thread)
+
+    def on_plot_thread_deleted(self, story_bible_id: str, thread_id: str) -> None:
+        indexes = self._written(story_bible_id)
+        if indexes is not None:
+            indexes.remove_plot_thread(thread_id)
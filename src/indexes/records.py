@@ -0,0 +1,312 @@
+"""Compact records for indexed story bible entities.
+
+A populated bible parsed from JSON is a tree of dicts and lists: every
+entity pays for a hash table, every list for an over-allocated buffer, and
+every ``"evening"``, ``"protagonist"`` or character id repeated across scenes
+is its own string object.  Indexes keep entities as slotted records instead:
+
+* known fields live in slots, anything else PayloadCMS sends in ``extra``;
+* enum-like values and ids are interned, so each distinct value exists once;
+* list fields are tuples, and relationship fields hold ids only (populated
+  related documents are reduced to their id, as JSON Patch already does).
+
+Records are read-only and dict-like (``get``, ``[]``, ``in``) for internal
+consumers, with sequences returned as tuples.  Anything leaving the index
+layer is materialised with :meth:`to_dict`, which is what
+:class:`RecordTable` does on item access.
+"""
+
+import sys
+from collections.abc import Iterable, Iterator, MutableMapping
+from dataclasses import dataclass, field, fields
+from typing import TYPE_CHECKING, Any, ClassVar, Dict, Optional, Tuple, Type, TypeVar, Union
+
+from ..utils.references import ref_id, ref_ids
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+# Absent from the source document, as opposed to present and null.
+MISSING: Any = _Missing()
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _pack_ref(value: Any) -> Optional[str]:
+    identifier = ref_id(value)
+    return sys.intern(identifier) if identifier is not None else None
+
+
+def _pack_refs(values: Any) -> Tuple[str, ...]:
+    if isinstance(values, list) and all(type(value) is str and value for value in values):
+        return tuple(map(sys.intern, values))
+    return tuple(sys.intern(identifier) for identifier in ref_ids(values))
+
+
+def _pack_list(values: Any) -> Any:
+    return tuple(values) if isinstance(values, list) else values
+
+
+def _pack_records(values: Any) -> Any:
+    if not isinstance(values, list):
+        return values
+    return tuple(RelationshipRecord.from_dict(value) if isinstance(value, dict) else value for value in values)
+
+
+def _unpack_sequence(values: Any) -> Any:
+    return list(values) if isinstance(values, tuple) else values
+
+
+def _unpack_records(values: Any) -> Any:
+    if not isinstance(values, tuple):
+        return values
+    return [value.to_dict() if isinstance(value, Record) else value for value in values]
+
+
+_PACK = {
+    "value": None,
+    "enum": _intern,
+    "ref": _pack_ref,
+    "refs": _pack_refs,
+    "list": _pack_list,
+    "records": _pack_records,
+}
+_UNPACK = {
+    "refs": _unpack_sequence,
+    "list": _unpack_sequence,
+    "records": _unpack_records,
+}
+
+
+def _slot(kind: str = "value") -> Any:
+    return field(default=MISSING, metadata={"kind": kind})
+
+
+R = TypeVar("R", bound="Record")
+
+
+class Record:
+    __slots__ = ()
+
+    # Field name -> packing kind and packing function, filled in by ``@_record``.
+    _KINDS: ClassVar[Dict[str, str]] = {}
+    _PACKERS: ClassVar[Dict[str, Any]] = {}
+    extra: Optional[Dict[str, Any]]
+
+    if TYPE_CHECKING:
+        # Generated per subclass by ``@_record``.
+        def __init__(self, **values: Any) -> None: ...
+
+    @classmethod
+    def coerce(cls: Type[R], entity: Union[Dict[str, Any], "Record"]) -> R:
+        """``entity`` as a record of this type, converting documents and records of other types."""
+        if isinstance(entity, cls):
+            return entity
+        return cls.from_dict(entity.to_dict() if isinstance(entity, Record) else entity)
+
+    @classmethod
+    def from_dict(cls: Type[R], data: Dict[str, Any]) -> R:
+        packers = cls._PACKERS
+        values: Dict[str, Any] = {}
+        extra: Optional[Dict[str, Any]] = None
+        for key, value in data.items():
+            if key not in packers:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+                continue
+            pack = packers[key]
+            values[key] = pack(value) if pack is not None and value is not None else value
+        return cls(**values, extra=extra)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        for name, kind in self._KINDS.items():
+            value = getattr(self, name)
+            if value is MISSING:
+                continue
+            unpack = _UNPACK.get(kind)
+            data[name] = unpack(value) if unpack is not None and value is not None else value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def merge(self: R, changes: Union[Dict[str, Any], "Record"]) -> R:
+        """A new record with the fields present in ``changes`` replaced."""
+        update = type(self).coerce(changes)
+        values = {}
+        for name in self._KINDS:
+            value = getattr(update, name)
+            values[name] = value if value is not MISSING else getattr(self, name)
+        extra = {**(self.extra or {}), **(update.extra or {})}
+        return type(self)(**values, extra=extra or None)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._KINDS:
+            value = getattr(self, key)
+            return default if value is MISSING else value
+        if self.extra is not None:
+            return self.extra.get(key, default)
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key, MISSING) is not MISSING  # type: ignore[arg-type]
+
+
+def _record(cls: Type[R]) -> Type[R]:
+    cls = dataclass(slots=True)(cls)
+    declared = fields(cls)  # type: ignore[arg-type]
+    cls._KINDS = {item.name: item.metadata.get("kind", "value") for item in declared if item.name != "extra"}
+    cls._PACKERS = {name: _PACK[kind] for name, kind in cls._KINDS.items()}
+    return cls
+
+
+@_record
+class RelationshipRecord(Record):
+    id: Any = _slot("enum")
+    story_bible: Any = _slot("ref")
+    character_from: Any = _slot("ref")
+    character_to: Any = _slot("ref")
+    relationship_type: Any = _slot("enum")
+    description: Any = _slot()
+    strength: Any = _slot()
+    createdAt: Any = _slot()
+    updatedAt: Any = _slot()
+    created_at: Any = _slot()
+    updated_at: Any = _slot()
+    extra: Optional[Dict[str, Any]] = None
+
+
+@_record
+class SceneRecord(Record):
+    id: Any = _slot("enum")
+    story_bible: Any = _slot("ref")
+    sequence_number: Any = _slot()
+    title: Any = _slot()
+    location: Any = _slot("enum")
+    time_of_day: Any = _slot("enum")
+    scene_purpose: Any = _slot("enum")
+    description: Any = _slot()
+    dialogue_notes: Any = _slot()
+    emotional_beats: Any = _slot("list")
+    estimated_duration: Any = _slot()
+    characters_present: Any = _slot("refs")
+    plot_threads: Any = _slot("refs")
+    createdAt: Any = _slot()
+    updatedAt: Any = _slot()
+    created_at: Any = _slot()
+    updated_at: Any = _slot()
+    extra: Optional[Dict[str, Any]] = None
+
+
+@_record
+class CharacterRecord(Record):
+    id: Any = _slot("enum")
+    story_bible: Any = _slot("ref")
+    name: Any = _slot()
+    role: Any = _slot("enum")
+    background: Any = _slot()
+    motivation: Any = _slot()
+    arc_description: Any = _slot()
+    physical_description: Any = _slot()
+    personality_traits: Any = _slot("list")
+    dialogue_style: Any = _slot()
+    relationships: Any = _slot("records")
+    createdAt: Any = _slot()
+    updatedAt: Any = _slot()
+    created_at: Any = _slot()
+    updated_at: Any = _slot()
+    extra: Optional[Dict[str, Any]] = None
+
+
+@_record
+class PlotThreadRecord(Record):
+    id: Any = _slot("enum")
+    story_bible: Any = _slot("ref")
+    thread_name: Any = _slot()
+    thread_type: Any = _slot("enum")
+    description: Any = _slot()
+    introduction_scene: Any = _slot("ref")
+    resolution_scene: Any = _slot("ref")
+    status: Any = _slot("enum")
+    key_scenes: Any = _slot("refs")
+    createdAt: Any = _slot()
+    updatedAt: Any = _slot()
+    created_at: Any = _slot()
+    updated_at: Any = _slot()
+    extra: Optional[Dict[str, Any]] = None
+
+
+# What index structures accept: a document fresh from PayloadCMS or a stored record.
+Entity = Union[Dict[str, Any], Record]
+
+
+class RecordTable(MutableMapping):
+    """Entities by id, stored as records and materialised as dicts on item access.
+
+    ``record()``/``records()`` give internal callers the records themselves.
+    """
+
+    __slots__ = ("_type", "_records")
+
+    def __init__(self, record_type: Type[Record], entities: Iterable[Dict[str, Any]] = ()) -> None:
+        self._type = record_type
+        self._records: Dict[str, Record] = {}
+        for entity in entities:
+            if entity.get("id"):
+                self[str(entity["id"])] = entity
+
+    def _coerce(self, entity: Union[Dict[str, Any], Record]) -> Record:
+        return self._type.coerce(entity)
+
+    def __getitem__(self, entity_id: str) -> Dict[str, Any]:
+        return self._records[entity_id].to_dict()
+
+    def __setitem__(self, entity_id: str, entity: Union[Dict[str, Any], Record]) -> None:
+        self._records[sys.intern(entity_id)] = self._coerce(entity)
+
+    def __delitem__(self, entity_id: str) -> None:
+        del self._records[entity_id]
+
+    def __contains__(self, entity_id: object) -> bool:
+        return entity_id in self._records
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def record(self, entity_id: str) -> Optional[Record]:
+        return self._records.get(entity_id)
+
+    def value(self, entity_id: str, key: str, default: Any = None) -> Any:
+        """One field of an entity without materialising the whole document."""
+        record = self._records.get(entity_id)
+        return record.get(key, default) if record is not None else default
+
+    def records(self) -> Iterable[Record]:
+        return self._records.values()
+
+    def pop_record(self, entity_id: str) -> Optional[Record]:
+        return self._records.pop(entity_id, None)
+
+    def merge(self, entity_id: str, changes: Union[Dict[str, Any], Record]) -> Record:
+        """Apply a partial document to the stored entity (or store it) and return the result."""
+        previous = self._records.get(entity_id)
+        merged = previous.merge(changes) if previous is not None else self._coerce(changes)
+        self._records[sys.intern(entity_id)] = merged
+        return merged
@@ -0,0 +1,234 @@
+"""Compact character relationship graph.
+
+Relationships are kept in an edge table that is updated on every write; the
+adjacency structure used by queries is a CSR layout (``offsets`` into flat
+``targets``/``edges`` arrays) that is rebuilt lazily on the first query after
+a write.  Edges are treated as undirected for traversal, with the original
+direction reported back to callers.
+"""
+
+import heapq
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..utils.references import ref_id
+from .records import Entity
+
+
+Edge = Tuple[str, str, Entity]
+
+
+def _strength(relationship: Entity) -> int:
+    """``strength`` as an int; PayloadCMS may send it as a string, and anything unparsable counts as 0."""
+    try:
+        return int(relationship.get("strength") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class RelationshipGraph:
+    def __init__(self, characters: Iterable[str] = (), relationships: Iterable[Entity] = ()) -> None:
+        self._characters: Dict[str, None] = dict.fromkeys(characters)
+        self._edges: Dict[str, Edge] = {}
+        self._dirty = True
+        self._node_ids: List[str] = []
+        self._node_index: Dict[str, int] = {}
+        self._offsets = array("i")
+        self._targets = array("i")
+        self._edge_slots: List[str] = []
+        self._by_strength: List[str] = []
+        self._cluster_cache: Dict[int, List[List[str]]] = {}
+        for relationship in relationships:
+            self.apply_relationship(relationship)
+
+    def add_character(self, character_id: str) -> None:
+        if character_id not in self._characters:
+            self._characters[character_id] = None
+            self._dirty = True
+
+    def remove_character(self, character_id: str) -> None:
+        if self._characters.pop(character_id, False) is None:
+            self._dirty = True
+
+    def apply_relationship(self, relationship: Entity) -> None:
+        relationship_id = ref_id(relationship.get("id"))
+        source = ref_id(relationship.get("character_from"))
+        target = ref_id(relationship.get("character_to"))
+        if not relationship_id or not source or not target:
+            return
+        self._edges[relationship_id] = (source, target, relationship)
+        self._dirty = True
+
+    def remove_relationship(self, relationship_id: str) -> None:
+        if self._edges.pop(relationship_id, None) is not None:
+            self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._edges)
+
+    def _build(self) -> None:
+        nodes: Dict[str, None] = dict(self._characters)
+        for source, target, _ in self._edges.values():
+            nodes.setdefault(source, None)
+            nodes.setdefault(target, None)
+        self._node_ids = list(nodes)
+        self._node_index = {node: index for index, node in enumerate(self._node_ids)}
+
+        degree = [0] * (len(self._node_ids) + 1)
+        for source, target, _ in self._edges.values():
+            degree[self._node_index[source] + 1] += 1
+            if source != target:
+                degree[self._node_index[target] + 1] += 1
+        for index in range(1, len(degree)):
+            degree[index] += degree[index - 1]
+        offsets = array("i", degree)
+
+        cursor = list(degree[:-1])
+        targets = array("i", [0]) * degree[-1]
+        edge_slots: List[str] = [""] * degree[-1]
+        for relationship_id, (source, target, _) in self._edges.items():
+            source_index, target_index = self._node_index[source], self._node_index[target]
+            targets[cursor[source_index]] = target_index
+            edge_slots[cursor[source_index]] = relationship_id
+            cursor[source_index] += 1
+            if source != target:
+                targets[cursor[target_index]] = source_index
+                edge_slots[cursor[target_index]] = relationship_id
+                cursor[target_index] += 1
+
+        self._offsets, self._targets, self._edge_slots = offsets, targets, edge_slots
+        self._by_strength = sorted(self._edges, key=self._strength_key, reverse=True)
+        self._cluster_cache = {}
+        self._dirty = False
+
+    def _strength_key(self, relationship_id: str) -> Tuple[int, str]:
+        return _strength(self._edges[relationship_id][2]), relationship_id
+
+    def _ensure_built(self) -> None:
+        if self._dirty:
+            self._build()
+
+    def has_character(self, character_id: str) -> bool:
+        self._ensure_built()
+        return character_id in self._node_index
+
+    def _describe(self, relationship_id: str, from_id: str) -> Dict[str, Any]:
+        source, target, relationship = self._edges[relationship_id]
+        return {
+            "relationship_id": relationship_id,
+            "character_id": target if source == from_id else source,
+            "direction": "outgoing" if source == from_id else "incoming",
+            "relationship_type": relationship.get("relationship_type"),
+            "strength": relationship.get("strength"),
+        }
+
+    def neighbors(self, character_id: str) -> List[Dict[str, Any]]:
+        self._ensure_built()
+        index = self._node_index.get(character_id)
+        if index is None:
+            return []
+        return [
+            self._describe(self._edge_slots[slot], character_id)
+            for slot in range(self._offsets[index], self._offsets[index + 1])
+        ]
+
+    def shortest_path(self, source: str, target: str) -> Optional[List[Dict[str, Any]]]:
+        """Fewest-hop path as a list of steps, or ``None`` when unreachable.
+
+        Uses a bidirectional breadth-first search, expanding the smaller
+        frontier first, so typical queries touch far fewer nodes than a
+        one-sided search over the whole cast.
+        """
+        self._ensure_built()
+        start, goal = self._node_index.get(source), self._node_index.get(target)
+        if start is None or goal is None:
+            return None
+        if start == goal:
+            return []
+        forward: Dict[int, Tuple[int, int]] = {start: (-1, -1)}
+        backward: Dict[int, Tuple[int, int]] = {goal: (-1, -1)}
+        forward_frontier, backward_frontier = [start], [goal]
+        meeting: Optional[int] = None
+        while forward_frontier and backward_frontier and meeting is None:
+            expand_forward = len(forward_frontier) <= len(backward_frontier)
+            frontier = forward_frontier if expand_forward else backward_frontier
+            seen, other = (forward, backward) if expand_forward else (backward, forward)
+            next_frontier: List[int] = []
+            for node in frontier:
+                for slot in range(self._offsets[node], self._offsets[node + 1]):
+                    neighbor = self._targets[slot]
+                    if neighbor in seen:
+                        continue
+                    seen[neighbor] = (node, slot)
+                    if neighbor in other:
+                        meeting = neighbor
+                        break
+                    next_frontier.append(neighbor)
+                if meeting is not None:
+                    break
+            if expand_forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+        if meeting is None:
+            return None
+
+        steps: List[Dict[str, Any]] = []
+        node = meeting
+        while node != start:
+            parent, slot = forward[node]
+            steps.append({"from": self._node_ids[parent], **self._describe(self._edge_slots[slot], self._node_ids[parent])})
+            node = parent
+        steps.reverse()
+        node = meeting
+        while node != goal:
+            child, slot = backward[node]
+            steps.append({"from": self._node_ids[node], **self._describe(self._edge_slots[slot], self._node_ids[node])})
+            node = child
+        return steps
+
+    def strongest(self, limit: int = 10, character_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        if character_id is not None:
+            candidates = {entry["relationship_id"] for entry in self.neighbors(character_id)}
+            top = heapq.nlargest(limit, candidates, key=self._strength_key)
+        else:
+            self._ensure_built()
+            top = self._by_strength[:limit]
+        return [
+            {
+                "relationship_id": relationship_id,
+                "character_from": self._edges[relationship_id][0],
+                "character_to": self._edges[relationship_id][1],
+                "relationship_type": self._edges[relationship_id][2].get("relationship_type"),
+                "strength": self._edges[relationship_id][2].get("strength"),
+            }
+            for relationship_id in top
+        ]
+
+    def clusters(self, min_strength: int = 0) -> List[List[str]]:
+        """Connected groups of characters using only ties of at least ``min_strength``, largest first."""
+        self._ensure_built()
+        cached = self._cluster_cache.get(min_strength)
+        if cached is not None:
+            return [list(members) for members in cached]
+        parent = list(range(len(self._node_ids)))
+
+        def find(node: int) -> int:
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        for source, target, relationship in self._edges.values():
+            if _strength(relationship) < min_strength:
+                continue
+            root_a, root_b = find(self._node_index[source]), find(self._node_index[target])
+            if root_a != root_b:
+                parent[root_b] = root_a
+
+        groups: Dict[int, List[str]] = {}
+        for index, node in enumerate(self._node_ids):
+            groups.setdefault(find(index), []).append(node)
+        clusters = sorted(groups.values(), key=lambda members: (-len(members), members[0]))
+        self._cluster_cache[min_strength] = clusters
+        return [list(members) for members in clusters]
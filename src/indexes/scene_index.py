@@ -0,0 +1,107 @@
+"""Ordered scene index for a single story bible."""
+
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .records import SceneRecord
+
+
+SceneKey = Tuple[int, str]
+
+
+def _scene_key(scene: SceneRecord) -> SceneKey:
+    return int(scene.get("sequence_number") or 0), str(scene["id"])
+
+
+class SceneIndex:
+    """Scenes by id plus a ``(sequence_number, id)`` ordering kept sorted on write.
+
+    Scenes are stored as :class:`SceneRecord` and returned as dicts; the
+    ``*_records`` accessors skip that conversion for internal readers.
+    """
+
+    def __init__(self, scenes: Iterable[Dict[str, Any]] = ()) -> None:
+        self._scenes: Dict[str, SceneRecord] = {}
+        self._keys: Dict[str, SceneKey] = {}
+        self._order: List[SceneKey] = []
+        for scene in scenes:
+            if scene.get("id"):
+                record = SceneRecord.from_dict(scene)
+                self._scenes[str(record["id"])] = record
+                self._keys[str(record["id"])] = _scene_key(record)
+        self._order = sorted(self._keys.values())
+
+    def __len__(self) -> int:
+        return len(self._scenes)
+
+    def __contains__(self, scene_id: object) -> bool:
+        return scene_id in self._scenes
+
+    def get(self, scene_id: str) -> Optional[Dict[str, Any]]:
+        record = self._scenes.get(scene_id)
+        return record.to_dict() if record is not None else None
+
+    def record(self, scene_id: str) -> Optional[SceneRecord]:
+        return self._scenes.get(scene_id)
+
+    def value(self, scene_id: str, key: str, default: Any = None) -> Any:
+        """One field of a scene without materialising the whole document."""
+        record = self._scenes.get(scene_id)
+        return record.get(key, default) if record is not None else default
+
+    def upsert(self, scene: Union[Dict[str, Any], SceneRecord]) -> SceneRecord:
+        """Merge a (partial) scene into the index and return the stored record."""
+        scene_id = str(scene["id"])
+        previous = self._scenes.get(scene_id)
+        if previous is not None:
+            record = previous.merge(scene)
+            self._remove_key(scene_id)
+        else:
+            record = scene if isinstance(scene, SceneRecord) else SceneRecord.from_dict(scene)
+        key = _scene_key(record)
+        self._scenes[scene_id] = record
+        self._keys[scene_id] = key
+        insort(self._order, key)
+        return record
+
+    def remove(self, scene_id: str) -> None:
+        if scene_id in self._scenes:
+            self._remove_key(scene_id)
+            del self._scenes[scene_id]
+
+    def _remove_key(self, scene_id: str) -> None:
+        key = self._keys.pop(scene_id)
+        position = bisect_left(self._order, key)
+        if position < len(self._order) and self._order[position] == key:
+            del self._order[position]
+
+    def position(self, scene_id: str) -> int:
+        return bisect_left(self._order, self._keys[scene_id])
+
+    def ordered(self) -> List[Dict[str, Any]]:
+        return [self._scenes[scene_id].to_dict() for _, scene_id in self._order]
+
+    def ordered_records(self) -> List[SceneRecord]:
+        return [self._scenes[scene_id] for _, scene_id in self._order]
+
+    def ordered_ids(self) -> List[str]:
+        return [scene_id for _, scene_id in self._order]
+
+    def ordered_subset(self, scene_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        keys = sorted(self._keys[scene_id] for scene_id in scene_ids if scene_id in self._keys)
+        return [self._scenes[key[1]].to_dict() for key in keys]
+
+    def neighborhood(
+        self,
+        scene_id: str,
+        before: int,
+        after: int,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Return up to ``before`` preceding and ``after`` following scenes in sequence order."""
+        position = self.position(scene_id)
+        preceding = self._order[max(0, position - before) : position]
+        following = self._order[position + 1 : position + 1 + after]
+        return (
+            [self._scenes[key[1]].to_dict() for key in preceding],
+            [self._scenes[key[1]].to_dict() for key in following],
+        )
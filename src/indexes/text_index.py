@@ -0,0 +1,116 @@
+"""BM25 full-text index over story bible prose fields.
+
+Each searchable field (``scene.description``, ``character.background`` ...)
+has its own postings, document lengths and average length, and an entity's
+score is the sum of its per-field BM25 scores.  Updating an entity only
+touches the postings of the terms it contained before and after the write.
+"""
+
+import heapq
+import math
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..utils.text import tokenize
+from .records import Entity
+
+
+EntityKey = Tuple[str, str]
+
+SEARCH_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "scene": ("title", "description", "dialogue_notes"),
+    "character": ("name", "background", "motivation"),
+    "plot_thread": ("thread_name", "description"),
+}
+
+ALL_FIELDS = tuple(f"{kind}.{field}" for kind, fields in SEARCH_FIELDS.items() for field in fields)
+
+
+class _FieldIndex:
+    def __init__(self) -> None:
+        self.postings: Dict[str, Dict[EntityKey, int]] = {}
+        self.lengths: Dict[EntityKey, int] = {}
+        self.terms: Dict[EntityKey, Counter] = {}
+        self.total_length = 0
+
+    def remove(self, key: EntityKey) -> None:
+        counts = self.terms.pop(key, None)
+        if counts is None:
+            return
+        for term in counts:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self.postings[term]
+        self.total_length -= self.lengths.pop(key, 0)
+
+    def add(self, key: EntityKey, text: str) -> None:
+        tokens = tokenize(text)
+        if not tokens:
+            return
+        counts = Counter(tokens)
+        self.terms[key] = counts
+        self.lengths[key] = len(tokens)
+        self.total_length += len(tokens)
+        for term, count in counts.items():
+            self.postings.setdefault(term, {})[key] = count
+
+
+class TextIndex:
+    def __init__(self, *, k1: float = 1.2, b: float = 0.75) -> None:
+        self._k1 = k1
+        self._b = b
+        self._fields: Dict[str, _FieldIndex] = {name: _FieldIndex() for name in ALL_FIELDS}
+
+    def index_entity(self, kind: str, entity: Entity) -> None:
+        key = (kind, str(entity["id"]))
+        for field in SEARCH_FIELDS[kind]:
+            index = self._fields[f"{kind}.{field}"]
+            index.remove(key)
+            value = entity.get(field)
+            if value:
+                index.add(key, str(value))
+
+    def remove_entity(self, kind: str, entity_id: str) -> None:
+        for field in SEARCH_FIELDS[kind]:
+            self._fields[f"{kind}.{field}"].remove((kind, entity_id))
+
+    def search(
+        self,
+        query: str,
+        *,
+        fields: Optional[Iterable[str]] = None,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        terms = list(dict.fromkeys(tokenize(query)))
+        selected = list(fields) if fields else list(ALL_FIELDS)
+        unknown = [name for name in selected if name not in self._fields]
+        if unknown:
+            raise ValueError(f"Unknown search fields: {', '.join(unknown)}")
+
+        scores: Dict[EntityKey, float] = {}
+        matched: Dict[EntityKey, List[str]] = {}
+        for name in selected:
+            index = self._fields[name]
+            documents = len(index.lengths)
+            if not documents:
+                continue
+            average_length = index.total_length / documents
+            for term in terms:
+                postings = index.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (documents - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, frequency in postings.items():
+                    norm = self._k1 * (1 - self._b + self._b * index.lengths[key] / average_length)
+                    scores[key] = scores.get(key, 0.0) + idf * frequency * (self._k1 + 1) / (frequency + norm)
+                    fields_hit = matched.setdefault(key, [])
+                    if name not in fields_hit:
+                        fields_hit.append(name)
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return [
+            {"kind": kind, "id": entity_id, "score": round(score, 4), "matched_fields": matched[(kind, entity_id)]}
+            for (kind, entity_id), score in top
+        ]
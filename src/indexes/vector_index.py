@@ -0,0 +1,171 @@
+"""Embedding matrix with cosine top-k search for one story bible.
+
+Writes only record the text an entity should be embedded from; rows whose
+text fingerprint changed are embedded in one batch on the next search, so an
+edit that does not touch descriptive fields (a new ``sequence_number``, say)
+never triggers a re-embed.  Vectors are L2-normalised and stored in a single
+contiguous ``float32`` matrix, which makes search one matrix-vector product.
+"""
+
+import asyncio
+import hashlib
+from collections.abc import Awaitable, Callable
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .records import Entity
+
+EntityKey = Tuple[str, str]
+EmbedFunction = Callable[[List[str]], Awaitable[np.ndarray]]
+
+KINDS = ("scene", "character")
+
+
+def scene_text(scene: Entity) -> str:
+    parts = [
+        scene.get("title"),
+        scene.get("location"),
+        scene.get("description"),
+        scene.get("dialogue_notes"),
+        " ".join(scene.get("emotional_beats") or []),
+    ]
+    return "\n".join(str(part) for part in parts if part)
+
+
+def character_text(character: Entity) -> str:
+    parts = [
+        character.get("name"),
+        character.get("role"),
+        character.get("background"),
+        character.get("motivation"),
+        character.get("arc_description"),
+        character.get("physical_description"),
+        " ".join(character.get("personality_traits") or []),
+    ]
+    return "\n".join(str(part) for part in parts if part)
+
+
+def _fingerprint(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def normalise(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class VectorIndex:
+    def __init__(self) -> None:
+        self._matrix: Optional[np.ndarray] = None
+        self._kinds = np.zeros(0, dtype=np.int8)
+        self._size = 0
+        self._keys: List[EntityKey] = []
+        self._rows: Dict[EntityKey, int] = {}
+        self._fingerprints: Dict[EntityKey, str] = {}
+        self._pending: Dict[EntityKey, str] = {}
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def mark(self, key: EntityKey, text: str) -> None:
+        """Queue ``key`` for (re-)embedding if its text changed."""
+        fingerprint = _fingerprint(text)
+        if self._fingerprints.get(key) == fingerprint and key in self._rows:
+            self._pending.pop(key, None)
+            return
+        self._pending[key] = text
+
+    def remove(self, key: EntityKey) -> None:
+        self._pending.pop(key, None)
+        self._fingerprints.pop(key, None)
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        last = self._size - 1
+        if row != last:
+            assert self._matrix is not None
+            moved = self._keys[last]
+            self._matrix[row] = self._matrix[last]
+            self._kinds[row] = self._kinds[last]
+            self._keys[row] = moved
+            self._rows[moved] = row
+        self._keys.pop()
+        self._size -= 1
+
+    async def refresh(self, embed: EmbedFunction, *, batch_size: int = 64) -> int:
+        """Embed every pending entity; returns the number of rows embedded."""
+        async with self._lock:
+            pending = list(self._pending.items())
+            embedded = 0
+            for start in range(0, len(pending), batch_size):
+                batch = pending[start : start + batch_size]
+                vectors = normalise(await embed([text for _, text in batch]))
+                for (key, text), vector in zip(batch, vectors):
+                    if self._pending.get(key) != text:
+                        continue
+                    self._store(key, vector)
+                    self._fingerprints[key] = _fingerprint(text)
+                    del self._pending[key]
+                    embedded += 1
+            return embedded
+
+    def _store(self, key: EntityKey, vector: np.ndarray) -> None:
+        if self._matrix is None:
+            self._matrix = np.zeros((16, vector.shape[0]), dtype=np.float32)
+            self._kinds = np.zeros(16, dtype=np.int8)
+        if vector.shape[0] != self._matrix.shape[1]:
+            raise ValueError(
+                f"Embedding dimension {vector.shape[0]} does not match index dimension {self._matrix.shape[1]}"
+            )
+        row = self._rows.get(key)
+        if row is None:
+            if self._size == self._matrix.shape[0]:
+                self._matrix = np.concatenate([self._matrix, np.zeros_like(self._matrix)])
+                self._kinds = np.concatenate([self._kinds, np.zeros_like(self._kinds)])
+            row = self._size
+            self._size += 1
+            self._keys.append(key)
+            self._rows[key] = row
+        assert self._matrix is not None
+        self._matrix[row] = vector
+        self._kinds[row] = KINDS.index(key[0])
+
+    def vector_for(self, key: EntityKey) -> Optional[np.ndarray]:
+        row = self._rows.get(key)
+        if row is None or self._matrix is None:
+            return None
+        return self._matrix[row]
+
+    def search(
+        self,
+        query: np.ndarray,
+        *,
+        limit: int = 10,
+        kind: Optional[str] = None,
+        exclude: Sequence[EntityKey] = (),
+    ) -> List[Tuple[EntityKey, float]]:
+        if self._matrix is None or self._size == 0:
+            return []
+        scores = self._matrix[: self._size] @ normalise(query)[0]
+        if kind is not None:
+            scores = np.where(self._kinds[: self._size] == KINDS.index(kind), scores, -np.inf)
+        for key in exclude:
+            row = self._rows.get(key)
+            if row is not None:
+                scores[row] = -np.inf
+        limit = min(limit, self._size)
+        if limit <= 0:
+            return []
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [(self._keys[row], float(scores[row])) for row in top if np.isfinite(scores[row])]
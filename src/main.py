@@ -1,24 +1,43 @@
 """FastAPI application entry point for the MCP Story Bible Service."""
 
 import logging
+import time
 from contextlib import asynccontextmanager
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from .cache import Cache, CacheBackend, MemoryCacheBackend, RedisCacheBackend
 from .config import settings
-from .routes import api, health, mcp
+from .indexes import IndexManager
+from .middleware.auth import configure_token_cache
+from .middleware.compression import CompressionMiddleware
+from .middleware.deadline import DEADLINE_HEADER, DeadlineMiddleware
+from .middleware.rate_limit import RateLimitHeadersMiddleware, enforce_rate_limit
+from .middleware.timing import ServerTimingMiddleware
+from .routes import api, health, hooks, mcp
 from .services.brain_client import BrainServiceClient
+from .services.brain_scheduler import BrainScheduler
+from .services.change_feed import ChangeBroker, ChangeLog
+from .services.embeddings import BrainEmbedder, Embedder, HashingEmbedder
 from .services.export_service import ExportService
+from .services.jobs import JobQueue
+from .services.payload_events import PayloadEventDebouncer
 from .services.payload_service import PayloadCMSService
+from .services.readiness import ReadinessMonitor
+from .services.rate_limit import RateLimiter
 from .services.story_bible_service import StoryBibleService
+from .snapshots import DiskSnapshotStore, MemorySnapshotStore, SnapshotManager, SnapshotStore
+from .utils.compression import configure_levels
 from .utils.exceptions import (
     AuthorizationError,
     BrainServiceException,
+    DeadlineExceeded,
     PayloadCMSException,
     ServiceError,
+    ServiceOverloaded,
 )
 
 
@@ -28,10 +47,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+_IMPORTED_AT = time.perf_counter()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting MCP Story Bible Service")
+    lifespan_started = time.perf_counter()
 
     payload_service = PayloadCMSService(
         base_url=settings.PAYLOADCMS_API_URL,
@@ -39,28 +61,151 @@ async def lifespan(app: FastAPI):
         timeout=settings.PAYLOADCMS_TIMEOUT_SECONDS,
         max_retries=settings.PAYLOADCMS_MAX_RETRIES,
     )
+    brain_scheduler = BrainScheduler(
+        max_concurrency=settings.BRAIN_MAX_CONCURRENCY,
+        per_project_limit=settings.BRAIN_PER_PROJECT_LIMIT,
+        max_queue_per_project=settings.BRAIN_MAX_QUEUE_PER_PROJECT,
+        max_queue_total=settings.BRAIN_MAX_QUEUE_TOTAL,
+        weights=settings.BRAIN_PROJECT_WEIGHTS,
+    )
     brain_client = BrainServiceClient(
         base_url=settings.BRAIN_SERVICE_URL,
         ws_url=settings.BRAIN_SERVICE_WS_URL,
         timeout=settings.BRAIN_SERVICE_TIMEOUT_SECONDS,
+        scheduler=brain_scheduler,
     )
     export_service = ExportService()
-    story_service = StoryBibleService(payload_service, brain_client, export_service)
+    cache_backend: CacheBackend
+    if settings.CACHE_BACKEND == "redis":
+        cache_backend = RedisCacheBackend(settings.CACHE_REDIS_URL)
+    else:
+        cache_backend = MemoryCacheBackend(max_entries=settings.CACHE_MEMORY_MAX_ENTRIES)
+    cache = Cache(cache_backend, namespace=settings.CACHE_NAMESPACE)
+    index_manager = IndexManager(max_story_bibles=settings.INDEX_MAX_STORY_BIBLES)
+    change_broker = ChangeBroker(max_buffer=settings.CHANGE_SUBSCRIBER_BUFFER)
+    job_queue = JobQueue(
+        workers=settings.JOB_WORKERS,
+        max_pending=settings.JOB_MAX_PENDING,
+        result_ttl_seconds=settings.JOB_RESULT_TTL_SECONDS,
+    )
+    change_log = ChangeLog(
+        max_entries=settings.CHANGE_LOG_MAX_ENTRIES,
+        max_story_bibles=settings.INDEX_MAX_STORY_BIBLES * 4,
+    )
+    embedder: Embedder
+    if settings.EMBEDDING_BACKEND == "brain":
+        embedder = BrainEmbedder(brain_client)
+    else:
+        embedder = HashingEmbedder(dimension=settings.EMBEDDING_DIMENSION)
+    snapshot_store: SnapshotStore
+    if settings.SNAPSHOT_BACKEND == "disk":
+        snapshot_store = DiskSnapshotStore(
+            settings.SNAPSHOT_DIR,
+            grace_seconds=settings.SNAPSHOT_COMPACTION_GRACE_SECONDS,
+        )
+    else:
+        snapshot_store = MemorySnapshotStore()
+    snapshots = SnapshotManager(snapshot_store, max_per_story_bible=settings.SNAPSHOT_MAX_PER_STORY_BIBLE)
+    story_service = StoryBibleService(
+        payload_service,
+        brain_client,
+        export_service,
+        index_manager,
+        scene_transition_window=settings.SCENE_TRANSITION_WINDOW,
+        embedder=embedder,
+        change_broker=change_broker,
+        change_log=change_log,
+        reorder_concurrency=settings.REORDER_MAX_CONCURRENCY,
+        job_queue=job_queue,
+        cache=cache,
+        document_cache_ttl=settings.CACHE_DOCUMENT_TTL_SECONDS,
+        export_cache_ttl=settings.CACHE_EXPORT_TTL_SECONDS,
+        brain_result_cache_ttl=settings.CACHE_BRAIN_RESULT_TTL_SECONDS,
+        compression_min_size=settings.COMPRESSION_MIN_SIZE,
+        compression_offload_size=settings.COMPRESSION_OFFLOAD_SIZE,
+        snapshots=snapshots,
+        clone_concurrency=settings.CLONE_MAX_CONCURRENCY,
+    )
+    configure_token_cache(cache, settings.AUTH_CACHE_TTL_SECONDS)
+    payload_events = PayloadEventDebouncer(
+        story_service.apply_external_changes,
+        debounce_seconds=settings.PAYLOAD_WEBHOOK_DEBOUNCE_SECONDS,
+        max_delay_seconds=settings.PAYLOAD_WEBHOOK_MAX_DELAY_SECONDS,
+        max_incremental=settings.PAYLOAD_WEBHOOK_MAX_INCREMENTAL,
+    )
+
+    rate_limiter = None
+    if settings.RATE_LIMIT_ENABLED:
+        rate_limiter = RateLimiter(
+            per_minute={
+                "read": settings.RATE_LIMIT_READ_PER_MINUTE,
+                "write": settings.RATE_LIMIT_WRITE_PER_MINUTE,
+                "ai": settings.RATE_LIMIT_AI_PER_MINUTE,
+            },
+            project_multiplier=settings.RATE_LIMIT_PROJECT_MULTIPLIER,
+        )
 
-    await brain_client.connect()
+    startup = app.state.startup = {}
+
+    def first_ready() -> None:
+        startup["time_to_ready_ms"] = round((time.perf_counter() - _IMPORTED_AT) * 1000, 1)
+        logger.info("Service ready %.0f ms after start", startup["time_to_ready_ms"])
+
+    readiness = ReadinessMonitor(
+        interval_seconds=settings.READINESS_PROBE_INTERVAL_SECONDS,
+        timeout_seconds=settings.READINESS_PROBE_TIMEOUT_SECONDS,
+        on_first_ready=first_ready,
+    )
+    readiness.add("payloadcms", payload_service.ping)
+    readiness.add("cache", cache.ping)
+    # Calls fall back to HTTP while the WebSocket is down, so the Brain Service only degrades readiness.
+    readiness.add("brain_service", brain_client.ping, required=False)
+    # Indexes and cached documents fill on each bible's first read; report how warm they are without gating on it.
+    readiness.add("caches", story_service.warm_state, required=False)
+
+    await cache.start()
+    # The WebSocket connects in the background; a down Brain Service must not hold up startup.
+    brain_client.start()
+    job_queue.start()
+    readiness.start()
     app.state.payload_service = payload_service
     app.state.brain_client = brain_client
+    app.state.brain_scheduler = brain_scheduler
     app.state.export_service = export_service
+    app.state.index_manager = index_manager
+    app.state.change_broker = change_broker
+    app.state.job_queue = job_queue
     app.state.story_service = story_service
-    logger.info("Service dependencies initialized")
+    app.state.cache = cache
+    app.state.payload_events = payload_events
+    app.state.rate_limiter = rate_limiter
+    app.state.readiness = readiness
+    startup["lifespan_ms"] = round((time.perf_counter() - lifespan_started) * 1000, 1)
+    startup["cold_start_ms"] = round((time.perf_counter() - _IMPORTED_AT) * 1000, 1)
+    logger.info(
+        "Service dependencies initialized in %.0f ms (cold start %.0f ms)",
+        startup["lifespan_ms"],
+        startup["cold_start_ms"],
+    )
 
     yield
 
+    await readiness.stop()
+    await payload_events.stop()
+    await job_queue.stop()
     await brain_client.disconnect()
     await payload_service.aclose()
+    configure_token_cache(None, 0)
+    await cache.close()
     logger.info("MCP Story Bible Service stopped")
 
 
+configure_levels(
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+)
+
 app = FastAPI(
     title="MCP Story Bible Service",
     description="Story bible management and AI assistance for the Auto-Movie platform",
@@ -68,17 +213,41 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        offload_size=settings.COMPRESSION_OFFLOAD_SIZE,
+    )
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
-    allow_headers=["*"],
+    allow_headers=["*", DEADLINE_HEADER],
+    expose_headers=["Server-Timing", "RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset", "Retry-After"],
+)
+
+app.add_middleware(RateLimitHeadersMiddleware)
+
+app.add_middleware(DeadlineMiddleware, default_timeout_ms=settings.DEFAULT_REQUEST_TIMEOUT_MS)
+
+app.add_middleware(
+    ServerTimingMiddleware,
+    slow_request_ms=settings.SLOW_REQUEST_THRESHOLD_MS,
+    emit_header=settings.ENABLE_SERVER_TIMING,
 )
 
 app.include_router(health.router, prefix="/health", tags=["health"])
-app.include_router(api.router, prefix="/api/v1", tags=["story-bible"])
+app.include_router(
+    api.router,
+    prefix="/api/v1",
+    tags=["story-bible"],
+    dependencies=[Depends(enforce_rate_limit)],
+)
 app.include_router(mcp.router, prefix="/mcp", tags=["mcp"])
+app.include_router(hooks.router, prefix="/hooks", tags=["hooks"])
 
 
 @app.exception_handler(AuthorizationError)
@@ -96,6 +265,20 @@ async def handle_brain_error(_, exc: BrainServiceException):
     return JSONResponse(status_code=502, content={"detail": str(exc)})
 
 
+@app.exception_handler(DeadlineExceeded)
+async def handle_deadline_exceeded(_, exc: DeadlineExceeded):
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
+
+@app.exception_handler(ServiceOverloaded)
+async def handle_service_overloaded(_, exc: ServiceOverloaded):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 @app.exception_handler(ServiceError)
 async def handle_service_error(_, exc: ServiceError):
     return JSONResponse(status_code=400, content={"detail": str(exc)})
@@ -123,4 +306,5 @@ if __name__ == "__main__":
         port=settings.PORT,
         reload=settings.ENVIRONMENT == "development",
         log_level=settings.LOG_LEVEL.lower(),
+        ws_per_message_deflate=settings.MCP_WS_PER_MESSAGE_DEFLATE,
     )
\ No newline at end of file
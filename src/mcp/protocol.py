@@ -1,11 +1,18 @@
 """Minimal JSON-RPC like protocol helpers for MCP WebSocket."""
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 
 def build_success_response(request_id: Any, result: Any) -> Dict[str, Any]:
     return {"jsonrpc": "2.0", "id": request_id, "result": result}
 
 
-def build_error_response(request_id: Any, message: str) -> Dict[str, Any]:
-    return {"jsonrpc": "2.0", "id": request_id, "error": {"message": message}}
+def build_error_response(request_id: Any, message: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    error: Dict[str, Any] = {"message": message}
+    if data is not None:
+        error["data"] = data
+    return {"jsonrpc": "2.0", "id": request_id, "error": error}
+
+
+def build_notification(method: str, params: Any) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "method": method, "params": params}
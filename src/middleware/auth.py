@@ -1,15 +1,27 @@
 """Bearer authentication middleware helpers."""
 
+import hashlib
 from typing import Optional
 
 import httpx
 from fastapi import Depends, Header, HTTPException, status
 
+from ..cache import Cache
 from ..config import settings
 from ..models import AuthenticatedUser
+from ..utils.timing import span
 
 
 _auth_client = httpx.AsyncClient(timeout=httpx.Timeout(10.0))
+_token_cache: Optional[Cache] = None
+_token_cache_ttl = 0.0
+
+
+def configure_token_cache(cache: Optional[Cache], ttl_seconds: float) -> None:
+    """Remember verified tokens in ``cache`` for ``ttl_seconds`` (0 disables)."""
+    global _token_cache, _token_cache_ttl
+    _token_cache = cache if ttl_seconds > 0 else None
+    _token_cache_ttl = ttl_seconds
 
 
 async def verify_bearer_token(authorization: Optional[str] = Header(default=None)) -> AuthenticatedUser:
@@ -19,9 +31,18 @@ async def verify_bearer_token(authorization: Optional[str] = Header(default=None
             detail="Authorization header with Bearer token required",
         )
     token = authorization.removeprefix("Bearer ").strip()
+    # Only a digest of the token is used as the key; the token itself is never stored.
+    cache_key = None
+    if _token_cache is not None:
+        cache_key = await _token_cache.key("token", hashlib.sha256(token.encode()).hexdigest())
+        cached = await _token_cache.get(cache_key)
+        if cached is not None:
+            return AuthenticatedUser.model_validate(cached)
+
     headers = {"Authorization": f"Bearer {token}"}
     try:
-        response = await _auth_client.get(f"{settings.PAYLOADCMS_API_URL}/api/users/me", headers=headers)
+        with span("auth"):
+            response = await _auth_client.get(f"{settings.PAYLOADCMS_API_URL}/api/users/me", headers=headers)
         response.raise_for_status()
     except httpx.HTTPStatusError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token") from exc
@@ -31,7 +52,10 @@ async def verify_bearer_token(authorization: Optional[str] = Header(default=None
     payload = response.json()
     if isinstance(payload, dict) and "doc" in payload:
         payload = payload["doc"]
-    return AuthenticatedUser.model_validate(payload)
+    user = AuthenticatedUser.model_validate(payload)
+    if _token_cache is not None:
+        await _token_cache.set(cache_key, user.model_dump(mode="json"), _token_cache_ttl)
+    return user
 
 
 async def get_current_user(user: AuthenticatedUser = Depends(verify_bearer_token)) -> AuthenticatedUser:
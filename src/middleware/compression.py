@@ -0,0 +1,68 @@
+"""Negotiated compression of REST responses.
+
+Only complete (non-streamed) bodies of a compressible type at or above
+``minimum_size`` are compressed.  Responses that already carry a
+``Content-Encoding`` (precompressed cached artifacts) pass through untouched.
+"""
+
+from typing import List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..utils.compression import compress_async, is_compressible, negotiate
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, *, minimum_size: int = 1024, offload_size: int = 256 * 1024) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message.get("headers", []))
+                if "content-encoding" in headers or not is_compressible(headers.get("content-type")):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            body: bytes = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                # Streamed or small: send as is.
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            compressed = await compress_async(body, encoding, offload_size=self.offload_size)
+            raw: List[Tuple[bytes, bytes]] = list(start.get("headers", []))
+            headers = MutableHeaders(raw=raw)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send({**start, "headers": headers.raw})
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,84 @@
+"""ASGI middleware binding request deadlines and cancelling abandoned requests."""
+
+import asyncio
+import logging
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..utils.deadlines import deadline_scope
+
+
+logger = logging.getLogger(__name__)
+
+DEADLINE_HEADER = "X-Request-Timeout-Ms"
+
+
+def parse_timeout_ms(value: Optional[object], default_ms: float) -> Optional[float]:
+    """Timeout in seconds from a millisecond value, falling back to ``default_ms`` (0 means none)."""
+    timeout_ms = default_ms
+    if isinstance(value, (str, int, float)):
+        try:
+            timeout_ms = float(value)
+        except ValueError:
+            pass
+    return timeout_ms / 1000 if timeout_ms > 0 else None
+
+
+class DeadlineMiddleware:
+    """Apply the ``X-Request-Timeout-Ms`` budget and stop work when the client disconnects.
+
+    The request runs in its own task while the middleware owns ``receive``,
+    forwarding body messages to the application.  An ``http.disconnect``
+    that arrives before the response is complete cancels the task, which in
+    turn cancels any in-flight PayloadCMS or Brain Service call.
+    """
+
+    def __init__(self, app: ASGIApp, *, default_timeout_ms: float = 0) -> None:
+        self.app = app
+        self.default_timeout_ms = default_timeout_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timeout = parse_timeout_ms(Headers(scope=scope).get(DEADLINE_HEADER), self.default_timeout_ms)
+        inbox: "asyncio.Queue[Message]" = asyncio.Queue()
+        response_done = False
+        disconnected = False
+
+        async def forwarding_send(message: Message) -> None:
+            nonlocal response_done
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_done = True
+            await send(message)
+
+        async def run_app() -> None:
+            await self.app(scope, inbox.get, forwarding_send)
+
+        with deadline_scope(timeout):
+            handler: "asyncio.Task[None]" = asyncio.create_task(run_app())
+
+        async def listen() -> None:
+            nonlocal disconnected
+            while True:
+                message = await receive()
+                inbox.put_nowait(message)
+                if message["type"] == "http.disconnect":
+                    if not response_done and not handler.done():
+                        disconnected = True
+                        logger.info("Client disconnected, cancelling %s %s", scope["method"], scope["path"])
+                        handler.cancel()
+                    return
+
+        listener = asyncio.create_task(listen())
+        try:
+            await handler
+        except asyncio.CancelledError:
+            if not disconnected:
+                handler.cancel()
+                raise
+        finally:
+            listener.cancel()
@@ -0,0 +1,84 @@
+"""Rate limiting for the REST API.
+
+:func:`enforce_rate_limit` is a router dependency: it authenticates the
+caller, charges the request to the matching token buckets and keeps the
+decision on ``request.state``.  :class:`RateLimitHeadersMiddleware` copies
+that decision onto the response as ``RateLimit-*`` headers, which covers
+routes that build their own ``Response`` and the 429 raised by the
+dependency itself.
+"""
+
+from typing import Any, Dict, Optional
+
+from fastapi import Depends, Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..middleware.auth import get_current_user
+from ..models import AuthenticatedUser
+from ..services.rate_limit import Category, Decision, RateLimiter
+
+
+# REST endpoints that call the Brain Service; everything else is a read or a write by method.
+AI_ROUTES = frozenset(
+    {
+        "validate_consistency",
+        "generate_character_arc",
+        "suggest_scene_transitions",
+        "find_similar",
+        "submit_job",
+    }
+)
+
+
+def classify_request(request: Request) -> Category:
+    endpoint = request.scope.get("endpoint")
+    if getattr(endpoint, "__name__", None) in AI_ROUTES:
+        return "ai"
+    return "read" if request.method in ("GET", "HEAD", "OPTIONS") else "write"
+
+
+def _project_of(request: Request) -> Optional[str]:
+    project_id = request.path_params.get("project_id") or request.query_params.get("project_id")
+    if project_id:
+        return project_id
+    story_bible_id = request.path_params.get("story_bible_id")
+    service = getattr(request.app.state, "story_service", None)
+    if story_bible_id and service is not None:
+        return service.cached_project_id(story_bible_id)
+    return None
+
+
+async def enforce_rate_limit(request: Request, user: AuthenticatedUser = Depends(get_current_user)) -> None:
+    limiter: Optional[RateLimiter] = getattr(request.app.state, "rate_limiter", None)
+    if limiter is None:
+        return
+    decision = await limiter.check(classify_request(request), user.id, _project_of(request))
+    if decision is None:
+        return
+    request.state.rate_limit = decision
+    decision.raise_if_limited()
+
+
+class RateLimitHeadersMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state: Dict[str, Any] = scope.setdefault("state", {})
+
+        async def send_with_headers(message: Message) -> None:
+            decision: Optional[Decision] = state.get("rate_limit")
+            if message["type"] == "http.response.start" and decision is not None:
+                headers = list(message.get("headers", []))
+                present = {name.lower() for name, _ in headers}
+                for name, value in decision.headers().items():
+                    if name.lower().encode("latin-1") not in present:
+                        headers.append((name.lower().encode("latin-1"), value.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,35 @@
+"""ASGI middleware exposing per-request timing breakdowns."""
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..utils.timing import RequestTimings, activate_timings, deactivate_timings, log_if_slow
+
+
+class ServerTimingMiddleware:
+    """Collect spans for each HTTP request and report them via ``Server-Timing``."""
+
+    def __init__(self, app: ASGIApp, *, slow_request_ms: float, emit_header: bool = True) -> None:
+        self.app = app
+        self.slow_request_ms = slow_request_ms
+        self.emit_header = emit_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = activate_timings(timings)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.emit_header:
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timings.server_timing_header())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            deactivate_timings(token)
+            log_if_slow(f"{scope['method']} {scope['path']}", timings, self.slow_request_ms)
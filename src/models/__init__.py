@@ -1,16 +1,22 @@
 """Domain models for the Story Bible Service."""
 
 from .auth import AuthenticatedUser
+from .continuity import ContinuityFinding
 from .character import Character, CharacterCreate, CharacterRelationship, CharacterRelationshipCreate
-from .scene import Scene, SceneCreate, SceneUpdate
+from .job import JobCreate
+from .patch import JsonPatchOperation
+from .scene import Scene, SceneCreate, SceneReorder, SceneUpdate
+from .snapshot import SnapshotCreate
 from .story_bible import (
     StoryBible,
+    StoryBibleClone,
     StoryBibleCreate,
     StoryBibleSummary,
     StoryBibleUpdate,
 )
 from .plot_thread import PlotThread, PlotThreadCreate, PlotThreadUpdate
 from .outline import StoryOutline, StoryOutlineCreate
+from .webhook import PayloadWebhookEvent
 
 __all__ = [
     "AuthenticatedUser",
@@ -18,10 +24,17 @@ __all__ = [
     "CharacterCreate",
     "CharacterRelationship",
     "CharacterRelationshipCreate",
+    "ContinuityFinding",
+    "JobCreate",
+    "JsonPatchOperation",
+    "PayloadWebhookEvent",
     "Scene",
     "SceneCreate",
+    "SceneReorder",
     "SceneUpdate",
+    "SnapshotCreate",
     "StoryBible",
+    "StoryBibleClone",
     "StoryBibleCreate",
     "StoryBibleSummary",
     "StoryBibleUpdate",
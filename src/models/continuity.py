@@ -0,0 +1,16 @@
+"""Continuity check result models."""
+
+from typing import Any, Dict, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ContinuityFinding(BaseModel):
+    rule: str = Field(..., description="Identifier of the rule that produced the finding")
+    severity: Literal["error", "warning", "info"] = Field(
+        default="warning", description="Set by the engine from the severity the rule is registered with"
+    )
+    message: str
+    entity_type: Literal["story_bible", "character", "scene", "plot_thread", "relationship"]
+    entity_id: Optional[str] = None
+    details: Dict[str, Any] = Field(default_factory=dict)
@@ -0,0 +1,11 @@
+"""Background job request models."""
+
+from typing import Any, Dict, Literal
+
+from pydantic import BaseModel, Field
+
+
+class JobCreate(BaseModel):
+    kind: Literal["validate_story_consistency", "generate_character_arc", "clone_story_bible"]
+    story_bible_id: str
+    arguments: Dict[str, Any] = Field(default_factory=dict)
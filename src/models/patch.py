@@ -0,0 +1,14 @@
+"""JSON Patch (RFC 6902) request models."""
+
+from typing import Any, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class JsonPatchOperation(BaseModel):
+    op: Literal["add", "remove", "replace", "move", "copy", "test"]
+    path: str
+    value: Optional[Any] = None
+    from_: Optional[str] = Field(None, alias="from")
+
+    model_config = ConfigDict(populate_by_name=True)
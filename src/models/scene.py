@@ -53,6 +53,10 @@ class SceneUpdate(BaseModel):
     plot_threads: Optional[List[str]] = None
 
 
+class SceneReorder(BaseModel):
+    scene_ids: List[str] = Field(..., min_length=1)
+
+
 class Scene(BaseModel):
     id: str
     story_bible: str
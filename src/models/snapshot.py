@@ -0,0 +1,9 @@
+"""Story bible snapshot request models."""
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class SnapshotCreate(BaseModel):
+    label: Optional[str] = Field(default=None, max_length=200)
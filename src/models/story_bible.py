@@ -25,6 +25,11 @@ class StoryBibleUpdate(BaseModel):
     status: Optional[Literal["draft", "in_progress", "completed"]] = None
 
 
+class StoryBibleClone(BaseModel):
+    title: Optional[str] = Field(None, min_length=1, max_length=200, description="Defaults to '<source title> (copy)'")
+    project_id: Optional[str] = Field(None, description="Project of the copy; defaults to the source project")
+
+
 class StoryBibleSummary(BaseModel):
     id: str
     project_id: str
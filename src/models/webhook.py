@@ -0,0 +1,26 @@
+"""PayloadCMS webhook payloads."""
+
+from typing import Any, Dict, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+WebhookCollection = Literal[
+    "story-bibles",
+    "story-bible-characters",
+    "story-bible-scenes",
+    "plot-threads",
+    "character-relationships",
+]
+
+
+class PayloadWebhookEvent(BaseModel):
+    """One afterChange/afterDelete hook call forwarded by the Auto-Movie PayloadCMS app."""
+
+    collection: WebhookCollection
+    operation: Literal["create", "update", "delete"]
+    doc: Dict[str, Any]
+    previous_doc: Optional[Dict[str, Any]] = Field(default=None, alias="previousDoc")
+    event: Optional[Literal["afterChange", "afterDelete"]] = None
+
+    model_config = ConfigDict(extra="allow", populate_by_name=True)
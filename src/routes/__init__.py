@@ -1,5 +1,5 @@
 """API routes for the Story Bible Service."""
 
-from . import api, health, mcp
+from . import api, health, hooks, mcp
 
-__all__ = ["api", "health", "mcp"]
+__all__ = ["api", "health", "hooks", "mcp"]
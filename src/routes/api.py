@@ -1,27 +1,38 @@
 """REST API routes for story bible management."""
 
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional, Union
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
+from ..config import settings
 from ..middleware.auth import get_current_user
 from ..models import (
     AuthenticatedUser,
     CharacterCreate,
+    JobCreate,
+    JsonPatchOperation,
     PlotThreadCreate,
     PlotThreadUpdate,
     SceneCreate,
+    SceneReorder,
     SceneUpdate,
+    SnapshotCreate,
+    StoryBibleClone,
     StoryBibleCreate,
     StoryBibleUpdate,
     StoryOutlineCreate,
 )
 from ..services.story_bible_service import StoryBibleService
+from ..utils.compression import is_compressible, negotiate
 
 
 router = APIRouter()
 
 
+def _patch_operations(operations: List[JsonPatchOperation]) -> List[Dict[str, Any]]:
+    return [operation.model_dump(by_alias=True, exclude_unset=True) for operation in operations]
+
+
 def get_story_service(request: Request) -> StoryBibleService:
     service: Optional[StoryBibleService] = getattr(request.app.state, "story_service", None)
     if service is None:
@@ -47,23 +58,51 @@ async def create_story_bible(
     return await service.create_story_bible(payload, user)
 
 
+def _negotiated_encoding(request: Request, media_type: str) -> Optional[str]:
+    # PDF and DOCX are compressed containers already.
+    if not settings.COMPRESSION_ENABLED or not is_compressible(media_type):
+        return None
+    return negotiate(request.headers.get("accept-encoding"))
+
+
+def _encoded_response(
+    content: bytes,
+    encoding: Optional[str],
+    media_type: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    headers = {**(headers or {}), "Vary": "Accept-Encoding"}
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=content, media_type=media_type, headers=headers)
+
+
 @router.get("/story-bibles/{story_bible_id}")
 async def get_story_bible(
+    request: Request,
     story_bible_id: str,
     populate: bool = True,
     service: StoryBibleService = Depends(get_story_service),
     user: AuthenticatedUser = Depends(get_current_user),
 ):
-    return await service.get_story_bible(story_bible_id, user, populate=populate)
+    content, encoding = await service.story_bible_document(
+        story_bible_id,
+        user,
+        populate=populate,
+        encoding=_negotiated_encoding(request, "application/json"),
+    )
+    return _encoded_response(content, encoding, "application/json")
 
 
 @router.patch("/story-bibles/{story_bible_id}")
 async def update_story_bible(
     story_bible_id: str,
-    payload: StoryBibleUpdate,
+    payload: Union[List[JsonPatchOperation], StoryBibleUpdate],
     service: StoryBibleService = Depends(get_story_service),
     user: AuthenticatedUser = Depends(get_current_user),
 ):
+    if isinstance(payload, list):
+        return await service.patch_story_bible(story_bible_id, _patch_operations(payload), user)
     return await service.update_story_bible(story_bible_id, payload, user)
 
 
@@ -77,6 +116,17 @@ async def delete_story_bible(
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
+@router.post("/story-bibles/{story_bible_id}/clone", status_code=status.HTTP_201_CREATED)
+async def clone_story_bible(
+    story_bible_id: str,
+    payload: Optional[StoryBibleClone] = None,
+    service: StoryBibleService = Depends(get_story_service),
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    payload = payload or StoryBibleClone.model_validate({})
+    return await service.clone_story_bible(story_bible_id, user, title=payload.title, project_id=payload.project_id)
+
+
 @router.post("/story-bibles/{story_bible_id}/characters", status_code=status.HTTP_201_CREATED)
 async def add_character(
     story_bible_id: str,
@@ -99,6 +149,53 @@ async def update_character(
     return await service.update_character(story_bible_id, character_id, payload, user)
 
 
+@router.get("/story-bibles/{story_bible_id}/characters/{character_id}/neighbors")
+async def get_character_neighbors(
+    story_bible_id: str,
+    character_id: str,
+    service: StoryBibleService = Depends(get_story_service),
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    return await service.get_character_neighbors(story_bible_id, character_id, user)
+
+
+@router.get("/story-bibles/{story_bible_id}/relationships/path")
+async def find_relationship_path(
+    story_bible_id: str,
+    source: str,
+    target: str,
+    service: StoryBibleService = Depends(get_story_service),
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    return await service.find_relationship_path(story_bible_id, source, target, user)
+
+
+@router.get("/story-bibles/{story_bible_id}/relationships/strongest")
+async def get_strongest_relationships(
+    story_bible_id: str,
+    limit: int = Query(default=10, ge=1, le=500),
+    character_id: Optional[str] = None,
+    service: StoryBibleService = Depends(get_story_service),
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    return await service.get_strongest_relationships(
+        story_bible_id,
+        user,
+        limit=limit,
+        character_id=character_id,
+    )
+
+
+@router.get("/story-bibles/{story_bible_id}/relationships/clusters")
+async def get_character_clusters(
+    story_bible_id: str,
+    min_strength: int = Query(default=0, ge=0, le=10),
+    service: StoryBibleService = Depends(get_story_service),
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    return await service.get_character_clusters(story_bible_id, user, min_strength=min_strength)
+
+
 @router.post("/story-bibles/{story_bible_id}/scenes", status_code=status.HTTP_201_CREATED)
 async def add_scene(
     story_bible_id: str,
@@ -110,14 +207,26 @@ async def add_scene(
     return await service.add_scene(updated, user)
 
 
+@router.post("/story-bibles/{story_bible_id}/scenes/reorder")
+async def reorder_scenes(
+    story_bible_id: str,
+    payload: SceneReorder,
+    service: StoryBibleService = Depends(get_story_service),
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    return await service.reorder_scenes(story_bible_id, payload.scene_ids, user)
+
+
 @router.patch("/story-bibles/{story_bible_id}/scenes/{scene_id}")
 async def update_scene(
     story_bible_id: str,
     scene_id: str,
-    payload: SceneUpdate,
+    payload: Union[List[JsonPatchOperation], SceneUpdate],
     service: StoryBibleService = Depends(get_story_service),
     user: AuthenticatedUser = Depends(get_current_user),
 ):
+    if isinstance(payload, list):
+        return await service.patch_scene(story_bible_id, scene_id, _patch_operations(payload), user)
     return await service.update_scene(story_bible_id, scene_id, payload, user)
 
 
@@ -136,10 +245,12 @@ async def create_plot_thread(
 async def update_plot_thread(
     story_bible_id: str,
     thread_id: str,
-    payload: PlotThreadUpdate,
+    payload: Union[List[JsonPatchOperation], PlotThreadUpdate],
     service: StoryBibleService = Depends(get_story_service),
     user: AuthenticatedUser = Depends(get_current_user),
 ):
+    if isinstance(payload, list):
+        return await service.patch_plot_thread(story_bible_id, thread_id, _patch_operations(payload), user)
     return await service.update_plot_thread(story_bible_id, thread_id, payload, user)
 
 
@@ -157,10 +268,11 @@ async def create_outline(
 @router.post("/story-bibles/{story_bible_id}/consistency")
 async def validate_consistency(
     story_bible_id: str,
+    fast: bool = False,
     service: StoryBibleService = Depends(get_story_service),
     user: AuthenticatedUser = Depends(get_current_user),
 ):
-    return await service.validate_story_consistency(story_bible_id, user)
+    return await service.validate_story_consistency(story_bible_id, user, fast=fast)
 
 
 @router.post("/story-bibles/{story_bible_id}/characters/{character_id}/arc")
@@ -183,35 +295,176 @@ async def generate_character_arc(
 async def suggest_scene_transitions(
     story_bible_id: str,
     scene_id: str,
+    window: Optional[int] = Query(default=None, ge=0, le=50),
     service: StoryBibleService = Depends(get_story_service),
     user: AuthenticatedUser = Depends(get_current_user),
 ):
-    return await service.suggest_scene_transitions(story_bible_id, scene_id, user)
+    return await service.suggest_scene_transitions(story_bible_id, scene_id, user, window=window)
+
+
+@router.get("/story-bibles/{story_bible_id}/similar")
+async def find_similar(
+    story_bible_id: str,
+    query: Optional[str] = None,
+    entity_id: Optional[str] = None,
+    kind: Optional[str] = Query(default=None, pattern="^(scene|character)$"),
+    limit: int = Query(default=10, ge=1, le=100),
+    service: StoryBibleService = Depends(get_story_service),
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    return await service.find_similar(
+        story_bible_id,
+        user,
+        query=query,
+        entity_id=entity_id,
+        kind=kind,
+        limit=limit,
+    )
+
+
+@router.get("/story-bibles/{story_bible_id}/changes")
+async def get_story_bible_changes(
+    story_bible_id: str,
+    since: Optional[int] = Query(default=None, ge=0),
+    service: StoryBibleService = Depends(get_story_service),
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    """Changes since a version, or a full snapshot.
+
+    Versions are issued per worker process: one issued by another worker or
+    before a restart is answered with a snapshot (``"snapshot": true``).
+    """
+    return await service.get_changes(story_bible_id, user, since=since)
+
+
+@router.get("/story-bibles/{story_bible_id}/search")
+async def search_story_bible(
+    story_bible_id: str,
+    q: str = Query(..., min_length=1),
+    fields: Optional[List[str]] = Query(default=None),
+    limit: int = Query(default=10, ge=1, le=100),
+    service: StoryBibleService = Depends(get_story_service),
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    return await service.search_story_bible(story_bible_id, user, query=q, fields=fields, limit=limit)
+
+
+def _export_media_type(export_format: str) -> str:
+    return {
+        "markdown": "text/markdown",
+        "json": "application/json",
+        "pdf": "application/pdf",
+        "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    }.get(export_format.lower(), "application/octet-stream")
 
 
 @router.get("/story-bibles/{story_bible_id}/export")
 async def export_story_bible(
+    request: Request,
     story_bible_id: str,
     format: str = "markdown",
     sections: Optional[List[str]] = Query(default=None),
     service: StoryBibleService = Depends(get_story_service),
     user: AuthenticatedUser = Depends(get_current_user),
 ):
-    content = await service.generate_export(
+    media_type = _export_media_type(format)
+    content, encoding = await service.export_artifact(
         story_bible_id,
         user,
         export_format=format,
         sections=sections,
+        encoding=_negotiated_encoding(request, media_type),
     )
-    media_type = {
-        "markdown": "text/markdown",
-        "json": "application/json",
-        "pdf": "application/pdf",
-        "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-    }.get(format.lower(), "application/octet-stream")
     filename = f"story-bible-{story_bible_id}.{format.lower()}"
     headers = {"Content-Disposition": f"attachment; filename={filename}"}
-    return Response(content=content, media_type=media_type, headers=headers)
+    return _encoded_response(content, encoding, media_type, headers)
+
+
+@router.post("/story-bibles/{story_bible_id}/snapshots", status_code=status.HTTP_201_CREATED)
+async def create_snapshot(
+    story_bible_id: str,
+    payload: Optional[SnapshotCreate] = None,
+    service: StoryBibleService = Depends(get_story_service),
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    label = payload.label if payload is not None else None
+    return await service.create_snapshot(story_bible_id, user, label=label)
+
+
+@router.get("/story-bibles/{story_bible_id}/snapshots")
+async def list_snapshots(
+    story_bible_id: str,
+    service: StoryBibleService = Depends(get_story_service),
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    return await service.list_snapshots(story_bible_id, user)
+
+
+@router.get("/story-bibles/{story_bible_id}/snapshots/{snapshot_id}")
+async def get_snapshot(
+    story_bible_id: str,
+    snapshot_id: str,
+    service: StoryBibleService = Depends(get_story_service),
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    return await service.get_snapshot(story_bible_id, snapshot_id, user)
+
+
+@router.get("/story-bibles/{story_bible_id}/snapshots/{snapshot_id}/export")
+async def export_snapshot(
+    request: Request,
+    story_bible_id: str,
+    snapshot_id: str,
+    format: str = "markdown",
+    sections: Optional[List[str]] = Query(default=None),
+    service: StoryBibleService = Depends(get_story_service),
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    media_type = _export_media_type(format)
+    content, encoding = await service.export_snapshot(
+        story_bible_id,
+        snapshot_id,
+        user,
+        export_format=format,
+        sections=sections,
+        encoding=_negotiated_encoding(request, media_type),
+    )
+    filename = f"story-bible-{story_bible_id}-{snapshot_id[:12]}.{format.lower()}"
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    return _encoded_response(content, encoding, media_type, headers)
+
+
+@router.get("/story-bibles/{story_bible_id}/diff")
+async def diff_story_bible(
+    request: Request,
+    story_bible_id: str,
+    base: str = Query(..., alias="from", min_length=1),
+    target: str = Query(default="current", alias="to", min_length=1),
+    format: Literal["json", "markdown"] = "json",
+    service: StoryBibleService = Depends(get_story_service),
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    media_type = _export_media_type(format)
+    content, encoding = await service.diff_document(
+        story_bible_id,
+        user,
+        base=base,
+        target=target,
+        diff_format=format,
+        encoding=_negotiated_encoding(request, media_type),
+    )
+    return _encoded_response(content, encoding, media_type)
+
+
+@router.delete("/story-bibles/{story_bible_id}/snapshots/{snapshot_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_snapshot(
+    story_bible_id: str,
+    snapshot_id: str,
+    service: StoryBibleService = Depends(get_story_service),
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    await service.delete_snapshot(story_bible_id, snapshot_id, user)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.post("/story-bibles/{story_bible_id}/changes")
@@ -222,3 +475,21 @@ async def track_story_bible_change(
     user: AuthenticatedUser = Depends(get_current_user),
 ):
     return await service.track_change(story_bible_id, user, changes)
+
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(
+    payload: JobCreate,
+    service: StoryBibleService = Depends(get_story_service),
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    return await service.submit_job(payload.kind, payload.story_bible_id, user, payload.arguments)
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(
+    job_id: str,
+    service: StoryBibleService = Depends(get_story_service),
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    return await service.get_job(job_id, user)
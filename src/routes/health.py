@@ -2,7 +2,8 @@
 
 import time
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
 
 router = APIRouter()
 
@@ -13,5 +14,23 @@ async def live() -> dict:
 
 
 @router.get("/ready")
-async def ready() -> dict:
-    return {"status": "ready", "timestamp": int(time.time())}
+async def ready(request: Request):
+    """Last dependency probe results; 503 until every required dependency is reachable."""
+    monitor = getattr(request.app.state, "readiness", None)
+    if monitor is None:
+        return {"status": "ready", "timestamp": int(time.time())}
+    body = {**monitor.snapshot(), "timestamp": int(time.time())}
+    startup = getattr(request.app.state, "startup", None)
+    if startup is not None:
+        body["startup"] = startup
+    return JSONResponse(status_code=200 if monitor.ready else 503, content=body)
+
+
+@router.get("/brain-scheduler")
+async def brain_scheduler(request: Request) -> dict:
+    """Brain Service admission control totals: in-flight calls, queue depth by priority and wait times.
+
+    This route is unauthenticated, so it never names projects.
+    """
+    scheduler = getattr(request.app.state, "brain_scheduler", None)
+    return scheduler.summary() if scheduler is not None else {"enabled": False}
@@ -0,0 +1,64 @@
+"""Inbound webhooks from the Auto-Movie PayloadCMS app."""
+
+import hmac
+from typing import List, Optional, Union
+
+from fastapi import APIRouter, Header, HTTPException, Request, status
+
+from ..config import settings
+from ..models import PayloadWebhookEvent
+from ..services.payload_events import PayloadEventDebouncer
+from ..utils.references import ref_id
+
+
+router = APIRouter()
+
+WEBHOOK_SECRET_HEADER = "X-Payload-Webhook-Secret"
+
+_OPERATIONS = {"create": "created", "update": "updated", "delete": "deleted"}
+
+
+def _verify_secret(secret: Optional[str], authorization: Optional[str]) -> None:
+    expected = settings.PAYLOAD_WEBHOOK_SECRET
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Webhook receiver is disabled")
+    presented = secret
+    if presented is None and authorization and authorization.startswith("Bearer "):
+        presented = authorization.removeprefix("Bearer ").strip()
+    if not presented or not hmac.compare_digest(presented.encode(), expected.encode()):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid webhook secret")
+
+
+def _story_bible_of(event: PayloadWebhookEvent) -> Optional[str]:
+    if event.collection == "story-bibles":
+        return ref_id(event.doc.get("id"))
+    return ref_id(event.doc.get("story_bible")) or ref_id((event.previous_doc or {}).get("story_bible"))
+
+
+@router.post("/payload", status_code=status.HTTP_202_ACCEPTED)
+async def payload_webhook(
+    request: Request,
+    body: Union[PayloadWebhookEvent, List[PayloadWebhookEvent]],
+    x_payload_webhook_secret: Optional[str] = Header(default=None),
+    authorization: Optional[str] = Header(default=None),
+):
+    _verify_secret(x_payload_webhook_secret, authorization)
+    debouncer: PayloadEventDebouncer = request.app.state.payload_events
+    events = body if isinstance(body, list) else [body]
+    accepted, ignored = 0, 0
+    for event in events:
+        story_bible_id = _story_bible_of(event)
+        if not story_bible_id or not event.doc.get("id"):
+            ignored += 1
+            continue
+        debouncer.submit(
+            story_bible_id,
+            {
+                "collection": event.collection,
+                "operation": _OPERATIONS[event.operation],
+                "doc": event.doc,
+                "previous_doc": event.previous_doc,
+            },
+        )
+        accepted += 1
+    return {"accepted": accepted, "ignored": ignored, "pending": debouncer.pending}
@@ -1,32 +1,49 @@
 """MCP WebSocket endpoint."""
 
+import asyncio
 import base64
+import json
 import logging
-from typing import Any, Dict
+import math
+from collections.abc import Awaitable, Callable, Coroutine
+from typing import Any, Dict, List, Optional, Set
 
 from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
 
+from ..config import settings
 from ..middleware.auth import verify_bearer_token
+from ..middleware.deadline import parse_timeout_ms
 from ..models import (
     CharacterCreate,
+    JobCreate,
     PlotThreadCreate,
     PlotThreadUpdate,
     SceneCreate,
+    SceneReorder,
     SceneUpdate,
+    SnapshotCreate,
+    StoryBibleClone,
     StoryBibleCreate,
     StoryBibleUpdate,
     StoryOutlineCreate,
 )
+from ..services.change_feed import Subscription
+from ..services.rate_limit import RateLimiter, classify_tool
 from ..services.story_bible_service import StoryBibleService
+from ..utils.deadlines import deadline_scope
 from ..utils.exceptions import ServiceError
+from ..utils.timing import RequestTimings, activate_timings, deactivate_timings, log_if_slow
 from ..utils.validation import ensure_project_access
-from ..mcp.protocol import build_error_response, build_success_response
+from ..mcp.protocol import build_error_response, build_notification, build_success_response
 from ..mcp.tool_registry import ToolRegistry
 
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Messages read ahead of the one being handled before the reader applies backpressure.
+_INBOX_SIZE = 32
+
 
 def _get_service(websocket: WebSocket) -> StoryBibleService:
     service = getattr(websocket.app.state, "story_service", None)
@@ -35,7 +52,24 @@ def _get_service(websocket: WebSocket) -> StoryBibleService:
     return service
 
 
-def _register_tools(service: StoryBibleService, user) -> ToolRegistry:
+def _patch_argument(arguments: Dict[str, Any]) -> List[Dict[str, Any]]:
+    operations = arguments.get("patch")
+    if not isinstance(operations, list):
+        raise ServiceError("patch must be a list of JSON Patch operations")
+    return operations
+
+
+Push = Callable[[str, Dict[str, Any]], Awaitable[None]]
+Spawn = Callable[[Coroutine[Any, Any, None]], None]
+
+
+def _register_tools(
+    service: StoryBibleService,
+    user,
+    *,
+    push: Optional[Push] = None,
+    spawn: Optional[Spawn] = None,
+) -> ToolRegistry:
     registry = ToolRegistry()
 
     async def wrap_story_bible_create(arguments: Dict[str, Any]) -> Dict[str, Any]:
@@ -46,6 +80,8 @@ def _register_tools(service: StoryBibleService, user) -> ToolRegistry:
         story_bible_id = arguments.get("story_bible_id")
         if not story_bible_id:
             raise ServiceError("story_bible_id is required")
+        if "patch" in arguments:
+            return await service.patch_story_bible(story_bible_id, _patch_argument(arguments), user)
         payload = StoryBibleUpdate.model_validate(arguments.get("data", {}))
         return await service.update_story_bible(story_bible_id, payload, user)
 
@@ -72,9 +108,18 @@ def _register_tools(service: StoryBibleService, user) -> ToolRegistry:
         scene_id = arguments.get("scene_id")
         if not story_bible_id or not scene_id:
             raise ServiceError("story_bible_id and scene_id are required")
+        if "patch" in arguments:
+            return await service.patch_scene(story_bible_id, scene_id, _patch_argument(arguments), user)
         payload = SceneUpdate.model_validate(arguments.get("data", {}))
         return await service.update_scene(story_bible_id, scene_id, payload, user)
 
+    async def wrap_reorder_scenes(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        story_bible_id = arguments.get("story_bible_id")
+        if not story_bible_id:
+            raise ServiceError("story_bible_id is required")
+        payload = SceneReorder.model_validate(arguments)
+        return await service.reorder_scenes(story_bible_id, payload.scene_ids, user)
+
     async def wrap_plot_thread(arguments: Dict[str, Any]) -> Dict[str, Any]:
         payload = PlotThreadCreate.model_validate(arguments)
         return await service.create_plot_thread(payload, user)
@@ -84,6 +129,8 @@ def _register_tools(service: StoryBibleService, user) -> ToolRegistry:
         thread_id = arguments.get("thread_id")
         if not story_bible_id or not thread_id:
             raise ServiceError("story_bible_id and thread_id are required")
+        if "patch" in arguments:
+            return await service.patch_plot_thread(story_bible_id, thread_id, _patch_argument(arguments), user)
         payload = PlotThreadUpdate.model_validate(arguments.get("data", {}))
         return await service.update_plot_thread(story_bible_id, thread_id, payload, user)
 
@@ -95,7 +142,11 @@ def _register_tools(service: StoryBibleService, user) -> ToolRegistry:
         story_bible_id = arguments.get("story_bible_id")
         if not story_bible_id:
             raise ServiceError("story_bible_id is required")
-        return await service.validate_story_consistency(story_bible_id, user)
+        return await service.validate_story_consistency(
+            story_bible_id,
+            user,
+            fast=bool(arguments.get("fast", False)),
+        )
 
     async def wrap_character_arc(arguments: Dict[str, Any]) -> Dict[str, Any]:
         story_bible_id = arguments.get("story_bible_id")
@@ -114,7 +165,104 @@ def _register_tools(service: StoryBibleService, user) -> ToolRegistry:
         scene_id = arguments.get("scene_id")
         if not story_bible_id or not scene_id:
             raise ServiceError("story_bible_id and scene_id are required")
-        return await service.suggest_scene_transitions(story_bible_id, scene_id, user)
+        window = arguments.get("window")
+        return await service.suggest_scene_transitions(
+            story_bible_id,
+            scene_id,
+            user,
+            window=int(window) if window is not None else None,
+        )
+
+    async def wrap_character_neighbors(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        story_bible_id = arguments.get("story_bible_id")
+        character_id = arguments.get("character_id")
+        if not story_bible_id or not character_id:
+            raise ServiceError("story_bible_id and character_id are required")
+        return await service.get_character_neighbors(story_bible_id, character_id, user)
+
+    async def wrap_relationship_path(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        story_bible_id = arguments.get("story_bible_id")
+        source = arguments.get("source")
+        target = arguments.get("target")
+        if not story_bible_id or not source or not target:
+            raise ServiceError("story_bible_id, source and target are required")
+        return await service.find_relationship_path(story_bible_id, source, target, user)
+
+    async def wrap_strongest_relationships(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        story_bible_id = arguments.get("story_bible_id")
+        if not story_bible_id:
+            raise ServiceError("story_bible_id is required")
+        return await service.get_strongest_relationships(
+            story_bible_id,
+            user,
+            limit=int(arguments.get("limit", 10)),
+            character_id=arguments.get("character_id"),
+        )
+
+    async def wrap_character_clusters(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        story_bible_id = arguments.get("story_bible_id")
+        if not story_bible_id:
+            raise ServiceError("story_bible_id is required")
+        return await service.get_character_clusters(
+            story_bible_id,
+            user,
+            min_strength=int(arguments.get("min_strength", 0)),
+        )
+
+    async def wrap_find_similar(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        story_bible_id = arguments.get("story_bible_id")
+        if not story_bible_id:
+            raise ServiceError("story_bible_id is required")
+        return await service.find_similar(
+            story_bible_id,
+            user,
+            query=arguments.get("query"),
+            entity_id=arguments.get("entity_id"),
+            kind=arguments.get("kind"),
+            limit=int(arguments.get("limit", 10)),
+        )
+
+    async def wrap_changes(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Changes since a version, or a full snapshot when the version was issued by another worker or is too old."""
+        story_bible_id = arguments.get("story_bible_id")
+        if not story_bible_id:
+            raise ServiceError("story_bible_id is required")
+        since = arguments.get("since")
+        return await service.get_changes(story_bible_id, user, since=int(since) if since is not None else None)
+
+    async def wrap_submit_job(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        payload = JobCreate.model_validate(arguments)
+        job = await service.submit_job(payload.kind, payload.story_bible_id, user, payload.arguments)
+        if arguments.get("notify", True) and push is not None and spawn is not None:
+            if job["status"] in ("queued", "running"):
+
+                async def deliver() -> None:
+                    finished = await service.wait_for_job(job["job_id"], user)
+                    try:
+                        await push("notifications/job_completed", finished)
+                    except (WebSocketDisconnect, RuntimeError):
+                        logger.debug("MCP client gone before job %s completed", job["job_id"])
+
+                spawn(deliver())
+        return job
+
+    async def wrap_get_job(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        job_id = arguments.get("job_id")
+        if not job_id:
+            raise ServiceError("job_id is required")
+        return await service.get_job(job_id, user)
+
+    async def wrap_search(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        story_bible_id = arguments.get("story_bible_id")
+        if not story_bible_id:
+            raise ServiceError("story_bible_id is required")
+        return await service.search_story_bible(
+            story_bible_id,
+            user,
+            query=arguments.get("query", ""),
+            fields=arguments.get("fields"),
+            limit=int(arguments.get("limit", 10)),
+        )
 
     async def wrap_export(arguments: Dict[str, Any]) -> Dict[str, Any]:
         story_bible_id = arguments.get("story_bible_id")
@@ -132,12 +280,84 @@ def _register_tools(service: StoryBibleService, user) -> ToolRegistry:
             "content_b64": base64.b64encode(data).decode("utf-8"),
         }
 
+    async def wrap_create_snapshot(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        story_bible_id = arguments.get("story_bible_id")
+        if not story_bible_id:
+            raise ServiceError("story_bible_id is required")
+        payload = SnapshotCreate.model_validate(arguments)
+        return await service.create_snapshot(story_bible_id, user, label=payload.label)
+
+    async def wrap_list_snapshots(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        story_bible_id = arguments.get("story_bible_id")
+        if not story_bible_id:
+            raise ServiceError("story_bible_id is required")
+        return await service.list_snapshots(story_bible_id, user)
+
+    async def wrap_get_snapshot(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        story_bible_id = arguments.get("story_bible_id")
+        snapshot_id = arguments.get("snapshot_id")
+        if not story_bible_id or not snapshot_id:
+            raise ServiceError("story_bible_id and snapshot_id are required")
+        return await service.get_snapshot(story_bible_id, snapshot_id, user)
+
+    async def wrap_export_snapshot(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        story_bible_id = arguments.get("story_bible_id")
+        snapshot_id = arguments.get("snapshot_id")
+        if not story_bible_id or not snapshot_id:
+            raise ServiceError("story_bible_id and snapshot_id are required")
+        export_format = arguments.get("format", "markdown")
+        data, _ = await service.export_snapshot(
+            story_bible_id,
+            snapshot_id,
+            user,
+            export_format=export_format,
+            sections=arguments.get("sections"),
+        )
+        return {
+            "story_bible_id": story_bible_id,
+            "snapshot_id": snapshot_id,
+            "format": export_format,
+            "content_b64": base64.b64encode(data).decode("utf-8"),
+        }
+
+    async def wrap_diff(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        story_bible_id = arguments.get("story_bible_id")
+        base = arguments.get("from")
+        if not story_bible_id or not base:
+            raise ServiceError("story_bible_id and from are required")
+        target = arguments.get("to") or "current"
+        if arguments.get("format", "json") == "markdown":
+            content, _ = await service.diff_document(
+                story_bible_id, user, base=base, target=target, diff_format="markdown"
+            )
+            return {"story_bible_id": story_bible_id, "format": "markdown", "content": content.decode("utf-8")}
+        return await service.diff_story_bible(story_bible_id, user, base=base, target=target)
+
+    async def wrap_clone(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        story_bible_id = arguments.get("story_bible_id")
+        if not story_bible_id:
+            raise ServiceError("story_bible_id is required")
+        payload = StoryBibleClone.model_validate(arguments)
+
+        async def report(event: Dict[str, Any]) -> None:
+            if push is not None:
+                await push("notifications/clone_progress", event)
+
+        return await service.clone_story_bible(
+            story_bible_id,
+            user,
+            title=payload.title,
+            project_id=payload.project_id,
+            progress=report if arguments.get("notify", True) else None,
+        )
+
     registry.register("create_story_bible", wrap_story_bible_create)
     registry.register("update_story_bible", wrap_story_bible_update)
     registry.register("get_story_bible", wrap_get)
     registry.register("add_character", wrap_character)
     registry.register("add_scene", wrap_scene)
     registry.register("update_scene", wrap_scene_update)
+    registry.register("reorder_scenes", wrap_reorder_scenes)
     registry.register("create_plot_thread", wrap_plot_thread)
     registry.register("update_plot_thread", wrap_plot_thread_update)
     registry.register("create_story_outline", wrap_outline)
@@ -145,55 +365,219 @@ def _register_tools(service: StoryBibleService, user) -> ToolRegistry:
     registry.register("generate_character_arc", wrap_character_arc)
     registry.register("suggest_scene_transitions", wrap_scene_transitions)
     registry.register("generate_story_bible_export", wrap_export)
+    registry.register("get_character_neighbors", wrap_character_neighbors)
+    registry.register("find_relationship_path", wrap_relationship_path)
+    registry.register("get_strongest_relationships", wrap_strongest_relationships)
+    registry.register("get_character_clusters", wrap_character_clusters)
+    registry.register("find_similar", wrap_find_similar)
+    registry.register("search_story_bible", wrap_search)
+    registry.register("get_story_bible_changes", wrap_changes)
+    registry.register("submit_job", wrap_submit_job)
+    registry.register("get_job", wrap_get_job)
+    registry.register("create_snapshot", wrap_create_snapshot)
+    registry.register("list_snapshots", wrap_list_snapshots)
+    registry.register("get_snapshot", wrap_get_snapshot)
+    registry.register("export_snapshot", wrap_export_snapshot)
+    registry.register("diff_story_bible", wrap_diff)
+    registry.register("clone_story_bible", wrap_clone)
 
     return registry
 
 
+async def _pump_changes(subscription: Subscription, send) -> None:
+    try:
+        while True:
+            event = await subscription.get()
+            await send(build_notification("notifications/story_bible_changed", event))
+    except (WebSocketDisconnect, RuntimeError):
+        logger.debug("MCP change stream closed")
+
+
 @router.websocket("/ws")
 async def mcp_websocket(websocket: WebSocket):
     await websocket.accept()
+    # The handshake gets its own collector so the auth span is recorded like on REST requests.
+    handshake = RequestTimings()
+    token = activate_timings(handshake)
     try:
         auth_header = websocket.headers.get("Authorization")
         user = await verify_bearer_token(authorization=auth_header)
     except HTTPException as exc:
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         raise exc
+    finally:
+        deactivate_timings(token)
+        log_if_slow("MCP handshake", handshake, settings.SLOW_REQUEST_THRESHOLD_MS)
 
     service = _get_service(websocket)
-    registry = _register_tools(service, user)
-
-    try:
-        while True:
-            message = await websocket.receive_json()
-            method = message.get("method")
-            request_id = message.get("id")
-            params = message.get("params", {})
-
-            if method == "list_tools":
-                await websocket.send_json(
-                    build_success_response(request_id, {"tools": registry.list_tools()})
-                )
-                continue
-
-            if method != "call_tool":
-                await websocket.send_json(
-                    build_error_response(request_id, f"Unsupported method {method}"),
+    # Responses and notifications are written from different tasks.
+    send_lock = asyncio.Lock()
+    subscription = service.changes.open()
+    pump = None
+    background: Set[asyncio.Task] = set()
+
+    async def send(message: Dict[str, Any]) -> None:
+        async with send_lock:
+            await websocket.send_json(message)
+
+    async def push(method: str, params: Dict[str, Any]) -> None:
+        await send(build_notification(method, params))
+
+    def spawn(coroutine: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(coroutine)
+        background.add(task)
+        task.add_done_callback(background.discard)
+
+    registry = _register_tools(service, user, push=push, spawn=spawn)
+    limiter: Optional[RateLimiter] = getattr(websocket.app.state, "rate_limiter", None)
+
+    async def throttled(request_id: Any, tool_name: str, arguments: Dict[str, Any]) -> bool:
+        """Charge the call to the rate limiter; answers with an error and returns True if it is over."""
+        if limiter is None:
+            return False
+        project_id = arguments.get("project_id")
+        if not project_id and arguments.get("story_bible_id"):
+            project_id = service.cached_project_id(arguments["story_bible_id"])
+        decision = await limiter.check(classify_tool(str(tool_name)), user.id, project_id)
+        if decision is None or decision.allowed:
+            return False
+        await send(
+            build_error_response(
+                request_id,
+                f"Rate limit exceeded for {decision.category} requests",
+                {
+                    "code": 429,
+                    "category": decision.category,
+                    "retry_after": math.ceil(decision.retry_after),
+                    "limit": decision.limit,
+                },
+            )
+        )
+        return True
+
+    async def handle(message: Any) -> None:
+        nonlocal pump
+        if not isinstance(message, dict):
+            await send(build_error_response(None, "Messages must be JSON objects"))
+            return
+        method = message.get("method")
+        request_id = message.get("id")
+        params = message.get("params", {})
+        if not isinstance(params, dict):
+            await send(build_error_response(request_id, "params must be an object"))
+            return
+
+        if method == "list_tools":
+            await send(build_success_response(request_id, {"tools": registry.list_tools()}))
+            return
+
+        if method in ("subscribe", "unsubscribe"):
+            story_bible_id = params.get("story_bible_id")
+            if not story_bible_id:
+                await send(build_error_response(request_id, "story_bible_id is required"))
+                return
+            if method == "subscribe":
+                try:
+                    await service.get_story_bible(story_bible_id, user, populate=False)
+                except Exception as exc:  # noqa: BLE001
+                    await send(build_error_response(request_id, str(exc)))
+                    return
+                service.changes.subscribe(subscription, story_bible_id)
+                if pump is None:
+                    pump = asyncio.create_task(_pump_changes(subscription, send))
+            else:
+                service.changes.unsubscribe(subscription, [story_bible_id])
+            await send(
+                build_success_response(
+                    request_id, {"subscriptions": sorted(subscription.story_bible_ids)}
                 )
-                continue
-
-            tool_name = params.get("name")
-            arguments: Dict[str, Any] = params.get("arguments", {})
-            try:
-                handler = registry.get(tool_name)
+            )
+            return
+
+        if method != "call_tool":
+            await send(build_error_response(request_id, f"Unsupported method {method}"))
+            return
+
+        tool_name = params.get("name")
+        arguments = params.get("arguments", {})
+        if not isinstance(tool_name, str) or not isinstance(arguments, dict):
+            await send(build_error_response(request_id, "call_tool needs a tool name and an arguments object"))
+            return
+        if await throttled(request_id, tool_name, arguments):
+            return
+        timings = RequestTimings()
+        token = activate_timings(timings)
+        try:
+            handler = registry.get(tool_name)
+            timeout = parse_timeout_ms(params.get("deadline_ms"), settings.DEFAULT_REQUEST_TIMEOUT_MS)
+            with deadline_scope(timeout):
                 result = await handler(arguments)
-                await websocket.send_json(build_success_response(request_id, result))
-            except KeyError:
-                await websocket.send_json(build_error_response(request_id, f"Unknown tool {tool_name}"))
-            except ServiceError as exc:
-                await websocket.send_json(build_error_response(request_id, str(exc)))
+            if params.get("timing") and isinstance(result, dict):
+                result = {**result, "_timing": timings.as_dict()}
+            await send(build_success_response(request_id, result))
+        except KeyError:
+            await send(build_error_response(request_id, f"Unknown tool {tool_name}"))
+        except ServiceError as exc:
+            await send(build_error_response(request_id, str(exc)))
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Unhandled MCP tool error")
+            await send(build_error_response(request_id, str(exc)))
+        finally:
+            deactivate_timings(token)
+            log_if_slow(f"MCP {tool_name}", timings, settings.SLOW_REQUEST_THRESHOLD_MS)
+
+    async def process() -> None:
+        # Messages are handled in order on this task so that a disconnect,
+        # noticed by the reader below, can cancel the call in flight.
+        while True:
+            message = await inbox.get()
+            try:
+                await handle(message)
+            except (WebSocketDisconnect, RuntimeError):
+                return
             except Exception as exc:  # noqa: BLE001
-                logger.exception("Unhandled MCP tool error")
-                await websocket.send_json(build_error_response(request_id, str(exc)))
+                logger.exception("Unhandled MCP message error")
+                request_id = message.get("id") if isinstance(message, dict) else None
+                try:
+                    await send(build_error_response(request_id, str(exc)))
+                except (WebSocketDisconnect, RuntimeError):
+                    return
+
+    async def read() -> None:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                message = json.loads(text)
+            except ValueError as exc:
+                # A frame that is not JSON has no id to answer to; report it and keep reading.
+                await send(build_error_response(None, f"Parse error: {exc}"))
+                continue
+            await inbox.put(message)
 
-    except WebSocketDisconnect:
-        logger.debug("MCP client disconnected")
+    inbox: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=_INBOX_SIZE)
+    processor = asyncio.create_task(process())
+    reader = asyncio.create_task(read())
+    try:
+        await asyncio.wait({reader, processor}, return_when=asyncio.FIRST_COMPLETED)
+        if reader.done():
+            error = reader.exception()
+            if isinstance(error, WebSocketDisconnect):
+                logger.debug("MCP client disconnected")
+            elif error is not None:
+                raise error
+        else:
+            # The processor only stops once the socket cannot be written to; do not leave the reader
+            # filling an inbox nobody drains.
+            logger.warning("MCP message processor stopped, closing the socket")
+            try:
+                await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+            except RuntimeError:
+                pass
+    finally:
+        subscription.close()
+        if pump is not None:
+            pump.cancel()
+        reader.cancel()
+        processor.cancel()
+        for task in list(background):
+            task.cancel()
@@ -1,13 +1,22 @@
 """Service layer modules for the Story Bible Service."""
 
 from .brain_client import BrainServiceClient
+from .brain_scheduler import BrainScheduler
+from .change_feed import ChangeBroker, ChangeLog
 from .export_service import ExportService
+from .jobs import JobQueue
 from .payload_service import PayloadCMSService
+from .readiness import ReadinessMonitor
 from .story_bible_service import StoryBibleService
 
 __all__ = [
+    "BrainScheduler",
     "BrainServiceClient",
+    "ChangeBroker",
+    "ChangeLog",
     "ExportService",
+    "JobQueue",
     "PayloadCMSService",
+    "ReadinessMonitor",
     "StoryBibleService",
 ]
@@ -1,6 +1,7 @@
 """Client wrapper for interacting with the MCP Brain Service."""
 
 import asyncio
+import contextvars
 import json
 import logging
 import uuid
@@ -9,14 +10,24 @@ from typing import Any, Dict, Optional
 import httpx
 import websockets
 
-from ..utils.exceptions import BrainServiceException
+from ..utils.deadlines import check_deadline, clamp_timeout, remaining
+from ..utils.exceptions import BrainServiceException, DeadlineExceeded
+from ..utils.timing import span
+from .brain_scheduler import BrainScheduler
 
 
 logger = logging.getLogger(__name__)
 
 
 class BrainServiceClient:
-    def __init__(self, base_url: str, ws_url: str, timeout: float) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        ws_url: str,
+        timeout: float,
+        *,
+        scheduler: Optional[BrainScheduler] = None,
+    ) -> None:
         self._base_url = base_url.rstrip("/")
         self._ws_url = ws_url
         self._timeout = timeout
@@ -26,6 +37,14 @@ class BrainServiceClient:
         )
         self._ws: Optional[websockets.WebSocketClientProtocol] = None
         self._ws_lock = asyncio.Lock()
+        self._pending: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+        self._reader: Optional[asyncio.Task] = None
+        self._connector: Optional[asyncio.Task] = None
+        self._scheduler = scheduler
+
+    @property
+    def scheduler(self) -> Optional[BrainScheduler]:
+        return self._scheduler
 
     async def connect(self) -> None:
         try:
@@ -35,7 +54,50 @@ class BrainServiceClient:
             self._ws = None
             logger.warning("WebSocket connection to Brain Service unavailable: %s", exc)
 
+    @property
+    def mode(self) -> str:
+        """``websocket`` while the socket is up; calls fall back to ``http`` otherwise."""
+        return "websocket" if self._ws is not None else "http"
+
+    def start(self) -> None:
+        """Connect the WebSocket in the background and reconnect whenever it drops."""
+        if self._connector is None:
+            self._connector = asyncio.create_task(
+                self._maintain_connection(), name="brain-ws-connect", context=contextvars.Context()
+            )
+
+    async def _maintain_connection(self) -> None:
+        backoff = 1.0
+        while True:
+            if self._ws is None:
+                await self.connect()
+            ws = self._ws
+            if ws is None:
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
+                continue
+            backoff = 1.0
+            await ws.wait_closed()
+            if self._ws is ws:
+                logger.warning("Brain Service WebSocket closed, falling back to HTTP while reconnecting")
+                self._ws = None
+
+    async def ping(self, timeout: float = 2.0) -> Dict[str, Any]:
+        """Reachability of the Brain Service in its current transport, for readiness probes."""
+        if self._ws is not None:
+            pong = await self._ws.ping()
+            await asyncio.wait_for(pong, timeout)
+            return {"ok": True, "mode": "websocket"}
+        response = await self._http.get("/health", timeout=timeout)
+        return {"ok": response.status_code < 500, "mode": "http", "status_code": response.status_code}
+
     async def disconnect(self) -> None:
+        if self._connector is not None:
+            self._connector.cancel()
+            self._connector = None
+        if self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
         if self._ws is not None:
             try:
                 await self._ws.close()
@@ -44,9 +106,20 @@ class BrainServiceClient:
         await self._http.aclose()
 
     async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        if self._ws is not None:
-            return await self._call_tool_ws(name, arguments)
-        return await self._call_tool_http(name, arguments)
+        check_deadline(f"Brain Service tool {name}")
+        scheduler = self._scheduler
+        ticket = None
+        if scheduler is not None:
+            with span("brain_queue"):
+                ticket = await scheduler.acquire()
+        try:
+            with span("brain"):
+                if self._ws is not None:
+                    return await self._call_tool_ws(name, arguments)
+                return await self._call_tool_http(name, arguments)
+        finally:
+            if scheduler is not None and ticket is not None:
+                scheduler.release(ticket)
 
     async def _call_tool_ws(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         assert self._ws is not None
@@ -58,22 +131,70 @@ class BrainServiceClient:
             "params": {"name": name, "arguments": arguments},
         }
 
-        async with self._ws_lock:
-            try:
+        # Calls are multiplexed over the one socket: the reader task resolves the
+        # future registered under each request id, so the scheduler's concurrency
+        # limit is the only thing serialising Brain calls.
+        self._ensure_reader()
+        future: "asyncio.Future[Dict[str, Any]]" = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            async with self._ws_lock:
                 await self._ws.send(json.dumps(payload))
-                response_raw = await asyncio.wait_for(self._ws.recv(), timeout=self._timeout)
-            except Exception as exc:
-                raise BrainServiceException(f"Brain Service WebSocket call failed: {exc}") from exc
+            response = await asyncio.wait_for(future, timeout=clamp_timeout(self._timeout))
+        except asyncio.TimeoutError as exc:
+            left = remaining()
+            if left is not None and left <= 0:
+                raise DeadlineExceeded(f"Request deadline exceeded waiting for Brain Service tool {name}") from exc
+            raise BrainServiceException(f"Brain Service WebSocket call timed out: {name}") from exc
+        except BrainServiceException:
+            raise
+        except Exception as exc:
+            raise BrainServiceException(f"Brain Service WebSocket call failed: {exc}") from exc
+        finally:
+            self._pending.pop(request_id, None)
 
-        response = json.loads(response_raw)
         if "error" in response:
             raise BrainServiceException(response["error"].get("message", "Unknown Brain Service error"))
         return response.get("result", {})
 
+    def _ensure_reader(self) -> None:
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(
+                self._read_responses(), name="brain-ws-reader", context=contextvars.Context()
+            )
+
+    async def _read_responses(self) -> None:
+        """Route WebSocket replies to their callers; late replies to abandoned calls are dropped."""
+        ws = self._ws
+        assert ws is not None
+        try:
+            async for raw in ws:
+                response = json.loads(raw)
+                future = self._pending.get(response.get("id"))
+                if future is None:
+                    logger.debug("Discarding stale Brain Service response %s", response.get("id"))
+                elif not future.done():
+                    future.set_result(response)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Brain Service WebSocket closed: %s", exc)
+        # The socket is gone: fail whoever is still waiting and fall back to HTTP.
+        if self._ws is ws:
+            self._ws = None
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(BrainServiceException("Brain Service WebSocket connection closed"))
+
     async def _call_tool_http(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         try:
-            resp = await self._http.post(f"/tools/{name}", json=arguments)
+            resp = await self._http.post(f"/tools/{name}", json=arguments, timeout=clamp_timeout(self._timeout))
             resp.raise_for_status()
             return resp.json()
+        except httpx.TimeoutException as exc:
+            left = remaining()
+            if left is not None and left <= 0:
+                raise DeadlineExceeded(f"Request deadline exceeded waiting for Brain Service tool {name}") from exc
+            raise BrainServiceException(f"Brain Service HTTP call failed: {exc}") from exc
         except httpx.HTTPError as exc:
             raise BrainServiceException(f"Brain Service HTTP call failed: {exc}") from exc
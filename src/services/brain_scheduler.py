@@ -0,0 +1,245 @@
+"""Admission control for Brain Service calls.
+
+Calls are tagged with the calling project and a priority class through a
+context variable (see :func:`brain_caller`), the same way request timings and
+deadlines travel.  The scheduler bounds total and per-project concurrency;
+when a call has to wait it is queued per project and per class:
+
+* ``interactive`` calls are always dispatched before ``batch`` calls;
+* within a class, projects share capacity by weighted fair queuing: every
+  queued call gets a virtual finish tag ``max(virtual_time, project_last_tag)
+  + 1 / weight`` and the eligible project with the smallest head tag goes
+  next, so a project with a deep backlog cannot starve a project that only
+  sends the occasional call.
+
+Calls are shed instead of queued when the project's queue or the global
+queue is full.  A project's state is dropped once it has nothing running or
+queued, so dispatch and :meth:`BrainScheduler.stats` only cover projects
+that are busy; lifetime counters are kept as totals.  :meth:`BrainScheduler.summary`
+reports the totals alone, without naming any project.
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Literal, Mapping, Optional, Tuple
+
+from ..utils.deadlines import remaining
+from ..utils.exceptions import DeadlineExceeded, ServiceOverloaded
+
+
+Priority = Literal["interactive", "batch"]
+PRIORITIES: Tuple[Priority, ...] = ("interactive", "batch")
+
+_UNKNOWN_PROJECT = "_unscoped"
+
+_caller: ContextVar[Tuple[Optional[str], Priority]] = ContextVar("brain_caller", default=(None, "interactive"))
+
+
+@contextmanager
+def brain_caller(*, project_id: Optional[str] = None, priority: Optional[Priority] = None) -> Iterator[None]:
+    """Attribute Brain calls made in this block to ``project_id`` and/or ``priority``."""
+    current_project, current_priority = _caller.get()
+    token = _caller.set((project_id or current_project, priority or current_priority))
+    try:
+        yield
+    finally:
+        _caller.reset(token)
+
+
+def current_caller() -> Tuple[str, Priority]:
+    project_id, priority = _caller.get()
+    return project_id or _UNKNOWN_PROJECT, priority
+
+
+@dataclass(eq=False)
+class _Waiter:
+    project_id: str
+    priority: Priority
+    tag: float
+    enqueued: float
+    future: "asyncio.Future[None]"
+
+
+@dataclass
+class _ProjectState:
+    active: int = 0
+    last_tag: float = 0.0
+    queues: Dict[str, Deque[_Waiter]] = field(default_factory=lambda: {p: deque() for p in PRIORITIES})
+    admitted: int = 0
+    shed: int = 0
+    wait_ms_total: float = 0.0
+    wait_ms_max: float = 0.0
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self.queues.values())
+
+
+class BrainScheduler:
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 16,
+        per_project_limit: int = 4,
+        max_queue_per_project: int = 50,
+        max_queue_total: int = 500,
+        weights: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        self._max_concurrency = max_concurrency
+        self._per_project_limit = per_project_limit
+        self._max_queue_per_project = max_queue_per_project
+        self._max_queue_total = max_queue_total
+        self._weights = dict(weights or {})
+        self._projects: Dict[str, _ProjectState] = {}
+        self._active = 0
+        self._queued = 0
+        self._virtual_time = 0.0
+        # Counters of projects whose state was dropped while idle.
+        self._retired = _ProjectState()
+
+    def _project(self, project_id: str) -> _ProjectState:
+        state = self._projects.get(project_id)
+        if state is None:
+            state = self._projects[project_id] = _ProjectState()
+        return state
+
+    def _forget_if_idle(self, project_id: str, state: _ProjectState) -> None:
+        if state.active or state.queued:
+            return
+        self._retired.admitted += state.admitted
+        self._retired.shed += state.shed
+        self._retired.wait_ms_total += state.wait_ms_total
+        self._retired.wait_ms_max = max(self._retired.wait_ms_max, state.wait_ms_max)
+        self._projects.pop(project_id, None)
+
+    def _can_run(self, state: _ProjectState) -> bool:
+        return self._active < self._max_concurrency and state.active < self._per_project_limit
+
+    def _start(self, project_id: str, state: _ProjectState, waited_ms: float) -> None:
+        self._active += 1
+        state.active += 1
+        state.admitted += 1
+        state.wait_ms_total += waited_ms
+        state.wait_ms_max = max(state.wait_ms_max, waited_ms)
+
+    def _dispatch(self) -> None:
+        while self._active < self._max_concurrency:
+            chosen: Optional[_Waiter] = None
+            for priority in PRIORITIES:
+                for state in self._projects.values():
+                    queue = state.queues[priority]
+                    if queue and state.active < self._per_project_limit:
+                        if chosen is None or queue[0].tag < chosen.tag:
+                            chosen = queue[0]
+                if chosen is not None:
+                    break
+            if chosen is None:
+                return
+            state = self._projects[chosen.project_id]
+            state.queues[chosen.priority].popleft()
+            self._queued -= 1
+            self._virtual_time = max(self._virtual_time, chosen.tag)
+            self._start(chosen.project_id, state, (time.monotonic() - chosen.enqueued) * 1000)
+            chosen.future.set_result(None)
+
+    def release(self, project_id: str) -> None:
+        """Return the slot taken by :meth:`acquire` for ``project_id``."""
+        state = self._projects[project_id]
+        self._active -= 1
+        state.active -= 1
+        self._forget_if_idle(project_id, state)
+        self._dispatch()
+
+    async def acquire(self, project_id: Optional[str] = None, priority: Optional[Priority] = None) -> str:
+        """Take one Brain Service slot, waiting or shedding as needed; returns the project to release."""
+        caller_project, caller_priority = current_caller()
+        project_id = project_id or caller_project
+        priority = priority or caller_priority
+        state = self._project(project_id)
+
+        # Whenever a slot frees up every eligible waiter is dispatched at once, so
+        # if this project may run now nobody queued is being overtaken.
+        if self._can_run(state):
+            self._start(project_id, state, 0.0)
+        else:
+            await self._wait(project_id, priority, state)
+        return project_id
+
+    @asynccontextmanager
+    async def admit(self, project_id: Optional[str] = None, priority: Optional[Priority] = None) -> AsyncIterator[None]:
+        ticket = await self.acquire(project_id, priority)
+        try:
+            yield
+        finally:
+            self.release(ticket)
+
+    async def _wait(self, project_id: str, priority: Priority, state: _ProjectState) -> None:
+        if state.queued >= self._max_queue_per_project:
+            state.shed += 1
+            raise ServiceOverloaded(
+                f"Too many queued Brain Service requests for project {project_id}", status_code=429, retry_after=1
+            )
+        if self._queued >= self._max_queue_total:
+            state.shed += 1
+            self._forget_if_idle(project_id, state)
+            raise ServiceOverloaded("Brain Service is saturated, retry later", status_code=503, retry_after=2)
+
+        weight = self._weights.get(project_id, 1.0)
+        tag = max(self._virtual_time, state.last_tag) + 1.0 / weight
+        state.last_tag = tag
+        waiter = _Waiter(project_id, priority, tag, time.monotonic(), asyncio.get_running_loop().create_future())
+        state.queues[priority].append(waiter)
+        self._queued += 1
+        self._dispatch()
+        try:
+            budget = remaining()
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=budget)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.future.done():
+                # Admitted at the same moment we gave up; hand the slot back.
+                self.release(project_id)
+            else:
+                waiter.future.cancel()
+                state.queues[priority].remove(waiter)
+                self._queued -= 1
+                self._forget_if_idle(project_id, state)
+            if isinstance(exc, asyncio.TimeoutError):
+                raise DeadlineExceeded("Request deadline exceeded while queued for the Brain Service") from exc
+            raise
+
+    def summary(self) -> Dict[str, Any]:
+        states = [self._retired, *self._projects.values()]
+        admitted = sum(state.admitted for state in states)
+        return {
+            "active": self._active,
+            "queued": self._queued,
+            "queued_by_priority": {
+                priority: sum(len(state.queues[priority]) for state in self._projects.values())
+                for priority in PRIORITIES
+            },
+            "projects_busy": len(self._projects),
+            "admitted": admitted,
+            "shed": sum(state.shed for state in states),
+            "avg_wait_ms": round(sum(state.wait_ms_total for state in states) / admitted, 2) if admitted else 0.0,
+            "max_wait_ms": round(max(state.wait_ms_max for state in states), 2),
+            "max_concurrency": self._max_concurrency,
+            "per_project_limit": self._per_project_limit,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        projects = {}
+        for project_id, state in self._projects.items():
+            projects[project_id] = {
+                "active": state.active,
+                "queued": {priority: len(queue) for priority, queue in state.queues.items()},
+                "admitted": state.admitted,
+                "shed": state.shed,
+                "avg_wait_ms": round(state.wait_ms_total / state.admitted, 2) if state.admitted else 0.0,
+                "max_wait_ms": round(state.wait_ms_max, 2),
+                "weight": self._weights.get(project_id, 1.0),
+            }
+        return {**self.summary(), "projects": projects}
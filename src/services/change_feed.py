@@ -0,0 +1,183 @@
+"""Fan-out of entity-level story bible changes to live subscribers.
+
+Every subscriber owns a bounded buffer.  Publishing never waits: when a
+subscriber's buffer is full it is dropped from the fan-out and receives a
+single ``dropped`` notice, after which the client is expected to refetch the
+bible and subscribe again.  One slow socket therefore never holds up writers
+or other subscribers.
+
+:class:`ChangeLog` keeps the same changes, versioned, for clients that
+reconnect and want to catch up without refetching the whole bible.
+"""
+
+import asyncio
+import logging
+import secrets
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """Buffered change stream for one connection, covering any number of bibles."""
+
+    def __init__(self, broker: "ChangeBroker", max_buffer: int) -> None:
+        self._broker = broker
+        self._queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_buffer + 1)
+        self._max_buffer = max_buffer
+        self.story_bible_ids: Set[str] = set()
+        self.dropped = False
+
+    async def get(self) -> Dict[str, Any]:
+        return await self._queue.get()
+
+    def _offer(self, event: Dict[str, Any]) -> bool:
+        # One slot is held back so the ``dropped`` notice always fits.
+        if self._queue.qsize() >= self._max_buffer:
+            return False
+        self._queue.put_nowait(event)
+        return True
+
+    def _drop(self, reason: str) -> None:
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(
+            {"type": "dropped", "reason": reason, "story_bible_ids": sorted(self.story_bible_ids)}
+        )
+        self.dropped = True
+
+    def close(self) -> None:
+        self._broker.unsubscribe(self)
+
+
+class ChangeBroker:
+    def __init__(self, *, max_buffer: int = 256) -> None:
+        self._max_buffer = max_buffer
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+
+    def open(self) -> Subscription:
+        return Subscription(self, self._max_buffer)
+
+    def subscribe(self, subscription: Subscription, story_bible_id: str) -> None:
+        subscription.dropped = False
+        subscription.story_bible_ids.add(story_bible_id)
+        self._subscribers.setdefault(story_bible_id, set()).add(subscription)
+
+    def unsubscribe(self, subscription: Subscription, story_bible_ids: Optional[Iterable[str]] = None) -> None:
+        targets = list(subscription.story_bible_ids if story_bible_ids is None else story_bible_ids)
+        for story_bible_id in targets:
+            subscription.story_bible_ids.discard(story_bible_id)
+            subscribers = self._subscribers.get(story_bible_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[story_bible_id]
+
+    def subscriber_count(self, story_bible_id: str) -> int:
+        return len(self._subscribers.get(story_bible_id, ()))
+
+    def publish(self, story_bible_id: str, event: Dict[str, Any]) -> int:
+        """Queue ``event`` for every subscriber of the bible; returns how many received it."""
+        subscribers = self._subscribers.get(story_bible_id)
+        if not subscribers:
+            return 0
+        delivered = 0
+        for subscription in list(subscribers):
+            if subscription._offer(event):
+                delivered += 1
+                continue
+            logger.warning("Dropping slow change subscriber for story bible %s", story_bible_id)
+            subscription._drop("slow_consumer")
+            self.unsubscribe(subscription)
+        return delivered
+
+
+# Versions are ``counter << _WORKER_BITS | worker tag`` and stay below 2**53 so JavaScript clients read them exactly.
+_WORKER_BITS = 20
+_WORKER_MASK = (1 << _WORKER_BITS) - 1
+_COUNTER_EPOCH = 1_704_067_200  # 2024-01-01T00:00:00Z
+
+
+class _History:
+    __slots__ = ("base", "counter", "entries")
+
+    def __init__(self, base: int, max_entries: int) -> None:
+        self.base = base
+        self.counter = base
+        self.entries: Deque[Tuple[int, Dict[str, Any]]] = deque(maxlen=max_entries)
+
+
+class ChangeLog:
+    """Bounded per story bible history of versioned changes.
+
+    The history lives in this process only.  Each version therefore carries
+    a random tag identifying the log that issued it, next to a counter seeded
+    from the wall clock in seconds.  A version issued by another worker, or
+    by this worker before a restart, has a different tag and is answered
+    with a full snapshot, like a version older than the retained history.
+    Delta sync behind a load balancer without sticky sessions thus degrades
+    to snapshots, but never misses changes.
+
+    A history evicted from the LRU is re-created above every counter this
+    log has handed out, so versions issued before the eviction fall below
+    its base and also get a snapshot.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1000,
+        max_story_bibles: int = 1024,
+        worker_tag: Optional[int] = None,
+    ) -> None:
+        self._max_entries = max_entries
+        self._max_story_bibles = max_story_bibles
+        self._histories: "OrderedDict[str, _History]" = OrderedDict()
+        # Highest counter handed out for any bible; the clock alone may lag behind a busy bible.
+        self._high_water = 0
+        self.worker_tag = secrets.randbelow(_WORKER_MASK + 1) if worker_tag is None else worker_tag & _WORKER_MASK
+
+    def _history(self, story_bible_id: str) -> _History:
+        history = self._histories.get(story_bible_id)
+        if history is None:
+            history = _History(max(int(time.time()) - _COUNTER_EPOCH, self._high_water + 1), self._max_entries)
+            self._histories[story_bible_id] = history
+            while len(self._histories) > self._max_story_bibles:
+                self._histories.popitem(last=False)
+        else:
+            self._histories.move_to_end(story_bible_id)
+        return history
+
+    def _version(self, counter: int) -> int:
+        self._high_water = max(self._high_water, counter)
+        return counter << _WORKER_BITS | self.worker_tag
+
+    def issued_here(self, version: int) -> bool:
+        """Whether ``version`` came from this log rather than another worker or an earlier process."""
+        return version & _WORKER_MASK == self.worker_tag
+
+    def current_version(self, story_bible_id: str) -> int:
+        return self._version(self._history(story_bible_id).counter)
+
+    def record(self, story_bible_id: str, entry: Dict[str, Any]) -> int:
+        history = self._history(story_bible_id)
+        history.counter += 1
+        if len(history.entries) == history.entries.maxlen:
+            history.base = history.entries[0][0]
+        history.entries.append((history.counter, entry))
+        return self._version(history.counter)
+
+    def since(self, story_bible_id: str, version: int) -> Optional[List[Tuple[int, Dict[str, Any]]]]:
+        """Entries newer than ``version``, or ``None`` when it is foreign or outside the retained history."""
+        if not self.issued_here(version):
+            return None
+        history = self._history(story_bible_id)
+        counter = version >> _WORKER_BITS
+        if counter < history.base or counter > history.counter:
+            return None
+        return [
+            (self._version(entry_counter), entry) for entry_counter, entry in history.entries if entry_counter > counter
+        ]
@@ -0,0 +1,250 @@
+"""Server-side copy of a story bible into a new bible.
+
+Entities are created in three phases so every reference can be remapped to
+an id that already exists:
+
+1. characters, plot threads (without their scene references) and outlines;
+2. scenes, with ``characters_present`` and ``plot_threads`` remapped, and
+   relationships, with both endpoints remapped;
+3. plot threads that reference scenes are updated with the new scene ids.
+
+Collections within a phase are copied concurrently, with at most
+``concurrency`` PayloadCMS calls in flight.  References to entities that do
+not exist in the source are dropped and counted.  If any call fails, every
+document created so far is deleted again and the original error is raised.
+"""
+
+import asyncio
+import contextvars
+import logging
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils.references import ref_id, ref_ids
+from .payload_service import PayloadCMSService
+
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# Fields PayloadCMS assigns itself, or that point at the source bible.
+_SYSTEM_FIELDS = frozenset({"id", "createdAt", "updatedAt", "created_at", "updated_at", "story_bible"})
+_THREAD_SCENE_FIELDS = ("introduction_scene", "resolution_scene", "key_scenes")
+# Collections whose new ids other documents are remapped to.
+_ID_MAPS = {"story-bible-characters": "characters", "plot-threads": "plot_threads", "story-bible-scenes": "scenes"}
+
+
+def _copyable(entity: Dict[str, Any], *exclude: str) -> Dict[str, Any]:
+    return {key: value for key, value in entity.items() if key not in _SYSTEM_FIELDS and key not in exclude}
+
+
+class _Progress:
+    """Counts created documents and reports roughly every 5% and at the end of each phase."""
+
+    def __init__(self, source_id: str, total: int, callback: Optional[ProgressCallback]) -> None:
+        self.source_id = source_id
+        self.story_bible_id: Optional[str] = None
+        self.total = total
+        self.completed = 0
+        self.by_collection: Dict[str, int] = {}
+        self._callback = callback
+        self._step = max(1, total // 20)
+        self._reported = 0
+
+    async def advance(self, collection: str) -> None:
+        self.completed += 1
+        self.by_collection[collection] = self.by_collection.get(collection, 0) + 1
+        if self.completed - self._reported >= self._step:
+            await self.report("copying")
+
+    async def report(self, stage: str) -> None:
+        self._reported = self.completed
+        if self._callback is None:
+            return
+        event = {
+            "source_id": self.source_id,
+            "story_bible_id": self.story_bible_id,
+            "stage": stage,
+            "completed": self.completed,
+            "total": self.total,
+            "collections": dict(self.by_collection),
+        }
+        try:
+            await self._callback(event)
+        except Exception:  # a lost progress listener must not fail the copy
+            logger.debug("Clone progress listener failed", exc_info=True)
+
+
+class StoryBibleCloner:
+    def __init__(self, payload_service: PayloadCMSService, *, concurrency: int = 8) -> None:
+        self._payload = payload_service
+        self._concurrency = concurrency
+        self._creators = {
+            "story-bibles": payload_service.create_story_bible,
+            "story-bible-characters": payload_service.create_character,
+            "character-relationships": payload_service.create_relationship,
+            "story-bible-scenes": payload_service.create_scene,
+            "plot-threads": payload_service.create_plot_thread,
+            "story-outlines": payload_service.create_story_outline,
+        }
+        self._deleters = {
+            "story-bibles": payload_service.delete_story_bible,
+            "story-bible-characters": payload_service.delete_character,
+            "character-relationships": payload_service.delete_relationship,
+            "story-bible-scenes": payload_service.delete_scene,
+            "plot-threads": payload_service.delete_plot_thread,
+            "story-outlines": payload_service.delete_story_outline,
+        }
+
+    async def clone(
+        self,
+        source: Dict[str, Any],
+        story_bible: Dict[str, Any],
+        outlines: List[Dict[str, Any]],
+        *,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """Copy ``source`` (a populated bible) and ``outlines`` into a new bible created from ``story_bible``."""
+        payload = self._payload
+        characters = source.get("characters") or []
+        scenes = source.get("scenes") or []
+        threads = source.get("plot_threads") or []
+        relationships = source.get("relationships") or []
+        linked_threads = [thread for thread in threads if any(thread.get(key) for key in _THREAD_SCENE_FIELDS)]
+        total = len(characters) + len(threads) + len(outlines) + len(scenes) + len(relationships) + len(linked_threads)
+        tracker = _Progress(str(source["id"]), 1 + total, progress)
+        semaphore = asyncio.Semaphore(self._concurrency)
+        created: List[Tuple[str, str]] = []
+        ids: Dict[str, Dict[str, str]] = {"characters": {}, "plot_threads": {}, "scenes": {}}
+        dangling = 0
+
+        async def create(collection: str, document: Dict[str, Any], original: Optional[Dict[str, Any]] = None) -> Any:
+            """Create ``document``; the new id of a copied ``original`` is recorded for remapping."""
+            async with semaphore:
+                result = await self._creators[collection](document)
+            created.append((collection, str(result["id"])))
+            if original is not None:
+                ids[_ID_MAPS[collection]][str(original["id"])] = str(result["id"])
+            await tracker.advance(collection)
+            return result
+
+        async def link(thread_id: str, update: Dict[str, Any]) -> None:
+            async with semaphore:
+                await payload.update_plot_thread(thread_id, update)
+            await tracker.advance("plot-threads")
+
+        async def run_phase(calls: List[Awaitable[Any]]) -> None:
+            # Let every call finish before failing, so nothing is created behind the rollback's back.
+            results = await asyncio.gather(*calls, return_exceptions=True)
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+
+        def remap(value: Any, mapping: Dict[str, str]) -> Optional[str]:
+            nonlocal dangling
+            identifier = ref_id(value)
+            if identifier is not None and identifier not in mapping:
+                dangling += 1
+            return mapping.get(identifier) if identifier is not None else None
+
+        def remap_all(values: Any, mapping: Dict[str, str]) -> List[str]:
+            nonlocal dangling
+            identifiers = ref_ids(values)
+            remapped = [mapping[identifier] for identifier in identifiers if identifier in mapping]
+            dangling += len(identifiers) - len(remapped)
+            return remapped
+
+        try:
+            bible = await create("story-bibles", story_bible)
+            new_id = tracker.story_bible_id = str(bible["id"])
+            await tracker.report("copying")
+
+            await run_phase(
+                [
+                    create(
+                        "story-bible-characters",
+                        {**_copyable(character, "relationships"), "story_bible": new_id},
+                        character,
+                    )
+                    for character in characters
+                ]
+                + [
+                    create("plot-threads", {**_copyable(thread, *_THREAD_SCENE_FIELDS), "story_bible": new_id}, thread)
+                    for thread in threads
+                ]
+                + [create("story-outlines", {**_copyable(outline), "story_bible": new_id}) for outline in outlines]
+            )
+
+            phase: List[Awaitable[Any]] = []
+            for scene in scenes:
+                document = {
+                    **_copyable(scene),
+                    "story_bible": new_id,
+                    "characters_present": remap_all(scene.get("characters_present"), ids["characters"]),
+                    "plot_threads": remap_all(scene.get("plot_threads"), ids["plot_threads"]),
+                }
+                phase.append(create("story-bible-scenes", document, scene))
+            for relationship in relationships:
+                character_from = remap(relationship.get("character_from"), ids["characters"])
+                character_to = remap(relationship.get("character_to"), ids["characters"])
+                if character_from is None or character_to is None:
+                    tracker.total -= 1
+                    continue
+                document = {
+                    **_copyable(relationship),
+                    "story_bible": new_id,
+                    "character_from": character_from,
+                    "character_to": character_to,
+                }
+                phase.append(create("character-relationships", document))
+            await run_phase(phase)
+
+            phase = []
+            for thread in linked_threads:
+                update: Dict[str, Any] = {}
+                for key in ("introduction_scene", "resolution_scene"):
+                    if thread.get(key):
+                        update[key] = remap(thread[key], ids["scenes"])
+                if thread.get("key_scenes"):
+                    update["key_scenes"] = remap_all(thread["key_scenes"], ids["scenes"])
+                phase.append(link(ids["plot_threads"][str(thread["id"])], update))
+            await run_phase(phase)
+        except BaseException:
+            # Roll back from a fresh context: the request's deadline may be what just ran out,
+            # and a cancelled request must not leave a half-made copy behind.
+            rollback = asyncio.create_task(self._rollback(created), context=contextvars.Context())
+            await asyncio.shield(rollback)
+            await tracker.report("rolled_back")
+            raise
+
+        await tracker.report("completed")
+        return {
+            "story_bible": bible,
+            "source_id": str(source["id"]),
+            "counts": dict(Counter(collection for collection, _ in created)),
+            "dangling_references": dangling,
+            "id_map": ids,
+        }
+
+    async def _rollback(self, created: List[Tuple[str, str]]) -> None:
+        if not created:
+            return
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def delete(collection: str, document_id: str) -> None:
+            async with semaphore:
+                await self._deleters[collection](document_id)
+
+        # Children first, the bible last.
+        children = [entry for entry in created if entry[0] != "story-bibles"]
+        bibles = [entry for entry in created if entry[0] == "story-bibles"]
+        failed: List[Tuple[str, str]] = []
+        for batch in (children, bibles):
+            results = await asyncio.gather(*(delete(*entry) for entry in batch), return_exceptions=True)
+            failed.extend(entry for entry, result in zip(batch, results) if isinstance(result, BaseException))
+        if failed:
+            logger.error("Clone rollback left %d of %d documents behind: %s", len(failed), len(created), failed)
+        else:
+            logger.info("Rolled back %d documents of a failed clone", len(created))
@@ -0,0 +1,60 @@
+"""Text embedders used by the story bible vector index."""
+
+import hashlib
+from typing import List, Protocol
+
+import numpy as np
+
+from ..utils.exceptions import BrainServiceException
+from ..utils.text import tokenize
+from .brain_client import BrainServiceClient
+
+
+class Embedder(Protocol):
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        ...
+
+
+class HashingEmbedder:
+    """Deterministic bag-of-words embedder for offline and test use.
+
+    Unigrams and bigrams are hashed into ``dimension`` signed buckets with
+    sub-linear term frequency weighting.  It has no notion of synonyms, but it
+    is stable across processes and needs no network access.
+    """
+
+    def __init__(self, dimension: int = 256) -> None:
+        self.dimension = dimension
+
+    def _bucket(self, token: str) -> tuple:
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.dimension, 1.0 if (value >> 63) & 1 else -1.0
+
+    def embed_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        tokens = tokenize(text)
+        counts: dict = {}
+        for token in [*tokens, *(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))]:
+            counts[token] = counts.get(token, 0) + 1
+        for token, count in counts.items():
+            bucket, sign = self._bucket(token)
+            vector[bucket] += sign * (1.0 + np.log(count))
+        return vector
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        return np.stack([self.embed_one(text) for text in texts]) if texts else np.zeros((0, self.dimension))
+
+
+class BrainEmbedder:
+    """Embeddings from the Brain Service ``generate_embeddings`` tool."""
+
+    def __init__(self, brain_client: BrainServiceClient) -> None:
+        self._brain = brain_client
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        result = await self._brain.call_tool("generate_embeddings", {"texts": texts})
+        embeddings = result.get("embeddings") if isinstance(result, dict) else None
+        if not isinstance(embeddings, list) or len(embeddings) != len(texts):
+            raise BrainServiceException("Brain Service returned an unexpected embeddings payload")
+        return np.asarray(embeddings, dtype=np.float32)
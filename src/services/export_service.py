@@ -3,6 +3,7 @@
 from typing import Any, Dict, List, Optional
 
 from ..utils.formatting import render_json, render_markdown
+from ..utils.timing import span
 
 
 class ExportService:
@@ -12,6 +13,16 @@ class ExportService:
         *,
         export_format: str,
         sections: Optional[List[str]] = None,
+    ) -> bytes:
+        with span("export"):
+            return self._render(story_bible, export_format=export_format, sections=sections)
+
+    def _render(
+        self,
+        story_bible: Dict[str, Any],
+        *,
+        export_format: str,
+        sections: Optional[List[str]],
     ) -> bytes:
         payload = self._filter_sections(story_bible, sections)
         fmt = export_format.lower()
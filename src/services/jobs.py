@@ -0,0 +1,149 @@
+"""Background execution of long-running operations (Brain Service calls, clones).
+
+Jobs run on a fixed pool of worker tasks fed from a bounded queue, so a burst
+of submissions cannot start more concurrent Brain calls than there are
+workers.  Submissions carrying the same deduplication key (kind, bible,
+bible version and arguments) share one job while it is queued, running or
+holding a result.  Finished jobs are kept for ``result_ttl_seconds`` and then
+forgotten.
+"""
+
+import asyncio
+import contextvars
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from ..utils.exceptions import ServiceError
+
+
+logger = logging.getLogger(__name__)
+
+JobFactory = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    story_bible_id: str
+    project_id: str
+    key: Hashable
+    status: str = "queued"
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    progress: Optional[Dict[str, Any]] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "story_bible_id": self.story_bible_id,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": self.progress,
+        }
+
+
+class JobQueue:
+    def __init__(self, *, workers: int = 4, max_pending: int = 100, result_ttl_seconds: float = 3600.0) -> None:
+        self._worker_count = workers
+        self._max_pending = max_pending
+        self._ttl = result_ttl_seconds
+        self._queue: "Optional[asyncio.Queue[Tuple[Job, JobFactory]]]" = None
+        self._workers: List[asyncio.Task] = []
+        self._jobs: Dict[str, Job] = {}
+        self._by_key: Dict[Hashable, str] = {}
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        # Workers start from an empty context so jobs never inherit the deadline
+        # or timing collector of the request that happened to start the pool.
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"job-worker-{n}", context=contextvars.Context())
+            for n in range(self._worker_count)
+        ]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self._ttl
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished and (job.finished_at or 0) < cutoff]
+        for job_id in expired:
+            job = self._jobs.pop(job_id)
+            if self._by_key.get(job.key) == job_id:
+                del self._by_key[job.key]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._prune()
+        return self._jobs.get(job_id)
+
+    def submit(
+        self,
+        kind: str,
+        story_bible_id: str,
+        project_id: str,
+        key: Hashable,
+        factory: JobFactory,
+    ) -> Tuple[Job, bool]:
+        """Queue ``factory`` unless an equivalent job exists; returns the job and whether it is new."""
+        self._prune()
+        existing = self._jobs.get(self._by_key.get(key, ""))
+        if existing is not None and existing.status != "failed":
+            return existing, False
+        self.start()
+        assert self._queue is not None
+        if self._queue.qsize() >= self._max_pending:
+            raise ServiceError("Job queue is full, retry later")
+        job = Job(id=uuid.uuid4().hex, kind=kind, story_bible_id=story_bible_id, project_id=project_id, key=key)
+        self._jobs[job.id] = job
+        self._by_key[key] = job.id
+        self._queue.put_nowait((job, factory))
+        return job, True
+
+    async def _work(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            job, factory = await queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            try:
+                job.result = await factory()
+                job.status = "succeeded"
+            except asyncio.CancelledError:
+                job.status, job.error = "failed", "cancelled"
+                raise
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Job %s (%s) failed: %s", job.id, job.kind, exc)
+                job.status, job.error = "failed", str(exc)
+            finally:
+                job.finished_at = time.time()
+                job.done.set()
+                queue.task_done()
@@ -0,0 +1,126 @@
+"""Debounced application of PayloadCMS change events.
+
+Admin edits and bulk imports arrive as bursts of hook calls.  Events are
+grouped per story bible and coalesced per entity (the latest document wins).
+A batch is applied once the bible has been quiet for ``debounce_seconds``,
+or after ``max_delay_seconds`` if the storm does not let up.  Batches larger
+than ``max_incremental`` are applied as a full refresh rather than as one
+incremental index update per event.
+"""
+
+import asyncio
+import contextvars
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# apply(story_bible_id, events, full_refresh); whatever it returns is ignored.
+BatchHandler = Callable[[str, List[Dict[str, Any]], bool], Awaitable[object]]
+
+
+@dataclass
+class _Batch:
+    first_seen: float
+    last_seen: float
+    events: Dict[Tuple[str, str], Dict[str, Any]] = field(default_factory=dict)
+    received: int = 0
+
+
+class PayloadEventDebouncer:
+    def __init__(
+        self,
+        apply: BatchHandler,
+        *,
+        debounce_seconds: float = 0.5,
+        max_delay_seconds: float = 5.0,
+        max_incremental: int = 50,
+    ) -> None:
+        self._apply = apply
+        self._debounce = debounce_seconds
+        self._max_delay = max_delay_seconds
+        self._max_incremental = max_incremental
+        self._batches: Dict[str, _Batch] = {}
+        self._timers: Dict[str, asyncio.Task] = {}
+        self.received = 0
+        self.applied_batches = 0
+
+    @property
+    def pending(self) -> int:
+        return sum(len(batch.events) for batch in self._batches.values())
+
+    def submit(self, story_bible_id: str, event: Dict[str, Any]) -> None:
+        """Queue ``event`` (``collection``, ``operation``, ``doc``, optional ``previous_doc``)."""
+        now = time.monotonic()
+        batch = self._batches.get(story_bible_id)
+        if batch is None:
+            batch = self._batches[story_bible_id] = _Batch(first_seen=now, last_seen=now)
+        batch.last_seen = now
+        batch.received += 1
+        self.received += 1
+
+        key = (event["collection"], str(event["doc"].get("id")))
+        earlier = batch.events.get(key)
+        if earlier is not None:
+            # A create followed by updates is still a create, seen with its latest state.
+            if earlier["operation"] == "created" and event["operation"] == "updated":
+                event = {**event, "operation": "created"}
+            if earlier.get("previous_doc") is not None:
+                event = {**event, "previous_doc": earlier["previous_doc"]}
+        batch.events[key] = event
+
+        if story_bible_id not in self._timers:
+            # Timers run outside the request that happened to start them.
+            self._timers[story_bible_id] = asyncio.create_task(
+                self._wait_and_flush(story_bible_id), context=contextvars.Context()
+            )
+
+    async def _wait_and_flush(self, story_bible_id: str) -> None:
+        try:
+            while True:
+                batch = self._batches.get(story_bible_id)
+                if batch is None:
+                    return
+                due = min(batch.last_seen + self._debounce, batch.first_seen + self._max_delay)
+                delay = due - time.monotonic()
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+        finally:
+            self._timers.pop(story_bible_id, None)
+        await self._flush(story_bible_id)
+
+    async def _flush(self, story_bible_id: str) -> None:
+        batch = self._batches.pop(story_bible_id, None)
+        if batch is None or not batch.events:
+            return
+        events = list(batch.events.values())
+        full_refresh = len(events) > self._max_incremental
+        try:
+            await self._apply(story_bible_id, events, full_refresh)
+            self.applied_batches += 1
+        except Exception:  # noqa: BLE001
+            logger.exception("Applying %d PayloadCMS events to story bible %s failed", len(events), story_bible_id)
+        logger.debug(
+            "Applied %d PayloadCMS events (%d received) to story bible %s%s",
+            len(events),
+            batch.received,
+            story_bible_id,
+            " as a full refresh" if full_refresh else "",
+        )
+
+    async def flush(self, story_bible_id: Optional[str] = None) -> None:
+        """Apply pending events now, for one bible or all of them."""
+        targets = [story_bible_id] if story_bible_id is not None else list(self._batches)
+        for target in targets:
+            timer = self._timers.pop(target, None)
+            if timer is not None:
+                timer.cancel()
+            await self._flush(target)
+
+    async def stop(self) -> None:
+        await self.flush()
@@ -1,11 +1,26 @@
 """Async client for interacting with PayloadCMS (Auto-Movie) collections."""
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import httpx
-from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential
+from tenacity import AsyncRetrying, RetryCallState, retry_if_exception_type, stop_after_attempt, wait_exponential
+from tenacity.stop import stop_base
+from tenacity.wait import wait_base
 
-from ..utils.exceptions import PayloadCMSException
+from ..utils.deadlines import check_deadline, clamp_timeout, remaining
+from ..utils.exceptions import DeadlineExceeded, PayloadCMSException
+from ..utils.timing import span
+
+
+class stop_before_deadline(stop_base):
+    """Stop retrying when the next backoff would not finish before the request deadline."""
+
+    def __init__(self, wait: wait_base) -> None:
+        self._wait = wait
+
+    def __call__(self, retry_state: RetryCallState) -> bool:
+        left = remaining()
+        return left is not None and left <= self._wait(retry_state)
 
 
 class PayloadCMSService:
@@ -24,11 +39,19 @@ class PayloadCMSService:
             timeout=httpx.Timeout(timeout),
             headers=headers,
         )
+        self._timeout = timeout
         self._max_retries = max_retries
 
     async def aclose(self) -> None:
         await self._client.aclose()
 
+    async def ping(self, timeout: float = 2.0) -> Dict[str, Any]:
+        """Single cheap read without retries, for readiness probes."""
+        response = await self._client.get(
+            "/api/story-bibles", params={"limit": 1, "depth": 0}, timeout=timeout
+        )
+        return {"ok": response.status_code < 400, "status_code": response.status_code}
+
     async def _request(
         self,
         method: str,
@@ -37,19 +60,33 @@ class PayloadCMSService:
         params: Optional[Dict[str, Any]] = None,
         json: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        async for attempt in AsyncRetrying(
-            stop=stop_after_attempt(self._max_retries),
-            wait=wait_exponential(multiplier=1, min=1, max=5),
-            retry=retry_if_exception_type(httpx.HTTPError),
-            reraise=True,
-        ):
-            with attempt:
-                response = await self._client.request(method, url, params=params, json=json)
-                response.raise_for_status()
-                data = response.json()
-                if isinstance(data, dict) and "doc" in data:
-                    return data["doc"]
-                return data
+        backoff = wait_exponential(multiplier=1, min=1, max=5)
+        try:
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(self._max_retries) | stop_before_deadline(backoff),
+                wait=backoff,
+                retry=retry_if_exception_type(httpx.HTTPError),
+                reraise=True,
+            ):
+                with attempt, span("payload"):
+                    check_deadline(f"PayloadCMS {method} {url}")
+                    response = await self._client.request(
+                        method,
+                        url,
+                        params=params,
+                        json=json,
+                        timeout=clamp_timeout(self._timeout),
+                    )
+                    response.raise_for_status()
+                    data = response.json()
+                    if isinstance(data, dict) and "doc" in data:
+                        return data["doc"]
+                    return data
+        except httpx.TimeoutException as exc:
+            left = remaining()
+            if left is not None and left <= 0:
+                raise DeadlineExceeded(f"Request deadline exceeded during PayloadCMS {method} {url}") from exc
+            raise
 
         raise PayloadCMSException(f"Failed to call PayloadCMS {method} {url}")
 
@@ -89,6 +126,9 @@ class PayloadCMSService:
     async def create_relationship(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         return await self._request("POST", "/api/character-relationships", json=payload)
 
+    async def delete_relationship(self, relationship_id: str) -> Dict[str, Any]:
+        return await self._request("DELETE", f"/api/character-relationships/{relationship_id}")
+
     async def create_scene(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         return await self._request("POST", "/api/story-bible-scenes", json=payload)
 
@@ -110,5 +150,16 @@ class PayloadCMSService:
     async def create_story_outline(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         return await self._request("POST", "/api/story-outlines", json=payload)
 
+    async def list_story_outlines(self, story_bible_id: str) -> List[Dict[str, Any]]:
+        data = await self._request(
+            "GET",
+            "/api/story-outlines",
+            params={"where[story_bible][equals]": story_bible_id, "depth": 0, "pagination": "false"},
+        )
+        return data.get("docs", []) if isinstance(data, dict) else data
+
+    async def delete_story_outline(self, outline_id: str) -> Dict[str, Any]:
+        return await self._request("DELETE", f"/api/story-outlines/{outline_id}")
+
     async def log_change(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         return await self._request("POST", "/api/story-bible-changes", json=payload)
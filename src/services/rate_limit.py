@@ -0,0 +1,157 @@
+"""Token-bucket rate limiting for inbound REST and MCP traffic.
+
+Every request is charged to two buckets of its category (``read``, ``write``
+or ``ai``): one for the user and, when the story bible's project is known, a
+larger one shared by everybody working on that project.  A request is
+admitted only if both buckets hold a token, so a runaway orchestrator loop
+is throttled long before it can flood PayloadCMS or the Brain Service.
+
+Bucket state lives behind :class:`RateLimitStore`.  The in-memory store
+suits a single worker; deployments with several workers plug in a shared
+store implementing the same ``take`` method.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Literal, Mapping, NamedTuple, Optional, Protocol, Sequence
+
+from ..utils.exceptions import ServiceOverloaded
+
+
+Category = Literal["read", "write", "ai"]
+CATEGORIES = ("read", "write", "ai")
+
+# Tools that call the Brain Service, whatever their verb.
+AI_TOOLS = frozenset(
+    {
+        "validate_story_consistency",
+        "generate_character_arc",
+        "suggest_scene_transitions",
+        "find_similar",
+        "submit_job",
+    }
+)
+_READ_PREFIXES = ("get_", "list_", "find_", "search_", "generate_story_bible_export", "export_snapshot", "diff_")
+
+
+def classify_tool(name: str) -> Category:
+    if name in AI_TOOLS:
+        return "ai"
+    return "read" if name.startswith(_READ_PREFIXES) else "write"
+
+
+class Bucket(NamedTuple):
+    key: str
+    capacity: float
+    refill_per_second: float
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_seconds: float
+    retry_after: float = 0.0
+    category: str = ""
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset_seconds)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(math.ceil(self.retry_after))
+        return headers
+
+    def raise_if_limited(self) -> None:
+        if not self.allowed:
+            raise ServiceOverloaded(
+                f"Rate limit exceeded for {self.category} requests, retry in {math.ceil(self.retry_after)}s",
+                status_code=429,
+                retry_after=math.ceil(self.retry_after),
+            )
+
+
+class RateLimitStore(Protocol):
+    async def take(self, buckets: Sequence[Bucket], cost: float = 1.0) -> Decision:
+        """Take ``cost`` tokens from every bucket, or from none if any of them is short."""
+
+
+class MemoryRateLimitStore:
+    """Per-process buckets; idle buckets beyond ``max_keys`` are forgotten (i.e. refilled)."""
+
+    def __init__(self, *, max_keys: int = 10_000, clock: Callable[[], float] = time.monotonic) -> None:
+        self._max_keys = max_keys
+        self._clock = clock
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def _level(self, bucket: Bucket, now: float) -> float:
+        state = self._buckets.get(bucket.key)
+        if state is None:
+            return bucket.capacity
+        self._buckets.move_to_end(bucket.key)
+        tokens, updated = state
+        return min(bucket.capacity, tokens + (now - updated) * bucket.refill_per_second)
+
+    async def take(self, buckets: Sequence[Bucket], cost: float = 1.0) -> Decision:
+        now = self._clock()
+        levels = [self._level(bucket, now) for bucket in buckets]
+        short = [(bucket, level) for bucket, level in zip(buckets, levels) if level < cost]
+        if short:
+            bucket, level = max(short, key=lambda item: (cost - item[1]) / item[0].refill_per_second)
+            return Decision(
+                allowed=False,
+                limit=int(bucket.capacity),
+                remaining=0,
+                reset_seconds=(bucket.capacity - level) / bucket.refill_per_second,
+                retry_after=(cost - level) / bucket.refill_per_second,
+            )
+
+        for bucket, level in zip(buckets, levels):
+            self._buckets[bucket.key] = [level - cost, now]
+            self._buckets.move_to_end(bucket.key)
+        while len(self._buckets) > self._max_keys:
+            self._buckets.popitem(last=False)
+        # Report the bucket closest to running dry.
+        bucket, level = min(zip(buckets, levels), key=lambda item: item[1] - cost)
+        return Decision(
+            allowed=True,
+            limit=int(bucket.capacity),
+            remaining=int(level - cost),
+            reset_seconds=(bucket.capacity - level + cost) / bucket.refill_per_second,
+        )
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        store: Optional[RateLimitStore] = None,
+        *,
+        per_minute: Mapping[str, float],
+        project_multiplier: float = 5.0,
+    ) -> None:
+        missing = set(CATEGORIES) - set(per_minute)
+        if missing:
+            raise ValueError(f"Missing rate limits for {sorted(missing)}")
+        self._store = store or MemoryRateLimitStore()
+        self._per_minute = dict(per_minute)
+        self._project_multiplier = project_multiplier
+
+    @property
+    def store(self) -> RateLimitStore:
+        return self._store
+
+    async def check(self, category: Category, user_id: str, project_id: Optional[str] = None) -> Optional[Decision]:
+        """Charge one request to the user's (and project's) ``category`` buckets; ``None`` if unlimited."""
+        rate = self._per_minute[category]
+        if rate <= 0:
+            return None
+        buckets = [Bucket(f"{category}:user:{user_id}", rate, rate / 60)]
+        if project_id:
+            project_rate = rate * self._project_multiplier
+            buckets.append(Bucket(f"{category}:project:{project_id}", project_rate, project_rate / 60))
+        return replace(await self._store.take(buckets), category=category)
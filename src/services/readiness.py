@@ -0,0 +1,113 @@
+"""Dependency probes behind ``/health/ready``.
+
+Probes run on an interval in the background and ``/health/ready`` only reads
+the last results, so a slow or unreachable dependency never makes the probe
+endpoint itself slow.  A failing *required* probe makes the service not
+ready; an optional one (the Brain Service, which has an HTTP fallback) only
+marks it degraded.
+"""
+
+import asyncio
+import contextvars
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# A probe returns details to report (``ok`` defaults to true) or raises.
+Probe = Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+
+
+@dataclass
+class _Check:
+    probe: Probe
+    required: bool
+    result: Dict[str, Any] = field(default_factory=dict)
+
+
+class ReadinessMonitor:
+    def __init__(
+        self,
+        *,
+        interval_seconds: float = 10.0,
+        timeout_seconds: float = 3.0,
+        on_first_ready: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self._interval = interval_seconds
+        self._timeout = timeout_seconds
+        self._on_first_ready = on_first_ready
+        self._checks: Dict[str, _Check] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._rounds = 0
+        self._was_ready = False
+
+    def add(self, name: str, probe: Probe, *, required: bool = True) -> None:
+        self._checks[name] = _Check(probe=probe, required=required)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="readiness-probes", context=contextvars.Context())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self._interval)
+
+    async def _probe(self, name: str, check: _Check) -> None:
+        started = time.perf_counter()
+        result: Dict[str, Any]
+        try:
+            details = await asyncio.wait_for(check.probe(), self._timeout)
+            result = {"ok": True, **(details or {})}
+        except asyncio.TimeoutError:
+            result = {"ok": False, "error": f"timed out after {self._timeout:g}s"}
+        except Exception as exc:  # noqa: BLE001
+            result = {"ok": False, "error": str(exc) or type(exc).__name__}
+        result["required"] = check.required
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        result["checked_at"] = int(time.time())
+        if check.result.get("ok", True) and not result["ok"]:
+            logger.warning("Readiness check %s failing: %s", name, result.get("error", result))
+        check.result = result
+
+    async def refresh(self) -> None:
+        """Run every probe once, concurrently."""
+        await asyncio.gather(*(self._probe(name, check) for name, check in self._checks.items()))
+        self._rounds += 1
+        if self.ready and not self._was_ready:
+            self._was_ready = True
+            if self._on_first_ready is not None:
+                self._on_first_ready()
+
+    @property
+    def ready(self) -> bool:
+        if self._rounds == 0:
+            return False
+        return all(check.result.get("ok") for check in self._checks.values() if check.required)
+
+    def snapshot(self) -> Dict[str, Any]:
+        if self._rounds == 0:
+            status = "starting"
+        elif not self.ready:
+            status = "not_ready"
+        elif all(check.result.get("ok") for check in self._checks.values()):
+            status = "ready"
+        else:
+            status = "degraded"
+        return {
+            "status": status,
+            "checks": {name: dict(check.result) for name, check in self._checks.items()},
+        }
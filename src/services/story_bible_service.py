@@ -1,7 +1,18 @@
 """Business logic for story bible operations."""
 
-from typing import Any, Dict, List, Optional
+import asyncio
+import contextvars
+import json
+import logging
+import uuid
+import weakref
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple, Type
 
+from pydantic import BaseModel, ValidationError
+
+from ..cache import Cache, MemoryCacheBackend
+from ..continuity import ContinuityEngine
+from ..indexes import IndexManager, StoryBibleIndexes
 from ..models import (
     AuthenticatedUser,
     CharacterCreate,
@@ -13,23 +24,239 @@ from ..models import (
     StoryBibleUpdate,
     StoryOutlineCreate,
 )
-from ..utils.exceptions import AuthorizationError, PayloadCMSException
+from ..snapshots import MemorySnapshotStore, SnapshotManager, diff_manifests, freeze
+from ..utils.compression import compress_async
+from ..utils.exceptions import AuthorizationError, JsonPatchError, PayloadCMSException, ServiceError
+from ..utils.formatting import render_diff_markdown
+from ..utils.json_patch import apply_patch, changed_fields
+from ..utils.references import ref_id, ref_ids
+from ..utils.sequencing import resequence
 from ..utils.validation import ensure_project_access
 from .brain_client import BrainServiceClient
+from .brain_scheduler import brain_caller
+from .change_feed import ChangeBroker, ChangeLog
+from .cloning import ProgressCallback, StoryBibleCloner
+from .embeddings import Embedder, HashingEmbedder
 from .export_service import ExportService
+from .jobs import Job, JobQueue
 from .payload_service import PayloadCMSService
 
 
+logger = logging.getLogger(__name__)
+
+# Relationship fields that JSON Patch paths address by id, whatever depth they were fetched at.
+_SCENE_REFERENCES: Dict[str, type] = {"characters_present": list, "plot_threads": list}
+_PLOT_THREAD_REFERENCES: Dict[str, type] = {"introduction_scene": str, "resolution_scene": str, "key_scenes": list}
+
+# Author recorded for changes that arrive through PayloadCMS webhooks.
+_PAYLOAD_ACTOR = AuthenticatedUser(id="payloadcms", email=None)
+
+_JOB_KINDS = ("validate_story_consistency", "generate_character_arc", "clone_story_bible")
+
+# Story bible fields a clone does not inherit from its source.
+_CLONE_RESET_FIELDS = frozenset({"id", "createdAt", "updatedAt", "created_at", "updated_at", "status", "created_by"})
+
+
 class StoryBibleService:
     def __init__(
         self,
         payload_service: PayloadCMSService,
         brain_client: BrainServiceClient,
         export_service: ExportService,
+        index_manager: Optional[IndexManager] = None,
+        *,
+        scene_transition_window: int = 3,
+        continuity_engine: Optional[ContinuityEngine] = None,
+        embedder: Optional[Embedder] = None,
+        change_broker: Optional[ChangeBroker] = None,
+        change_log: Optional[ChangeLog] = None,
+        reorder_concurrency: int = 8,
+        job_queue: Optional[JobQueue] = None,
+        cache: Optional[Cache] = None,
+        document_cache_ttl: float = 300.0,
+        export_cache_ttl: float = 3600.0,
+        brain_result_cache_ttl: float = 3600.0,
+        compression_min_size: int = 1024,
+        compression_offload_size: int = 256 * 1024,
+        snapshots: Optional[SnapshotManager] = None,
+        clone_concurrency: int = 8,
     ) -> None:
         self._payload = payload_service
         self._brain = brain_client
         self._export = export_service
+        self._indexes = index_manager or IndexManager()
+        self._scene_transition_window = scene_transition_window
+        self._continuity = continuity_engine or ContinuityEngine()
+        self._embedder = embedder or HashingEmbedder()
+        self._changes = change_broker or ChangeBroker()
+        self._change_log = change_log or ChangeLog()
+        self._reorder_concurrency = reorder_concurrency
+        self._jobs = job_queue or JobQueue()
+        self._cache = cache or Cache(MemoryCacheBackend())
+        # Writes made by other workers invalidate this worker's indexes too.
+        self._cache.on_invalidate(self._indexes.invalidate)
+        self._document_cache_ttl = document_cache_ttl
+        self._export_cache_ttl = export_cache_ttl
+        self._brain_result_cache_ttl = brain_result_cache_ttl
+        self._compression_min_size = compression_min_size
+        self._compression_offload_size = compression_offload_size
+        self._snapshots = snapshots or SnapshotManager(MemorySnapshotStore())
+        self._cloner = StoryBibleCloner(payload_service, concurrency=clone_concurrency)
+        self._entity_locks: "weakref.WeakValueDictionary[Tuple[str, str], asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+
+    @property
+    def changes(self) -> ChangeBroker:
+        return self._changes
+
+    async def _record_change(
+        self,
+        story_bible_id: str,
+        collection: str,
+        entity: Dict[str, Any],
+        operation: str,
+        fields: Iterable[str],
+        user: AuthenticatedUser,
+        *,
+        invalidate: bool = True,
+    ) -> int:
+        """Version a successful write, drop cached copies everywhere and push it to live subscribers."""
+        if invalidate:
+            await self._cache.invalidate_story_bible(story_bible_id)
+        event = {
+            "type": "change",
+            "story_bible_id": story_bible_id,
+            "collection": collection,
+            "id": entity.get("id"),
+            "operation": operation,
+            "fields": sorted(fields),
+            "user": user.id,
+        }
+        version = self._change_log.record(
+            story_bible_id, {**event, "data": entity if operation != "deleted" else None}
+        )
+        self._changes.publish(story_bible_id, {**event, "version": version})
+        return version
+
+    @staticmethod
+    def _indexed_entity(indexes: StoryBibleIndexes, collection: str, entity_id: str) -> Optional[Dict[str, Any]]:
+        if collection == "story-bibles":
+            return indexes.summary
+        if collection == "story-bible-scenes":
+            return indexes.scenes.get(entity_id)
+        if collection == "story-bible-characters":
+            return indexes.characters.get(entity_id)
+        if collection == "plot-threads":
+            return indexes.plot_threads.get(entity_id)
+        return None
+
+    def _apply_external_change(self, story_bible_id: str, collection: str, operation: str, doc: Dict[str, Any]) -> None:
+        entity_id = str(doc.get("id"))
+        if collection == "story-bibles":
+            self._indexes.on_story_bible_written(story_bible_id, doc)
+        elif collection == "story-bible-scenes":
+            if operation == "deleted":
+                self._indexes.on_scene_deleted(story_bible_id, entity_id)
+            else:
+                self._indexes.on_scene_written(story_bible_id, doc)
+        elif collection == "story-bible-characters":
+            if operation == "deleted":
+                self._indexes.on_character_deleted(story_bible_id, entity_id)
+            else:
+                self._indexes.on_character_written(story_bible_id, doc)
+        elif collection == "plot-threads":
+            if operation == "deleted":
+                self._indexes.on_plot_thread_deleted(story_bible_id, entity_id)
+            else:
+                self._indexes.on_plot_thread_written(story_bible_id, doc)
+        elif collection == "character-relationships":
+            if operation == "deleted":
+                self._indexes.on_relationship_deleted(story_bible_id, entity_id)
+            else:
+                self._indexes.on_relationship_written(story_bible_id, doc)
+
+    async def apply_external_changes(
+        self,
+        story_bible_id: str,
+        events: List[Dict[str, Any]],
+        full_refresh: bool = False,
+    ) -> int:
+        """Bring caches, indexes and change subscribers up to date with edits made in PayloadCMS itself.
+
+        Events echoing a write this worker already indexed (same ``updatedAt``)
+        are skipped.  Returns the number of events applied.
+        """
+        indexes = self._indexes.peek(story_bible_id)
+        if indexes is not None:
+            fresh = []
+            for event in events:
+                doc = event["doc"]
+                indexed = self._indexed_entity(indexes, event["collection"], str(doc.get("id")))
+                echoed = (
+                    event["operation"] != "deleted"
+                    and indexed is not None
+                    and doc.get("updatedAt") is not None
+                    and indexed.get("updatedAt") == doc.get("updatedAt")
+                )
+                if not echoed:
+                    fresh.append(event)
+            events = fresh
+        if not events:
+            return 0
+
+        await self._cache.invalidate_story_bible(story_bible_id)
+        bible_deleted = any(
+            event["collection"] == "story-bibles" and event["operation"] == "deleted" for event in events
+        )
+        if full_refresh or bible_deleted:
+            self._indexes.invalidate(story_bible_id)
+        else:
+            for event in events:
+                self._apply_external_change(story_bible_id, event["collection"], event["operation"], event["doc"])
+
+        for event in events:
+            doc, previous = event["doc"], event.get("previous_doc")
+            if event["operation"] == "deleted":
+                fields: Iterable[str] = ()
+            elif previous:
+                fields = changed_fields(previous, doc)
+            else:
+                fields = [key for key in doc if key != "id"]
+            await self._record_change(
+                story_bible_id, event["collection"], doc, event["operation"], fields, _PAYLOAD_ACTOR, invalidate=False
+            )
+        return len(events)
+
+    def _entity_lock(self, kind: str, entity_id: str) -> asyncio.Lock:
+        """Serialises read-modify-write cycles on one entity within this worker."""
+        lock = self._entity_locks.get((kind, entity_id))
+        if lock is None:
+            lock = asyncio.Lock()
+            self._entity_locks[(kind, entity_id)] = lock
+        return lock
+
+    @staticmethod
+    def _patched_fields(
+        document: Dict[str, Any],
+        operations: List[Dict[str, Any]],
+        model: Type[BaseModel],
+        references: Optional[Dict[str, type]] = None,
+    ) -> Dict[str, Any]:
+        """Apply ``operations`` to ``document`` and return only the top-level fields that changed."""
+        base = dict(document)
+        for field, shape in (references or {}).items():
+            if field in base:
+                base[field] = ref_ids(base[field]) if shape is list else ref_id(base[field])
+        changes = changed_fields(base, apply_patch(base, operations))
+        not_patchable = sorted(set(changes) - set(model.model_fields))
+        if not_patchable:
+            raise JsonPatchError(f"Fields cannot be patched: {', '.join(not_patchable)}")
+        try:
+            model.model_validate({key: value for key, value in changes.items() if value is not None})
+        except ValidationError as exc:
+            raise JsonPatchError(f"Patched document is invalid: {exc}") from exc
+        return changes
 
     async def list_story_bibles(self, project_id: str, user: AuthenticatedUser) -> Dict[str, Any]:
         ensure_project_access(project_id, user)
@@ -53,12 +280,122 @@ class StoryBibleService:
         *,
         populate: bool = True,
     ) -> Dict[str, Any]:
-        story_bible = await self._payload.get_story_bible(story_bible_id, populate=populate)
+        _, _, story_bible = await self._story_bible_entry(story_bible_id, user, populate)
+        return story_bible
+
+    async def story_bible_document(
+        self,
+        story_bible_id: str,
+        user: AuthenticatedUser,
+        *,
+        populate: bool = True,
+        encoding: Optional[str] = None,
+    ) -> Tuple[bytes, Optional[str]]:
+        """The bible as JSON bytes, compressed with ``encoding`` when it is large enough."""
+        key, body, _ = await self._story_bible_entry(story_bible_id, user, populate)
+        return await self._encoded(key, body, encoding, self._document_cache_ttl)
+
+    async def _story_bible_entry(
+        self,
+        story_bible_id: str,
+        user: AuthenticatedUser,
+        populate: bool,
+    ) -> Tuple[Optional[str], bytes, Dict[str, Any]]:
+        """Cache key, cached JSON and parsed document of a bible the user may read."""
+        key = await self._cache.key("story-bible", populate, story_bible_id=story_bible_id)
+        body = await self._cache.get_bytes(key)
+        if body is not None:
+            story_bible = json.loads(body)
+        else:
+            story_bible = await self._payload.get_story_bible(story_bible_id, populate=populate)
+            body = json.dumps(story_bible, default=str).encode()
+            await self._cache.set_bytes(key, body, self._document_cache_ttl)
         project_id = story_bible.get("project_id")
         if not project_id:
             raise PayloadCMSException("Story bible missing project_id")
         ensure_project_access(project_id, user)
-        return story_bible
+        return key, body, story_bible
+
+    async def _encoded(
+        self,
+        key: Optional[str],
+        content: bytes,
+        encoding: Optional[str],
+        ttl: float,
+    ) -> Tuple[bytes, Optional[str]]:
+        """``content`` compressed with ``encoding``, cached next to the plain copy under ``key``."""
+        if encoding is None or len(content) < self._compression_min_size:
+            return content, None
+        variant_key = f"{key}:{encoding}" if key is not None else None
+        compressed = await self._cache.get_bytes(variant_key)
+        if compressed is None:
+            compressed = await compress_async(content, encoding, offload_size=self._compression_offload_size)
+            await self._cache.set_bytes(variant_key, compressed, ttl)
+        return compressed, encoding
+
+    async def get_indexes(self, story_bible_id: str, user: AuthenticatedUser) -> StoryBibleIndexes:
+        indexes = await self._indexes.get(
+            story_bible_id,
+            lambda: self.get_story_bible(story_bible_id, user, populate=True),
+        )
+        if not indexes.project_id:
+            raise PayloadCMSException("Story bible missing project_id")
+        ensure_project_access(indexes.project_id, user)
+        return indexes
+
+    async def warm_state(self) -> Dict[str, Any]:
+        """Readiness details: whether any story bible has been loaded into the in-process indexes yet."""
+        indexed = len(self._indexes)
+        return {"warm": indexed > 0, "indexed_story_bibles": indexed}
+
+    def cached_project_id(self, story_bible_id: str) -> Optional[str]:
+        """Project of an already indexed story bible, without loading it or checking access."""
+        indexes = self._indexes.peek(story_bible_id)
+        return indexes.project_id if indexes is not None else None
+
+    async def get_changes(
+        self,
+        story_bible_id: str,
+        user: AuthenticatedUser,
+        *,
+        since: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Entities written since ``since``, or a full snapshot when that version is unknown.
+
+        The change log is per process (see :class:`ChangeLog`), so a version
+        issued by another worker always gets the snapshot.
+        """
+        await self.get_story_bible(story_bible_id, user, populate=False)
+        version = self._change_log.current_version(story_bible_id)
+        entries = self._change_log.since(story_bible_id, since) if since is not None else None
+        if entries is None:
+            story_bible = await self.get_story_bible(story_bible_id, user, populate=True)
+            return {
+                "story_bible_id": story_bible_id,
+                "version": version,
+                "snapshot": True,
+                "story_bible": story_bible,
+            }
+
+        latest: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+        for entry_version, entry in entries:
+            key = (entry["collection"], entry["id"])
+            previous = latest.pop(key, None)
+            change = {**entry, "version": entry_version}
+            change.pop("type", None)
+            change.pop("story_bible_id", None)
+            if previous is not None and change["operation"] != "deleted":
+                change["fields"] = sorted({*previous["fields"], *change["fields"]})
+                if previous["operation"] == "created":
+                    change["operation"] = "created"
+            latest[key] = change
+        return {
+            "story_bible_id": story_bible_id,
+            "version": version,
+            "since": since,
+            "snapshot": False,
+            "changes": list(latest.values()),
+        }
 
     async def update_story_bible(
         self,
@@ -70,19 +407,76 @@ class StoryBibleService:
         payload = data.model_dump(exclude_none=True)
         if not payload:
             return story_bible
+        async with self._entity_lock("story_bible", story_bible_id):
+            return await self._write_story_bible(story_bible_id, payload, user)
+
+    async def patch_story_bible(
+        self,
+        story_bible_id: str,
+        operations: List[Dict[str, Any]],
+        user: AuthenticatedUser,
+    ) -> Dict[str, Any]:
+        indexes = await self.get_indexes(story_bible_id, user)
+        async with self._entity_lock("story_bible", story_bible_id):
+            payload = self._patched_fields(indexes.summary, operations, StoryBibleUpdate)
+            if not payload:
+                return indexes.summary
+            return await self._write_story_bible(story_bible_id, payload, user)
+
+    async def _write_story_bible(
+        self,
+        story_bible_id: str,
+        payload: Dict[str, Any],
+        user: AuthenticatedUser,
+    ) -> Dict[str, Any]:
         updated = await self._payload.update_story_bible(story_bible_id, payload)
+        self._indexes.on_story_bible_written(story_bible_id, updated)
+        version = await self._record_change(
+            story_bible_id, "story-bibles", {"id": story_bible_id, **updated}, "updated", payload, user
+        )
         await self._payload.log_change(
             {
                 "story_bible": story_bible_id,
                 "user": user.id,
                 "changes": payload,
+                "version": version,
             }
         )
         return updated
 
     async def delete_story_bible(self, story_bible_id: str, user: AuthenticatedUser) -> Dict[str, Any]:
         await self.get_story_bible(story_bible_id, user, populate=False)
-        return await self._payload.delete_story_bible(story_bible_id)
+        deleted = await self._payload.delete_story_bible(story_bible_id)
+        self._indexes.invalidate(story_bible_id)
+        await self._record_change(story_bible_id, "story-bibles", {"id": story_bible_id}, "deleted", (), user)
+        return deleted
+
+    async def clone_story_bible(
+        self,
+        story_bible_id: str,
+        user: AuthenticatedUser,
+        *,
+        title: Optional[str] = None,
+        project_id: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """Copy a bible and all its entities into a new draft, remapping every cross-reference.
+
+        A failed copy is rolled back; see :mod:`.cloning`.
+        """
+        indexes = await self.get_indexes(story_bible_id, user)
+        target_project = project_id or str(indexes.project_id)
+        ensure_project_access(target_project, user)
+        outlines = await self._payload.list_story_outlines(story_bible_id)
+        summary = {key: value for key, value in indexes.summary.items() if key not in _CLONE_RESET_FIELDS}
+        story_bible = {
+            **summary,
+            "project_id": target_project,
+            "title": title or f"{summary.get('title') or 'Untitled'} (copy)",
+            "status": "draft",
+            "created_by": user.id,
+        }
+        return await self._cloner.clone(indexes.to_story_bible(), story_bible, outlines, progress=progress)
 
     async def add_character(
         self,
@@ -98,7 +492,11 @@ class StoryBibleService:
             rel_payload = relationship.model_dump(exclude_none=True)
             rel_payload["story_bible"] = story_bible_id
             rel_payload.setdefault("character_from", character.get("id"))
-            await self._payload.create_relationship(rel_payload)
+            created = await self._payload.create_relationship(rel_payload)
+            self._indexes.on_relationship_written(story_bible_id, created)
+            await self._record_change(story_bible_id, "character-relationships", created, "created", rel_payload, user)
+        self._indexes.on_character_written(story_bible_id, character)
+        await self._record_change(story_bible_id, "story-bible-characters", character, "created", payload, user)
         return character
 
     async def update_character(
@@ -109,7 +507,12 @@ class StoryBibleService:
         user: AuthenticatedUser,
     ) -> Dict[str, Any]:
         await self.get_story_bible(story_bible_id, user, populate=False)
-        return await self._payload.update_character(character_id, payload)
+        character = await self._payload.update_character(character_id, payload)
+        self._indexes.on_character_written(story_bible_id, character)
+        await self._record_change(
+            story_bible_id, "story-bible-characters", {"id": character_id, **character}, "updated", payload, user
+        )
+        return character
 
     async def add_scene(
         self,
@@ -119,7 +522,10 @@ class StoryBibleService:
         story_bible = await self.get_story_bible(data.story_bible_id, user, populate=False)
         payload = data.model_dump(by_alias=True, exclude_none=True)
         payload["story_bible"] = story_bible["id"]
-        return await self._payload.create_scene(payload)
+        scene = await self._payload.create_scene(payload)
+        self._indexes.on_scene_written(data.story_bible_id, scene)
+        await self._record_change(data.story_bible_id, "story-bible-scenes", scene, "created", payload, user)
+        return scene
 
     async def update_scene(
         self,
@@ -130,7 +536,119 @@ class StoryBibleService:
     ) -> Dict[str, Any]:
         await self.get_story_bible(story_bible_id, user, populate=False)
         payload = data.model_dump(exclude_none=True)
-        return await self._payload.update_scene(scene_id, payload)
+        async with self._entity_lock("scene", scene_id):
+            return await self._write_scene(story_bible_id, scene_id, payload, user)
+
+    async def patch_scene(
+        self,
+        story_bible_id: str,
+        scene_id: str,
+        operations: List[Dict[str, Any]],
+        user: AuthenticatedUser,
+    ) -> Dict[str, Any]:
+        indexes = await self.get_indexes(story_bible_id, user)
+        async with self._entity_lock("scene", scene_id):
+            current = indexes.scenes.get(scene_id)
+            if current is None:
+                raise AuthorizationError("Scene not found in story bible")
+            payload = self._patched_fields(current, operations, SceneUpdate, _SCENE_REFERENCES)
+            if not payload:
+                return current
+            return await self._write_scene(story_bible_id, scene_id, payload, user)
+
+    async def reorder_scenes(
+        self,
+        story_bible_id: str,
+        scene_ids: List[str],
+        user: AuthenticatedUser,
+    ) -> Dict[str, Any]:
+        """Renumber scenes to follow ``scene_ids``, rewriting as few scenes as possible.
+
+        If any write fails the scenes already renumbered are put back, so a
+        failed reorder leaves the previous order in place.
+        """
+        indexes = await self.get_indexes(story_bible_id, user)
+        if len(set(scene_ids)) != len(scene_ids):
+            raise ServiceError("scene_ids must not contain duplicates")
+        if set(scene_ids) != set(indexes.scenes.ordered_ids()):
+            raise ServiceError("scene_ids must list every scene of the story bible exactly once")
+
+        current = [int(indexes.scenes.value(scene_id, "sequence_number") or 0) for scene_id in scene_ids]
+        numbers = resequence(current)
+        writes = [
+            (scene_id, number, previous)
+            for scene_id, number, previous in zip(scene_ids, numbers, current)
+            if number != previous
+        ]
+        semaphore = asyncio.Semaphore(self._reorder_concurrency)
+        applied: List[Tuple[str, int, int]] = []
+
+        async def renumber(scene_id: str, number: int, previous: int) -> None:
+            async with semaphore, self._entity_lock("scene", scene_id):
+                await self._write_scene(story_bible_id, scene_id, {"sequence_number": number}, user)
+            applied.append((scene_id, previous, number))
+
+        try:
+            results = await asyncio.gather(*(renumber(*write) for write in writes), return_exceptions=True)
+            failures = [result for result in results if isinstance(result, BaseException)]
+            if failures:
+                logger.warning(
+                    "Scene reorder for %s failed on %d of %d writes", story_bible_id, len(failures), len(writes)
+                )
+                raise failures[0]
+        except BaseException:
+            # Revert from a fresh context, as a clone rollback does: the deadline may be what ran out.
+            revert = asyncio.create_task(
+                self._revert_scene_numbers(story_bible_id, applied, user), context=contextvars.Context()
+            )
+            await asyncio.shield(revert)
+            raise
+        return {
+            "story_bible_id": story_bible_id,
+            "order": [
+                {"id": scene_id, "sequence_number": number} for scene_id, number in zip(scene_ids, numbers)
+            ],
+            "writes": len(writes),
+        }
+
+    async def _revert_scene_numbers(
+        self,
+        story_bible_id: str,
+        applied: List[Tuple[str, int, int]],
+        user: AuthenticatedUser,
+    ) -> None:
+        if not applied:
+            return
+        semaphore = asyncio.Semaphore(self._reorder_concurrency)
+
+        async def restore(scene_id: str, previous: int, _number: int) -> None:
+            async with semaphore, self._entity_lock("scene", scene_id):
+                await self._write_scene(story_bible_id, scene_id, {"sequence_number": previous}, user)
+
+        results = await asyncio.gather(*(restore(*write) for write in applied), return_exceptions=True)
+        failed = [write for write, result in zip(applied, results) if isinstance(result, BaseException)]
+        if failed:
+            logger.error(
+                "Scene reorder rollback for %s left %d of %d scenes renumbered: %s",
+                story_bible_id,
+                len(failed),
+                len(applied),
+                [{"id": scene_id, "sequence_number": number} for scene_id, _previous, number in failed],
+            )
+        else:
+            logger.info("Reverted %d scene renumbers of a failed reorder", len(applied))
+
+    async def _write_scene(
+        self,
+        story_bible_id: str,
+        scene_id: str,
+        payload: Dict[str, Any],
+        user: AuthenticatedUser,
+    ) -> Dict[str, Any]:
+        scene = await self._payload.update_scene(scene_id, payload)
+        self._indexes.on_scene_written(story_bible_id, scene)
+        await self._record_change(story_bible_id, "story-bible-scenes", {"id": scene_id, **scene}, "updated", payload, user)
+        return scene
 
     async def create_plot_thread(
         self,
@@ -139,7 +657,10 @@ class StoryBibleService:
     ) -> Dict[str, Any]:
         await self.get_story_bible(data.story_bible_id, user, populate=False)
         payload = data.model_dump(by_alias=True, exclude_none=True)
-        return await self._payload.create_plot_thread(payload)
+        thread = await self._payload.create_plot_thread(payload)
+        self._indexes.on_plot_thread_written(data.story_bible_id, thread)
+        await self._record_change(data.story_bible_id, "plot-threads", thread, "created", payload, user)
+        return thread
 
     async def update_plot_thread(
         self,
@@ -150,7 +671,37 @@ class StoryBibleService:
     ) -> Dict[str, Any]:
         await self.get_story_bible(story_bible_id, user, populate=False)
         payload = data.model_dump(exclude_none=True)
-        return await self._payload.update_plot_thread(thread_id, payload)
+        async with self._entity_lock("plot_thread", thread_id):
+            return await self._write_plot_thread(story_bible_id, thread_id, payload, user)
+
+    async def patch_plot_thread(
+        self,
+        story_bible_id: str,
+        thread_id: str,
+        operations: List[Dict[str, Any]],
+        user: AuthenticatedUser,
+    ) -> Dict[str, Any]:
+        indexes = await self.get_indexes(story_bible_id, user)
+        async with self._entity_lock("plot_thread", thread_id):
+            current = indexes.plot_threads.get(thread_id)
+            if current is None:
+                raise AuthorizationError("Plot thread not found in story bible")
+            payload = self._patched_fields(current, operations, PlotThreadUpdate, _PLOT_THREAD_REFERENCES)
+            if not payload:
+                return current
+            return await self._write_plot_thread(story_bible_id, thread_id, payload, user)
+
+    async def _write_plot_thread(
+        self,
+        story_bible_id: str,
+        thread_id: str,
+        payload: Dict[str, Any],
+        user: AuthenticatedUser,
+    ) -> Dict[str, Any]:
+        thread = await self._payload.update_plot_thread(thread_id, payload)
+        self._indexes.on_plot_thread_written(story_bible_id, thread)
+        await self._record_change(story_bible_id, "plot-threads", {"id": thread_id, **thread}, "updated", payload, user)
+        return thread
 
     async def create_story_outline(
         self,
@@ -159,18 +710,27 @@ class StoryBibleService:
     ) -> Dict[str, Any]:
         await self.get_story_bible(data.story_bible_id, user, populate=False)
         payload = data.model_dump(by_alias=True, exclude_none=True)
-        return await self._payload.create_story_outline(payload)
+        outline = await self._payload.create_story_outline(payload)
+        await self._record_change(data.story_bible_id, "story-outlines", outline, "created", payload, user)
+        return outline
 
     async def validate_story_consistency(
         self,
         story_bible_id: str,
         user: AuthenticatedUser,
+        *,
+        fast: bool = False,
     ) -> Dict[str, Any]:
-        story_bible = await self.get_story_bible(story_bible_id, user, populate=True)
-        return await self._brain.call_tool(
+        indexes = await self.get_indexes(story_bible_id, user)
+        report = self._continuity.run(indexes)
+        if fast:
+            return {"rule_findings": report, "brain_skipped": True}
+        result = await self._call_brain(
+            indexes,
             "validate_story_consistency",
-            {"story_bible": story_bible},
+            lambda: {"story_bible": indexes.to_story_bible(), "rule_findings": report["findings"]},
         )
+        return {**result, "rule_findings": report} if isinstance(result, dict) else result
 
     async def generate_character_arc(
         self,
@@ -179,44 +739,291 @@ class StoryBibleService:
         user: AuthenticatedUser,
         context: Optional[str] = None,
     ) -> Dict[str, Any]:
-        story_bible = await self.get_story_bible(story_bible_id, user, populate=True)
-        character = next(
-            (
-                char
-                for char in story_bible.get("characters", [])
-                if char.get("id") == character_id
-            ),
-            None,
-        )
-        if not character:
+        indexes = await self.get_indexes(story_bible_id, user)
+        bundle = indexes.character_context(character_id)
+        if bundle is None:
             raise AuthorizationError(f"Character {character_id} not found in story bible {story_bible_id}")
-        return await self._brain.call_tool(
+        story_context: Any = context or bundle
+        context_bytes = len(json.dumps(story_context, default=str))
+        logger.info(
+            "Character arc context for %s/%s: %d bytes, %d scenes, %d relationships, %d plot threads",
+            story_bible_id,
+            character_id,
+            context_bytes,
+            len(bundle["scenes"]),
+            len(bundle["relationships"]),
+            len(bundle["plot_threads"]),
+        )
+        result = await self._call_brain(
+            indexes,
             "generate_character_arc",
-            {"character": character, "story_context": context or story_bible},
+            lambda: {"character": bundle["character"], "story_context": story_context},
+            character_id,
+            context,
         )
+        context_stats = {
+            "bytes": context_bytes,
+            "scenes": len(bundle["scenes"]),
+            "relationships": len(bundle["relationships"]),
+            "plot_threads": len(bundle["plot_threads"]),
+        }
+        return {**result, "_context": context_stats} if isinstance(result, dict) else result
 
     async def suggest_scene_transitions(
         self,
         story_bible_id: str,
         scene_id: str,
         user: AuthenticatedUser,
+        *,
+        window: Optional[int] = None,
     ) -> Dict[str, Any]:
-        story_bible = await self.get_story_bible(story_bible_id, user, populate=True)
-        scene = next(
-            (
-                sc
-                for sc in story_bible.get("scenes", [])
-                if sc.get("id") == scene_id
-            ),
-            None,
-        )
+        indexes = await self.get_indexes(story_bible_id, user)
+        scene = indexes.scenes.get(scene_id)
         if not scene:
             raise AuthorizationError(f"Scene {scene_id} not found in story bible {story_bible_id}")
-        return await self._brain.call_tool(
+        size = self._scene_transition_window if window is None else max(0, window)
+        preceding, following = indexes.scenes.neighborhood(scene_id, size, size)
+        neighborhood = [*preceding, scene, *following]
+        context = {
+            **indexes.summary,
+            "scenes": neighborhood,
+            **indexes.referenced_by(neighborhood),
+        }
+        return await self._call_brain(
+            indexes,
             "suggest_scene_transitions",
-            {"scene": scene, "story_bible": story_bible},
+            lambda: {
+                "scene": scene,
+                "preceding_scenes": preceding,
+                "following_scenes": following,
+                "story_bible": context,
+            },
+            scene_id,
+            size,
         )
 
+    async def _call_brain(
+        self,
+        indexes: StoryBibleIndexes,
+        tool: str,
+        arguments: Callable[[], Dict[str, Any]],
+        *key_parts: Any,
+    ) -> Any:
+        """Call a Brain tool on the bible's behalf, reusing the result until the bible changes.
+
+        ``key_parts`` identify the call within the bible; the bible generation in
+        the cache key covers its content, so ``arguments`` is only built on a miss.
+        """
+        key = await self._cache.key("brain", tool, *key_parts, story_bible_id=indexes.story_bible_id)
+        result = await self._cache.get(key)
+        if result is None:
+            with brain_caller(project_id=indexes.project_id):
+                result = await self._brain.call_tool(tool, arguments())
+            await self._cache.set(key, result, self._brain_result_cache_ttl)
+        return result
+
+    def _require_character(self, indexes: StoryBibleIndexes, character_id: str) -> None:
+        if character_id not in indexes.characters and not indexes.graph.has_character(character_id):
+            raise AuthorizationError(f"Character {character_id} not found in story bible {indexes.story_bible_id}")
+
+    def _with_names(self, indexes: StoryBibleIndexes, entries: List[Dict[str, Any]], *fields: str) -> List[Dict[str, Any]]:
+        named = []
+        for entry in entries:
+            names = {
+                f"{field.removesuffix('_id')}_name": indexes.characters.value(entry.get(field) or "", "name")
+                for field in fields
+            }
+            named.append({**entry, **names})
+        return named
+
+    async def get_character_neighbors(
+        self,
+        story_bible_id: str,
+        character_id: str,
+        user: AuthenticatedUser,
+    ) -> Dict[str, Any]:
+        indexes = await self.get_indexes(story_bible_id, user)
+        self._require_character(indexes, character_id)
+        neighbors = indexes.graph.neighbors(character_id)
+        return {"character_id": character_id, "neighbors": self._with_names(indexes, neighbors, "character_id")}
+
+    async def find_relationship_path(
+        self,
+        story_bible_id: str,
+        source_id: str,
+        target_id: str,
+        user: AuthenticatedUser,
+    ) -> Dict[str, Any]:
+        indexes = await self.get_indexes(story_bible_id, user)
+        self._require_character(indexes, source_id)
+        self._require_character(indexes, target_id)
+        steps = indexes.graph.shortest_path(source_id, target_id)
+        return {
+            "source": source_id,
+            "target": target_id,
+            "connected": steps is not None,
+            "hops": len(steps) if steps is not None else None,
+            "path": self._with_names(indexes, steps or [], "from", "character_id"),
+        }
+
+    async def get_strongest_relationships(
+        self,
+        story_bible_id: str,
+        user: AuthenticatedUser,
+        *,
+        limit: int = 10,
+        character_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        indexes = await self.get_indexes(story_bible_id, user)
+        if character_id is not None:
+            self._require_character(indexes, character_id)
+        ties = indexes.graph.strongest(limit, character_id=character_id)
+        return {"relationships": self._with_names(indexes, ties, "character_from", "character_to")}
+
+    async def get_character_clusters(
+        self,
+        story_bible_id: str,
+        user: AuthenticatedUser,
+        *,
+        min_strength: int = 0,
+    ) -> Dict[str, Any]:
+        indexes = await self.get_indexes(story_bible_id, user)
+        clusters = indexes.graph.clusters(min_strength)
+        return {
+            "min_strength": min_strength,
+            "clusters": [
+                [{"id": cid, "name": indexes.characters.value(cid, "name")} for cid in members]
+                for members in clusters
+            ],
+        }
+
+    async def find_similar(
+        self,
+        story_bible_id: str,
+        user: AuthenticatedUser,
+        *,
+        query: Optional[str] = None,
+        entity_id: Optional[str] = None,
+        kind: Optional[str] = None,
+        limit: int = 10,
+    ) -> Dict[str, Any]:
+        if not query and not entity_id:
+            raise ServiceError("Either query or entity_id is required")
+        if kind is not None and kind not in ("scene", "character"):
+            raise ServiceError(f"Unsupported kind {kind}")
+        indexes = await self.get_indexes(story_bible_id, user)
+        with brain_caller(project_id=indexes.project_id):
+            embedded = await indexes.vectors.refresh(self._embedder.embed)
+
+            exclude = []
+            if entity_id:
+                key = ("scene", entity_id) if entity_id in indexes.scenes else ("character", entity_id)
+                stored = indexes.vectors.vector_for(key)
+                if stored is None:
+                    raise AuthorizationError(f"Entity {entity_id} not found in story bible {story_bible_id}")
+                vector = stored
+                exclude.append(key)
+            else:
+                assert query is not None
+                vector = (await self._embedder.embed([query]))[0]
+
+        matches = []
+        for (entity_kind, match_id), score in indexes.vectors.search(vector, limit=limit, kind=kind, exclude=exclude):
+            if entity_kind == "scene":
+                label = indexes.scenes.value(match_id, "title")
+                extra = {"sequence_number": indexes.scenes.value(match_id, "sequence_number")}
+            else:
+                label = indexes.characters.value(match_id, "name")
+                extra = {}
+            matches.append({"kind": entity_kind, "id": match_id, "label": label, "score": round(score, 4), **extra})
+        return {"matches": matches, "embedded": embedded}
+
+    async def search_story_bible(
+        self,
+        story_bible_id: str,
+        user: AuthenticatedUser,
+        *,
+        query: str,
+        fields: Optional[List[str]] = None,
+        limit: int = 10,
+    ) -> Dict[str, Any]:
+        if not query or not query.strip():
+            raise ServiceError("query is required")
+        indexes = await self.get_indexes(story_bible_id, user)
+        try:
+            hits = indexes.text.search(query, fields=fields, limit=limit)
+        except ValueError as exc:
+            raise ServiceError(str(exc)) from exc
+        for hit in hits:
+            if hit["kind"] == "scene":
+                hit.update(
+                    label=indexes.scenes.value(hit["id"], "title"),
+                    sequence_number=indexes.scenes.value(hit["id"], "sequence_number"),
+                )
+            elif hit["kind"] == "character":
+                hit["label"] = indexes.characters.value(hit["id"], "name")
+            else:
+                hit["label"] = indexes.plot_threads.value(hit["id"], "thread_name")
+        return {"query": query, "hits": hits}
+
+    async def submit_job(
+        self,
+        kind: str,
+        story_bible_id: str,
+        user: AuthenticatedUser,
+        arguments: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Run a long operation in the background; equal Brain submissions for one bible version share a job."""
+        arguments = dict(arguments or {})
+        if kind not in _JOB_KINDS:
+            raise ServiceError(f"Unsupported job kind {kind}")
+        if kind == "generate_character_arc" and not arguments.get("character_id"):
+            raise ServiceError("character_id is required")
+
+        async def report(event: Dict[str, Any]) -> None:
+            job.progress = event
+
+        async def run() -> Dict[str, Any]:
+            if kind == "clone_story_bible":
+                return await self.clone_story_bible(
+                    story_bible_id,
+                    user,
+                    title=arguments.get("title"),
+                    project_id=arguments.get("project_id"),
+                    progress=report,
+                )
+            # Background work yields to interactive Brain calls.
+            with brain_caller(priority="batch"):
+                if kind == "validate_story_consistency":
+                    return await self.validate_story_consistency(story_bible_id, user)
+                return await self.generate_character_arc(
+                    story_bible_id, arguments["character_id"], user, arguments.get("context")
+                )
+
+        indexes = await self.get_indexes(story_bible_id, user)
+        version = self._change_log.current_version(story_bible_id)
+        key: Hashable = (kind, story_bible_id, version, json.dumps(arguments, sort_keys=True, default=str))
+        if kind == "clone_story_bible":
+            # Every clone request means another copy.
+            key = uuid.uuid4().hex
+        job, created = self._jobs.submit(kind, story_bible_id, str(indexes.project_id), key, run)
+        return {**job.as_dict(), "version": version, "deduplicated": not created}
+
+    def _visible_job(self, job_id: str, user: AuthenticatedUser) -> Job:
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise AuthorizationError("Job not found")
+        ensure_project_access(job.project_id, user)
+        return job
+
+    async def get_job(self, job_id: str, user: AuthenticatedUser) -> Dict[str, Any]:
+        return self._visible_job(job_id, user).as_dict()
+
+    async def wait_for_job(self, job_id: str, user: AuthenticatedUser) -> Dict[str, Any]:
+        job = self._visible_job(job_id, user)
+        await job.done.wait()
+        return job.as_dict()
+
     async def generate_export(
         self,
         story_bible_id: str,
@@ -225,12 +1032,197 @@ class StoryBibleService:
         export_format: str,
         sections: Optional[List[str]] = None,
     ) -> bytes:
+        _, content = await self._export_entry(story_bible_id, user, export_format, sections)
+        return content
+
+    async def export_artifact(
+        self,
+        story_bible_id: str,
+        user: AuthenticatedUser,
+        *,
+        export_format: str,
+        sections: Optional[List[str]] = None,
+        encoding: Optional[str] = None,
+    ) -> Tuple[bytes, Optional[str]]:
+        """Export bytes, precompressed with ``encoding`` and cached per encoding."""
+        key, content = await self._export_entry(story_bible_id, user, export_format, sections)
+        return await self._encoded(key, content, encoding, self._export_cache_ttl)
+
+    async def _export_entry(
+        self,
+        story_bible_id: str,
+        user: AuthenticatedUser,
+        export_format: str,
+        sections: Optional[List[str]],
+    ) -> Tuple[Optional[str], bytes]:
         story_bible = await self.get_story_bible(story_bible_id, user, populate=True)
-        return self._export.generate(
-            story_bible,
-            export_format=export_format,
-            sections=sections,
+        key = await self._cache.key("export", export_format.lower(), sections, story_bible_id=story_bible_id)
+        content = await self._cache.get_bytes(key)
+        if content is None:
+            content = self._export.generate(
+                story_bible,
+                export_format=export_format,
+                sections=sections,
+            )
+            await self._cache.set_bytes(key, content, self._export_cache_ttl)
+        return key, content
+
+    async def create_snapshot(
+        self,
+        story_bible_id: str,
+        user: AuthenticatedUser,
+        *,
+        label: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Freeze the bible as it is now; an unchanged bible yields the existing snapshot."""
+        # Read the version first: the indexed document is at least that recent.
+        version = self._change_log.current_version(story_bible_id)
+        indexes = await self.get_indexes(story_bible_id, user)
+        return await self._snapshots.create(
+            indexes.to_story_bible(),
+            project_id=str(indexes.project_id),
+            version=version,
+            created_by=user.id,
+            label=label,
+        )
+
+    async def list_snapshots(self, story_bible_id: str, user: AuthenticatedUser) -> Dict[str, Any]:
+        await self.get_story_bible(story_bible_id, user, populate=False)
+        snapshots = await self._snapshots.list(story_bible_id)
+        return {"story_bible_id": story_bible_id, "snapshots": snapshots}
+
+    async def _visible_snapshot(self, story_bible_id: str, snapshot_id: str, user: AuthenticatedUser) -> Dict[str, Any]:
+        record = await self._snapshots.get(story_bible_id, snapshot_id)
+        if record is None:
+            raise AuthorizationError("Snapshot not found")
+        ensure_project_access(record["project_id"], user)
+        return record
+
+    async def get_snapshot(self, story_bible_id: str, snapshot_id: str, user: AuthenticatedUser) -> Dict[str, Any]:
+        record = await self._visible_snapshot(story_bible_id, snapshot_id, user)
+        _, story_bible = await self._snapshot_entry(record)
+        return {**record, "story_bible": story_bible}
+
+    async def _snapshot_entry(self, record: Dict[str, Any]) -> Tuple[bytes, Dict[str, Any]]:
+        # Snapshots never change, so their cache keys are not tied to the bible's generation.
+        key = await self._cache.key("snapshot", record["id"])
+        body = await self._cache.get_bytes(key)
+        if body is not None:
+            return body, json.loads(body)
+        story_bible = await self._snapshots.load(record)
+        body = json.dumps(story_bible, default=str).encode()
+        await self._cache.set_bytes(key, body, self._document_cache_ttl)
+        return body, story_bible
+
+    async def export_snapshot(
+        self,
+        story_bible_id: str,
+        snapshot_id: str,
+        user: AuthenticatedUser,
+        *,
+        export_format: str,
+        sections: Optional[List[str]] = None,
+        encoding: Optional[str] = None,
+    ) -> Tuple[bytes, Optional[str]]:
+        """A snapshot exported like a live bible, cached per format, sections and encoding."""
+        record = await self._visible_snapshot(story_bible_id, snapshot_id, user)
+        key = await self._cache.key("snapshot-export", record["id"], export_format.lower(), sections)
+        content = await self._cache.get_bytes(key)
+        if content is None:
+            _, story_bible = await self._snapshot_entry(record)
+            content = self._export.generate(story_bible, export_format=export_format, sections=sections)
+            await self._cache.set_bytes(key, content, self._export_cache_ttl)
+        return await self._encoded(key, content, encoding, self._export_cache_ttl)
+
+    async def diff_story_bible(
+        self,
+        story_bible_id: str,
+        user: AuthenticatedUser,
+        *,
+        base: str,
+        target: str = "current",
+    ) -> Dict[str, Any]:
+        """Entities added, removed and changed between two snapshots (or a snapshot and ``current``)."""
+        _, content = await self._diff_entry(story_bible_id, user, base, target, "json")
+        return json.loads(content)
+
+    async def diff_document(
+        self,
+        story_bible_id: str,
+        user: AuthenticatedUser,
+        *,
+        base: str,
+        target: str = "current",
+        diff_format: str = "json",
+        encoding: Optional[str] = None,
+    ) -> Tuple[bytes, Optional[str]]:
+        key, content = await self._diff_entry(story_bible_id, user, base, target, diff_format)
+        return await self._encoded(key, content, encoding, self._export_cache_ttl)
+
+    async def _diff_entry(
+        self,
+        story_bible_id: str,
+        user: AuthenticatedUser,
+        base: str,
+        target: str,
+        diff_format: str,
+    ) -> Tuple[Optional[str], bytes]:
+        if diff_format not in ("json", "markdown"):
+            raise ServiceError(f"Unsupported diff format: {diff_format}")
+        (source, old, old_blobs), (destination, new, new_blobs) = await asyncio.gather(
+            self._diff_side(story_bible_id, base, user),
+            self._diff_side(story_bible_id, target, user),
         )
+        # Both sides are content addresses, so the diff of a pair never changes.
+        key = await self._cache.key("diff", source, destination, diff_format)
+        content = await self._cache.get_bytes(key)
+        if content is not None:
+            return key, content
+        local = {**old_blobs, **new_blobs}
+
+        async def fetch(addresses: Iterable[str]) -> Dict[str, bytes]:
+            wanted = set(addresses)
+            found = {address: local[address] for address in wanted if address in local}
+            found.update(await self._snapshots.blobs(wanted - found.keys()))
+            if len(found) != len(wanted):
+                raise ServiceError("Snapshot is incomplete")
+            return found
+
+        diff = {"from": source, "to": destination, **await diff_manifests(old, new, fetch)}
+        if diff_format == "markdown":
+            content = render_diff_markdown(diff).encode()
+        else:
+            content = json.dumps(diff, default=str).encode()
+        await self._cache.set_bytes(key, content, self._export_cache_ttl)
+        return key, content
+
+    async def _diff_side(
+        self,
+        story_bible_id: str,
+        ref: str,
+        user: AuthenticatedUser,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, bytes]]:
+        """Descriptor, manifest and in-memory blobs of ``current`` or a snapshot id."""
+        if ref == "current":
+            version = self._change_log.current_version(story_bible_id)
+            indexes = await self.get_indexes(story_bible_id, user)
+            frozen = await asyncio.to_thread(freeze, indexes.to_story_bible())
+            descriptor = {"name": "current", "snapshot_id": frozen.snapshot_id, "version": version}
+            return descriptor, frozen.manifest, frozen.blobs
+        record = await self._visible_snapshot(story_bible_id, ref, user)
+        descriptor = {
+            "name": record.get("label") or record["id"][:12],
+            "snapshot_id": record["id"],
+            "version": record.get("version"),
+            "created_at": record.get("created_at"),
+        }
+        return descriptor, await self._snapshots.manifest(record["id"]), {}
+
+    async def delete_snapshot(self, story_bible_id: str, snapshot_id: str, user: AuthenticatedUser) -> Dict[str, Any]:
+        await self._visible_snapshot(story_bible_id, snapshot_id, user)
+        await self._snapshots.delete(story_bible_id, snapshot_id)
+        compacted = await self._snapshots.compact()
+        return {"id": snapshot_id, "deleted": True, "compaction": compacted}
 
     async def track_change(
         self,
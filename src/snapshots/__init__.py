@@ -0,0 +1,15 @@
+"""Immutable, content-addressed snapshots of story bibles."""
+
+from .diff import diff_manifests
+from .snapshots import SnapshotManager, freeze, thaw
+from .store import DiskSnapshotStore, MemorySnapshotStore, SnapshotStore
+
+__all__ = [
+    "DiskSnapshotStore",
+    "MemorySnapshotStore",
+    "SnapshotManager",
+    "SnapshotStore",
+    "diff_manifests",
+    "freeze",
+    "thaw",
+]
@@ -0,0 +1,134 @@
+"""Structural diff between two frozen versions of a story bible.
+
+Both sides are snapshot manifests (see :mod:`.snapshots`), which already
+carry a fingerprint per entity: its content address.  Entities are aligned
+by id per collection, equal addresses are skipped without loading anything,
+and only the blobs of added, removed and changed entities are fetched and
+compared field by field.  The work is linear in the number of entities.
+"""
+
+import json
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any, Dict, List, Set, Tuple, TypeGuard
+
+from .snapshots import ENTITY_FIELDS
+
+
+FetchBlobs = Callable[[Iterable[str]], Awaitable[Dict[str, bytes]]]
+
+# Bookkeeping timestamps change on every save and say nothing about the story.
+IGNORED_FIELDS = frozenset({"createdAt", "updatedAt", "created_at", "updated_at"})
+
+_LABEL_FIELDS = ("name", "title", "thread_name")
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def entity_label(entity: Dict[str, Any]) -> str:
+    for key in _LABEL_FIELDS:
+        if entity.get(key):
+            return str(entity[key])
+    if "character_from" in entity or "character_to" in entity:
+        return f"{_ref(entity.get('character_from'))} → {_ref(entity.get('character_to'))}"
+    return str(entity.get("id", ""))
+
+
+def _ref(value: Any) -> str:
+    return str(value.get("id")) if isinstance(value, dict) else str(value)
+
+
+def field_changes(old: Dict[str, Any], new: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Top-level fields that differ, with both values; lists of ids or tags also get added/removed items."""
+    changes = []
+    for key in sorted(old.keys() | new.keys()):
+        if key in IGNORED_FIELDS or key == "id":
+            continue
+        before, after = old.get(key), new.get(key)
+        if key in old and key in new and before == after:
+            continue
+        change: Dict[str, Any] = {"field": key}
+        if key in old:
+            change["old"] = before
+        if key in new:
+            change["new"] = after
+        if _scalar_list(before) and _scalar_list(after):
+            before_set, after_set = set(before), set(after)
+            change["added"] = [item for item in after if item not in before_set]
+            change["removed"] = [item for item in before if item not in after_set]
+        changes.append(change)
+    return changes
+
+
+def _scalar_list(value: Any) -> TypeGuard[List[Any]]:
+    return isinstance(value, list) and all(isinstance(item, _SCALARS) for item in value)
+
+
+def _aligned(manifest: Dict[str, Any], collection: str) -> Dict[str, str]:
+    return {entity_id: address for entity_id, address in manifest.get(collection, [])}
+
+
+def _plan(old: Dict[str, Any], new: Dict[str, Any]) -> Tuple[Dict[str, Any], Set[str]]:
+    """Per collection alignment and the blobs the diff needs."""
+    needed: Set[str] = set()
+    if old["summary"] != new["summary"]:
+        needed.update((old["summary"], new["summary"]))
+    plan: Dict[str, Any] = {}
+    for collection in ENTITY_FIELDS:
+        before, after = _aligned(old, collection), _aligned(new, collection)
+        added = [entity_id for entity_id in after if entity_id not in before]
+        removed = [entity_id for entity_id in before if entity_id not in after]
+        changed = [
+            entity_id
+            for entity_id, address in after.items()
+            if entity_id in before and before[entity_id] != address
+        ]
+        needed.update(after[entity_id] for entity_id in added)
+        needed.update(before[entity_id] for entity_id in removed)
+        for entity_id in changed:
+            needed.update((before[entity_id], after[entity_id]))
+        plan[collection] = (before, after, added, removed, changed)
+    return plan, needed
+
+
+async def diff_manifests(old: Dict[str, Any], new: Dict[str, Any], fetch: FetchBlobs) -> Dict[str, Any]:
+    """Entities added, removed and changed from ``old`` to ``new``, by collection."""
+    plan, needed = _plan(old, new)
+    blobs = await fetch(needed) if needed else {}
+
+    def load(address: str) -> Dict[str, Any]:
+        return json.loads(blobs[address])
+
+    story_bible: List[Dict[str, Any]] = []
+    if old["summary"] != new["summary"]:
+        story_bible = field_changes(load(old["summary"]), load(new["summary"]))
+
+    collections: Dict[str, Any] = {}
+    summary: Dict[str, Dict[str, int]] = {}
+    for collection, (before, after, added, removed, changed) in plan.items():
+        entries: Dict[str, List[Dict[str, Any]]] = {"added": [], "removed": [], "changed": []}
+        for entity_id in added:
+            entity = load(after[entity_id])
+            entries["added"].append({"id": entity_id, "label": entity_label(entity), "entity": entity})
+        for entity_id in removed:
+            entity = load(before[entity_id])
+            entries["removed"].append({"id": entity_id, "label": entity_label(entity), "entity": entity})
+        for entity_id in changed:
+            previous, current = load(before[entity_id]), load(after[entity_id])
+            fields = field_changes(previous, current)
+            if fields:
+                entries["changed"].append({"id": entity_id, "label": entity_label(current), "fields": fields})
+        collections[collection] = entries
+        summary[collection] = {
+            "added": len(entries["added"]),
+            "removed": len(entries["removed"]),
+            "changed": len(entries["changed"]),
+            "unchanged": len(after) - len(added) - len(entries["changed"]),
+        }
+    identical = not story_bible and not any(
+        counts["added"] or counts["removed"] or counts["changed"] for counts in summary.values()
+    )
+    return {
+        "identical": identical,
+        "summary": summary,
+        "story_bible": story_bible,
+        "collections": collections,
+    }
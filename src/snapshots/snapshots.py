@@ -0,0 +1,184 @@
+"""Freezing story bibles into content-addressed snapshots.
+
+A snapshot is stored as blobs of canonical JSON addressed by their sha256:
+one per character, scene, plot thread and relationship, one for the bible's
+own fields, and a manifest listing ``[id, address]`` pairs per collection in
+document order.  The manifest's address is the snapshot id, so freezing an
+unchanged bible twice yields the same snapshot, and an entity that did not
+change between two snapshots is the same blob in both (structural sharing).
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from ..utils.exceptions import ServiceError
+from ..utils.timing import span
+from .store import SnapshotRecord, SnapshotStore
+
+
+ENTITY_FIELDS = ("characters", "scenes", "plot_threads", "relationships")
+MANIFEST_FORMAT = 1
+
+
+def canonical_json(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+
+
+def address_of(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@dataclass
+class FrozenStoryBible:
+    snapshot_id: str
+    manifest: Dict[str, Any]
+    blobs: Dict[str, bytes]
+    counts: Dict[str, int]
+    size_bytes: int
+
+
+def freeze(story_bible: Dict[str, Any]) -> FrozenStoryBible:
+    """Split a populated story bible into blobs and the manifest that reassembles it."""
+    blobs: Dict[str, bytes] = {}
+    size = 0
+
+    def store(value: Any) -> str:
+        nonlocal size
+        data = canonical_json(value)
+        address = address_of(data)
+        blobs[address] = data
+        size += len(data)
+        return address
+
+    summary = {key: value for key, value in story_bible.items() if key not in ENTITY_FIELDS}
+    manifest: Dict[str, Any] = {"format": MANIFEST_FORMAT, "summary": store(summary)}
+    for collection in ENTITY_FIELDS:
+        entities = story_bible.get(collection) or []
+        manifest[collection] = [[str(entity.get("id")), store(entity)] for entity in entities]
+    manifest_address = store(manifest)
+    return FrozenStoryBible(
+        snapshot_id=manifest_address,
+        manifest=manifest,
+        blobs=blobs,
+        counts={collection: len(manifest[collection]) for collection in ENTITY_FIELDS},
+        size_bytes=size,
+    )
+
+
+def manifest_addresses(manifest: Dict[str, Any]) -> Iterator[str]:
+    yield manifest["summary"]
+    for collection in ENTITY_FIELDS:
+        for _, address in manifest.get(collection, []):
+            yield address
+
+
+def thaw(manifest: Dict[str, Any], blobs: Dict[str, bytes]) -> Dict[str, Any]:
+    """Reassemble the story bible described by ``manifest`` from its blobs."""
+    story_bible = json.loads(blobs[manifest["summary"]])
+    for collection in ENTITY_FIELDS:
+        story_bible[collection] = [json.loads(blobs[address]) for _, address in manifest.get(collection, [])]
+    return story_bible
+
+
+class SnapshotManager:
+    """Creates, lists, loads and garbage-collects snapshots in a :class:`SnapshotStore`.
+
+    Keeps at most ``max_per_story_bible`` snapshots per bible (0 keeps all),
+    dropping the oldest and compacting the store when a new one exceeds it.
+    """
+
+    def __init__(self, store: SnapshotStore, *, max_per_story_bible: int = 50) -> None:
+        self._store = store
+        self._max_per_story_bible = max_per_story_bible
+        # Compaction must not sweep blobs of a snapshot whose record is still being written.
+        self._lock = asyncio.Lock()
+
+    async def create(
+        self,
+        story_bible: Dict[str, Any],
+        *,
+        project_id: str,
+        version: int,
+        created_by: str,
+        label: Optional[str] = None,
+    ) -> SnapshotRecord:
+        story_bible_id = str(story_bible["id"])
+        with span("snapshot_freeze"):
+            frozen = await asyncio.to_thread(freeze, story_bible)
+        async with self._lock:
+            existing = await self._store.get_record(story_bible_id, frozen.snapshot_id)
+            if existing is not None:
+                return existing
+            new_blobs = await self._store.put_blobs(frozen.blobs)
+            record: SnapshotRecord = {
+                "id": frozen.snapshot_id,
+                "story_bible_id": story_bible_id,
+                "project_id": project_id,
+                "version": version,
+                "label": label,
+                "created_at": time.time(),
+                "created_by": created_by,
+                "counts": frozen.counts,
+                "size_bytes": frozen.size_bytes,
+                "blobs": len(frozen.blobs),
+                "new_blobs": new_blobs,
+            }
+            await self._store.put_record(record)
+        await self._enforce_retention(story_bible_id)
+        return record
+
+    async def _enforce_retention(self, story_bible_id: str) -> None:
+        if self._max_per_story_bible <= 0:
+            return
+        records = await self._store.list_records(story_bible_id)
+        excess = records[: max(0, len(records) - self._max_per_story_bible)]
+        if not excess:
+            return
+        for record in excess:
+            await self._store.delete_record(story_bible_id, record["id"])
+        await self.compact()
+
+    async def list(self, story_bible_id: str) -> List[SnapshotRecord]:
+        return await self._store.list_records(story_bible_id)
+
+    async def get(self, story_bible_id: str, snapshot_id: str) -> Optional[SnapshotRecord]:
+        return await self._store.get_record(story_bible_id, snapshot_id)
+
+    async def load(self, record: SnapshotRecord) -> Dict[str, Any]:
+        """The frozen story bible of ``record``."""
+        manifest = await self.manifest(record["id"])
+        addresses = set(manifest_addresses(manifest))
+        blobs = await self._store.get_blobs(addresses)
+        if len(blobs) != len(addresses):
+            raise ServiceError(f"Snapshot {record['id']} is incomplete")
+        return thaw(manifest, blobs)
+
+    async def manifest(self, snapshot_id: str) -> Dict[str, Any]:
+        found = await self._store.get_blobs([snapshot_id])
+        if snapshot_id not in found:
+            raise ServiceError(f"Snapshot {snapshot_id} is incomplete")
+        return json.loads(found[snapshot_id])
+
+    async def blobs(self, addresses: Iterable[str]) -> Dict[str, bytes]:
+        return await self._store.get_blobs(addresses)
+
+    async def delete(self, story_bible_id: str, snapshot_id: str) -> bool:
+        """Forget a snapshot; its blobs are reclaimed by the next :meth:`compact`."""
+        return await self._store.delete_record(story_bible_id, snapshot_id)
+
+    async def compact(self) -> Dict[str, int]:
+        """Delete blobs no longer referenced by any snapshot (mark and sweep)."""
+        async with self._lock:
+            reachable = set()
+            for record in await self._store.list_records():
+                reachable.add(record["id"])
+                try:
+                    reachable.update(manifest_addresses(await self.manifest(record["id"])))
+                except ServiceError:
+                    continue
+            return await self._store.sweep(reachable)
@@ -0,0 +1,254 @@
+"""Snapshot store protocol, the in-process store and the local disk store.
+
+A store holds two things: immutable blobs addressed by the sha256 of their
+bytes, and small snapshot records (metadata) grouped by story bible.  What
+a blob contains is up to :mod:`.snapshots`; stores never parse them.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Set, Tuple
+
+
+SnapshotRecord = Dict[str, Any]
+
+
+class SnapshotStore(Protocol):
+    async def put_blobs(self, blobs: Mapping[str, bytes]) -> int:
+        """Store blobs that are not stored yet and return how many were new."""
+        ...
+
+    async def get_blobs(self, addresses: Iterable[str]) -> Dict[str, bytes]:
+        """The stored blobs among ``addresses``; missing ones are left out."""
+        ...
+
+    async def put_record(self, record: SnapshotRecord) -> None:
+        ...
+
+    async def get_record(self, story_bible_id: str, snapshot_id: str) -> Optional[SnapshotRecord]:
+        ...
+
+    async def list_records(self, story_bible_id: Optional[str] = None) -> List[SnapshotRecord]:
+        """Records of one story bible (or all of them), oldest first."""
+        ...
+
+    async def delete_record(self, story_bible_id: str, snapshot_id: str) -> bool:
+        ...
+
+    async def sweep(self, reachable: Set[str]) -> Dict[str, int]:
+        """Delete blobs outside ``reachable``; returns kept/removed counts and bytes freed."""
+        ...
+
+
+def _oldest_first(records: Iterable[SnapshotRecord]) -> List[SnapshotRecord]:
+    return sorted(records, key=lambda record: (record.get("created_at", 0), record["id"]))
+
+
+class MemorySnapshotStore:
+    """Snapshots kept in process memory; lost on restart and not shared between workers."""
+
+    def __init__(self) -> None:
+        self._blobs: Dict[str, bytes] = {}
+        self._records: Dict[Tuple[str, str], SnapshotRecord] = {}
+
+    async def put_blobs(self, blobs: Mapping[str, bytes]) -> int:
+        added = 0
+        for address, data in blobs.items():
+            if address not in self._blobs:
+                self._blobs[address] = data
+                added += 1
+        return added
+
+    async def get_blobs(self, addresses: Iterable[str]) -> Dict[str, bytes]:
+        return {address: self._blobs[address] for address in addresses if address in self._blobs}
+
+    async def put_record(self, record: SnapshotRecord) -> None:
+        self._records[(record["story_bible_id"], record["id"])] = dict(record)
+
+    async def get_record(self, story_bible_id: str, snapshot_id: str) -> Optional[SnapshotRecord]:
+        record = self._records.get((story_bible_id, snapshot_id))
+        return dict(record) if record is not None else None
+
+    async def list_records(self, story_bible_id: Optional[str] = None) -> List[SnapshotRecord]:
+        return _oldest_first(
+            dict(record)
+            for (owner, _), record in self._records.items()
+            if story_bible_id is None or owner == story_bible_id
+        )
+
+    async def delete_record(self, story_bible_id: str, snapshot_id: str) -> bool:
+        return self._records.pop((story_bible_id, snapshot_id), None) is not None
+
+    async def sweep(self, reachable: Set[str]) -> Dict[str, int]:
+        garbage = [address for address in self._blobs if address not in reachable]
+        freed = sum(len(self._blobs.pop(address)) for address in garbage)
+        return {"kept": len(self._blobs), "removed": len(garbage), "bytes_freed": freed}
+
+
+_ADDRESS = re.compile(r"^[0-9a-f]{64}$")
+_SAFE_NAME = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+
+
+def _directory_name(story_bible_id: str) -> str:
+    # Ids come from PayloadCMS; anything that is not a plain token is hashed rather than trusted as a path.
+    if _SAFE_NAME.match(story_bible_id):
+        return story_bible_id
+    return "_" + hashlib.sha256(story_bible_id.encode()).hexdigest()
+
+
+def _write_atomically(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temporary = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(handle, "wb") as stream:
+            stream.write(data)
+        os.replace(temporary, path)
+    except BaseException:
+        try:
+            os.unlink(temporary)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class DiskSnapshotStore:
+    """Snapshots on the local filesystem, safe to share between workers on one host.
+
+    Blobs are gzip files under ``blobs/<aa>/<address>`` and records JSON files
+    under ``snapshots/<story bible>/<snapshot id>.json``.  Every file is
+    written to a temporary name and renamed into place, so readers never see
+    a partial file.  :meth:`sweep` spares blobs younger than
+    ``grace_seconds``: another worker may have stored them for a snapshot
+    whose record is not written yet.
+    """
+
+    def __init__(self, root: str, *, grace_seconds: float = 600.0, compresslevel: int = 6) -> None:
+        self._root = Path(root)
+        self._blob_root = self._root / "blobs"
+        self._record_root = self._root / "snapshots"
+        self._grace_seconds = grace_seconds
+        self._compresslevel = compresslevel
+
+    def _blob_path(self, address: str) -> Path:
+        if not _ADDRESS.match(address):
+            raise ValueError(f"Invalid blob address: {address!r}")
+        return self._blob_root / address[:2] / address
+
+    def _record_path(self, story_bible_id: str, snapshot_id: str) -> Path:
+        return self._record_root / _directory_name(story_bible_id) / f"{self._blob_path(snapshot_id).name}.json"
+
+    async def put_blobs(self, blobs: Mapping[str, bytes]) -> int:
+        return await asyncio.to_thread(self._put_blobs, dict(blobs))
+
+    def _put_blobs(self, blobs: Dict[str, bytes]) -> int:
+        added = 0
+        for address, data in blobs.items():
+            path = self._blob_path(address)
+            if path.exists():
+                # Refresh the mtime so a concurrent sweep treats the blob as fresh.
+                os.utime(path)
+                continue
+            _write_atomically(path, gzip.compress(data, compresslevel=self._compresslevel, mtime=0))
+            added += 1
+        return added
+
+    async def get_blobs(self, addresses: Iterable[str]) -> Dict[str, bytes]:
+        return await asyncio.to_thread(self._get_blobs, list(addresses))
+
+    def _get_blobs(self, addresses: List[str]) -> Dict[str, bytes]:
+        found: Dict[str, bytes] = {}
+        for address in addresses:
+            try:
+                found[address] = gzip.decompress(self._blob_path(address).read_bytes())
+            except FileNotFoundError:
+                continue
+        return found
+
+    async def put_record(self, record: SnapshotRecord) -> None:
+        path = self._record_path(record["story_bible_id"], record["id"])
+        await asyncio.to_thread(_write_atomically, path, json.dumps(record, default=str).encode())
+
+    async def get_record(self, story_bible_id: str, snapshot_id: str) -> Optional[SnapshotRecord]:
+        try:
+            path = self._record_path(story_bible_id, snapshot_id)
+        except ValueError:
+            return None
+        return await asyncio.to_thread(self._read_record, path)
+
+    @staticmethod
+    def _read_record(path: Path) -> Optional[SnapshotRecord]:
+        try:
+            return json.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+
+    async def list_records(self, story_bible_id: Optional[str] = None) -> List[SnapshotRecord]:
+        return await asyncio.to_thread(self._list_records, story_bible_id)
+
+    def _list_records(self, story_bible_id: Optional[str]) -> List[SnapshotRecord]:
+        if story_bible_id is not None:
+            directories = [self._record_root / _directory_name(story_bible_id)]
+        elif self._record_root.is_dir():
+            directories = [path for path in self._record_root.iterdir() if path.is_dir()]
+        else:
+            directories = []
+        records = []
+        for directory in directories:
+            if not directory.is_dir():
+                continue
+            for path in directory.glob("*.json"):
+                record = self._read_record(path)
+                if record is not None:
+                    records.append(record)
+        return _oldest_first(records)
+
+    async def delete_record(self, story_bible_id: str, snapshot_id: str) -> bool:
+        try:
+            path = self._record_path(story_bible_id, snapshot_id)
+        except ValueError:
+            return False
+        return await asyncio.to_thread(self._unlink, path)
+
+    @staticmethod
+    def _unlink(path: Path) -> bool:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    async def sweep(self, reachable: Set[str]) -> Dict[str, int]:
+        return await asyncio.to_thread(self._sweep, set(reachable))
+
+    def _sweep(self, reachable: Set[str]) -> Dict[str, int]:
+        kept = removed = freed = 0
+        if not self._blob_root.is_dir():
+            return {"kept": 0, "removed": 0, "bytes_freed": 0}
+        cutoff = time.time() - self._grace_seconds
+        for fan_out in self._blob_root.iterdir():
+            if not fan_out.is_dir():
+                continue
+            for path in fan_out.iterdir():
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                if path.name in reachable or stat.st_mtime > cutoff:
+                    kept += 1
+                    continue
+                if self._unlink(path):
+                    removed += 1
+                    freed += stat.st_size
+            try:
+                fan_out.rmdir()
+            except OSError:
+                pass  # not empty
+        return {"kept": kept, "removed": removed, "bytes_freed": freed}
@@ -0,0 +1,109 @@
+"""Content-Encoding negotiation and compression.
+
+gzip is always available; ``br`` and ``zstd`` are offered only when the
+optional ``brotli`` and ``zstandard`` packages are installed.  Bodies at or
+above the offload size are compressed in a worker thread so a large export
+does not stall the event loop.
+"""
+
+import asyncio
+import gzip
+from typing import Dict, List, Optional, Tuple
+
+from .timing import span
+
+try:  # pragma: no cover - optional dependency
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:  # pragma: no cover - optional dependency
+    import zstandard  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+# Server preference when a client accepts several encodings equally.
+PREFERENCE: Tuple[str, ...] = ("zstd", "br", "gzip")
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/problem+json",
+)
+
+_levels: Dict[str, int] = {"gzip": 6, "br": 5, "zstd": 3}
+
+
+def available_encodings() -> List[str]:
+    modules = {"zstd": zstandard, "br": brotli, "gzip": gzip}
+    return [encoding for encoding in PREFERENCE if modules[encoding] is not None]
+
+
+def configure_levels(*, gzip_level: int, brotli_quality: int, zstd_level: int) -> None:
+    _levels.update(gzip=gzip_level, br=brotli_quality, zstd=zstd_level)
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    return content_type.split(";")[0].strip().lower().startswith(COMPRESSIBLE_TYPES)
+
+
+def negotiate(accept_encoding: Optional[str], available: Optional[List[str]] = None) -> Optional[str]:
+    """Pick an encoding from an ``Accept-Encoding`` header, or ``None`` for identity."""
+    if not accept_encoding:
+        return None
+    offered = available if available is not None else available_encodings()
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+    wildcard = weights.get("*")
+    best: Optional[str] = None
+    best_weight = 0.0
+    for encoding in offered:
+        weight = weights.get(encoding, wildcard if wildcard is not None else 0.0)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=_levels["gzip"], mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=_levels["br"])
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=_levels["zstd"]).compress(data)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "br" and brotli is not None:
+        return brotli.decompress(data)
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+async def compress_async(data: bytes, encoding: str, *, offload_size: int = 256 * 1024) -> bytes:
+    with span("compress"):
+        if len(data) >= offload_size:
+            return await asyncio.to_thread(compress, data, encoding)
+        return compress(data, encoding)
@@ -0,0 +1,53 @@
+"""Request-scoped deadlines for upstream calls.
+
+A deadline is bound to the current context for the duration of a REST
+request or MCP tool call, like the timing collector in :mod:`.timing`.
+Upstream clients ask for the remaining budget before each attempt, clamp
+their timeouts to it and stop retrying once it is spent.  Without an active
+deadline every helper is a no-op and callers keep their configured timeouts.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from .exceptions import DeadlineExceeded
+
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(timeout_seconds: Optional[float]) -> Iterator[None]:
+    """Bind a deadline ``timeout_seconds`` from now; an earlier enclosing deadline wins."""
+    if timeout_seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + max(timeout_seconds, 0.0)
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the active deadline, or ``None`` when there is none."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline(operation: str) -> None:
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f"Request deadline exceeded before {operation}")
+
+
+def clamp_timeout(timeout: float) -> float:
+    """``timeout`` shortened to the remaining budget, if a deadline is active."""
+    left = remaining()
+    return timeout if left is None else max(min(timeout, left), 0.001)
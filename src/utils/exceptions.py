@@ -15,3 +15,24 @@ class BrainServiceException(ServiceError):
 
 class AuthorizationError(ServiceError):
     """Raised when authorization checks fail."""
+
+
+class JsonPatchError(ServiceError):
+    """Raised when a JSON Patch document is malformed or cannot be applied."""
+
+
+class DeadlineExceeded(ServiceError):
+    """Raised when a request's deadline runs out before upstream work completes."""
+
+
+class ServiceOverloaded(ServiceError):
+    """Raised when a request is shed because capacity or a rate limit is exhausted."""
+
+    def __init__(self, message: str, *, status_code: int = 503, retry_after: float = 1) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class CacheError(Exception):
+    """Raised when a cache backend is unreachable or rejects a command; callers treat it as a miss."""
@@ -61,3 +61,70 @@ def render_markdown(story_bible: Dict[str, Any]) -> str:
 
 def render_json(story_bible: Dict[str, Any]) -> str:
     return json.dumps(story_bible, indent=2, sort_keys=True, default=str)
+
+
+_DIFF_HEADINGS = {
+    "characters": "Characters",
+    "scenes": "Scenes",
+    "plot_threads": "Plot Threads",
+    "relationships": "Relationships",
+}
+
+
+def _diff_value(value: Any, limit: int = 80) -> str:
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    if len(text) > limit:
+        text = text[: limit - 1] + "…"
+    return f"`{text}`"
+
+
+def _diff_field(change: Dict[str, Any]) -> str:
+    name = change["field"]
+    if "added" in change:
+        items = [f"+{item}" for item in change["added"]] + [f"-{item}" for item in change["removed"]]
+        return f"- **{name}**: {', '.join(items) or 'reordered'}"
+    if "old" not in change:
+        return f"- **{name}** set to {_diff_value(change['new'])}"
+    if "new" not in change:
+        return f"- **{name}** removed (was {_diff_value(change['old'])})"
+    return f"- **{name}**: {_diff_value(change['old'])} → {_diff_value(change['new'])}"
+
+
+def render_diff_markdown(diff: Dict[str, Any]) -> str:
+    lines: List[str] = ["# Story Bible Changes", ""]
+    source, target = diff.get("from") or {}, diff.get("to") or {}
+    if source or target:
+        lines.append(f"From `{source.get('name', '?')}` to `{target.get('name', '?')}`")
+        lines.append("")
+    if diff.get("identical"):
+        lines.append("No changes.")
+        return "\n".join(lines)
+
+    lines.append("| Collection | Added | Removed | Changed | Unchanged |")
+    lines.append("|---|---:|---:|---:|---:|")
+    for collection, counts in diff["summary"].items():
+        lines.append(
+            f"| {_DIFF_HEADINGS.get(collection, collection)} | {counts['added']} | {counts['removed']} "
+            f"| {counts['changed']} | {counts['unchanged']} |"
+        )
+    lines.append("")
+
+    if diff.get("story_bible"):
+        lines.append("## Story Bible")
+        lines.extend(_diff_field(change) for change in diff["story_bible"])
+        lines.append("")
+
+    for collection, entries in diff["collections"].items():
+        if not any(entries.values()):
+            continue
+        lines.append(f"## {_DIFF_HEADINGS.get(collection, collection)}")
+        for entry in entries["added"]:
+            lines.append(f"- Added {entry['label']} (`{entry['id']}`)")
+        for entry in entries["removed"]:
+            lines.append(f"- Removed {entry['label']} (`{entry['id']}`)")
+        for entry in entries["changed"]:
+            lines.append(f"### {entry['label']} (`{entry['id']}`)")
+            lines.extend(_diff_field(change) for change in entry["fields"])
+        lines.append("")
+
+    return "\n".join(lines)
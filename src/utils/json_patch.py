@@ -0,0 +1,138 @@
+"""RFC 6902 JSON Patch application for story bible documents."""
+
+import copy
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from .exceptions import JsonPatchError
+
+
+_OPERATIONS = ("add", "remove", "replace", "move", "copy", "test")
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """Split an RFC 6901 JSON pointer into unescaped reference tokens."""
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer '{pointer}'")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _index(container: List[Any], token: str, *, allow_end: bool) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise JsonPatchError(f"Invalid array index '{token}'")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError(f"Array index {index} out of range")
+    return index
+
+
+def _parent(document: Any, tokens: Sequence[str]) -> Tuple[Any, str]:
+    target = document
+    for token in tokens[:-1]:
+        if isinstance(target, dict):
+            if token not in target:
+                raise JsonPatchError(f"Path segment '{token}' does not exist")
+            target = target[token]
+        elif isinstance(target, list):
+            target = target[_index(target, token, allow_end=False)]
+        else:
+            raise JsonPatchError(f"Cannot traverse into a scalar at '{token}'")
+    return target, tokens[-1]
+
+
+def _get(document: Any, tokens: Sequence[str]) -> Any:
+    if not tokens:
+        return document
+    parent, token = _parent(document, tokens)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path segment '{token}' does not exist")
+        return parent[token]
+    if isinstance(parent, list):
+        return parent[_index(parent, token, allow_end=False)]
+    raise JsonPatchError(f"Cannot traverse into a scalar at '{token}'")
+
+
+def _add(document: Any, tokens: Sequence[str], value: Any) -> Any:
+    if not tokens:
+        return value
+    parent, token = _parent(document, tokens)
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, token, allow_end=True), value)
+    else:
+        raise JsonPatchError(f"Cannot add to a scalar at '{token}'")
+    return document
+
+
+def _remove(document: Any, tokens: Sequence[str]) -> Any:
+    if not tokens:
+        raise JsonPatchError("Cannot remove the whole document")
+    parent, token = _parent(document, tokens)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path segment '{token}' does not exist")
+        return parent.pop(token)
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, token, allow_end=False))
+    raise JsonPatchError(f"Cannot remove from a scalar at '{token}'")
+
+
+def apply_patch(document: Mapping[str, Any], operations: Iterable[Mapping[str, Any]]) -> Dict[str, Any]:
+    """Return a patched copy of ``document``; the input is never modified.
+
+    The patch is atomic: if any operation fails (including a ``test``),
+    :class:`JsonPatchError` is raised and no partial result is returned.
+    """
+    result: Any = copy.deepcopy(dict(document))
+    for position, operation in enumerate(operations):
+        if not isinstance(operation, Mapping):
+            raise JsonPatchError(f"Operation {position} is not an object")
+        op = operation.get("op")
+        if op not in _OPERATIONS:
+            raise JsonPatchError(f"Operation {position} has unsupported op '{op}'")
+        if "path" not in operation:
+            raise JsonPatchError(f"Operation {position} is missing 'path'")
+        path = parse_pointer(operation["path"])
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise JsonPatchError(f"Operation {position} ({op}) is missing 'value'")
+        if op in ("move", "copy") and "from" not in operation:
+            raise JsonPatchError(f"Operation {position} ({op}) is missing 'from'")
+
+        if op == "add":
+            result = _add(result, path, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            _remove(result, path)
+        elif op == "replace":
+            _get(result, path)
+            if not path:
+                result = copy.deepcopy(operation["value"])
+            else:
+                _remove(result, path)
+                result = _add(result, path, copy.deepcopy(operation["value"]))
+        elif op == "move":
+            source = parse_pointer(operation["from"])
+            if path[: len(source)] == source and path != source:
+                raise JsonPatchError(f"Operation {position} moves a value into its own child")
+            if path != source:
+                result = _add(result, path, _remove(result, source))
+        elif op == "copy":
+            value = copy.deepcopy(_get(result, parse_pointer(operation["from"])))
+            result = _add(result, path, value)
+        elif _get(result, path) != operation["value"]:
+            raise JsonPatchError(f"Test failed at '{operation['path']}'")
+
+    if not isinstance(result, dict):
+        raise JsonPatchError("Patched document must remain an object")
+    return result
+
+
+def changed_fields(before: Mapping[str, Any], after: Mapping[str, Any]) -> Dict[str, Any]:
+    """Top-level fields of ``after`` that differ from ``before``; removed fields map to ``None``."""
+    changes = {key: value for key, value in after.items() if key not in before or before[key] != value}
+    changes.update({key: None for key in before if key not in after})
+    return changes
@@ -0,0 +1,21 @@
+"""Helpers for PayloadCMS relationship fields.
+
+Depending on the ``depth`` a document was fetched with, relationship fields
+hold either bare ids or the populated related documents.
+"""
+
+from typing import Any, Iterable, List, Optional
+
+
+def ref_id(value: Any) -> Optional[str]:
+    if isinstance(value, dict):
+        value = value.get("id")
+    if value is None or value == "":
+        return None
+    return str(value)
+
+
+def ref_ids(values: Optional[Iterable[Any]]) -> List[str]:
+    if not values:
+        return []
+    return [item for item in (ref_id(value) for value in values) if item is not None]
@@ -0,0 +1,49 @@
+"""Minimal renumbering of ordered items with integer sequence numbers."""
+
+from bisect import bisect_right
+from typing import List, Sequence
+
+
+def longest_non_decreasing_subsequence(values: Sequence[int]) -> List[int]:
+    """Positions of one longest non-decreasing subsequence of ``values``, in order."""
+    tails: List[int] = []
+    tail_positions: List[int] = []
+    previous = [-1] * len(values)
+    for position, value in enumerate(values):
+        slot = bisect_right(tails, value)
+        if slot == len(tails):
+            tails.append(value)
+            tail_positions.append(position)
+        else:
+            tails[slot] = value
+            tail_positions[slot] = position
+        previous[position] = tail_positions[slot - 1] if slot else -1
+    positions: List[int] = []
+    cursor = tail_positions[-1] if tail_positions else -1
+    while cursor != -1:
+        positions.append(cursor)
+        cursor = previous[cursor]
+    positions.reverse()
+    return positions
+
+
+def resequence(current: Sequence[int], *, start: int = 1) -> List[int]:
+    """New strictly increasing sequence numbers for items listed in their desired order.
+
+    ``current[i]`` is the number the ``i``-th item has today.  An item can keep
+    its number only if there is room for every item before it, and for every
+    item between it and the previous kept item, which holds exactly when
+    ``current[i] - i`` never decreases across the kept items and stays at or
+    above ``start``.  Keeping a longest such run leaves the fewest items to
+    renumber; those are packed right after the preceding kept item.
+    """
+    offsets = [number - position for position, number in enumerate(current)]
+    eligible = [position for position, offset in enumerate(offsets) if offset >= start]
+    kept = {eligible[index] for index in longest_non_decreasing_subsequence([offsets[p] for p in eligible])}
+
+    numbers: List[int] = []
+    last = start - 1
+    for position, number in enumerate(current):
+        last = number if position in kept else last + 1
+        numbers.append(last)
+    return numbers
@@ -0,0 +1,11 @@
+"""Text normalisation shared by the search and embedding indexes."""
+
+import re
+from typing import List
+
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
@@ -0,0 +1,89 @@
+"""Lightweight request-scoped timing spans.
+
+A :class:`RequestTimings` collector is bound to the current context for the
+duration of a REST request or MCP tool call.  Code on the hot path wraps
+upstream calls in :func:`span`; when no collector is active the span is a
+no-op, so services can be used outside a request without any setup.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+_current_timings: ContextVar[Optional["RequestTimings"]] = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    def __init__(self) -> None:
+        self._started = time.perf_counter()
+        self._spans: List[Tuple[str, float]] = []
+
+    def record(self, name: str, duration_ms: float) -> None:
+        self._spans.append((name, duration_ms))
+
+    @property
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self._started) * 1000
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Aggregate spans by name into ``{name: {"count": n, "dur_ms": total}}``."""
+        aggregated: Dict[str, Dict[str, float]] = {}
+        for name, duration in self._spans:
+            entry = aggregated.setdefault(name, {"count": 0, "dur_ms": 0.0})
+            entry["count"] += 1
+            entry["dur_ms"] += duration
+        return aggregated
+
+    def as_dict(self) -> Dict[str, Any]:
+        spans = {
+            name: {"count": int(entry["count"]), "dur_ms": round(entry["dur_ms"], 2)}
+            for name, entry in self.summary().items()
+        }
+        return {"total_ms": round(self.total_ms, 2), "spans": spans}
+
+    def server_timing_header(self) -> str:
+        parts = [
+            f'{name};dur={entry["dur_ms"]:.2f};desc="{int(entry["count"])} call(s)"'
+            for name, entry in self.summary().items()
+        ]
+        parts.append(f"total;dur={self.total_ms:.2f}")
+        return ", ".join(parts)
+
+
+def activate_timings(timings: RequestTimings) -> Token:
+    return _current_timings.set(timings)
+
+
+def deactivate_timings(token: Token) -> None:
+    _current_timings.reset(token)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current_timings.get()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Record the wall time of the enclosed block under ``name``."""
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.record(name, (time.perf_counter() - started) * 1000)
+
+
+def log_if_slow(label: str, timings: RequestTimings, threshold_ms: float) -> None:
+    if threshold_ms <= 0:
+        return
+    total = timings.total_ms
+    if total >= threshold_ms:
+        logger.warning("Slow request %s took %.1fms: %s", label, total, timings.as_dict()["spans"])
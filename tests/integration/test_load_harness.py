@@ -0,0 +1,15 @@
+import pytest
+
+from benchmarks.load_test import LoadTestConfig, run_load_test
+
+
+@pytest.mark.asyncio
+async def test_load_harness_smoke():
+    config = LoadTestConfig(duration_s=0.5, concurrency=2, latency="none", size="small", bulk_scene_batch=2)
+
+    report = await run_load_test(config)
+
+    overall = report["results"]["overall"]
+    assert overall["count"] > 0
+    assert overall["errors"] == 0
+    assert {"p50_ms", "p95_ms", "p99_ms", "rps"} <= set(overall)
@@ -0,0 +1,209 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.routes import health
+from src.services.brain_client import BrainServiceClient
+from src.services.brain_scheduler import BrainScheduler, brain_caller, current_caller
+from src.utils.deadlines import deadline_scope
+from src.utils.exceptions import BrainServiceException, DeadlineExceeded, ServiceOverloaded
+
+
+async def _queue(scheduler: BrainScheduler, order: list, project_id: str, priority: str = "interactive"):
+    await scheduler.acquire(project_id, priority)
+    order.append((project_id, priority))
+
+
+async def _admitted(order: list, count: int) -> None:
+    while len(order) < count:
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_limits_concurrency_globally_and_per_project():
+    scheduler = BrainScheduler(max_concurrency=3, per_project_limit=2)
+    assert await scheduler.acquire("a") == "a"
+    await scheduler.acquire("a")
+    order: list = []
+    blocked = asyncio.create_task(_queue(scheduler, order, "a"))
+    await scheduler.acquire("b")
+    await asyncio.sleep(0)
+    assert not blocked.done()
+    assert scheduler.stats()["projects"]["a"]["queued"]["interactive"] == 1
+
+    scheduler.release("b")
+    await asyncio.sleep(0)
+    assert not blocked.done(), "project a is still at its own limit"
+    scheduler.release("a")
+    await asyncio.wait_for(blocked, 1)
+    assert scheduler.stats()["projects"]["a"]["active"] == 2
+
+
+@pytest.mark.asyncio
+async def test_interactive_calls_overtake_batch_and_projects_share_fairly():
+    scheduler = BrainScheduler(max_concurrency=1, per_project_limit=1)
+    await scheduler.acquire("busy")
+    order: list = []
+    tasks = [asyncio.create_task(_queue(scheduler, order, "bulk", "batch")) for _ in range(2)]
+    tasks += [asyncio.create_task(_queue(scheduler, order, "heavy")) for _ in range(3)]
+    tasks.append(asyncio.create_task(_queue(scheduler, order, "light")))
+    await asyncio.sleep(0)
+
+    scheduler.release("busy")
+    for n in range(1, 7):
+        await asyncio.wait_for(_admitted(order, n), 1)
+        scheduler.release(order[-1][0])
+    await asyncio.gather(*tasks)
+
+    # light's single call is not stuck behind heavy's backlog, and batch runs last.
+    assert order[:2] == [("heavy", "interactive"), ("light", "interactive")]
+    assert order[-2:] == [("bulk", "batch"), ("bulk", "batch")]
+
+
+@pytest.mark.asyncio
+async def test_weights_give_projects_proportional_share():
+    scheduler = BrainScheduler(max_concurrency=1, per_project_limit=1, weights={"gold": 2.0})
+    await scheduler.acquire("busy")
+    order: list = []
+    tasks = [asyncio.create_task(_queue(scheduler, order, project)) for project in ["gold"] * 4 + ["std"] * 2]
+    await asyncio.sleep(0)
+    scheduler.release("busy")
+    for n in range(1, 7):
+        await asyncio.wait_for(_admitted(order, n), 1)
+        scheduler.release(order[-1][0])
+    await asyncio.gather(*tasks)
+    assert [project for project, _ in order[:3]].count("gold") == 2
+
+
+@pytest.mark.asyncio
+async def test_sheds_with_429_per_project_and_503_globally():
+    scheduler = BrainScheduler(max_concurrency=1, per_project_limit=1, max_queue_per_project=1, max_queue_total=2)
+    await scheduler.acquire("a")
+    order: list = []
+    waiting = [asyncio.create_task(_queue(scheduler, order, "a"))]
+    await asyncio.sleep(0)
+    with pytest.raises(ServiceOverloaded) as per_project:
+        await scheduler.acquire("a")
+    assert per_project.value.status_code == 429
+
+    waiting.append(asyncio.create_task(_queue(scheduler, order, "b")))
+    await asyncio.sleep(0)
+    with pytest.raises(ServiceOverloaded) as global_limit:
+        await scheduler.acquire("c")
+    assert global_limit.value.status_code == 503
+    assert scheduler.stats()["projects"]["a"]["shed"] == 1
+    assert "c" not in scheduler.stats()["projects"] and scheduler.stats()["shed"] == 2
+
+    for task in waiting:
+        task.cancel()
+    await asyncio.gather(*waiting, return_exceptions=True)
+    assert scheduler.stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_deadline_expires_while_queued_and_frees_the_slot():
+    scheduler = BrainScheduler(max_concurrency=1)
+    await scheduler.acquire("a")
+    with deadline_scope(0.01), pytest.raises(DeadlineExceeded):
+        await scheduler.acquire("b")
+    stats = scheduler.stats()
+    assert stats["queued"] == 0 and "b" not in stats["projects"]
+
+    scheduler.release("a")
+    async with scheduler.admit("b"):
+        assert scheduler.stats()["projects"]["b"]["active"] == 1
+    assert scheduler.stats()["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_caller_context_supplies_project_and_priority():
+    scheduler = BrainScheduler(max_concurrency=1)
+    with brain_caller(project_id="proj-1"), brain_caller(priority="batch"):
+        assert current_caller() == ("proj-1", "batch")
+        assert await scheduler.acquire() == "proj-1"
+    assert current_caller() == ("_unscoped", "interactive")
+    scheduler.release("proj-1")
+    assert scheduler.stats()["admitted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_idle_projects_are_forgotten():
+    scheduler = BrainScheduler(max_concurrency=1)
+    await scheduler.acquire("held")
+    waiters = [asyncio.create_task(scheduler.acquire(f"proj-{index}")) for index in range(20)]
+    await asyncio.sleep(0)
+    assert len(scheduler.stats()["projects"]) == 21
+
+    for _ in range(20):
+        scheduler.release(next(project for project, state in scheduler._projects.items() if state.active))
+        await asyncio.sleep(0)
+    await asyncio.gather(*waiters)
+    scheduler.release("proj-19")
+
+    stats = scheduler.stats()
+    assert stats["projects"] == {} and stats["admitted"] == 21 and stats["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_health_route_reports_totals_without_project_ids():
+    scheduler = BrainScheduler(max_concurrency=1)
+    await scheduler.acquire("secret-project")
+    waiters = [asyncio.create_task(_queue(scheduler, [], "other-project", "batch"))]
+    waiters.append(asyncio.create_task(_queue(scheduler, [], "secret-project")))
+    await asyncio.sleep(0)
+    app = FastAPI()
+    app.include_router(health.router, prefix="/health")
+    app.state.brain_scheduler = scheduler
+
+    body = TestClient(app).get("/health/brain-scheduler").json()
+    assert body["queued_by_priority"] == {"interactive": 1, "batch": 1} and body["projects_busy"] == 2
+    assert "projects" not in body and "secret-project" not in json.dumps(body)
+
+    for waiter in waiters:
+        waiter.cancel()
+
+
+class _FakeSocket:
+    def __init__(self) -> None:
+        self.sent: list = []
+        self.replies: asyncio.Queue = asyncio.Queue()
+
+    async def send(self, raw: str) -> None:
+        self.sent.append(json.loads(raw))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> str:
+        reply = await self.replies.get()
+        if reply is None:
+            raise StopAsyncIteration
+        return reply
+
+
+@pytest.mark.asyncio
+async def test_websocket_calls_are_multiplexed_and_fail_when_socket_closes():
+    client = BrainServiceClient("http://brain", "ws://brain", timeout=1, scheduler=BrainScheduler(max_concurrency=2))
+    socket = client._ws = _FakeSocket()
+    first = asyncio.create_task(client.call_tool("one", {}))
+    second = asyncio.create_task(client.call_tool("two", {}))
+    while len(socket.sent) < 2:
+        await asyncio.sleep(0)
+
+    # Replies arrive out of order, with a stale one in between.
+    one_id, two_id = (message["id"] for message in socket.sent)
+    for request_id, value in ((two_id, 2), ("abandoned", 0), (one_id, 1)):
+        socket.replies.put_nowait(json.dumps({"id": request_id, "result": {"value": value}}))
+    assert await first == {"value": 1} and await second == {"value": 2}
+
+    third = asyncio.create_task(client.call_tool("three", {}))
+    while len(socket.sent) < 3:
+        await asyncio.sleep(0)
+    socket.replies.put_nowait(None)
+    with pytest.raises(BrainServiceException):
+        await third
+    assert client._ws is None
+    await client.disconnect()
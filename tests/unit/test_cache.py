@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.cache import Cache, MemoryCacheBackend, RedisCacheBackend
+from src.cache.stand_in import RespStandInServer
+from src.middleware import auth
+from src.models import AuthenticatedUser, SceneUpdate
+from src.services.story_bible_service import StoryBibleService
+from src.utils.exceptions import CacheError
+
+
+@pytest.fixture
+def user() -> AuthenticatedUser:
+    return AuthenticatedUser(id="user-1", projects=["proj-1"])
+
+
+async def _eventually(condition) -> None:
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met")
+
+
+@pytest.mark.asyncio
+async def test_resp_backend_round_trips_against_stand_in():
+    server = await RespStandInServer(password="s3cret").start()
+    backend = RedisCacheBackend(f"redis://:s3cret@127.0.0.1:{server.port}/2")
+    try:
+        assert await backend.get("missing") is None
+        await backend.set("k", b"\x00binary\r\nvalue")
+        assert await backend.get("k") == b"\x00binary\r\nvalue"
+        await backend.set("short", b"v", ttl=0.05)
+        await asyncio.sleep(0.1)
+        assert await backend.get("short") is None
+        assert await backend.incr("gen") == 1 and await backend.incr("gen") == 2
+        await backend.delete("k")
+        assert await backend.get("k") is None
+        assert server.commands[:2] == ["AUTH", "SELECT"]
+    finally:
+        await backend.close()
+        await server.close()
+
+    with pytest.raises(CacheError):
+        await backend.get("k")
+
+
+@pytest.mark.asyncio
+async def test_invalidation_reaches_other_workers_over_resp():
+    server = await RespStandInServer().start()
+    worker_a, worker_b = Cache(RedisCacheBackend(server.url)), Cache(RedisCacheBackend(server.url))
+    invalidated = []
+    worker_b.on_invalidate(invalidated.append)
+    await worker_a.start()
+    await worker_b.start()
+    try:
+        key = await worker_b.key("story-bible", True, story_bible_id="sb-1")
+        await worker_b.set(key, {"title": "Old"})
+        assert await worker_a.get(await worker_a.key("story-bible", True, story_bible_id="sb-1")) == {"title": "Old"}
+
+        await worker_a.invalidate_story_bible("sb-1")
+        await _eventually(lambda: invalidated == ["sb-1"])
+        assert await worker_b.get(await worker_b.key("story-bible", True, story_bible_id="sb-1")) is None
+        # Other bibles are untouched.
+        other = await worker_b.key("story-bible", True, story_bible_id="sb-2")
+        await worker_b.set(other, {"title": "Kept"})
+        await worker_a.invalidate_story_bible("sb-1")
+        assert await worker_b.get(other) == {"title": "Kept"}
+    finally:
+        await worker_a.close()
+        await worker_b.close()
+        await server.close()
+
+
+def _service(cache: Cache) -> StoryBibleService:
+    payload_service = AsyncMock()
+    payload_service.get_story_bible.return_value = {
+        "id": "sb-1",
+        "project_id": "proj-1",
+        "scenes": [{"id": "s1", "title": "Storm", "sequence_number": 1}],
+    }
+    payload_service.update_scene.return_value = {"id": "s1", "title": "Squall", "sequence_number": 1}
+    brain_client = AsyncMock()
+    brain_client.call_tool.return_value = {"issues": []}
+    export_service = MagicMock()
+    export_service.generate.return_value = b"# Story"
+    return StoryBibleService(payload_service, brain_client, export_service, cache=cache)
+
+
+@pytest.mark.asyncio
+async def test_service_caches_until_a_write_on_any_worker(user: AuthenticatedUser):
+    backend = MemoryCacheBackend()
+    worker_a, worker_b = Cache(backend), Cache(backend)
+    await worker_a.start()
+    await worker_b.start()
+    service_a, service_b = _service(worker_a), _service(worker_b)
+
+    await service_a.get_story_bible("sb-1", user)
+    await service_a.get_story_bible("sb-1", user)
+    await service_b.get_story_bible("sb-1", user)
+    assert service_a._payload.get_story_bible.await_count == 1
+    assert service_b._payload.get_story_bible.await_count == 0
+
+    await service_a.validate_story_consistency("sb-1", user)
+    await service_b.validate_story_consistency("sb-1", user)
+    assert service_a._brain.call_tool.await_count == 1 and service_b._brain.call_tool.await_count == 0
+    assert await service_b.generate_export("sb-1", user, export_format="markdown") == b"# Story"
+    await service_a.generate_export("sb-1", user, export_format="markdown")
+    assert service_b._export.generate.call_count == 1 and service_a._export.generate.call_count == 0
+
+    assert service_b._indexes.peek("sb-1") is not None
+    await service_a.update_scene("sb-1", "s1", SceneUpdate(title="Squall"), user)
+    assert service_b._indexes.peek("sb-1") is None
+    await service_b.validate_story_consistency("sb-1", user)
+    assert service_b._payload.get_story_bible.await_count == 1
+    assert service_b._brain.call_tool.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_unreachable_backend_is_bypassed(user: AuthenticatedUser):
+    cache = Cache(RedisCacheBackend("redis://127.0.0.1:1/0", timeout=0.2))
+    await cache.start()
+    service = _service(cache)
+    assert (await service.get_story_bible("sb-1", user))["id"] == "sb-1"
+    await service.update_scene("sb-1", "s1", SceneUpdate(title="Squall"), user)
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_verified_tokens_are_cached(monkeypatch, user: AuthenticatedUser):
+    response = MagicMock()
+    response.json.return_value = {"doc": user.model_dump()}
+    fake_client = MagicMock()
+    fake_client.get = AsyncMock(return_value=response)
+    monkeypatch.setattr(auth, "_auth_client", fake_client)
+    auth.configure_token_cache(Cache(MemoryCacheBackend()), 60)
+    try:
+        assert (await auth.verify_bearer_token("Bearer abc")).id == "user-1"
+        assert (await auth.verify_bearer_token("Bearer abc")).projects == ["proj-1"]
+        await auth.verify_bearer_token("Bearer other")
+    finally:
+        auth.configure_token_cache(None, 0)
+    assert fake_client.get.await_count == 2
@@ -0,0 +1,151 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.models import AuthenticatedUser, SceneUpdate
+from src.routes import mcp
+from src.services.change_feed import ChangeBroker, ChangeLog
+from src.services.story_bible_service import StoryBibleService
+
+
+@pytest.fixture
+def user() -> AuthenticatedUser:
+    return AuthenticatedUser(id="user-1", projects=["proj-1"])
+
+
+def _service(broker: ChangeBroker) -> StoryBibleService:
+    payload_service = AsyncMock()
+    payload_service.get_story_bible.return_value = {"id": "sb-1", "project_id": "proj-1"}
+    payload_service.update_scene.return_value = {"id": "s1", "title": "Dawn"}
+    return StoryBibleService(payload_service, AsyncMock(), MagicMock(), change_broker=broker)
+
+
+@pytest.mark.asyncio
+async def test_mutations_publish_entity_deltas(user: AuthenticatedUser):
+    broker = ChangeBroker()
+    subscription = broker.open()
+    broker.subscribe(subscription, "sb-1")
+
+    await _service(broker).update_scene("sb-1", "s1", SceneUpdate(title="Dawn"), user)
+
+    event = await subscription.get()
+    assert event.pop("version") > 0
+    assert event == {
+        "type": "change",
+        "story_bible_id": "sb-1",
+        "collection": "story-bible-scenes",
+        "id": "s1",
+        "operation": "updated",
+        "fields": ["title"],
+        "user": "user-1",
+    }
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_dropped_without_affecting_others():
+    broker = ChangeBroker(max_buffer=2)
+    slow, fast = broker.open(), broker.open()
+    broker.subscribe(slow, "sb-1")
+    broker.subscribe(fast, "sb-1")
+
+    for index in range(3):
+        broker.publish("sb-1", {"n": index})
+        assert (await fast.get()) == {"n": index}
+
+    assert slow.dropped
+    assert (await slow.get())["type"] == "dropped"
+    assert broker.subscriber_count("sb-1") == 1
+    assert broker.publish("sb-1", {"n": 3}) == 1
+
+
+def test_websocket_subscribe_receives_notifications(monkeypatch, user: AuthenticatedUser):
+    async def fake_verify(authorization=None):
+        return user
+
+    monkeypatch.setattr(mcp, "verify_bearer_token", fake_verify)
+    broker = ChangeBroker()
+    app = FastAPI()
+    app.include_router(mcp.router, prefix="/mcp")
+    app.state.story_service = _service(broker)
+
+    with TestClient(app).websocket_connect("/mcp/ws") as websocket:
+        websocket.send_json({"id": 1, "method": "subscribe", "params": {"story_bible_id": "sb-1"}})
+        assert websocket.receive_json()["result"] == {"subscriptions": ["sb-1"]}
+
+        websocket.send_json(
+            {
+                "id": 2,
+                "method": "call_tool",
+                "params": {
+                    "name": "update_scene",
+                    "arguments": {"story_bible_id": "sb-1", "scene_id": "s1", "data": {"title": "Dawn"}},
+                },
+            }
+        )
+        messages = [websocket.receive_json(), websocket.receive_json()]
+        notification = next(message for message in messages if "method" in message)
+        assert notification["method"] == "notifications/story_bible_changed"
+        assert notification["params"]["fields"] == ["title"]
+
+        websocket.send_json({"id": 3, "method": "unsubscribe", "params": {"story_bible_id": "sb-1"}})
+        assert websocket.receive_json()["result"] == {"subscriptions": []}
+    assert broker.subscriber_count("sb-1") == 0
+
+
+def test_change_log_falls_back_when_history_is_truncated():
+    log = ChangeLog(max_entries=2)
+    start = log.current_version("sb-1")
+    versions = [log.record("sb-1", {"n": index}) for index in range(3)]
+
+    assert versions == sorted(versions) and versions[0] > start and len(set(versions)) == 3
+    assert log.since("sb-1", start) is None
+    assert [entry["n"] for _, entry in log.since("sb-1", versions[0])] == [1, 2]
+    assert [version for version, _ in log.since("sb-1", versions[0])] == versions[1:]
+    assert log.since("sb-1", versions[2]) == []
+    assert log.since("sb-1", versions[2] + (versions[2] - versions[1]) * 10) is None
+    assert all(version < 2**53 for version in versions)
+
+
+def test_change_log_answers_versions_of_other_workers_with_a_snapshot():
+    worker_a, worker_b = ChangeLog(worker_tag=1), ChangeLog(worker_tag=2)
+    issued_by_a = worker_a.record("sb-1", {"n": 0})
+    worker_b.record("sb-1", {"n": 1})
+
+    assert worker_a.issued_here(issued_by_a) and not worker_b.issued_here(issued_by_a)
+    assert worker_b.since("sb-1", issued_by_a) is None
+    assert worker_a.since("sb-1", issued_by_a) == []
+
+
+def test_change_log_answers_versions_from_before_an_eviction_with_a_snapshot():
+    log = ChangeLog(max_story_bibles=1, worker_tag=1)
+    versions = [log.record("sb-1", {"n": n}) for n in range(5)]
+    log.record("sb-2", {"n": 0})
+    for n in range(3):
+        log.record("sb-1", {"n": n})
+
+    assert log.since("sb-1", versions[2]) is None
+    assert log.since("sb-1", log.current_version("sb-1")) == []
+
+
+@pytest.mark.asyncio
+async def test_get_changes_collapses_entries_per_entity(user: AuthenticatedUser):
+    service = _service(ChangeBroker())
+    since = (await service.get_changes("sb-1", user))["version"]
+
+    await service.update_scene("sb-1", "s1", SceneUpdate(title="Dawn"), user)
+    await service.update_scene("sb-1", "s1", SceneUpdate(sequence_number=4), user)
+    delta = await service.get_changes("sb-1", user, since=since)
+
+    assert delta["snapshot"] is False
+    assert delta["version"] > since
+    assert delta["version"] == (await service.get_changes("sb-1", user))["version"]
+    [change] = delta["changes"]
+    assert change["id"] == "s1"
+    assert change["fields"] == ["sequence_number", "title"]
+    assert change["data"] == {"id": "s1", "title": "Dawn"}
+
+    snapshot = await service.get_changes("sb-1", user, since=since - 5)
+    assert snapshot["snapshot"] is True
+    assert snapshot["story_bible"]["id"] == "sb-1"
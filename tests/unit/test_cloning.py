@@ -0,0 +1,118 @@
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from benchmarks.fakes import (
+    BENCH_PROJECT_ID,
+    FakePayloadStore,
+    LatencyProfile,
+    create_fake_payload_app,
+    seed_story_bible,
+)
+from benchmarks.synthetic import SCALES
+from src.models import AuthenticatedUser
+from src.services.payload_service import PayloadCMSService
+from src.services.story_bible_service import StoryBibleService
+
+
+@pytest.fixture
+def user() -> AuthenticatedUser:
+    return AuthenticatedUser(id="user-1", projects=[BENCH_PROJECT_ID])
+
+
+class _InFlight:
+    """ASGI wrapper recording the most PayloadCMS requests handled at once."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.current = self.peak = 0
+
+    async def __call__(self, scope, receive, send) -> None:
+        self.current += 1
+        self.peak = max(self.peak, self.current)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.current -= 1
+
+
+def _service(store: FakePayloadStore, *, concurrency: int = 4):
+    app = _InFlight(create_fake_payload_app(store, LatencyProfile(payload_ms=2.0, jitter=0.0)))
+    payload_service = PayloadCMSService("http://payload.test", None, timeout=5.0, max_retries=1)
+    payload_service._client = httpx.AsyncClient(base_url="http://payload.test", transport=httpx.ASGITransport(app=app))
+    service = StoryBibleService(payload_service, AsyncMock(), MagicMock(), clone_concurrency=concurrency)
+    return service, app
+
+
+def _owned(store: FakePayloadStore, collection: str, story_bible_id: str):
+    return store.find(collection, {"story_bible": {"equals": story_bible_id}})
+
+
+@pytest.mark.asyncio
+async def test_clone_copies_every_collection_and_remaps_references(user: AuthenticatedUser):
+    store = FakePayloadStore()
+    source_id = seed_story_bible(store, SCALES["small"])
+    store.insert("story-outlines", {"story_bible": source_id, "act_structure": "three_act"})
+    service, app = _service(store)
+    events = []
+
+    async def progress(event):
+        events.append(event)
+
+    result = await service.clone_story_bible(source_id, user, progress=progress)
+
+    clone_id = result["story_bible"]["id"]
+    assert clone_id != source_id and result["story_bible"]["title"].endswith("(copy)")
+    assert result["counts"] == {
+        "story-bibles": 1,
+        "story-bible-characters": 6,
+        "plot-threads": 3,
+        "story-outlines": 1,
+        "story-bible-scenes": 10,
+        "character-relationships": 8,
+    }
+    assert result["dangling_references"] == 0
+    assert 1 < app.peak <= 4
+    assert events[-1]["stage"] == "completed" and events[-1]["completed"] == events[-1]["total"]
+
+    id_map = result["id_map"]
+    new_characters = set(id_map["characters"].values())
+    for scene in _owned(store, "story-bible-scenes", clone_id):
+        assert scene["characters_present"] and set(scene["characters_present"]) <= new_characters
+        assert set(scene["plot_threads"]) <= set(id_map["plot_threads"].values())
+    for thread in _owned(store, "plot-threads", clone_id):
+        original = store.get("plot-threads", next(k for k, v in id_map["plot_threads"].items() if v == thread["id"]))
+        assert thread["key_scenes"] == [id_map["scenes"][scene_id] for scene_id in original["key_scenes"]]
+        assert thread["introduction_scene"] == id_map["scenes"][original["introduction_scene"]]
+    for relationship in _owned(store, "character-relationships", clone_id):
+        assert {relationship["character_from"], relationship["character_to"]} <= new_characters
+    assert len(_owned(store, "story-bible-scenes", source_id)) == 10
+
+
+@pytest.mark.asyncio
+async def test_failed_clone_is_rolled_back(monkeypatch, user: AuthenticatedUser):
+    store = FakePayloadStore()
+    source_id = seed_story_bible(store, SCALES["small"])
+    before = {collection: len(docs) for collection, docs in store.collections.items()}
+    service, _ = _service(store)
+    insert = store.insert
+    scenes = []
+
+    def failing_insert(collection, doc):
+        if collection == "story-bible-scenes":
+            scenes.append(doc)
+            if len(scenes) == 4:
+                raise RuntimeError("PayloadCMS rejected the scene")
+        return insert(collection, doc)
+
+    monkeypatch.setattr(store, "insert", failing_insert)
+    events = []
+
+    async def progress(event):
+        events.append(event)
+
+    with pytest.raises(RuntimeError, match="rejected"):
+        await service.clone_story_bible(source_id, user, title="Alternate ending", progress=progress)
+
+    assert {collection: len(docs) for collection, docs in store.collections.items()} == before
+    assert events[-1]["stage"] == "rolled_back"
@@ -0,0 +1,122 @@
+import gzip
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.middleware.auth import get_current_user
+from src.middleware.compression import CompressionMiddleware
+from src.models import AuthenticatedUser, SceneUpdate
+from src.routes import api
+from src.services import story_bible_service
+from src.services.story_bible_service import StoryBibleService
+from src.utils.compression import negotiate
+
+
+@pytest.fixture
+def user() -> AuthenticatedUser:
+    return AuthenticatedUser(id="user-1", projects=["proj-1"])
+
+
+def test_negotiate_honours_quality_values_and_availability():
+    offered = ["zstd", "br", "gzip"]
+    assert negotiate("gzip, deflate, br", offered) == "br"
+    assert negotiate("gzip;q=1.0, br;q=0.5", offered) == "gzip"
+    assert negotiate("*;q=0.1, zstd;q=0", offered) == "br"
+    assert negotiate("br", ["gzip"]) is None
+    assert negotiate("identity", offered) is None and negotiate(None, offered) is None
+    assert negotiate("GZIP;q=bogus, gzip", ["gzip"]) == "gzip"
+
+
+def test_middleware_compresses_only_large_complete_bodies():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100, offload_size=1000)
+
+    @app.get("/large")
+    async def large():
+        return {"text": "storm " * 500}
+
+    @app.get("/small")
+    async def small():
+        return {"text": "storm"}
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(iter([b"a" * 200, b"b" * 200]), media_type="text/plain")
+
+    @app.get("/precompressed")
+    async def precompressed():
+        headers = {"Content-Encoding": "gzip"}
+        return PlainTextResponse(gzip.compress(b"x" * 500), headers=headers)
+
+    client = TestClient(app)
+    headers = {"Accept-Encoding": "gzip"}
+    response = client.get("/large", headers=headers)
+    assert response.headers["content-encoding"] == "gzip" and response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < 200
+    assert response.json()["text"].startswith("storm storm")
+
+    assert "content-encoding" not in client.get("/small", headers=headers).headers
+    assert "content-encoding" not in client.get("/stream", headers=headers).headers
+    assert "content-encoding" not in client.get("/large", headers={"Accept-Encoding": "identity"}).headers
+    assert client.get("/precompressed", headers=headers).text == "x" * 500
+
+
+def _service() -> StoryBibleService:
+    payload_service = AsyncMock()
+    payload_service.get_story_bible.return_value = {
+        "id": "sb-1",
+        "project_id": "proj-1",
+        "premise": "A keeper guards the light. " * 100,
+        "scenes": [{"id": "s1", "title": "Storm", "sequence_number": 1}],
+    }
+    payload_service.update_scene.return_value = {"id": "s1", "title": "Squall", "sequence_number": 1}
+    export_service = MagicMock()
+    export_service.generate.return_value = b"# Story\n" * 500
+    return StoryBibleService(payload_service, AsyncMock(), export_service, compression_min_size=100)
+
+
+@pytest.mark.asyncio
+async def test_precompressed_variants_are_cached_until_a_write(monkeypatch, user: AuthenticatedUser):
+    compressions = []
+    original = story_bible_service.compress_async
+
+    async def counting(data, encoding, **kwargs):
+        compressions.append(encoding)
+        return await original(data, encoding, **kwargs)
+
+    monkeypatch.setattr(story_bible_service, "compress_async", counting)
+    service = _service()
+
+    for _ in range(3):
+        content, encoding = await service.export_artifact("sb-1", user, export_format="markdown", encoding="gzip")
+        assert encoding == "gzip" and gzip.decompress(content) == b"# Story\n" * 500
+    assert await service.export_artifact("sb-1", user, export_format="markdown") == (b"# Story\n" * 500, None)
+    body, _ = await service.story_bible_document("sb-1", user, encoding="gzip")
+    await service.story_bible_document("sb-1", user, encoding="gzip")
+    assert b'"premise"' in gzip.decompress(body)
+    assert compressions == ["gzip", "gzip"]
+
+    await service.update_scene("sb-1", "s1", SceneUpdate(title="Squall"), user)
+    await service.export_artifact("sb-1", user, export_format="markdown", encoding="gzip")
+    assert len(compressions) == 3 and service._export.generate.call_count == 2
+
+
+def test_routes_serve_precompressed_documents(user: AuthenticatedUser):
+    app = FastAPI()
+    app.include_router(api.router, prefix="/api/v1")
+    app.state.story_service = _service()
+    app.dependency_overrides[get_current_user] = lambda: user
+    client = TestClient(app)
+
+    response = client.get("/api/v1/story-bibles/sb-1", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()["id"] == "sb-1"
+    export = client.get("/api/v1/story-bibles/sb-1/export?format=markdown", headers={"Accept-Encoding": "gzip"})
+    assert export.headers["content-encoding"] == "gzip" and export.headers["content-disposition"].startswith("attach")
+    assert export.content == b"# Story\n" * 500
+    plain = client.get("/api/v1/story-bibles/sb-1", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers and plain.json()["project_id"] == "proj-1"
@@ -0,0 +1,77 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.continuity import ContinuityEngine, RuleRegistry
+from src.indexes import IndexManager, StoryBibleIndexes
+from src.models import AuthenticatedUser, ContinuityFinding
+from src.services.story_bible_service import StoryBibleService
+
+
+def _broken_bible() -> dict:
+    return {
+        "id": "sb-1",
+        "project_id": "proj-1",
+        "characters": [{"id": "c1", "name": "Ada"}],
+        "scenes": [
+            {"id": "s1", "sequence_number": 1, "characters_present": ["c1", "ghost"], "plot_threads": ["t1"]},
+            {"id": "s2", "sequence_number": 2, "characters_present": [], "plot_threads": []},
+            {"id": "s3", "sequence_number": 2, "characters_present": [], "plot_threads": []},
+        ],
+        "plot_threads": [
+            {
+                "id": "t1",
+                "thread_name": "Backwards",
+                "introduction_scene": "s2",
+                "resolution_scene": "s1",
+                "key_scenes": ["deleted"],
+                "status": "active",
+            },
+            {"id": "t2", "thread_name": "Orphan", "status": "active", "key_scenes": []},
+        ],
+    }
+
+
+def test_builtin_rules_find_deterministic_problems():
+    report = ContinuityEngine().run(StoryBibleIndexes(_broken_bible()))
+
+    fired = {(finding["rule"], finding["entity_id"]) for finding in report["findings"]}
+    assert ("unknown_character_in_scene", "s1") in fired
+    assert ("duplicate_sequence_number", "s2") in fired
+    assert ("dangling_scene_reference", "t1") in fired
+    assert ("resolution_before_introduction", "t1") in fired
+    assert ("active_thread_without_scenes", "t2") in fired
+    assert report["summary"]["error"] >= 4
+
+
+def test_custom_registry_runs_only_its_rules():
+    registry = RuleRegistry()
+
+    @registry.rule("no_title", severity="info")
+    def no_title(indexes):
+        if not indexes.summary.get("title"):
+            yield ContinuityFinding(rule="no_title", message="Untitled", entity_type="story_bible")
+
+    report = ContinuityEngine(registry).run(StoryBibleIndexes(_broken_bible()))
+
+    assert report["rules_run"] == ["no_title"]
+    assert report["summary"] == {"error": 0, "warning": 0, "info": 1}
+    assert report["findings"][0]["severity"] == "info"
+
+
+@pytest.mark.asyncio
+async def test_fast_mode_skips_brain_call():
+    user = AuthenticatedUser(id="user-1", projects=["proj-1"])
+    payload_service = AsyncMock()
+    payload_service.get_story_bible.return_value = _broken_bible()
+    brain_client = AsyncMock()
+    brain_client.call_tool.return_value = {"issues": []}
+    service = StoryBibleService(payload_service, brain_client, MagicMock(), IndexManager())
+
+    fast = await service.validate_story_consistency("sb-1", user, fast=True)
+    full = await service.validate_story_consistency("sb-1", user)
+
+    assert fast["brain_skipped"] is True
+    assert fast["rule_findings"]["findings"]
+    brain_client.call_tool.assert_awaited_once()
+    assert full["issues"] == []
+    assert brain_client.call_tool.await_args.args[1]["rule_findings"] == fast["rule_findings"]["findings"]
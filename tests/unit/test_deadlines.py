@@ -0,0 +1,154 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi import FastAPI, WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+from src.middleware.deadline import DeadlineMiddleware
+from src.models import AuthenticatedUser
+from src.routes import mcp
+from src.services.brain_client import BrainServiceClient
+from src.services.payload_service import PayloadCMSService
+from src.services.story_bible_service import StoryBibleService
+from src.utils.deadlines import clamp_timeout, deadline_scope, remaining
+from src.utils.exceptions import DeadlineExceeded
+
+
+def test_nested_deadlines_keep_the_earliest():
+    assert remaining() is None
+    assert clamp_timeout(30.0) == 30.0
+    with deadline_scope(0.5):
+        with deadline_scope(10):
+            assert 0 < remaining() <= 0.5
+            assert clamp_timeout(30.0) <= 0.5
+    assert remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_payload_retries_stop_when_backoff_would_overrun_deadline():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        raise httpx.ConnectError("connection refused", request=request)
+
+    service = PayloadCMSService("http://payload.test", None, timeout=30.0, max_retries=3)
+    service._client = httpx.AsyncClient(base_url="http://payload.test", transport=httpx.MockTransport(handler))
+
+    started = time.monotonic()
+    with deadline_scope(0.5), pytest.raises(httpx.ConnectError):
+        await service.get_story_bible("sb-1")
+    assert len(calls) == 1
+    assert time.monotonic() - started < 0.5
+
+    with deadline_scope(0), pytest.raises(DeadlineExceeded):
+        await service.get_story_bible("sb-1")
+    assert len(calls) == 1
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_brain_call_refused_once_deadline_is_spent():
+    client = BrainServiceClient("http://brain.test", "ws://brain.test/mcp", timeout=30.0)
+    with deadline_scope(0), pytest.raises(DeadlineExceeded):
+        await client.call_tool("analyze_story_consistency", {})
+    await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_middleware_binds_deadline_and_cancels_on_disconnect():
+    observed = {}
+
+    async def app(scope, receive, send):
+        await receive()
+        observed["remaining"] = remaining()
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            observed["cancelled"] = True
+            raise
+
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(0.01)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        raise AssertionError("no response expected after disconnect")
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/v1/story-bibles/sb-1",
+        "headers": [(b"x-request-timeout-ms", b"1500")],
+    }
+    await asyncio.wait_for(DeadlineMiddleware(app)(scope, receive, send), timeout=1)
+
+    assert 0 < observed["remaining"] <= 1.5
+    assert observed["cancelled"]
+
+
+def test_malformed_mcp_messages_get_errors_and_keep_the_socket_usable(monkeypatch):
+    async def fake_verify(authorization=None):
+        return AuthenticatedUser(id="user-1", projects=["proj-1"])
+
+    monkeypatch.setattr(mcp, "verify_bearer_token", fake_verify)
+    app = FastAPI()
+    app.include_router(mcp.router, prefix="/mcp")
+    app.state.story_service = StoryBibleService(AsyncMock(), AsyncMock(), MagicMock())
+
+    with TestClient(app).websocket_connect("/mcp/ws") as websocket:
+        websocket.send_json([1, 2, 3])
+        assert websocket.receive_json()["error"]["message"] == "Messages must be JSON objects"
+        websocket.send_json({"id": 1, "method": "call_tool", "params": ["get_story_bible"]})
+        assert websocket.receive_json() == {"jsonrpc": "2.0", "id": 1, "error": {"message": "params must be an object"}}
+        websocket.send_json({"id": 2, "method": "call_tool", "params": {"name": "get_story_bible", "arguments": 7}})
+        assert "arguments object" in websocket.receive_json()["error"]["message"]
+        websocket.send_json({"id": 3, "method": "list_tools"})
+        reply = websocket.receive_json()
+        assert reply["id"] == 3 and "get_story_bible" in reply["result"]["tools"]
+
+
+def test_non_json_mcp_frames_get_a_parse_error_and_keep_the_socket_open(monkeypatch):
+    async def fake_verify(authorization=None):
+        return AuthenticatedUser(id="user-1", projects=["proj-1"])
+
+    monkeypatch.setattr(mcp, "verify_bearer_token", fake_verify)
+    app = FastAPI()
+    app.include_router(mcp.router, prefix="/mcp")
+    app.state.story_service = StoryBibleService(AsyncMock(), AsyncMock(), MagicMock())
+
+    with TestClient(app).websocket_connect("/mcp/ws") as websocket:
+        websocket.send_text("not json")
+        error = websocket.receive_json()
+        assert error["id"] is None and error["error"]["message"].startswith("Parse error")
+        websocket.send_json({"id": 1, "method": "list_tools"})
+        reply = websocket.receive_json()
+        assert reply["id"] == 1 and "get_story_bible" in reply["result"]["tools"]
+
+
+def test_mcp_socket_closes_when_its_processor_stops(monkeypatch):
+    async def fake_verify(authorization=None):
+        return AuthenticatedUser(id="user-1", projects=["proj-1"])
+
+    def failing_response(request_id, result):
+        raise RuntimeError("socket state lost")
+
+    monkeypatch.setattr(mcp, "verify_bearer_token", fake_verify)
+    monkeypatch.setattr(mcp, "build_success_response", failing_response)
+    app = FastAPI()
+    app.include_router(mcp.router, prefix="/mcp")
+    app.state.story_service = StoryBibleService(AsyncMock(), AsyncMock(), MagicMock())
+
+    with TestClient(app).websocket_connect("/mcp/ws") as websocket:
+        websocket.send_json({"id": 1, "method": "list_tools"})
+        with pytest.raises(WebSocketDisconnect) as closed:
+            websocket.receive_json()
+    assert closed.value.code == 1011
@@ -0,0 +1,179 @@
+import json
+import sys
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from benchmarks.synthetic import SCALES, generate_story_bible
+from src.indexes import (
+    CharacterIndex,
+    IndexManager,
+    RecordTable,
+    RelationshipRecord,
+    SceneIndex,
+    SceneRecord,
+    StoryBibleIndexes,
+)
+from src.models import AuthenticatedUser, SceneUpdate
+from src.services.story_bible_service import StoryBibleService
+
+
+@pytest.fixture
+def user() -> AuthenticatedUser:
+    return AuthenticatedUser(id="user-1", projects=["proj-1"])
+
+
+def test_scene_index_keeps_sequence_order_on_upsert():
+    index = SceneIndex(
+        [
+            {"id": "a", "sequence_number": 1},
+            {"id": "b", "sequence_number": 2},
+            {"id": "c", "sequence_number": 3},
+        ]
+    )
+
+    index.upsert({"id": "a", "sequence_number": 4})
+    index.upsert({"id": "d", "sequence_number": 0})
+
+    assert index.ordered_ids() == ["d", "b", "c", "a"]
+    preceding, following = index.neighborhood("c", 1, 5)
+    assert [scene["id"] for scene in preceding] == ["b"]
+    assert [scene["id"] for scene in following] == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_scene_transitions_send_only_the_window(user: AuthenticatedUser):
+    story_bible = generate_story_bible(SCALES["medium"], project_id="proj-1")
+    payload_service = AsyncMock()
+    payload_service.get_story_bible.return_value = story_bible
+    brain_client = AsyncMock()
+    brain_client.call_tool.return_value = {"suggestions": []}
+    service = StoryBibleService(payload_service, brain_client, MagicMock(), IndexManager(), scene_transition_window=2)
+
+    target = story_bible["scenes"][50]
+    await service.suggest_scene_transitions(story_bible["id"], target["id"], user)
+
+    arguments = brain_client.call_tool.await_args.args[1]
+    assert [scene["sequence_number"] for scene in arguments["story_bible"]["scenes"]] == [49, 50, 51, 52, 53]
+    referenced = {cid for scene in arguments["story_bible"]["scenes"] for cid in scene["characters_present"]}
+    assert {character["id"] for character in arguments["story_bible"]["characters"]} == referenced
+
+    # Subsequent writes update the resident index instead of forcing a re-fetch.
+    payload_service.update_scene.return_value = {**target, "sequence_number": 1000}
+    await service.update_scene(story_bible["id"], target["id"], SceneUpdate(sequence_number=1000), user)
+    await service.suggest_scene_transitions(story_bible["id"], target["id"], user, window=1)
+
+    arguments = brain_client.call_tool.await_args.args[1]
+    assert [scene["sequence_number"] for scene in arguments["preceding_scenes"]] == [100]
+    assert arguments["following_scenes"] == []
+    payload_service.get_story_bible.assert_any_await(story_bible["id"], populate=True)
+    populated_fetches = [c for c in payload_service.get_story_bible.await_args_list if c.kwargs.get("populate")]
+    assert len(populated_fetches) == 1
+
+
+def test_character_index_tracks_scene_membership_incrementally():
+    index = CharacterIndex(
+        scenes=[{"id": "s1", "characters_present": ["c1", "c2"], "plot_threads": ["t1"]}],
+        relationships=[{"id": "r1", "character_from": "c1", "character_to": "c3"}],
+        plot_threads=[{"id": "t2", "key_scenes": ["s2"]}],
+    )
+
+    index.apply_scene({"id": "s1", "characters_present": ["c2"]})
+    index.apply_scene({"id": "s2", "characters_present": [{"id": "c1"}]})
+
+    assert index.scene_ids_for("c1") == {"s2"}
+    assert index.scene_ids_for("c2") == {"s1"}
+    assert [rel["id"] for rel in index.relationships_for("c3")] == ["r1"]
+    assert index.thread_ids_for("c1") == ["t2"]
+
+
+def test_records_round_trip_and_merge_partial_documents():
+    scene = {
+        "id": "s1",
+        "story_bible": {"id": "sb-1", "title": "Harbour"},
+        "time_of_day": "".join(["even", "ing"]),
+        "dialogue_notes": None,
+        "emotional_beats": ["dread"],
+        "characters_present": ["c1", {"id": "c2", "name": "Bram"}],
+        "customField": {"kept": True},
+    }
+    record = SceneRecord.from_dict(scene)
+    assert record.time_of_day is sys.intern("evening")
+    assert record.get("characters_present") == ("c1", "c2") and "sequence_number" not in record
+    assert record.to_dict() == {
+        **scene,
+        "story_bible": "sb-1",
+        "characters_present": ["c1", "c2"],
+    }
+
+    merged = record.merge({"id": "s1", "sequence_number": 2, "dialogue_notes": "Quiet"})
+    assert merged.to_dict()["sequence_number"] == 2 and merged["dialogue_notes"] == "Quiet"
+    assert merged["customField"] == {"kept": True} and record.get("sequence_number") is None
+
+    table = RecordTable(SceneRecord, [scene])
+    table["s1"]["emotional_beats"].append("hope")
+    assert table["s1"]["emotional_beats"] == ["dread"]
+    assert table.value("s1", "time_of_day") == "evening" and table.value("missing", "title") is None
+
+
+def test_records_coerce_documents_and_other_record_types():
+    scene = SceneRecord.from_dict({"id": "s1", "title": "Storm", "sequence_number": 1})
+    assert SceneRecord.coerce(scene) is scene
+    merged = scene.merge(RelationshipRecord.from_dict({"id": "s1", "description": "Rain"}))
+    assert merged.to_dict() == {"id": "s1", "title": "Storm", "sequence_number": 1, "description": "Rain"}
+
+    index = SceneIndex([scene.to_dict()])
+    assert index.value("s1", "title") == "Storm" and index.value("missing", "title", "-") == "-"
+
+
+def test_indexes_hand_out_documents_equal_to_the_source():
+    story_bible = generate_story_bible(SCALES["small"], project_id="proj-1")
+    indexes = StoryBibleIndexes(json.loads(json.dumps(story_bible)))
+    assert indexes.to_story_bible() == {
+        **story_bible,
+        "scenes": sorted(story_bible["scenes"], key=lambda scene: scene["sequence_number"]),
+    }
+
+
+@pytest.mark.asyncio
+async def test_character_arc_sends_focused_context(user: AuthenticatedUser):
+    story_bible = generate_story_bible(SCALES["medium"], project_id="proj-1")
+    payload_service = AsyncMock()
+    payload_service.get_story_bible.return_value = story_bible
+    brain_client = AsyncMock()
+    brain_client.call_tool.return_value = {"arc": "..."}
+    service = StoryBibleService(payload_service, brain_client, MagicMock(), IndexManager())
+
+    character = story_bible["characters"][5]
+    result = await service.generate_character_arc(story_bible["id"], character["id"], user)
+
+    context = brain_client.call_tool.await_args.args[1]["story_context"]
+    expected_scenes = [s["id"] for s in story_bible["scenes"] if character["id"] in s["characters_present"]]
+    assert [scene["id"] for scene in context["scenes"]] == expected_scenes
+    assert all(character["id"] in (rel["character_from"], rel["character_to"]) for rel in context["relationships"])
+    assert "scenes" not in context["story_bible"]
+    assert result["_context"]["scenes"] == len(expected_scenes)
+    assert 0 < result["_context"]["bytes"] < len(json.dumps(story_bible))
+
+
+@pytest.mark.asyncio
+async def test_build_overlapping_a_write_is_not_stored_stale():
+    manager = IndexManager()
+    versions = iter(["Before", "After"])
+
+    async def loader():
+        title = next(versions)
+        if title == "Before":
+            # A write lands while the first load is still in flight.
+            manager.on_scene_written("sb-1", {"id": "s1", "title": "After"})
+        return {"id": "sb-1", "scenes": [{"id": "s1", "title": title, "sequence_number": 1}]}
+
+    indexes = await manager.get("sb-1", loader)
+    assert indexes.scenes.get("s1")["title"] == "After" and manager.peek("sb-1") is indexes
+
+    async def failing():
+        raise RuntimeError("PayloadCMS down")
+
+    with pytest.raises(RuntimeError):
+        await manager.get("sb-2", failing)
+    assert not manager._build_locks and not manager._generations
@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.models import AuthenticatedUser, SceneUpdate
+from src.routes import mcp
+from src.services.jobs import JobQueue
+from src.services.story_bible_service import StoryBibleService
+from src.utils.exceptions import ServiceError
+
+
+@pytest.fixture
+def user() -> AuthenticatedUser:
+    return AuthenticatedUser(id="user-1", projects=["proj-1"])
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_bounds_concurrency_and_records_failures():
+    queue = JobQueue(workers=2)
+    running = peak = 0
+
+    async def work(fail: bool = False):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if fail:
+            raise RuntimeError("brain unavailable")
+        return {"ok": True}
+
+    jobs = [queue.submit("k", "sb-1", "proj-1", n, work)[0] for n in range(5)]
+    failed, _ = queue.submit("k", "sb-1", "proj-1", "bad", lambda: work(fail=True))
+    await asyncio.gather(*(job.done.wait() for job in [*jobs, failed]))
+    await queue.stop()
+
+    assert peak == 2
+    assert all(job.status == "succeeded" and job.result == {"ok": True} for job in jobs)
+    assert failed.status == "failed" and failed.error == "brain unavailable"
+
+
+@pytest.mark.asyncio
+async def test_results_expire_and_queue_is_bounded():
+    queue = JobQueue(workers=1, max_pending=1, result_ttl_seconds=0.01)
+    gate = asyncio.Event()
+
+    async def blocked():
+        await gate.wait()
+
+    first, _ = queue.submit("k", "sb-1", "proj-1", 1, blocked)
+    await asyncio.sleep(0)
+    queue.submit("k", "sb-1", "proj-1", 2, blocked)
+    with pytest.raises(ServiceError):
+        queue.submit("k", "sb-1", "proj-1", 3, blocked)
+
+    gate.set()
+    await first.done.wait()
+    await asyncio.sleep(0.02)
+    assert queue.get(first.id) is None
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_submissions_are_deduplicated_per_bible_version(user: AuthenticatedUser):
+    payload_service = AsyncMock()
+    payload_service.get_story_bible.return_value = {"id": "sb-1", "project_id": "proj-1", "scenes": []}
+    payload_service.update_scene.return_value = {"id": "s1", "title": "Dawn"}
+    brain_client = AsyncMock()
+    brain_client.call_tool.return_value = {"issues": []}
+    service = StoryBibleService(payload_service, brain_client, MagicMock())
+
+    first = await service.submit_job("validate_story_consistency", "sb-1", user)
+    second = await service.submit_job("validate_story_consistency", "sb-1", user)
+    assert second["job_id"] == first["job_id"] and second["deduplicated"]
+
+    finished = await service.wait_for_job(first["job_id"], user)
+    assert finished["status"] == "succeeded"
+    assert finished["result"]["issues"] == []
+
+    await service.update_scene("sb-1", "s1", SceneUpdate(title="Dawn"), user)
+    third = await service.submit_job("validate_story_consistency", "sb-1", user)
+    assert third["job_id"] != first["job_id"] and not third["deduplicated"]
+
+    with pytest.raises(ServiceError):
+        await service.submit_job("generate_character_arc", "sb-1", user)
+    await service._jobs.stop()
+
+
+def test_job_completion_is_pushed_over_mcp(monkeypatch, user: AuthenticatedUser):
+    async def fake_verify(authorization=None):
+        return user
+
+    monkeypatch.setattr(mcp, "verify_bearer_token", fake_verify)
+    payload_service = AsyncMock()
+    payload_service.get_story_bible.return_value = {"id": "sb-1", "project_id": "proj-1", "scenes": []}
+    brain_client = AsyncMock()
+    brain_client.call_tool.return_value = {"issues": []}
+    app = FastAPI()
+    app.include_router(mcp.router, prefix="/mcp")
+    app.state.story_service = StoryBibleService(payload_service, brain_client, MagicMock())
+
+    with TestClient(app).websocket_connect("/mcp/ws") as websocket:
+        websocket.send_json(
+            {
+                "id": 1,
+                "method": "call_tool",
+                "params": {
+                    "name": "submit_job",
+                    "arguments": {"kind": "validate_story_consistency", "story_bible_id": "sb-1"},
+                },
+            }
+        )
+        messages = [websocket.receive_json(), websocket.receive_json()]
+        response = next(message for message in messages if message.get("id") == 1)
+        notification = next(message for message in messages if "method" in message)
+
+    assert notification["method"] == "notifications/job_completed"
+    assert notification["params"]["job_id"] == response["result"]["job_id"]
+    assert notification["params"]["status"] == "succeeded"
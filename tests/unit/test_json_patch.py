@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.middleware.auth import get_current_user
+from src.models import AuthenticatedUser
+from src.routes import api
+from src.services.story_bible_service import StoryBibleService
+from src.utils.exceptions import JsonPatchError
+from src.utils.json_patch import apply_patch, changed_fields
+
+
+@pytest.fixture
+def user() -> AuthenticatedUser:
+    return AuthenticatedUser(id="user-1", projects=["proj-1"])
+
+
+def _bible() -> dict:
+    return {
+        "id": "sb-1",
+        "project_id": "proj-1",
+        "title": "Harbour",
+        "themes": ["loss"],
+        "characters": [{"id": "c1", "name": "Ada"}],
+        "scenes": [
+            {
+                "id": "s1",
+                "sequence_number": 1,
+                "title": "Storm",
+                "emotional_beats": ["dread"],
+                "characters_present": [{"id": "c1", "name": "Ada"}],
+            }
+        ],
+        "plot_threads": [],
+    }
+
+
+def test_apply_patch_operations():
+    document = {"a": {"b": [1, 2]}, "c": "x"}
+    patched = apply_patch(
+        document,
+        [
+            {"op": "add", "path": "/a/b/-", "value": 3},
+            {"op": "replace", "path": "/a/b/0", "value": 0},
+            {"op": "move", "from": "/c", "path": "/d"},
+            {"op": "copy", "from": "/d", "path": "/e"},
+            {"op": "remove", "path": "/a/b/1"},
+            {"op": "test", "path": "/e", "value": "x"},
+            {"op": "add", "path": "/f~1g", "value": None},
+        ],
+    )
+
+    assert patched == {"a": {"b": [0, 3]}, "d": "x", "e": "x", "f/g": None}
+    assert document == {"a": {"b": [1, 2]}, "c": "x"}
+    assert changed_fields(document, patched) == {"a": {"b": [0, 3]}, "d": "x", "e": "x", "f/g": None, "c": None}
+
+
+@pytest.mark.parametrize(
+    "operations",
+    [
+        [{"op": "test", "path": "/c", "value": "y"}],
+        [{"op": "remove", "path": "/missing"}],
+        [{"op": "add", "path": "/a/b/5", "value": 1}],
+        [{"op": "replace", "path": "c", "value": 1}],
+        [{"op": "add", "path": "/c"}],
+    ],
+)
+def test_apply_patch_rejects_invalid_operations(operations):
+    with pytest.raises(JsonPatchError):
+        apply_patch({"a": {"b": []}, "c": "x"}, operations)
+
+
+def _service() -> StoryBibleService:
+    payload_service = AsyncMock()
+    payload_service.get_story_bible.return_value = _bible()
+
+    async def update_scene(scene_id, payload):
+        await asyncio.sleep(0)
+        return {"id": scene_id, **payload}
+
+    payload_service.update_scene.side_effect = update_scene
+    return StoryBibleService(payload_service, AsyncMock(), MagicMock())
+
+
+@pytest.mark.asyncio
+async def test_patch_scene_sends_only_changed_fields(user: AuthenticatedUser):
+    service = _service()
+
+    await service.patch_scene(
+        "sb-1",
+        "s1",
+        [
+            {"op": "add", "path": "/characters_present/-", "value": "c2"},
+            {"op": "test", "path": "/title", "value": "Storm"},
+        ],
+        user,
+    )
+
+    service._payload.update_scene.assert_awaited_once_with("s1", {"characters_present": ["c1", "c2"]})
+
+
+@pytest.mark.asyncio
+async def test_concurrent_patches_to_one_list_are_serialised(user: AuthenticatedUser):
+    service = _service()
+
+    await asyncio.gather(
+        service.patch_scene("sb-1", "s1", [{"op": "add", "path": "/emotional_beats/-", "value": "hope"}], user),
+        service.patch_scene("sb-1", "s1", [{"op": "add", "path": "/emotional_beats/-", "value": "relief"}], user),
+    )
+
+    indexes = await service.get_indexes("sb-1", user)
+    assert indexes.scenes.get("s1")["emotional_beats"] == ["dread", "hope", "relief"]
+
+
+@pytest.mark.asyncio
+async def test_patch_rejects_unpatchable_and_invalid_fields(user: AuthenticatedUser):
+    service = _service()
+
+    with pytest.raises(JsonPatchError):
+        await service.patch_scene("sb-1", "s1", [{"op": "replace", "path": "/id", "value": "s9"}], user)
+    with pytest.raises(JsonPatchError):
+        await service.patch_scene("sb-1", "s1", [{"op": "replace", "path": "/sequence_number", "value": 0}], user)
+    service._payload.update_scene.assert_not_awaited()
+
+
+def test_patch_route_accepts_json_patch_bodies(user: AuthenticatedUser):
+    service = _service()
+    app = FastAPI()
+    app.include_router(api.router, prefix="/api/v1")
+    app.state.story_service = service
+    app.dependency_overrides[get_current_user] = lambda: user
+    client = TestClient(app)
+
+    response = client.patch(
+        "/api/v1/story-bibles/sb-1/scenes/s1",
+        content='[{"op": "replace", "path": "/title", "value": "Squall"}]',
+        headers={"Content-Type": "application/json-patch+json"},
+    )
+    assert response.status_code == 200
+    service._payload.update_scene.assert_awaited_once_with("s1", {"title": "Squall"})
+
+    response = client.patch("/api/v1/story-bibles/sb-1/scenes/s1", json={"title": "Gale"})
+    assert response.status_code == 200
+    assert service._payload.update_scene.await_args.args == ("s1", {"title": "Gale"})
@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.config import settings
+from src.models import AuthenticatedUser
+from src.routes import hooks
+from src.services.payload_events import PayloadEventDebouncer
+from src.services.story_bible_service import StoryBibleService
+
+
+@pytest.fixture
+def user() -> AuthenticatedUser:
+    return AuthenticatedUser(id="user-1", projects=["proj-1"])
+
+
+def _event(collection: str, operation: str, **doc) -> dict:
+    return {"collection": collection, "operation": operation, "doc": doc}
+
+
+@pytest.mark.asyncio
+async def test_debouncer_coalesces_bursts_per_story_bible():
+    applied = []
+
+    async def apply(story_bible_id, events, full_refresh):
+        applied.append((story_bible_id, events, full_refresh))
+
+    debouncer = PayloadEventDebouncer(apply, debounce_seconds=0.05, max_delay_seconds=1, max_incremental=2)
+    debouncer.submit("sb-1", _event("story-bible-scenes", "created", id="s1", title="A"))
+    debouncer.submit("sb-1", _event("story-bible-scenes", "updated", id="s1", title="B"))
+    debouncer.submit("sb-2", _event("plot-threads", "deleted", id="t1"))
+    assert debouncer.pending == 2 and not applied
+
+    await asyncio.sleep(0.15)
+    batches = {story_bible_id: (events, full) for story_bible_id, events, full in applied}
+    assert batches["sb-1"] == ([_event("story-bible-scenes", "created", id="s1", title="B")], False)
+    assert [event["operation"] for event in batches["sb-2"][0]] == ["deleted"]
+
+    for n in range(3):
+        debouncer.submit("sb-3", _event("story-bible-scenes", "updated", id=f"s{n}"))
+    await debouncer.stop()
+    assert applied[-1][0] == "sb-3" and applied[-1][2] is True
+    assert debouncer.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_debouncer_flushes_after_max_delay_during_a_storm():
+    applied = []
+
+    async def apply(story_bible_id, events, full_refresh):
+        applied.append(len(events))
+
+    debouncer = PayloadEventDebouncer(apply, debounce_seconds=0.05, max_delay_seconds=0.12)
+    for n in range(8):
+        debouncer.submit("sb-1", _event("story-bible-scenes", "updated", id=f"s{n}"))
+        await asyncio.sleep(0.03)
+    assert applied and applied[0] < 8
+    await debouncer.stop()
+    assert sum(applied) == 8
+
+
+def _service() -> StoryBibleService:
+    payload_service = AsyncMock()
+    payload_service.get_story_bible.return_value = {
+        "id": "sb-1",
+        "project_id": "proj-1",
+        "scenes": [{"id": "s1", "title": "Storm", "sequence_number": 1, "updatedAt": "2024-01-01"}],
+        "characters": [{"id": "c1", "name": "Ada"}],
+    }
+    return StoryBibleService(payload_service, AsyncMock(), MagicMock())
+
+
+@pytest.mark.asyncio
+async def test_external_changes_update_indexes_caches_and_subscribers(user: AuthenticatedUser):
+    service = _service()
+    indexes = await service.get_indexes("sb-1", user)
+    subscription = service.changes.open()
+    service.changes.subscribe(subscription, "sb-1")
+
+    echo = _event("story-bible-scenes", "updated", id="s1", title="Storm", updatedAt="2024-01-01")
+    assert await service.apply_external_changes("sb-1", [echo]) == 0
+
+    edit = _event("story-bible-scenes", "updated", id="s1", title="Squall", updatedAt="2024-02-01")
+    edit["previous_doc"] = {"id": "s1", "title": "Storm", "updatedAt": "2024-01-01"}
+    applied = await service.apply_external_changes(
+        "sb-1", [edit, _event("story-bible-characters", "deleted", id="c1")]
+    )
+    assert applied == 2
+    assert indexes.scenes.get("s1")["title"] == "Squall"
+    assert "c1" not in indexes.characters
+    first, second = await subscription.get(), await subscription.get()
+    assert first["fields"] == ["title", "updatedAt"] and first["user"] == "payloadcms"
+    assert second["operation"] == "deleted"
+
+    # Cached documents were invalidated, so the next read goes back to PayloadCMS.
+    await service.get_story_bible("sb-1", user)
+    assert service._payload.get_story_bible.await_count == 2
+
+    await service.apply_external_changes("sb-1", [_event("story-bibles", "deleted", id="sb-1")])
+    assert service._indexes.peek("sb-1") is None
+
+
+def test_webhook_route_requires_secret_and_queues_events(monkeypatch):
+    app = FastAPI()
+    app.include_router(hooks.router, prefix="/hooks")
+    app.state.payload_events = PayloadEventDebouncer(AsyncMock(), debounce_seconds=60)
+    client = TestClient(app)
+    body = [
+        {"collection": "story-bible-scenes", "operation": "update", "doc": {"id": "s1", "story_bible": "sb-1"}},
+        {"collection": "plot-threads", "operation": "delete", "doc": {"id": "t1", "story_bible": {"id": "sb-1"}}},
+        {"collection": "plot-threads", "operation": "update", "doc": {"id": "t2"}},
+    ]
+
+    monkeypatch.setattr(settings, "PAYLOAD_WEBHOOK_SECRET", None)
+    assert client.post("/hooks/payload", json=body).status_code == 503
+    monkeypatch.setattr(settings, "PAYLOAD_WEBHOOK_SECRET", "s3cret")
+    assert client.post("/hooks/payload", json=body, headers={"X-Payload-Webhook-Secret": "nope"}).status_code == 401
+
+    response = client.post("/hooks/payload", json=body, headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 202
+    assert response.json()["accepted"] == 2 and response.json()["ignored"] == 1
+    unknown = {"collection": "users", "operation": "update", "doc": {}}
+    headers = {"X-Payload-Webhook-Secret": "s3cret"}
+    assert client.post("/hooks/payload", json=unknown, headers=headers).status_code == 422
@@ -0,0 +1,131 @@
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from src.middleware.auth import get_current_user
+from src.middleware.rate_limit import RateLimitHeadersMiddleware, enforce_rate_limit
+from src.models import AuthenticatedUser
+from src.routes import api, mcp
+from src.services.rate_limit import Bucket, MemoryRateLimitStore, RateLimiter, classify_tool
+from src.services.story_bible_service import StoryBibleService
+from src.utils.exceptions import ServiceOverloaded
+
+
+@pytest.fixture
+def user() -> AuthenticatedUser:
+    return AuthenticatedUser(id="user-1", projects=["proj-1"])
+
+
+@pytest.fixture
+def clock():
+    return [1000.0]
+
+
+def _limiter(read=2, write=2, ai=1, project_multiplier=1.5, clock=None) -> RateLimiter:
+    store = MemoryRateLimitStore(clock=(lambda: clock[0]) if clock else time.monotonic)
+    return RateLimiter(
+        store, per_minute={"read": read, "write": write, "ai": ai}, project_multiplier=project_multiplier
+    )
+
+
+@pytest.mark.asyncio
+async def test_bucket_refills_over_time(clock):
+    store = MemoryRateLimitStore(clock=lambda: clock[0])
+    bucket = Bucket("read:user:u", 2, 1.0)
+    assert (await store.take([bucket])).remaining == 1
+    assert (await store.take([bucket])).remaining == 0
+    denied = await store.take([bucket])
+    assert not denied.allowed and denied.retry_after == pytest.approx(1.0)
+
+    clock[0] += 1.5
+    assert (await store.take([bucket])).allowed
+    assert not (await store.take([bucket])).allowed
+
+
+@pytest.mark.asyncio
+async def test_project_bucket_is_shared_and_denials_consume_nothing(clock):
+    limiter = _limiter(read=2, project_multiplier=1.5, clock=clock)
+    assert (await limiter.check("read", "alice", "proj-1")).allowed
+    assert (await limiter.check("read", "alice", "proj-1")).allowed
+    assert (await limiter.check("read", "bob", "proj-1")).allowed
+    denied = await limiter.check("read", "carol", "proj-1")
+    assert not denied.allowed and denied.limit == 3
+    with pytest.raises(ServiceOverloaded) as exc:
+        denied.raise_if_limited()
+    assert exc.value.status_code == 429
+
+    # Carol's own bucket was not charged for the rejected request.
+    assert (await limiter.check("read", "carol")).remaining == 1
+    assert (await limiter.check("write", "carol", "proj-1")).allowed
+    clock[0] += 20
+    assert (await limiter.check("read", "bob", "proj-1")).allowed
+
+
+@pytest.mark.asyncio
+async def test_zero_rate_disables_category():
+    assert await _limiter(ai=0).check("ai", "alice") is None
+
+
+def test_tools_are_classified_by_cost():
+    assert classify_tool("get_story_bible") == "read"
+    assert classify_tool("search_story_bible") == "read"
+    assert classify_tool("update_scene") == "write"
+    assert classify_tool("find_similar") == "ai"
+    assert classify_tool("generate_character_arc") == "ai"
+
+
+def _service() -> StoryBibleService:
+    payload_service = AsyncMock()
+    payload_service.get_story_bible.return_value = {"id": "sb-1", "project_id": "proj-1", "scenes": []}
+    payload_service.list_story_bibles.return_value = {"docs": []}
+    return StoryBibleService(payload_service, AsyncMock(), MagicMock())
+
+
+def test_rest_requests_carry_headers_and_are_rejected_when_exhausted(user: AuthenticatedUser):
+    app = FastAPI()
+    app.add_middleware(RateLimitHeadersMiddleware)
+    app.include_router(api.router, prefix="/api/v1", dependencies=[Depends(enforce_rate_limit)])
+    app.state.story_service = _service()
+    app.state.rate_limiter = _limiter(read=2)
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    @app.exception_handler(ServiceOverloaded)
+    async def overloaded(_, exc: ServiceOverloaded):
+        return JSONResponse(status_code=exc.status_code, content={"detail": str(exc)})
+
+    client = TestClient(app)
+    first = client.get("/api/v1/story-bibles/sb-1")
+    assert first.status_code == 200
+    assert first.headers["RateLimit-Limit"] == "2" and first.headers["RateLimit-Remaining"] == "1"
+
+    client.get("/api/v1/story-bibles/sb-1")
+    limited = client.get("/api/v1/story-bibles/sb-1")
+    assert limited.status_code == 429
+    assert limited.headers["RateLimit-Remaining"] == "0"
+    assert int(limited.headers["Retry-After"]) >= 1
+
+
+def test_mcp_calls_are_rate_limited(monkeypatch, user: AuthenticatedUser):
+    async def fake_verify(authorization=None):
+        return user
+
+    monkeypatch.setattr(mcp, "verify_bearer_token", fake_verify)
+    app = FastAPI()
+    app.include_router(mcp.router, prefix="/mcp")
+    app.state.story_service = _service()
+    app.state.rate_limiter = _limiter(read=1)
+
+    call = {"method": "call_tool", "params": {"name": "get_story_bible", "arguments": {"story_bible_id": "sb-1"}}}
+    with TestClient(app).websocket_connect("/mcp/ws") as websocket:
+        websocket.send_json({"id": 1, **call})
+        assert "result" in websocket.receive_json()
+        websocket.send_json({"id": 2, **call})
+        error = websocket.receive_json()["error"]
+
+    assert error["data"]["code"] == 429
+    assert error["data"]["category"] == "read" and error["data"]["retry_after"] >= 1
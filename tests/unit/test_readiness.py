@@ -0,0 +1,99 @@
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.models import AuthenticatedUser
+from src.routes import health
+from src.services.brain_client import BrainServiceClient
+from src.services.readiness import ReadinessMonitor
+from src.services.story_bible_service import StoryBibleService
+
+
+@pytest.mark.asyncio
+async def test_required_checks_gate_readiness_and_optional_ones_degrade():
+    state = {"payload": False}
+    became_ready = []
+
+    async def payload():
+        if not state["payload"]:
+            raise ConnectionError("connection refused")
+        return {"status_code": 200}
+
+    async def brain():
+        await asyncio.sleep(1)
+
+    monitor = ReadinessMonitor(timeout_seconds=0.05, on_first_ready=lambda: became_ready.append(True))
+    monitor.add("payloadcms", payload)
+    monitor.add("brain_service", brain, required=False)
+    assert monitor.snapshot()["status"] == "starting" and not monitor.ready
+
+    await monitor.refresh()
+    snapshot = monitor.snapshot()
+    assert snapshot["status"] == "not_ready"
+    assert snapshot["checks"]["payloadcms"]["error"] == "connection refused"
+    assert "timed out" in snapshot["checks"]["brain_service"]["error"]
+
+    state["payload"] = True
+    await monitor.refresh()
+    await monitor.refresh()
+    snapshot = monitor.snapshot()
+    assert monitor.ready and snapshot["status"] == "degraded"
+    assert snapshot["checks"]["payloadcms"]["status_code"] == 200
+    assert became_ready == [True]
+
+
+def test_ready_route_serves_cached_results():
+    calls = []
+
+    async def probe():
+        calls.append(True)
+        return None
+
+    app = FastAPI()
+    app.include_router(health.router, prefix="/health")
+    client = TestClient(app)
+    assert client.get("/health/ready").json()["status"] == "ready"
+
+    app.state.readiness = ReadinessMonitor()
+    app.state.readiness.add("payloadcms", probe)
+    assert client.get("/health/ready").status_code == 503
+
+    asyncio.run(app.state.readiness.refresh())
+    response = client.get("/health/ready")
+    assert response.status_code == 200 and response.json()["status"] == "ready"
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_caches_check_reports_warm_state_without_gating_readiness():
+    payload_service = AsyncMock()
+    payload_service.get_story_bible.return_value = {"id": "sb-1", "project_id": "proj-1"}
+    service = StoryBibleService(payload_service, AsyncMock(), MagicMock())
+    monitor = ReadinessMonitor()
+    monitor.add("caches", service.warm_state, required=False)
+
+    await monitor.refresh()
+    assert monitor.ready and monitor.snapshot()["checks"]["caches"]["warm"] is False
+
+    await service.get_indexes("sb-1", AuthenticatedUser(id="user-1", projects=["proj-1"]))
+    await monitor.refresh()
+    caches = monitor.snapshot()["checks"]["caches"]
+    assert caches["warm"] is True and caches["indexed_story_bibles"] == 1
+
+
+@pytest.mark.asyncio
+async def test_brain_connection_does_not_block_startup():
+    client = BrainServiceClient("http://127.0.0.1:1", "ws://127.0.0.1:1/mcp", timeout=30)
+    started = time.perf_counter()
+    client.start()
+    assert time.perf_counter() - started < 0.1
+    assert client.mode == "http"
+    await asyncio.sleep(0.05)
+    with pytest.raises(Exception):
+        await client.ping(timeout=0.5)
+    await client.disconnect()
@@ -0,0 +1,134 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.indexes import RelationshipGraph, StoryBibleIndexes
+from src.middleware.auth import get_current_user
+from src.models import AuthenticatedUser
+from src.routes import api, mcp
+from src.services.story_bible_service import StoryBibleService
+from src.utils.exceptions import AuthorizationError
+
+
+@pytest.fixture
+def user() -> AuthenticatedUser:
+    return AuthenticatedUser(id="user-1", projects=["proj-1"])
+
+
+def _rel(rel_id: str, source: str, target: str, strength) -> dict:
+    return {"id": rel_id, "character_from": source, "character_to": target, "strength": strength}
+
+
+def test_graph_queries():
+    graph = RelationshipGraph(
+        ["a", "b", "c", "d", "e"],
+        [_rel("r1", "a", "b", 9), _rel("r2", "b", "c", 3), _rel("r3", "c", "d", 7)],
+    )
+
+    assert {entry["character_id"] for entry in graph.neighbors("b")} == {"a", "c"}
+    path = graph.shortest_path("a", "d")
+    assert [step["character_id"] for step in path] == ["b", "c", "d"]
+    assert graph.shortest_path("a", "e") is None
+    assert [tie["relationship_id"] for tie in graph.strongest(2)] == ["r1", "r3"]
+    assert graph.clusters() == [["a", "b", "c", "d"], ["e"]]
+    assert graph.clusters(min_strength=5) == [["a", "b"], ["c", "d"], ["e"]]
+
+
+def test_graph_follows_index_writes():
+    indexes = StoryBibleIndexes(
+        {
+            "id": "sb-1",
+            "project_id": "proj-1",
+            "characters": [{"id": "a"}, {"id": "b"}, {"id": "c"}],
+            "relationships": [_rel("r1", "a", "b", 5)],
+        }
+    )
+    assert indexes.graph.shortest_path("a", "c") is None
+
+    indexes.apply_relationship(_rel("r2", "b", "c", 4))
+    assert len(indexes.graph.shortest_path("a", "c")) == 2
+
+    indexes.remove_character("b")
+    assert indexes.graph.shortest_path("a", "c") is None
+    assert indexes.graph.neighbors("a") == []
+
+
+def test_graph_edge_cases():
+    graph = RelationshipGraph(
+        ["a", "b", "c", "d"],
+        [_rel("r1", "a", "b", "8"), _rel("r2", "a", "c", 2), _rel("r3", "c", "d", None), _rel("r4", "b", "d", "high")],
+    )
+
+    assert graph.shortest_path("a", "a") == []
+    assert graph.shortest_path("a", "nobody") is None
+    assert [tie["relationship_id"] for tie in graph.strongest(2, character_id="a")] == ["r1", "r2"]
+    assert [tie["relationship_id"] for tie in graph.strongest(10, character_id="d")] == ["r4", "r3"]
+    assert graph.clusters(min_strength=2) == [["a", "b", "c"], ["d"]]
+    assert graph.clusters(min_strength=3) == [["a", "b"], ["c"], ["d"]]
+
+    graph.add_character("e")
+    assert graph.clusters(min_strength=3) == [["a", "b"], ["c"], ["d"], ["e"]]
+    graph.apply_relationship(_rel("r5", "d", "e", 9))
+    assert [tie["relationship_id"] for tie in graph.strongest(1)] == ["r5"]
+    assert graph.clusters(min_strength=3) == [["a", "b"], ["d", "e"], ["c"]]
+    graph.remove_relationship("r1")
+    assert graph.shortest_path("b", "c") == [
+        {"from": "b", "relationship_id": "r4", "character_id": "d", "direction": "outgoing",
+         "relationship_type": None, "strength": "high"},
+        {"from": "d", "relationship_id": "r3", "character_id": "c", "direction": "incoming",
+         "relationship_type": None, "strength": None},
+    ]
+
+
+def _service() -> StoryBibleService:
+    payload_service = AsyncMock()
+    payload_service.get_story_bible.return_value = {
+        "id": "sb-1",
+        "project_id": "proj-1",
+        "characters": [{"id": "a", "name": "Ada"}, {"id": "b", "name": "Bram"}, {"id": "c", "name": "Cole"}],
+        "relationships": [_rel("r1", "a", "b", 7), _rel("r2", "b", "c", 2)],
+    }
+    return StoryBibleService(payload_service, AsyncMock(), MagicMock())
+
+
+def test_rest_routes_name_characters_and_reject_unknown_ones(user: AuthenticatedUser):
+    app = FastAPI()
+    app.include_router(api.router, prefix="/api/v1")
+    app.state.story_service = _service()
+    app.dependency_overrides[get_current_user] = lambda: user
+    client = TestClient(app)
+
+    path = client.get("/api/v1/story-bibles/sb-1/relationships/path?source=a&target=c").json()
+    assert path["connected"] and path["hops"] == 2
+    assert [(step["from_name"], step["character_name"]) for step in path["path"]] == [("Ada", "Bram"), ("Bram", "Cole")]
+    strongest = client.get("/api/v1/story-bibles/sb-1/relationships/strongest?limit=1&character_id=c").json()
+    ties = strongest["relationships"]
+    assert [(tie["relationship_id"], tie["character_from_name"]) for tie in ties] == [("r2", "Bram")]
+    clusters = client.get("/api/v1/story-bibles/sb-1/relationships/clusters?min_strength=5").json()
+    assert [[member["name"] for member in group] for group in clusters["clusters"]] == [["Ada", "Bram"], ["Cole"]]
+
+    with pytest.raises(AuthorizationError, match="Character ghost not found"):
+        client.get("/api/v1/story-bibles/sb-1/relationships/path?source=a&target=ghost")
+
+
+def test_mcp_relationship_tools(monkeypatch, user: AuthenticatedUser):
+    async def fake_verify(authorization=None):
+        return user
+
+    monkeypatch.setattr(mcp, "verify_bearer_token", fake_verify)
+    app = FastAPI()
+    app.include_router(mcp.router, prefix="/mcp")
+    app.state.story_service = _service()
+
+    def call(websocket, request_id: int, name: str, **arguments):
+        arguments = {"story_bible_id": "sb-1", **arguments}
+        websocket.send_json({"id": request_id, "method": "call_tool", "params": {"name": name, "arguments": arguments}})
+        return websocket.receive_json()
+
+    with TestClient(app).websocket_connect("/mcp/ws") as websocket:
+        path = call(websocket, 1, "find_relationship_path", source="c", target="a")["result"]
+        assert [step["character_id"] for step in path["path"]] == ["b", "a"]
+        assert call(websocket, 2, "get_character_clusters", min_strength=3)["result"]["min_strength"] == 3
+        assert "required" in call(websocket, 3, "find_relationship_path", source="a")["error"]["message"]
@@ -0,0 +1,102 @@
+import asyncio
+import itertools
+import random
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.models import AuthenticatedUser
+from src.services.story_bible_service import StoryBibleService
+from src.utils.exceptions import ServiceError
+from src.utils.sequencing import resequence
+
+
+def _minimum_writes(current):
+    """Brute force: the largest set of positions that can keep their numbers."""
+    n = len(current)
+    for keep in range(n, -1, -1):
+        for kept in itertools.combinations(range(n), keep):
+            slots = [-1, *kept]
+            if all(current[i] >= i + 1 for i in kept) and all(
+                current[b] - current[a] >= b - a for a, b in zip(slots[1:], slots[2:])
+            ):
+                return n - keep
+    return n
+
+
+def test_resequence_is_valid_and_minimal():
+    rng = random.Random(7)
+    for _ in range(300):
+        n = rng.randint(1, 7)
+        current = [rng.randint(1, 10) for _ in range(n)]
+        numbers = resequence(current)
+
+        assert numbers[0] >= 1
+        assert all(a < b for a, b in zip(numbers, numbers[1:]))
+        writes = sum(1 for old, new in zip(current, numbers) if old != new)
+        assert writes == _minimum_writes(current), current
+
+
+def test_resequence_moves_only_the_dragged_scene():
+    # Scene 1 dragged to the end of a 1..10 numbering.
+    assert resequence([2, 3, 4, 5, 6, 7, 8, 9, 10, 1]) == [2, 3, 4, 5, 6, 7, 8, 9, 10, 11]
+    # Gaps in the numbering leave room for a scene dropped between neighbours.
+    numbers = resequence([10, 30, 20, 40])
+    assert numbers in ([10, 11, 20, 40], [10, 30, 31, 40])
+
+
+@pytest.mark.asyncio
+async def test_reorder_scenes_bounds_concurrency_and_reports_writes():
+    user = AuthenticatedUser(id="user-1", projects=["proj-1"])
+    scenes = [{"id": f"s{n}", "sequence_number": n * 10} for n in range(1, 7)]
+    payload_service = AsyncMock()
+    payload_service.get_story_bible.return_value = {"id": "sb-1", "project_id": "proj-1", "scenes": scenes}
+    in_flight = peak = 0
+
+    async def update_scene(scene_id, payload):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"id": scene_id, **payload}
+
+    payload_service.update_scene.side_effect = update_scene
+    service = StoryBibleService(payload_service, AsyncMock(), MagicMock(), reorder_concurrency=2)
+
+    order = ["s6", "s5", "s4", "s1", "s2", "s3"]
+    result = await service.reorder_scenes("sb-1", order, user)
+
+    assert [entry["id"] for entry in result["order"]] == order
+    assert result["writes"] == payload_service.update_scene.await_count == 3
+    assert peak == 2
+    indexes = await service.get_indexes("sb-1", user)
+    assert indexes.scenes.ordered_ids() == order
+
+    with pytest.raises(ServiceError):
+        await service.reorder_scenes("sb-1", order[:-1], user)
+
+
+@pytest.mark.asyncio
+async def test_failed_reorder_puts_renumbered_scenes_back():
+    user = AuthenticatedUser(id="user-1", projects=["proj-1"])
+    scenes = [{"id": f"s{n}", "sequence_number": n * 10} for n in range(1, 7)]
+    payload_service = AsyncMock()
+    payload_service.get_story_bible.return_value = {"id": "sb-1", "project_id": "proj-1", "scenes": scenes}
+    stored = {scene["id"]: scene["sequence_number"] for scene in scenes}
+
+    async def update_scene(scene_id, payload):
+        if scene_id == "s5" and payload["sequence_number"] != stored["s5"]:
+            raise ServiceError("scene s5 is locked")
+        stored[scene_id] = payload["sequence_number"]
+        return {"id": scene_id, **payload}
+
+    payload_service.update_scene.side_effect = update_scene
+    service = StoryBibleService(payload_service, AsyncMock(), MagicMock())
+
+    with pytest.raises(ServiceError, match="s5 is locked"):
+        await service.reorder_scenes("sb-1", ["s6", "s5", "s4", "s1", "s2", "s3"], user)
+
+    assert stored == {scene["id"]: scene["sequence_number"] for scene in scenes}
+    indexes = await service.get_indexes("sb-1", user)
+    assert indexes.scenes.ordered_ids() == ["s1", "s2", "s3", "s4", "s5", "s6"]
@@ -0,0 +1,164 @@
+import copy
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from src.middleware.auth import get_current_user
+from src.models import AuthenticatedUser, SceneUpdate
+from src.routes import api
+from src.services.story_bible_service import StoryBibleService
+from src.snapshots import DiskSnapshotStore, MemorySnapshotStore, SnapshotManager, diff_manifests, freeze
+from src.utils.exceptions import AuthorizationError
+
+
+def _story_bible() -> dict:
+    return {
+        "id": "sb-1",
+        "project_id": "proj-1",
+        "title": "Lighthouse",
+        "characters": [{"id": "c1", "name": "Mara", "role": "protagonist"}],
+        "scenes": [
+            {"id": f"s{number}", "title": f"Scene {number}", "sequence_number": number, "characters_present": ["c1"]}
+            for number in range(1, 6)
+        ],
+        "plot_threads": [{"id": "t1", "thread_name": "The storm", "key_scenes": ["s1", "s5"]}],
+        "relationships": [],
+    }
+
+
+def test_freeze_shares_unchanged_entities():
+    first = freeze(_story_bible())
+    assert freeze(_story_bible()).snapshot_id == first.snapshot_id
+
+    edited = _story_bible()
+    edited["scenes"][2]["title"] = "Squall"
+    second = freeze(edited)
+    assert second.snapshot_id != first.snapshot_id
+    # Only the edited scene and the manifest are new.
+    assert set(second.blobs) - set(first.blobs) == {second.snapshot_id, second.manifest["scenes"][2][1]}
+
+
+@pytest.mark.asyncio
+async def test_disk_store_round_trips_and_compacts(tmp_path):
+    manager = SnapshotManager(DiskSnapshotStore(str(tmp_path), grace_seconds=0), max_per_story_bible=0)
+    original = _story_bible()
+    first = await manager.create(original, project_id="proj-1", version=1, created_by="user-1", label="draft")
+    assert first["new_blobs"] == first["blobs"] == 9
+    assert await manager.create(original, project_id="proj-1", version=1, created_by="user-1") == first
+
+    edited = copy.deepcopy(original)
+    edited["scenes"][0]["title"] = "Prologue"
+    second = await manager.create(edited, project_id="proj-1", version=2, created_by="user-1")
+    assert second["new_blobs"] == 2
+
+    reopened = SnapshotManager(DiskSnapshotStore(str(tmp_path), grace_seconds=0))
+    assert [record["id"] for record in await reopened.list("sb-1")] == [first["id"], second["id"]]
+    assert await reopened.load(await reopened.get("sb-1", first["id"])) == original
+
+    assert await reopened.delete("sb-1", first["id"])
+    compacted = await reopened.compact()
+    assert compacted["kept"] == 9 and compacted["removed"] == 2 and compacted["bytes_freed"] > 0
+    assert await reopened.load(second) == edited
+    assert not list(tmp_path.rglob(".tmp-*"))
+
+
+@pytest.mark.asyncio
+async def test_retention_drops_the_oldest_snapshots():
+    store = MemorySnapshotStore()
+    manager = SnapshotManager(store, max_per_story_bible=2)
+    ids = []
+    for number in range(3):
+        story_bible = _story_bible()
+        story_bible["title"] = f"Draft {number}"
+        ids.append((await manager.create(story_bible, project_id="proj-1", version=number, created_by="u"))["id"])
+    assert [record["id"] for record in await manager.list("sb-1")] == ids[1:]
+    assert ids[0] not in await store.get_blobs([ids[0]])
+
+
+@pytest.mark.asyncio
+async def test_service_snapshots_are_immutable_and_project_scoped():
+    user = AuthenticatedUser(id="user-1", projects=["proj-1"])
+    payload_service = AsyncMock()
+    payload_service.get_story_bible.return_value = _story_bible()
+    payload_service.update_scene.return_value = {"id": "s2", "title": "Squall", "sequence_number": 2}
+    export_service = MagicMock()
+    export_service.generate.side_effect = lambda story_bible, **_: story_bible["scenes"][1]["title"].encode()
+    service = StoryBibleService(payload_service, AsyncMock(), export_service)
+
+    record = await service.create_snapshot("sb-1", user, label="before edits")
+    await service.update_scene("sb-1", "s2", SceneUpdate(title="Squall"), user)
+    later = await service.create_snapshot("sb-1", user)
+    assert later["version"] > record["version"] and later["id"] != record["id"]
+
+    frozen = await service.get_snapshot("sb-1", record["id"], user)
+    assert frozen["label"] == "before edits" and frozen["story_bible"]["scenes"][1]["title"] == "Scene 2"
+    content, _ = await service.export_snapshot("sb-1", record["id"], user, export_format="markdown")
+    assert content == b"Scene 2"
+    listed = await service.list_snapshots("sb-1", user)
+    assert [entry["id"] for entry in listed["snapshots"]] == [record["id"], later["id"]]
+
+    with pytest.raises(HTTPException):
+        await service.get_snapshot("sb-1", record["id"], AuthenticatedUser(id="user-2", projects=["proj-2"]))
+    await service.delete_snapshot("sb-1", record["id"], user)
+    with pytest.raises(AuthorizationError):
+        await service.get_snapshot("sb-1", record["id"], user)
+
+
+@pytest.mark.asyncio
+async def test_diff_loads_only_entities_whose_fingerprint_changed():
+    old = freeze(_story_bible())
+    edited = _story_bible()
+    edited["title"] = "The Lighthouse"
+    edited["scenes"][1].update(title="Squall", characters_present=["c1", "c2"], updatedAt="2026-01-02")
+    edited["scenes"][3]["updatedAt"] = "2026-01-02"
+    edited["characters"].append({"id": "c2", "name": "Ilse", "role": "supporting"})
+    del edited["plot_threads"][0]
+    new = freeze(edited)
+    fetched = []
+
+    async def fetch(addresses):
+        fetched.extend(addresses)
+        return {address: {**old.blobs, **new.blobs}[address] for address in addresses}
+
+    diff = await diff_manifests(old.manifest, new.manifest, fetch)
+
+    assert len(fetched) == 2 + 2 + 2 + 1 + 1  # summary, two edited scenes, added character, removed thread
+    assert diff["story_bible"] == [{"field": "title", "old": "Lighthouse", "new": "The Lighthouse"}]
+    assert diff["summary"]["scenes"] == {"added": 0, "removed": 0, "changed": 1, "unchanged": 4}
+    (scene,) = diff["collections"]["scenes"]["changed"]
+    assert scene["label"] == "Squall"
+    assert scene["fields"][0] == {
+        "field": "characters_present", "old": ["c1"], "new": ["c1", "c2"], "added": ["c2"], "removed": [],
+    }
+    assert [entry["id"] for entry in diff["collections"]["characters"]["added"]] == ["c2"]
+    assert diff["collections"]["plot_threads"]["removed"][0]["label"] == "The storm"
+    assert not diff["identical"]
+    assert (await diff_manifests(old.manifest, old.manifest, fetch))["identical"]
+
+
+def test_diff_routes_compare_a_snapshot_with_the_current_draft():
+    user = AuthenticatedUser(id="user-1", projects=["proj-1"])
+    payload_service = AsyncMock()
+    payload_service.get_story_bible.return_value = _story_bible()
+    payload_service.update_scene.return_value = {"id": "s2", "title": "Squall", "sequence_number": 2}
+    app = FastAPI()
+    app.include_router(api.router, prefix="/api/v1")
+    app.state.story_service = StoryBibleService(payload_service, AsyncMock(), MagicMock())
+    app.dependency_overrides[get_current_user] = lambda: user
+    client = TestClient(app)
+
+    snapshot_id = client.post("/api/v1/story-bibles/sb-1/snapshots", json={"label": "draft 1"}).json()["id"]
+    assert client.get(f"/api/v1/story-bibles/sb-1/diff?from={snapshot_id}").json()["identical"]
+    client.patch("/api/v1/story-bibles/sb-1/scenes/s2", json={"title": "Squall"})
+
+    diff = client.get(f"/api/v1/story-bibles/sb-1/diff?from={snapshot_id}&to=current").json()
+    assert diff["from"]["name"] == "draft 1" and diff["to"]["name"] == "current"
+    (scene,) = diff["collections"]["scenes"]["changed"]
+    assert scene["fields"] == [{"field": "title", "old": "Scene 2", "new": "Squall"}]
+    markdown = client.get(f"/api/v1/story-bibles/sb-1/diff?from={snapshot_id}&format=markdown")
+    assert markdown.headers["content-type"].startswith("text/markdown")
+    assert "### Squall (`s2`)" in markdown.text and "- **title**: `Scene 2` → `Squall`" in markdown.text
+    assert client.get("/api/v1/story-bibles/sb-1/diff?from=current&format=xml").status_code == 422
@@ -0,0 +1,29 @@
+from benchmarks.micro import find_regressions, run_micro_benchmarks
+from benchmarks.synthetic import SCALES, generate_story_bible
+from src.models import CharacterCreate, SceneCreate
+
+
+def test_generator_is_deterministic_and_scaled():
+    first = generate_story_bible(SCALES["medium"], seed=3)
+    second = generate_story_bible(SCALES["medium"], seed=3)
+
+    assert first == second
+    assert len(first["scenes"]) == SCALES["medium"].scenes
+    assert len(first["characters"]) == SCALES["medium"].characters
+    character_ids = {character["id"] for character in first["characters"]}
+    for scene in first["scenes"]:
+        assert set(scene["characters_present"]) <= character_ids
+        SceneCreate.model_validate(scene)
+    for character in first["characters"]:
+        CharacterCreate.model_validate(character)
+
+
+def test_micro_benchmarks_report_time_and_memory():
+    report = run_micro_benchmarks(["small"], repeats=1, only=["render_markdown"])
+
+    stats = report["results"]["small"]["render_markdown"]
+    assert stats["best_ms"] >= 0
+    assert stats["peak_kib"] > 0
+
+    slower = {"results": {"small": {"render_markdown": {**stats, "best_ms": stats["best_ms"] * 2 + 1}}}}
+    assert find_regressions(report, slower, max_regression=0.25)
@@ -0,0 +1,55 @@
+import pytest
+
+from src.indexes import StoryBibleIndexes, TextIndex
+
+
+def _bible() -> dict:
+    return {
+        "id": "sb-1",
+        "project_id": "proj-1",
+        "characters": [
+            {"id": "c1", "name": "Ada", "background": "A lighthouse keeper on the northern rock", "motivation": "Keep the lamp lit"},
+            {"id": "c2", "name": "Bram", "background": "A fishmonger", "motivation": "Buy the lighthouse"},
+        ],
+        "scenes": [
+            {"id": "s1", "sequence_number": 1, "title": "Storm", "description": "The lighthouse lamp fails in the storm"},
+            {"id": "s2", "sequence_number": 2, "title": "Market", "description": "Fishmongers argue over prices"},
+        ],
+        "plot_threads": [{"id": "t1", "thread_name": "The sale", "description": "Bram schemes to buy the lighthouse"}],
+    }
+
+
+def test_bm25_prefers_denser_and_rarer_matches():
+    index = TextIndex()
+    index.index_entity("scene", {"id": "a", "description": "storm storm over the harbour"})
+    index.index_entity("scene", {"id": "b", "description": "a long quiet morning with one storm cloud far away"})
+    index.index_entity("scene", {"id": "c", "description": "harbour market"})
+
+    hits = index.search("storm")
+    assert [hit["id"] for hit in hits] == ["a", "b"]
+    assert hits[0]["matched_fields"] == ["scene.description"]
+
+
+def test_field_filter_and_unknown_field():
+    indexes = StoryBibleIndexes(_bible())
+
+    all_hits = {(hit["kind"], hit["id"]) for hit in indexes.text.search("lighthouse")}
+    assert all_hits == {("scene", "s1"), ("character", "c1"), ("character", "c2"), ("plot_thread", "t1")}
+
+    motivation_hits = indexes.text.search("lighthouse", fields=["character.motivation"])
+    assert [hit["id"] for hit in motivation_hits] == ["c2"]
+
+    with pytest.raises(ValueError):
+        indexes.text.search("lighthouse", fields=["scene.nonsense"])
+
+
+def test_index_follows_writes():
+    indexes = StoryBibleIndexes(_bible())
+
+    indexes.apply_scene({"id": "s2", "description": "A lighthouse rises from the fog"})
+    assert ("scene", "s2") in {(hit["kind"], hit["id"]) for hit in indexes.text.search("fog")}
+    assert indexes.text.search("fishmongers") == []
+
+    indexes.remove_character("c2")
+    indexes.remove_plot_thread("t1")
+    assert {hit["id"] for hit in indexes.text.search("buy")} == set()
@@ -0,0 +1,71 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.middleware.timing import ServerTimingMiddleware
+from src.models import AuthenticatedUser
+from src.routes import mcp
+from src.services.story_bible_service import StoryBibleService
+from src.utils.timing import RequestTimings, activate_timings, deactivate_timings, span
+
+
+def test_span_without_active_timings_is_noop():
+    with span("payload"):
+        pass
+
+
+def test_spans_are_aggregated_by_name():
+    timings = RequestTimings()
+    token = activate_timings(timings)
+    try:
+        with span("payload"):
+            pass
+        with span("payload"):
+            pass
+        with span("brain"):
+            pass
+    finally:
+        deactivate_timings(token)
+
+    summary = timings.as_dict()
+    assert summary["spans"]["payload"]["count"] == 2
+    assert summary["spans"]["brain"]["count"] == 1
+    header = timings.server_timing_header()
+    assert header.startswith("payload;dur=")
+    assert "total;dur=" in header
+
+
+def test_middleware_emits_server_timing_header():
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware, slow_request_ms=0)
+
+    @app.get("/ping")
+    async def ping() -> dict:
+        with span("export"):
+            return {"ok": True}
+
+    response = TestClient(app).get("/ping")
+
+    assert response.status_code == 200
+    assert "export;dur=" in response.headers["Server-Timing"]
+
+
+def test_mcp_handshake_records_the_auth_span(monkeypatch):
+    async def fake_verify(authorization=None):
+        with span("auth"):
+            return AuthenticatedUser(id="user-1", projects=["proj-1"])
+
+    logged = []
+    monkeypatch.setattr(mcp, "verify_bearer_token", fake_verify)
+    monkeypatch.setattr(mcp, "log_if_slow", lambda label, timings, threshold: logged.append((label, timings)))
+    app = FastAPI()
+    app.include_router(mcp.router, prefix="/mcp")
+    app.state.story_service = StoryBibleService(AsyncMock(), AsyncMock(), MagicMock())
+
+    with TestClient(app).websocket_connect("/mcp/ws") as websocket:
+        websocket.send_json({"id": 1, "method": "list_tools"})
+        assert websocket.receive_json()["result"]["tools"]
+
+    label, timings = logged[0]
+    assert label == "MCP handshake" and timings.as_dict()["spans"]["auth"]["count"] == 1
@@ -0,0 +1,61 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.indexes import IndexManager, StoryBibleIndexes
+from src.models import AuthenticatedUser
+from src.services.embeddings import HashingEmbedder
+from src.services.story_bible_service import StoryBibleService
+
+
+def _bible() -> dict:
+    return {
+        "id": "sb-1",
+        "project_id": "proj-1",
+        "characters": [{"id": "c1", "name": "Ada", "background": "A lighthouse keeper on the northern rock"}],
+        "scenes": [
+            {"id": "s1", "sequence_number": 1, "title": "Storm", "description": "The lighthouse lamp fails in the storm"},
+            {"id": "s2", "sequence_number": 2, "title": "Market", "description": "Fishmongers argue over prices"},
+            {"id": "s3", "sequence_number": 3, "title": "Ferry", "description": "The ferry leaves the harbour at dawn"},
+        ],
+    }
+
+
+class CountingEmbedder(HashingEmbedder):
+    def __init__(self) -> None:
+        super().__init__(dimension=128)
+        self.calls = []
+
+    async def embed(self, texts):
+        self.calls.append(len(texts))
+        return await super().embed(texts)
+
+
+@pytest.mark.asyncio
+async def test_only_changed_rows_are_reembedded():
+    indexes = StoryBibleIndexes(_bible())
+    embedder = CountingEmbedder()
+
+    assert await indexes.vectors.refresh(embedder.embed) == 4
+    indexes.apply_scene({"id": "s2", "sequence_number": 9})
+    assert await indexes.vectors.refresh(embedder.embed) == 0
+    indexes.apply_scene({"id": "s2", "description": "Fishmongers whisper about the lighthouse"})
+    assert await indexes.vectors.refresh(embedder.embed) == 1
+
+    indexes.remove_scene("s1")
+    assert len(indexes.vectors) == 3
+    assert embedder.calls == [4, 1]
+
+
+@pytest.mark.asyncio
+async def test_find_similar_ranks_matching_scene_first():
+    user = AuthenticatedUser(id="user-1", projects=["proj-1"])
+    payload_service = AsyncMock()
+    payload_service.get_story_bible.return_value = _bible()
+    service = StoryBibleService(payload_service, AsyncMock(), MagicMock(), IndexManager(), embedder=HashingEmbedder())
+
+    by_text = await service.find_similar("sb-1", user, query="lighthouse storm", kind="scene", limit=2)
+    by_entity = await service.find_similar("sb-1", user, entity_id="c1", kind="scene", limit=1)
+
+    assert by_text["matches"][0]["id"] == "s1"
+    assert all(match["kind"] == "scene" for match in by_text["matches"])
+    assert by_entity["matches"][0]["id"] == "s1"